@@ -0,0 +1,41 @@
+"""
+Compare summing dwell times per location with ActionSequence.dwell_times for
+each sequence with the nanosecond arrays of Sequences.dwell_time_arrays.
+"""
+from argparse import ArgumentParser
+from collections import defaultdict
+from datetime import timedelta
+
+from benchmarks.helpers import random_sequences, timed
+
+
+def loop_dwell_times(sequences) -> dict:
+
+    dwell_times = defaultdict(timedelta)
+    for sequence in sequences:
+        for location, duration in sequence.dwell_times(True).items():
+            dwell_times[location] += duration
+    return dwell_times
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--n-loop', type=int, default=50_000)
+    args = parser.parse_args()
+
+    small = random_sequences(args.n_loop)
+    looped = timed('dwell_times per sequence for {} actions'.format(
+        len(small.store)), loop_dwell_times, small)
+    summed = timed('dwell_time_arrays for {} actions'.format(
+        len(small.store)), lambda: small.dwell_times(True, True))
+    assert dict(looped) == dict(summed)
+
+    sequences = random_sequences(args.n)
+    dwell_times = timed('dwell_time_arrays for {} actions'.format(
+        len(sequences.store)), sequences.dwell_time_arrays)
+    timed('location sums', dwell_times.location_sums)
+    timed('sequence sums', dwell_times.sequence_sums)
+    timed('sequence location sums', dwell_times.sequence_location_sums)
+    timed('quartiles', dwell_times.quantiles, [0.25, 0.5, 0.75])
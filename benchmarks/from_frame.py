@@ -0,0 +1,67 @@
+"""
+Compare building Sequences from a DataFrame of events row by row with
+`DataFrame.iterrows` with the vectorized `Sequences.from_frame`, and with
+reading the same events from CSV chunks.
+"""
+from argparse import ArgumentParser
+from collections import defaultdict
+from io import StringIO
+
+from pandas import DataFrame, read_csv
+
+from benchmarks.helpers import random_store, timed
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+
+
+def iterrows_sequences(frame: DataFrame) -> Sequences:
+
+    session_actions = defaultdict(list)
+    for _, row in frame.iterrows():
+        session_actions[row['session_id']].append(UserAction(
+            action_id=None, action_type=row['action_type'],
+            source_id=row['source_id'], target_id=row['target_id'],
+            time_stamp=row['time_stamp'].to_pydatetime(),
+            user_id=row['user_id'], session_id=row['session_id']
+        ))
+    return Sequences([
+        ActionSequence(sorted(actions, key=lambda a: a.time_stamp))
+        for actions in session_actions.values()
+    ])
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=2_000_000)
+    parser.add_argument('--n-iterrows', type=int, default=20_000)
+    parser.add_argument('--n-csv', type=int, default=200_000)
+    args = parser.parse_args()
+
+    store = random_store(args.n)
+    frame = DataFrame({
+        column: store.decode(column)
+        for column in ('session_id', 'action_type', 'source_id',
+                       'target_id', 'user_id')
+    })
+    frame['time_stamp'] = store.time_stamps
+    frame = frame.sample(frac=1, random_state=0).reset_index(drop=True)
+    print('{} events in {} sessions'.format(len(frame), store.n_sequences))
+
+    subset = frame.loc[frame['session_id'].isin(
+        store.categories('session_id')[: args.n_iterrows])]
+    timed('iterrows for {} events'.format(len(subset)),
+          iterrows_sequences, subset)
+    timed('from_frame for {} events'.format(len(subset)),
+          Sequences.from_frame, subset)
+    sequences = timed('from_frame for {} events'.format(len(frame)),
+                      Sequences.from_frame, frame)
+    assert len(sequences) == store.n_sequences
+
+    csv_frame = frame.loc[frame['session_id'].isin(
+        store.categories('session_id')[: args.n_csv])]
+    csv = csv_frame.to_csv(index=False)
+    timed('from_frame for {} events from CSV chunks'.format(len(csv_frame)),
+          lambda: Sequences.from_frame(read_csv(
+              StringIO(csv), chunksize=100_000, parse_dates=['time_stamp']
+          )))
@@ -0,0 +1,69 @@
+"""
+Compare the single-pass Sequences.group_by with the previous implementation,
+which split the sequences once per grouper and intersected every combination
+of groups.
+"""
+from argparse import ArgumentParser
+from collections import OrderedDict, defaultdict
+from itertools import product
+
+from benchmarks.helpers import random_sequences, timed
+from ux.sequences.sequences import Sequences
+from ux.sequences.sequences_group_by import SequencesGroupBy
+
+
+def length_band(sequence) -> str:
+    return 'short' if len(sequence) < 4 else 'long'
+
+
+def user_tier(sequence) -> int:
+    return int(sequence.user_id[-1]) % 4
+
+
+def product_group_by(sequences: Sequences, groupers: dict) -> SequencesGroupBy:
+    """
+    The group_by algorithm replaced by the single-pass implementation.
+    """
+    group_bys = OrderedDict()
+    for name, method in groupers.items():
+        splits = defaultdict(list)
+        for sequence in sequences:
+            splits[method(sequence)].append(sequence)
+        group_bys[name] = {
+            key: Sequences(group) for key, group in splits.items()
+        }
+    result = dict()
+    for combo in product(*[group.items() for group in group_bys.values()]):
+        key = tuple(subgroup[0] for subgroup in combo)
+        result[key] = Sequences.intersect_all(
+            [subgroup[1] for subgroup in combo]
+        )
+    return SequencesGroupBy(result, names=list(groupers.keys()))
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--skip-baseline', action='store_true')
+    args = parser.parse_args()
+
+    sequences = timed('generate {} sequences'.format(args.n),
+                      random_sequences, args.n)
+    by = OrderedDict([
+        ('weekday', Sequences._sequence_lookups['weekday']),
+        ('month', Sequences._sequence_lookups['month']),
+        ('length_band', length_band),
+        ('user_tier', user_tier)
+    ])
+    single_pass = timed('single-pass group_by (4 groupers)',
+                        sequences.group_by, by)
+    print('non-empty groups: {}'.format(len(single_pass)))
+    if not args.skip_baseline:
+        baseline = timed('product + intersect_all group_by (4 groupers)',
+                         product_group_by, sequences, by)
+        print('groups incl. empty: {}'.format(len(baseline)))
+        assert all(
+            set(baseline[key].sequences) == set(single_pass[key].sequences)
+            for key in single_pass.keys()
+        )
@@ -0,0 +1,99 @@
+from datetime import datetime
+from time import perf_counter
+from typing import Callable
+
+from numpy import append, arange, array, cumsum, datetime64, int32, int64, \
+    timedelta64, where
+from numpy.random import default_rng
+
+from ux.sequences.action_store import ActionStore
+from ux.sequences.sequences import Sequences
+
+
+def random_store(n_sequences: int,
+                 mean_length: int = 5,
+                 n_locations: int = 50,
+                 n_action_types: int = 4,
+                 n_users: int = 10000,
+                 start: datetime = datetime(2020, 1, 1),
+                 days: int = 90,
+                 seed: int = 0) -> ActionStore:
+    """
+    Generate an ActionStore of random sequences without creating any
+    UserActions.
+
+    :param n_sequences: Number of sequences to generate.
+    :param mean_length: Mean number of actions per sequence.
+    :param n_locations: Number of distinct locations.
+    :param n_action_types: Number of distinct action types.
+    :param n_users: Number of distinct users.
+    :param start: Earliest sequence start date-time.
+    :param days: Number of days the sequence starts are spread over.
+    :param seed: Seed for the random number generator.
+    """
+    rng = default_rng(seed)
+    lengths = rng.integers(1, 2 * mean_length, n_sequences)
+    n_actions = int(lengths.sum())
+    offsets = append([0], cumsum(lengths)).astype(int64)
+    sequence_ids = arange(n_sequences).repeat(lengths)
+    # time stamps increase by a random gap within each sequence
+    sequence_starts = (
+        datetime64(start, 'ns') +
+        rng.integers(0, days * 86400, n_sequences) * timedelta64(1, 's')
+    )
+    gaps = rng.integers(1, 120, n_actions).astype(int64)
+    gaps[offsets[: -1]] = 0
+    elapsed = cumsum(gaps)
+    elapsed -= elapsed[offsets[: -1]].repeat(lengths)
+    time_stamps = (
+        sequence_starts.repeat(lengths) + elapsed * timedelta64(1, 's')
+    )
+    # each action navigates from its source to the next action's source
+    source_codes = rng.integers(0, n_locations, n_actions).astype(int32)
+    target_codes = append(source_codes[1:], [-1]).astype(int32)
+    target_codes[offsets[1:] - 1] = -1
+    user_codes = rng.integers(0, n_users, n_sequences).astype(int32)
+    codes = {
+        'action_type': rng.integers(
+            0, n_action_types, n_actions).astype(int32),
+        'source_id': source_codes,
+        'target_id': where(
+            rng.random(n_actions) < 0.9, target_codes, -1
+        ).astype(int32),
+        'user_id': user_codes.repeat(lengths),
+        'session_id': sequence_ids.astype(int32)
+    }
+    categories = {
+        'action_type': array(['action-type-{}'.format(a)
+                              for a in range(n_action_types)], dtype=object),
+        'location': array(['location-{}'.format(loc)
+                           for loc in range(n_locations)], dtype=object),
+        'user_id': array(['user-{}'.format(u)
+                          for u in range(n_users)], dtype=object),
+        'session_id': array(['session-{}'.format(s)
+                             for s in range(n_sequences)], dtype=object)
+    }
+    return ActionStore(
+        codes=codes, categories=categories, time_stamps=time_stamps,
+        offsets=offsets
+    )
+
+
+def random_sequences(n_sequences: int, **kwargs) -> Sequences:
+    """
+    Generate a columnar Sequences collection of random sequences.
+
+    :param n_sequences: Number of sequences to generate.
+    :param kwargs: Keyword arguments for random_store.
+    """
+    return Sequences.from_store(random_store(n_sequences, **kwargs))
+
+
+def timed(label: str, method: Callable, *args, **kwargs):
+    """
+    Call the method, print the time it took and return its result.
+    """
+    start = perf_counter()
+    result = method(*args, **kwargs)
+    print('{:<50}{:>10.3f} s'.format(label, perf_counter() - start))
+    return result
@@ -0,0 +1,131 @@
+"""
+Compare KPIEngine with the previous calculate_kpis_by_config, which filtered
+a Sequences for every combination of filter-set values and re-filtered the
+subsets for every KPI config.
+"""
+from argparse import ArgumentParser
+from itertools import product
+from typing import Dict, List
+
+from benchmarks.helpers import random_sequences, timed
+from ux.kpis.kpi import KPI
+from ux.kpis.kpi_config import KPIConfig
+from ux.kpis.kpi_engine import KPIEngine
+from ux.sequences.action_sequence import SequenceFilterSet
+from ux.sequences.predicates import contains_action_type, contains_location
+from ux.sequences.sequences import Sequences
+
+
+def previous_calculate_kpis_by_config(
+        sequences: Sequences,
+        kpi_configs: List[KPIConfig],
+        filter_sets: Dict[str, SequenceFilterSet]
+) -> List[KPI]:
+    """
+    The calculate_kpis_by_config algorithm replaced by KPIEngine.
+    """
+    sub_sequences = {}
+    filter_set_names = sorted(filter_sets.keys())
+    for filter_names in product(*[
+        [None] + sorted(filter_sets[name].keys()) for name in filter_set_names
+    ]):
+        loop_seqs = sequences
+        for filter_set_name, filter_name in zip(filter_set_names,
+                                                filter_names):
+            if filter_name is not None:
+                loop_seqs = loop_seqs.filter(
+                    filter_sets[filter_set_name][filter_name]
+                )
+        sub_sequences[filter_names] = loop_seqs
+    results = []
+    for kpi_config in kpi_configs:
+        numer_filter_product = list(product(*[
+            [None] if name not in kpi_config.numerator_sets
+            else sorted(filter_sets[name].keys())
+            for name in filter_set_names
+        ]))
+        denom_filter_product = list(product(*[
+            [None] if name not in kpi_config.denominator_sets
+            else sorted(filter_sets[name].keys())
+            for name in filter_set_names
+        ]))
+        for numer_names, denom_names in product(numer_filter_product,
+                                                denom_filter_product):
+            if not all(numer == denom or denom is None
+                       for numer, denom in zip(numer_names, denom_names)):
+                continue
+            results.append(KPI(
+                name=kpi_config.name,
+                numerator=sub_sequences[numer_names].filter(
+                    kpi_config.condition).count(),
+                denominator=sub_sequences[denom_names].count(),
+                numer_config={
+                    name: numer for name, numer in
+                    zip(filter_set_names, numer_names) if numer is not None
+                },
+                denom_config={
+                    name: denom for name, denom in
+                    zip(filter_set_names, denom_names) if denom is not None
+                }
+            ))
+    return results
+
+
+def make_filter_sets(n_sets: int,
+                     n_filters: int) -> Dict[str, SequenceFilterSet]:
+    """
+    Create filter-sets alternating between declarative predicates and plain
+    lambdas.
+    """
+    filter_sets = {}
+    for s in range(n_sets):
+        filters = {}
+        for f in range(n_filters):
+            if s % 2 == 0:
+                filters['visits {}'.format(f)] = contains_location(
+                    'location-{}'.format(s * n_filters + f))
+            else:
+                filters['length {}'.format(f)] = (
+                    lambda seq, n=f, m=n_filters: len(seq) % m == n)
+        filter_sets['set {:02d}'.format(s)] = filters
+    return filter_sets
+
+
+def make_kpi_configs(set_names: List[str]) -> List[KPIConfig]:
+    """
+    Create KPI configs splitting by growing numbers of filter-sets.
+    """
+    configs = []
+    for c in range(1, min(len(set_names), 3) + 1):
+        configs.append(KPIConfig(
+            name='kpi {}'.format(c),
+            condition=contains_action_type('action-type-{}'.format(c % 4)),
+            numerator_sets=set_names[: c],
+            denominator_sets=set_names[: c - 1]
+        ))
+    return configs
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=100_000)
+    parser.add_argument('--sets', type=int, default=4)
+    parser.add_argument('--filters', type=int, default=3)
+    parser.add_argument('--skip-baseline', action='store_true')
+    args = parser.parse_args()
+
+    sequences = timed('generate {} sequences'.format(args.n),
+                      random_sequences, args.n)
+    filter_sets = make_filter_sets(args.sets, args.filters)
+    kpi_configs = make_kpi_configs(sorted(filter_sets.keys()))
+    kpis = timed('KPIEngine',
+                 lambda: KPIEngine(sequences, filter_sets).calculate(
+                     kpi_configs))
+    if not args.skip_baseline:
+        baseline = timed('per combination calculate_kpis_by_config',
+                         previous_calculate_kpis_by_config,
+                         sequences, kpi_configs, filter_sets)
+        assert ([kpi.to_dict() for kpi in kpis] ==
+                [kpi.to_dict() for kpi in baseline])
+    print('{} KPIs'.format(len(kpis)))
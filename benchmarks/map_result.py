@@ -0,0 +1,57 @@
+"""
+Compare the conversion of MapResults with list values for many groups to
+Series by concatenating a Series per key with the flat columnar conversion.
+"""
+from argparse import ArgumentParser
+
+from numpy.random import default_rng
+from pandas import concat, Index, MultiIndex, Series
+
+from benchmarks.helpers import timed
+from ux.wrappers.map_result import MapResult
+
+
+def previous_to_series(result: MapResult) -> Series:
+    """
+    The list-valued conversion of MapResult.to_series before the columnar
+    representation, which concatenated one Series per key.
+    """
+    if len(result.key_names) > 1:
+        return concat([
+            Series(index=MultiIndex.from_tuples(tuples=[key] * len(values),
+                                                names=result.key_names),
+                   data=values, name=result.value_names[0])
+            for key, values in result.items()
+        ])
+    return concat([
+        Series(index=Index([key] * len(values), name=result.key_names[0]),
+               data=values, name=result.value_names[0])
+        for key, values in result.items()
+    ])
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--groups', type=int, default=100_000)
+    parser.add_argument('--max-values', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = default_rng(0)
+    lengths = rng.integers(1, args.max_values + 1, args.groups).tolist()
+    single = {'group-{}'.format(g): rng.integers(0, 100, n).tolist()
+              for g, n in enumerate(lengths)}
+    double = {('group-{}'.format(g // 10), 'sub-{}'.format(g % 10)): values
+              for g, values in enumerate(single.values())}
+
+    for label, data, key_names in (('single', single, 'group'),
+                                   ('tuple', double, ['group', 'sub'])):
+        result = timed('MapResult {} keys'.format(label),
+                       MapResult, data, key_names)
+        previous = timed('previous to_series {} keys'.format(label),
+                         previous_to_series, result)
+        series = timed('to_series {} keys'.format(label), result.to_series)
+        timed('cached to_series {} keys'.format(label), result.to_series)
+        timed('cached to_frame {} keys'.format(label), result.to_frame)
+        assert previous.equals(series)
+        assert previous.index.equals(series.index)
@@ -0,0 +1,138 @@
+"""
+Compare the memory and hashing cost of the slotted UserAction and interned
+ActionTemplate with the previous __dict__-based implementations.
+
+Objects are measured on a sample of --n actions and the totals extrapolated
+to --scale actions.
+"""
+import gc
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from benchmarks.helpers import timed
+from ux.actions.user_action import UserAction
+
+
+class DictActionTemplate(object):
+    """
+    The previous ActionTemplate, with a __dict__ and an uncached hash.
+    """
+    def __init__(self, action_type, source_id, target_id=None, weighting=1):
+
+        self._action_type = action_type
+        self._source_id = source_id
+        self._target_id = target_id
+        self._weighting = weighting
+
+    def to_dict(self) -> dict:
+        return {
+            'action_type': self._action_type,
+            'source_id': self._source_id,
+            'target_id': self._target_id
+        }
+
+    def __eq__(self, other) -> bool:
+        return (
+            (self._action_type == other._action_type or
+             '*' in (self._action_type, other._action_type)) and
+            (self._source_id == other._source_id or
+             '*' in (self._source_id, other._source_id)) and
+            (self._target_id == other._target_id or
+             '*' in (self._target_id, other._target_id))
+        )
+
+    def __hash__(self) -> int:
+        return hash(tuple(sorted(self.to_dict().items())))
+
+
+class DictUserAction(object):
+    """
+    The previous UserAction, with a __dict__ and a new template per action.
+    """
+    def __init__(self, action_id, action_type, source_id, time_stamp,
+                 user_id, session_id, target_id=None, meta=None):
+
+        self._action_type = action_type
+        self._source_id = source_id
+        self._target_id = target_id
+        self._action_id = action_id
+        self._time_stamp = time_stamp
+        self._user_id = user_id
+        self._session_id = session_id
+        self._meta = meta
+        self._action_template = None
+
+    def template(self) -> DictActionTemplate:
+        if self._action_template is None:
+            self._action_template = DictActionTemplate(
+                action_type=self._action_type,
+                source_id=self._source_id,
+                target_id=self._target_id
+            )
+        return self._action_template
+
+
+def make_actions(action_class: type, n: int) -> list:
+    """
+    Create n actions over 50 locations, sharing their field values so only
+    the per-object overhead is measured.
+    """
+    y2k = datetime(2000, 1, 1)
+    locations = ['location-{}'.format(loc) for loc in range(50)]
+    time_stamps = [y2k + timedelta(seconds=s) for s in range(1000)]
+    action_ids = [str(a) for a in range(n)]
+    return [
+        action_class(
+            action_id=action_ids[a], action_type='click',
+            source_id=locations[a % 50], target_id=locations[(a + 1) % 50],
+            time_stamp=time_stamps[a % 1000], user_id='user',
+            session_id='session'
+        )
+        for a in range(n)
+    ]
+
+
+def measure(make: Callable[[], List]) -> tuple:
+    """
+    Return the objects created by make and the bytes they allocated.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = make()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, size
+
+
+def hash_templates(actions: list) -> int:
+
+    return len({action.template() for action in actions})
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--scale', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    for label, action_class in (('dict', DictUserAction),
+                                ('slots', UserAction)):
+        actions, action_bytes = measure(
+            lambda: make_actions(action_class, args.n))
+        # the action id strings and list are shared by both implementations
+        _, shared_bytes = measure(
+            lambda: [str(a) for a in range(args.n)] + [None] * args.n)
+        templates, template_bytes = measure(
+            lambda: [action.template() for action in actions])
+        per_action = (action_bytes - shared_bytes) / args.n
+        per_template = template_bytes / args.n
+        print('{} UserAction: {:.0f} B/action, templates: {:.0f} B/action, '
+              '{:.2f} GB at {:,} actions'.format(
+                label, per_action, per_template,
+                (per_action + per_template) * args.scale / 1e9, args.scale))
+        timed('{} hash templates of {:,} actions'.format(label, args.n),
+              hash_templates, actions)
+        del actions, templates
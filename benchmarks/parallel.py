@@ -0,0 +1,36 @@
+"""
+Compare sequential and parallel Sequences operations with Python-level
+functions that cannot be vectorized.
+"""
+from argparse import ArgumentParser
+
+from benchmarks.helpers import random_sequences, timed
+
+
+def visits_twice(sequence) -> bool:
+
+    source_ids = sequence.source_ids
+    return len(set(source_ids)) < len(source_ids)
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=200_000)
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--kind', default='process')
+    args = parser.parse_args()
+
+    sequences = timed('generate {} sequences'.format(args.n),
+                      random_sequences, args.n)
+    parallel = sequences.with_executor(n_jobs=args.jobs, kind=args.kind)
+    print('{} workers'.format(parallel.executor.n_jobs))
+    for label, method in [
+        ('filter', lambda seqs: len(seqs.filter(visits_twice))),
+        ('counter', lambda seqs: seqs.counter(lambda seq: seq.source_ids)),
+        ('group_by', lambda seqs: len(seqs.group_by(
+            lambda seq: seq.source_ids[0]))),
+        ('dwell_times', lambda seqs: seqs.dwell_times(True, True))
+    ]:
+        sequential = timed('sequential ' + label, method, sequences)
+        assert sequential == timed('parallel ' + label, method, parallel)
@@ -0,0 +1,48 @@
+"""
+Compare rebuilding a Sequences collection from UserActions with loading one
+saved with Sequences.save.
+"""
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+
+from benchmarks.helpers import random_sequences, timed
+from ux.sequences.action_store import ActionStore
+from ux.sequences.sequences import Sequences
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    sequences = timed('generate {} sequences'.format(args.n),
+                      random_sequences, args.n)
+    user_actions = timed('create {} user actions'.format(
+        len(sequences.store)), sequences.store.user_actions)
+    lengths = (sequences.store.offsets[1:] -
+               sequences.store.offsets[: -1]).tolist()
+    timed('rebuild from user actions', lambda: Sequences.from_store(
+        ActionStore.from_arrays(
+            action_types=[a.action_type for a in user_actions],
+            source_ids=[a.source_id for a in user_actions],
+            target_ids=[a.target_id for a in user_actions],
+            user_ids=[a.user_id for a in user_actions],
+            session_ids=[a.session_id for a in user_actions],
+            time_stamps=[a.time_stamp for a in user_actions],
+            lengths=lengths
+        )
+    ))
+    with TemporaryDirectory() as path:
+        timed('save', sequences.save, path)
+        loaded = timed('load memory-mapped', Sequences.load, path)
+        timed('count sequences visiting location-0',
+              lambda: loaded.count(lambda s: 'location-0' in s.source_ids))
+        assert loaded.store.time_stamps.shape == \
+            sequences.store.time_stamps.shape
+        timed('save partitioned by date', sequences.save,
+              path + '/partitioned', partition_by='date')
+        week = timed('load one week of partitions', Sequences.load,
+                     path + '/partitioned', start='2020-01-01',
+                     end='2020-01-07')
+        print('{} sequences in the week'.format(len(week)))
@@ -0,0 +1,66 @@
+"""
+Compare splitting user streams into sessions on an inactivity gap by looping
+over the actions of each stream with the vectorized Sessionizer, in one pass
+and in batches.
+"""
+from argparse import ArgumentParser
+from datetime import timedelta
+
+from numpy import argsort, array_split
+
+from benchmarks.helpers import random_store, timed
+from ux.sequences import ActionSequence, Sequences, Sessionizer
+
+
+def loop_sessions(streams: Sequences, gap: timedelta) -> Sequences:
+
+    sessions = []
+    for stream in streams:
+        actions = stream.user_actions
+        start = 0
+        for a in range(1, len(actions)):
+            if actions[a].time_stamp - actions[a - 1].time_stamp > gap:
+                sessions.append(ActionSequence(actions[start: a]))
+                start = a
+        sessions.append(ActionSequence(actions[start:]))
+    return Sequences(sessions)
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--n-loop', type=int, default=50_000)
+    parser.add_argument('--n-batches', type=int, default=10)
+    args = parser.parse_args()
+
+    gap = timedelta(minutes=30)
+    sessionizer = Sessionizer(gap=gap)
+    small = Sessionizer(gap=None).sessionize(random_store(args.n_loop))
+    looped = timed('loop over {} actions'.format(len(small.store)),
+                   loop_sessions, small, gap)
+    vectorized = timed('Sessionizer over {} actions'.format(len(small.store)),
+                       sessionizer.sessionize, small)
+    assert sorted(s.source_ids for s in looped) == \
+           sorted(s.source_ids for s in vectorized)
+
+    store = random_store(args.n)
+    sessions = timed('Sessionizer over {} actions'.format(len(store)),
+                     sessionizer.sessionize, store)
+    # time-ordered batches of single actions
+    rows = argsort(store.time_stamps, kind='stable')
+    batches = [store.take(batch_rows, batch_rows + 1)
+               for batch_rows in array_split(rows, args.n_batches)]
+
+    def incremental() -> list:
+        batch_sessionizer = Sessionizer(gap=gap)
+        batch_sessions = []
+        for batch in batches:
+            batch_sessions.extend(batch_sessionizer.update(batch))
+        batch_sessions.extend(batch_sessionizer.flush())
+        return batch_sessions
+
+    incremental_sessions = timed(
+        'Sessionizer over {} batches'.format(args.n_batches), incremental)
+    assert len(incremental_sessions) == len(sessions)
+    print('{} sessions'.format(len(sessions)))
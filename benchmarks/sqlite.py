@@ -0,0 +1,42 @@
+"""
+Compare reading the sequences of every session from SQLiteDatabaseManager
+one session at a time with reading them in bulk batches.
+"""
+from argparse import ArgumentParser
+
+from benchmarks.helpers import random_store, timed
+from ux.sqlite_database_manager import SQLiteDatabaseManager
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=20_000)
+    parser.add_argument('--path', default=':memory:')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    store = random_store(args.n)
+    user_actions = timed('create {} user actions'.format(len(store)),
+                         store.user_actions)
+    manager = SQLiteDatabaseManager(args.path)
+    timed('insert user actions', manager.insert_user_actions, user_actions)
+    session_ids = [session.session_id for session in manager.sessions()]
+    per_session = timed(
+        'get_session_sequence per session',
+        lambda: [manager.get_session_sequence(session_id)
+                 for session_id in session_ids]
+    )
+    bulk = timed(
+        'get_session_sequences in batches of {}'.format(args.batch_size),
+        lambda: list(manager.get_session_sequences(
+            session_ids, batch_size=args.batch_size))
+    )
+    prefetched = timed(
+        'get_session_sequences with prefetch',
+        lambda: list(manager.get_session_sequences(
+            session_ids, batch_size=args.batch_size, prefetch_batches=True))
+    )
+    for sequences in (bulk, prefetched):
+        assert [sequence.source_ids for sequence in sequences] == \
+               [sequence.source_ids for sequence in per_session]
@@ -0,0 +1,43 @@
+"""
+Compare splitting and cropping each ActionSequence in turn with the
+collection-level Sequences.split and Sequences.crop.
+"""
+from argparse import ArgumentParser
+
+from benchmarks.helpers import random_sequences, timed
+from ux.actions.action_template import ActionTemplate
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=200_000)
+    args = parser.parse_args()
+
+    sequences = random_sequences(args.n, n_locations=3)
+    start = ActionTemplate('action-type-0', 'location-0', 'location-1')
+    end = ActionTemplate('action-type-1', 'location-2', 'location-0')
+    looped = timed(
+        'ActionSequence.crop per sequence',
+        lambda: [cropped for cropped in (
+            sequence.crop(start, end, how='first') for sequence in sequences
+        ) if cropped is not None]
+    )
+    cropped = timed('Sequences.crop', sequences.crop, start, end, 'first')
+    assert [s.store_offsets for s in looped] == \
+           [s.store_offsets for s in cropped]
+    matching = sequences.filter(
+        lambda seq: any(template == start
+                        for template in seq.action_templates())
+    )
+    looped = timed(
+        'ActionSequence.split per sequence',
+        lambda: [sub_sequence for sequence in matching
+                 for sub_sequence in sequence.split(
+                     lambda action: action.template() == start, how='before')]
+    )
+    split = timed('Sequences.split', matching.split, start, 'before')
+    assert [s.store_offsets for s in looped] == \
+           [s.store_offsets for s in split]
+    print('{} cropped, {} split from {} sequences'.format(
+        len(cropped), len(split), len(matching)))
@@ -0,0 +1,49 @@
+"""
+Time a chained dashboard expression over years of hourly TemporalCounts,
+which align and combine their count arrays instead of round-tripping every
+operation through pandas, and building counts from dicts.
+"""
+from argparse import ArgumentParser
+
+from numpy.random import default_rng
+from pandas import date_range
+
+from benchmarks.helpers import timed
+from ux.counts.temporal_count import TemporalCount
+
+
+def expression(visits, orders, returns):
+
+    return (orders - returns) / visits * 100 + 0
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--n-categories', type=int, default=10)
+    parser.add_argument('--repeats', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = default_rng(0)
+    date_times = date_range('2020-01-01', periods=args.years * 8760,
+                            freq='H')
+    categories = ['category-{}'.format(c) for c in range(args.n_categories)]
+    for split in (False, True):
+        counts = [
+            TemporalCount(
+                name=name, date_times=date_times,
+                counts=rng.integers(
+                    1, 100, (len(date_times), args.n_categories) if split
+                    else len(date_times)),
+                categories=categories if split else None
+            )
+            for name in ('visits', 'orders', 'returns')
+        ]
+        label = 'split' if split else 'unsplit'
+        timed('{} x {} {}'.format(args.repeats, len(date_times), label),
+              lambda: [expression(*counts) for _ in range(args.repeats)])
+        as_dicts = [dict(count.items()) for count in counts]
+        timed('from_dict {}'.format(label),
+              lambda: [TemporalCount.from_dict(as_dict, name='count')
+                       for as_dict in as_dicts])
@@ -0,0 +1,86 @@
+"""
+Compare dense and sparse storage of split TemporalCounts with many
+categories, selecting the top categories of a heatmap before and after
+creating the full pivot table, and streaming category counts through a
+SpaceSaving sketch.
+"""
+from argparse import ArgumentParser
+from collections import Counter
+
+from numpy import minimum
+from numpy.random import default_rng
+from pandas import date_range, pivot_table, Series
+
+from benchmarks.helpers import timed
+from ux.counts.space_saving import SpaceSaving
+from ux.counts.temporal_count import TemporalCount
+
+
+def previous_heatmap_data(count: TemporalCount, top: int):
+    """
+    The heatmap data of TemporalCount.plot before top-k selection, which
+    pivoted every (date-time, category) count before slicing the top rows.
+    """
+    data = count.to_series().reset_index()
+    pt = pivot_table(
+        data=data, index='date_time', columns=count.name, values='count'
+    ).astype(int)
+    pt = (
+        pt.append(Series(data=pt.sum(), name='#TOTAL#'))
+          .sort_values('#TOTAL#', axis=1, ascending=False)
+          .drop('#TOTAL#', axis=0)
+    )
+    return pt.T.head(top).T
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--n-categories', type=int, default=5000)
+    parser.add_argument('--per-bucket', type=int, default=50)
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = default_rng(0)
+    date_times = date_range('2020-01-01', periods=args.days * 24, freq='H')
+    # zipf-distributed categories, as for counts split by page
+    codes = minimum(rng.zipf(1.3, (len(date_times), args.per_bucket)),
+                    args.n_categories) - 1
+    dictionary = {
+        date_time: dict(Counter(
+            'page-{}'.format(code) for code in bucket_codes.tolist()))
+        for date_time, bucket_codes in zip(date_times, codes)
+    }
+    dense = timed('from_dict dense', TemporalCount.from_dict,
+                  dictionary, 'pages')
+    sparse = timed('from_dict sparse', TemporalCount.from_dict,
+                   dictionary, 'pages', sparse=True)
+    print('{} buckets x {} categories stored as {:.1f} MB dense, '
+          '{:.1f} MB sparse'.format(
+              len(sparse), len(sparse.categories), dense.counts.nbytes / 1e6,
+              (sparse.counts.data.nbytes + sparse.counts.indices.nbytes +
+               sparse.counts.indptr.nbytes) / 1e6
+          ))
+    previous = timed('heatmap data via full pivot table',
+                     previous_heatmap_data, dense, args.top)
+    for count in (dense, sparse):
+        label = 'sparse' if count.is_sparse else 'dense'
+        selected = timed('heatmap data via top({}) {}'.format(args.top, label),
+                         lambda: count.top(args.top).to_dense().to_frame()
+                         .droplevel(0, axis=1).astype(int))
+        assert (previous.sum().sort_values(ascending=False).values ==
+                selected.sum().values).all()
+    timed('sparse + sparse', lambda: sparse + sparse)
+    timed('dense + dense', lambda: dense + dense)
+    timed('resample sparse to days', sparse.resample, 'D')
+    timed('resample dense to days', dense.resample, 'D')
+
+    sketch = SpaceSaving(capacity=200)
+    timed('SpaceSaving(200) over {} buckets'.format(len(dictionary)),
+          lambda: [sketch.update(bucket) for bucket in dictionary.values()])
+    exact = set(dense.top(args.top).categories)
+    found = [category for category, _ in sketch.top(args.top)]
+    print('{} of the top {} categories found, {} guaranteed'.format(
+        len(exact.intersection(found)), args.top,
+        len(sketch.guaranteed(args.top))))
@@ -0,0 +1,60 @@
+"""
+Compare re-counting sequences by week with resampling daily TemporalCounts,
+and time rolling, cumulative and differenced views of years of hourly counts.
+"""
+from argparse import ArgumentParser
+
+from numpy.random import default_rng
+from pandas import date_range
+
+from benchmarks.helpers import random_sequences, timed
+from benchmarks.temporal_counts import make_configs
+from ux.counts.temporal_count import TemporalCount
+from ux.utils.counts import temporal_counts_by_config
+
+
+def sorted_pandas(count: TemporalCount):
+    """
+    Return the pandas representation of a count with its categories sorted,
+    since they are in the order they were first counted.
+    """
+    data = count.to_pandas()
+    return data.sort_index(axis=1) if count.is_split else data
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=200_000)
+    parser.add_argument('--configs', type=int, default=8)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--n-categories', type=int, default=10)
+    args = parser.parse_args()
+
+    sequences = random_sequences(args.n)
+    configs = make_configs(args.configs)
+    daily = timed('daily temporal_counts_by_config',
+                  temporal_counts_by_config, sequences, configs, 'D')
+    recounted = timed('weekly temporal_counts_by_config',
+                      temporal_counts_by_config, sequences, configs, 'W-MON')
+    resampled = timed('resample daily counts to weekly', lambda: {
+        name: count.resample('W-MON') for name, count in daily.items()
+    })
+    for name, count in recounted.items():
+        assert sorted_pandas(count).equals(sorted_pandas(resampled[name]))
+
+    rng = default_rng(0)
+    date_times = date_range('2010-01-01', periods=args.years * 8760,
+                            freq='H')
+    hourly = TemporalCount(
+        name='hourly', date_times=date_times,
+        counts=rng.integers(0, 100, (len(date_times), args.n_categories)),
+        categories=['category-{}'.format(c) for c in range(args.n_categories)]
+    )
+    label = '{} x {}'.format(len(date_times), args.n_categories)
+    timed('resample {} to weeks'.format(label), hourly.resample, 'W-MON')
+    timed('rolling 7D mean {}'.format(label), hourly.rolling, '7D')
+    timed('rolling 24 bucket sum {}'.format(label), hourly.rolling, 24,
+          'sum')
+    timed('cumsum {}'.format(label), hourly.cumsum)
+    timed('diff {}'.format(label), hourly.diff)
@@ -0,0 +1,49 @@
+"""
+Compare an hourly job that recounts the full history with
+temporal_counts_by_config with one that updates a saved TemporalCounter with
+the sequences of the last hour.
+"""
+import json
+from argparse import ArgumentParser
+
+from benchmarks.helpers import random_sequences, timed
+from benchmarks.temporal_counts import make_configs
+from ux.counts.temporal_counter import TemporalCounter
+from ux.sequences.sequences import Sequences
+from ux.utils.counts import temporal_counts_by_config
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=200_000)
+    parser.add_argument('--configs', type=int, default=8)
+    parser.add_argument('--days', type=int, default=90)
+    args = parser.parse_args()
+
+    sequences = random_sequences(args.n, days=args.days)
+    configs = make_configs(args.configs)
+    start_times = sequences.start_times()
+    last_hour = start_times.max().floor('H')
+    history = Sequences([sequences[p] for p in
+                         (start_times < last_hour).nonzero()[0].tolist()])
+    new = Sequences([sequences[p] for p in
+                     (start_times >= last_hour).nonzero()[0].tolist()])
+    state = json.dumps(TemporalCounter(configs, 'H').update(history)
+                       .to_state())
+
+    recounted = timed('recount {} sequences'.format(len(sequences)),
+                      temporal_counts_by_config, sequences, configs, 'H')
+
+    def hourly_job():
+        counter = TemporalCounter.from_state(configs, json.loads(state))
+        counter.update(new)
+        return json.dumps(counter.to_state()), counter
+
+    new_state, counter = timed(
+        'load state, update {} sequences, save state'.format(len(new)),
+        hourly_job
+    )
+    for name, count in recounted.items():
+        assert (count.to_series().sort_index().equals(
+            counter.counts[name].to_series().sort_index())), name
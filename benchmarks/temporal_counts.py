@@ -0,0 +1,124 @@
+"""
+Compare the single-pass temporal_counts_by_config with the previous
+implementation, which rebuilt a Sequences and re-filtered it for every
+(bucket, config) pair.
+"""
+from argparse import ArgumentParser
+from collections import Counter
+from typing import List
+
+from benchmarks.helpers import random_sequences, timed
+from ux.counts.count_config import CountConfig
+from ux.counts.temporal_count import TemporalCount
+from ux.sequences.sequences import Sequences
+from ux.utils.counts import count_sequences_where, temporal_counts_by_config
+from ux.utils.sequences import split_sequences_by_day
+
+
+def previous_count_actions_where(sequences, action_condition,
+                                 sequence_condition=None, split_by=None):
+    """
+    count_actions_where before the fused evaluator, accumulating with +=.
+    """
+    sequences = sequences.filter(sequence_condition)
+    if split_by is None:
+        count = 0
+        for sequence in sequences:
+            count += sequence.count(action_condition)
+        return count
+    counts = Counter()
+    for sequence in sequences:
+        counts += sequence.filter(action_condition).counter(split_by)
+    return dict(counts)
+
+
+def previous_temporal_counts_by_config(sequences, configs, temporal_split):
+    """
+    The temporal_counts_by_config algorithm replaced by CountEvaluator.
+    """
+    total_counts = dict()
+    for config in configs:
+        total_counts[config.name] = TemporalCount(config.name)
+    sequence_groups = temporal_split(sequences)
+    for sequence_date, date_sequences in sequence_groups.items():
+        for config in configs:
+            if config.action_condition is None:
+                counts = count_sequences_where(
+                    sequences=Sequences(date_sequences),
+                    condition=config.sequence_condition,
+                    split_by=config.sequence_split_by
+                )
+            else:
+                counts = previous_count_actions_where(
+                    sequences=Sequences(date_sequences),
+                    sequence_condition=config.sequence_condition,
+                    action_condition=config.action_condition,
+                    split_by=config.action_split_by
+                )
+            total_counts[config.name][sequence_date] = counts
+    return total_counts
+
+
+def make_configs(n_configs: int) -> List[CountConfig]:
+    """
+    Create a mix of sequence and action count configs, with and without
+    splits.
+    """
+    configs = []
+    for c in range(n_configs):
+        location = 'location-{}'.format(c)
+        action_type = 'action-type-{}'.format(c % 4)
+        kind = c % 4
+        if kind == 0:
+            configs.append(CountConfig(
+                name='sequences visiting {}'.format(location),
+                sequence_condition=(
+                    lambda seq, loc=location: loc in seq.source_ids)
+            ))
+        elif kind == 1:
+            configs.append(CountConfig(
+                name='sequences by length {}'.format(c),
+                sequence_condition=lambda seq, n=c: len(seq) > n % 5,
+                sequence_split_by=lambda seq: str(min(len(seq), 5))
+            ))
+        elif kind == 2:
+            configs.append(CountConfig(
+                name='{} actions'.format(action_type),
+                sequence_condition=lambda seq: True,
+                action_condition=(
+                    lambda a, t=action_type: a.action_type == t)
+            ))
+        else:
+            configs.append(CountConfig(
+                name='actions from {} by target'.format(location),
+                sequence_condition=lambda seq: True,
+                action_condition=lambda a, loc=location: a.source_id == loc,
+                action_split_by=lambda a: a.target_id or 'none'
+            ))
+    return configs
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser()
+    parser.add_argument('--n', type=int, default=1_000_000)
+    parser.add_argument('--configs', type=int, default=20)
+    parser.add_argument('--skip-baseline', action='store_true')
+    args = parser.parse_args()
+
+    sequences = timed('generate {} sequences'.format(args.n),
+                      random_sequences, args.n)
+    sequences = timed('materialise user actions',
+                      lambda: Sequences([
+                          sequence for sequence in sequences
+                          if sequence.user_actions is not None
+                      ]))
+    configs = make_configs(args.configs)
+    fused = timed('single-pass temporal_counts_by_config',
+                  temporal_counts_by_config,
+                  sequences, configs, split_sequences_by_day)
+    if not args.skip_baseline:
+        baseline = timed('per bucket x config temporal_counts_by_config',
+                         previous_temporal_counts_by_config,
+                         sequences, configs, split_sequences_by_day)
+        assert fused == baseline
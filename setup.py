@@ -17,5 +17,9 @@ setup(
         'scipy',
         'seaborn',
         'statsmodels'
-    ]
+    ],
+    extras_require={
+        'parquet': ['pyarrow'],
+        'test': ['pyarrow']
+    }
 )
@@ -0,0 +1,29 @@
+from datetime import datetime
+from unittest import TestCase
+
+from ux.actions.action_template import ActionTemplate, intern_template
+from ux.actions.user_action import UserAction
+
+
+class TestActionTemplate(TestCase):
+
+    def test_intern_template(self):
+
+        template = intern_template('click', 'A', 'B')
+        self.assertIs(template, intern_template('click', 'A', 'B'))
+        self.assertIsNot(template, intern_template('click', 'A'))
+        self.assertEqual(ActionTemplate('click', 'A', 'B'), template)
+        self.assertEqual(hash(ActionTemplate('click', 'A', 'B')),
+                         hash(template))
+
+    def test_actions_share_templates(self):
+
+        actions = [
+            UserAction(action_id=str(a), action_type='click', source_id='A',
+                       target_id='B', time_stamp=datetime(2000, 1, 1),
+                       user_id='user_1', session_id='session_1')
+            for a in range(2)
+        ]
+        self.assertIs(actions[0].template(), actions[1].template())
+        with self.assertRaises(AttributeError):
+            actions[0].extra = 1
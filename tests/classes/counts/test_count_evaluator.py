@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import UserAction
+from ux.counts import CountConfig, CountEvaluator
+from ux.sequences import ActionSequence
+
+
+class TestCountEvaluator(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        sequences = [
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(a), action_type='view',
+                    source_id=source_id, target_id=target_id,
+                    time_stamp=y2k + timedelta(hours=s, seconds=a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a, (source_id, target_id) in enumerate(actions)
+            ])
+            for s, actions in enumerate([
+                [('A', 'B'), ('B', 'C'), ('C', None)],
+                [('B', 'C'), ('C', 'A')],
+                [('A', 'B'), ('B', 'C'), ('C', 'A')]
+            ])
+        ]
+        self.buckets = [sequences[: 2], [], sequences[2:]]
+
+    def test_sequence_counts(self):
+
+        starts_at_a = lambda seq: seq[0].source_id == 'A'
+        evaluator = CountEvaluator([
+            CountConfig(name='from A', sequence_condition=starts_at_a),
+            CountConfig(name='by length', sequence_condition=starts_at_a,
+                        sequence_split_by=lambda seq: str(len(seq)))
+        ])
+        self.assertEqual({
+            'from A': [1, 0, 1],
+            'by length': [{'3': 1}, {}, {'3': 1}]
+        }, evaluator.evaluate(self.buckets))
+
+    def test_action_counts(self):
+
+        evaluator = CountEvaluator([
+            CountConfig(name='B to C', sequence_condition=lambda seq: True,
+                        action_condition=ActionTemplate('view', 'B', 'C')),
+            CountConfig(name='targets', sequence_condition=lambda seq: True,
+                        action_condition=lambda a: a.target_id is not None,
+                        action_split_by=lambda a: a.target_id)
+        ])
+        self.assertEqual({
+            'B to C': [2, 0, 1],
+            'targets': [{'B': 1, 'C': 2, 'A': 1}, {},
+                        {'B': 1, 'C': 1, 'A': 1}]
+        }, evaluator.evaluate(self.buckets))
+
+    def test_invalid_action_split(self):
+
+        evaluator = CountEvaluator([
+            CountConfig(name='bad', sequence_condition=lambda seq: True,
+                        action_condition=lambda a: True,
+                        action_split_by=lambda a: 1)
+        ])
+        with self.assertRaises(TypeError):
+            evaluator.evaluate(self.buckets)
@@ -0,0 +1,49 @@
+import json
+from collections import Counter
+from random import Random
+from unittest import TestCase
+
+from ux.counts import SpaceSaving
+
+
+class TestSpaceSaving(TestCase):
+
+    def setUp(self) -> None:
+
+        random = Random(0)
+        # item i occurs about 1 / (i + 1) as often as item 0
+        self.items = [int(1 / random.random()) - 1 for _ in range(20000)]
+        self.items = [item for item in self.items if item < 1000]
+        self.counts = Counter(self.items)
+
+    def test_bounds(self):
+
+        sketch = SpaceSaving(50)
+        for start in range(0, len(self.items), 1000):
+            sketch.update(self.items[start: start + 1000])
+        self.assertEqual(50, len(sketch))
+        self.assertEqual(len(self.items), sketch.total)
+        errors = sketch.errors()
+        for item, count in sketch.counts().items():
+            self.assertLessEqual(self.counts[item], count)
+            self.assertLessEqual(count - errors[item], self.counts[item])
+        for item, count in self.counts.items():
+            if count > sketch.total / sketch.capacity:
+                self.assertIn(item, sketch)
+        self.assertEqual([item for item, _ in self.counts.most_common(3)],
+                         sketch.guaranteed(3))
+
+    def test_weighted_update_and_state(self):
+
+        sketch = SpaceSaving(2).update({'a': 5, 'b': 3})
+        sketch.update({'c': 1})
+        self.assertEqual({'a': 5, 'c': 4}, sketch.counts())
+        self.assertEqual({'a': 0, 'c': 3}, sketch.errors())
+        restored = SpaceSaving.from_state(
+            json.loads(json.dumps(sketch.to_state())))
+        for updated in (sketch, restored):
+            updated.update(['b', 'b'])
+        self.assertEqual(sketch.counts(), restored.counts())
+        self.assertEqual([('b', 6)], restored.top(1))
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
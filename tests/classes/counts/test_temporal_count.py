@@ -0,0 +1,192 @@
+import json
+from copy import copy, deepcopy
+from datetime import datetime, timedelta
+from pickle import dumps, loads
+from unittest import TestCase
+
+from numpy import isnan
+
+from ux.counts.temporal_count import TemporalCount
+
+
+class TestTemporalCount(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.days = [y2k + timedelta(days=d) for d in range(4)]
+        self.visits = TemporalCount.from_dict(
+            {day: 10 * (d + 1) for d, day in enumerate(self.days[: 3])},
+            name='visits'
+        )
+        self.orders = TemporalCount.from_dict(
+            {day: d for d, day in enumerate(self.days[1:])}, name='orders'
+        )
+        self.split = TemporalCount.from_dict({
+            self.days[0]: {'A': 1, 'B': 2},
+            self.days[1]: {'B': 3, 'C': 4}
+        }, name='by_page')
+
+    def test_arrays(self):
+
+        self.assertEqual(self.days[: 3], self.visits.date_times.tolist())
+        self.assertEqual([10, 20, 30], self.visits.counts.tolist())
+        self.assertIsNone(self.visits.categories)
+        self.assertEqual(['A', 'B', 'C'], self.split.categories.tolist())
+        self.assertEqual([[1, 2, 0], [0, 3, 4]], self.split.counts.tolist())
+
+    def test_aligned_arithmetic(self):
+
+        result = self.orders / self.visits
+        self.assertEqual('orders / visits', result.name)
+        self.assertEqual(self.days, result.date_times.tolist())
+        self.assertTrue(isnan(result.counts[0]))
+        self.assertEqual([0, 1 / 30], result.counts[1: 3].tolist())
+        self.assertTrue(isnan(result.counts[3]))
+        self.assertTrue(result.to_series().equals(
+            (self.orders.to_series() / self.visits.to_series()).fillna(0)
+        ))
+        total = 2 * self.split + self.split
+        self.assertEqual('2 * by_page + by_page', total.name)
+        self.assertEqual([[3, 6, 0], [0, 9, 12]], total.counts.tolist())
+
+    def test_operand_errors(self):
+
+        with self.assertRaises(ValueError):
+            _ = self.visits + self.split
+        with self.assertRaises(TypeError):
+            _ = self.visits + 'one'
+
+    def test_dict_interface(self):
+
+        count = self.split.copy()
+        count[self.days[3]] = {'D': 5}
+        count[self.days[0]] = {'A': 6}
+        self.assertEqual(3, len(count))
+        self.assertEqual({'A': 6}, count[self.days[0]])
+        self.assertEqual({'D': 5}, count[self.days[3]])
+        del count[self.days[1]]
+        self.assertEqual([self.days[0], self.days[3]], list(count))
+        self.assertEqual(2, len(self.split))
+        with self.assertRaises(ValueError):
+            count[self.days[2]] = 1
+            _ = count.counts
+
+    def test_dict_keys(self):
+
+        dates = [day.date() for day in self.days]
+        count = TemporalCount.from_dict({dates[1]: 2, dates[0]: 1}, 'visits')
+        count[dates[2]] = 3
+        self.assertEqual({dates[0]: 1, dates[1]: 2, dates[2]: 3}, dict(count))
+        self.assertEqual(repr(dict(count)), repr(count))
+        self.assertEqual(dates[: 3], list((count + count).keys()))
+        self.assertEqual(count, loads(dumps(count)))
+        self.assertNotEqual(count, count * 2)
+        self.assertFalse('foo' in count)
+        self.assertIsNone(count.get('foo'))
+        self.assertNotIsInstance(count, dict)
+        with self.assertRaises(TypeError):
+            json.dumps(count)
+
+    def test_copies_are_independent(self):
+
+        dates = [day.date() for day in self.days]
+        count = TemporalCount.from_dict({dates[0]: 2, dates[1]: 3}, 'visits')
+        for copied in (copy(count), deepcopy(count), count.copy()):
+            copied[dates[0]] = 9
+            copied[dates[2]] = 1
+            self.assertEqual([9, 3, 1], list(copied.values()))
+        self.assertEqual([2, 3], list(count.values()))
+        self.assertEqual(dates[: 2], list(count))
+
+    def test_frequency(self):
+
+        self.assertTrue(self.split.is_split)
+        self.assertFalse(self.visits.is_split)
+        self.assertIsNone(TemporalCount(name='empty').is_split)
+        self.assertEqual(timedelta(days=1), self.visits.frequency)
+        self.assertEqual('daily', self.visits.freq_str)
+
+    def test_resample(self):
+
+        weekly = self.visits.resample('W-MON')
+        self.assertEqual([datetime(1999, 12, 27), datetime(2000, 1, 3)],
+                         weekly.date_times.tolist())
+        self.assertEqual([30, 30], weekly.counts.tolist())
+        ratio = (self.orders / self.visits).resample('W-MON', how='mean')
+        self.assertEqual([0, 1 / 30], ratio.counts.tolist())
+        split = self.split.resample('W-MON', how='max')
+        self.assertEqual(['A', 'B', 'C'], split.categories.tolist())
+        self.assertEqual([[1, 3, 4]], split.counts.tolist())
+        with self.assertRaises(ValueError):
+            self.visits.resample('W-MON', how='median')
+
+    def test_rolling_cumsum_diff(self):
+
+        rolling = self.visits.rolling(2)
+        self.assertTrue(isnan(rolling.counts[0]))
+        self.assertEqual([15, 25], rolling.counts[1:].tolist())
+        self.assertEqual([10, 30, 50],
+                         self.visits.rolling('2D', how='sum').counts.tolist())
+        self.assertEqual([[1, 2, 0], [1, 5, 4]],
+                         self.split.cumsum().counts.tolist())
+        diff = self.split.diff()
+        self.assertTrue(isnan(diff.counts[0]).all())
+        self.assertEqual([-1, 1, 4], diff.counts[1].tolist())
+
+    def test_merge_and_state(self):
+
+        count = self.split.copy()
+        count.merge(TemporalCount.from_dict({
+            self.days[1]: {'A': 1}, self.days[2]: {'D': 2}
+        }, name='new'))
+        self.assertEqual([[1, 2, 0, 0], [1, 3, 4, 0], [0, 0, 0, 2]],
+                         count.counts.tolist())
+        count.merge(TemporalCount.from_dict({self.days[1]: {'A': 5}},
+                                            name='new'), replace=True)
+        self.assertEqual([5, 0, 0, 0], count.counts[1].tolist())
+        with self.assertRaises(ValueError):
+            count.merge(self.visits)
+        for original in (count, self.visits, TemporalCount(name='empty')):
+            restored = TemporalCount.from_state(original.to_state())
+            self.assertEqual(original.name, restored.name)
+            self.assertTrue(
+                original.to_pandas().equals(restored.to_pandas()))
+
+    def test_sparse(self):
+
+        sparse = TemporalCount.from_dict({
+            self.days[0]: {'A': 1, 'B': 2},
+            self.days[1]: {'B': 3, 'C': 4}
+        }, name='by_page', sparse=True)
+        self.assertTrue(sparse.is_sparse)
+        self.assertEqual(self.split.counts.tolist(),
+                         sparse.counts.toarray().tolist())
+        self.assertEqual({'B': 3, 'C': 4}, sparse[self.days[1]])
+        total = sparse + sparse.to_dense()
+        self.assertFalse(total.is_sparse)
+        doubled = sparse + sparse
+        self.assertTrue(doubled.is_sparse)
+        self.assertEqual((2 * self.split).counts.tolist(),
+                         doubled.counts.toarray().tolist())
+        self.assertEqual(4, len(sparse.to_series()))
+        self.assertTrue(sparse.resample('W-MON').is_sparse)
+        self.assertFalse(self.split.to_sparse().to_dense().is_sparse)
+        with self.assertRaises(ValueError):
+            self.visits.to_sparse()
+
+    def test_top_and_select(self):
+
+        for count in (self.split, self.split.to_sparse()):
+            top = count.top(2)
+            self.assertEqual(['B', 'C'], top.categories.tolist())
+            self.assertEqual(count.is_sparse, top.is_sparse)
+            top = count.top(1, other='rest')
+            self.assertEqual(['B', 'rest'], top.categories.tolist())
+            self.assertEqual([[2, 1], [3, 4]],
+                             top.to_dense().counts.tolist())
+            selected = top.select(['rest', 'A'], other='rest')
+            self.assertEqual(['rest'], selected.categories.tolist())
+            self.assertEqual([[3], [7]], selected.to_dense().counts.tolist())
+        with self.assertRaises(ValueError):
+            self.visits.top(1)
@@ -0,0 +1,92 @@
+import json
+from datetime import datetime, timedelta
+from random import Random
+from unittest import TestCase
+
+from ux.actions.user_action import UserAction
+from ux.counts import CountConfig, TemporalCounter
+from ux.sequences import ActionSequence, Sequences
+from ux.utils.counts import temporal_counts_by_config
+
+
+class TestTemporalCounter(TestCase):
+
+    def setUp(self) -> None:
+
+        random = Random(0)
+        y2k = datetime(2000, 1, 1)
+        self.sequences = [
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id='{}-{}'.format(s, a), action_type='view',
+                    source_id=random.choice('ABC'),
+                    target_id=random.choice('ABC'),
+                    time_stamp=y2k + timedelta(minutes=20 * s, seconds=a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a in range(random.randint(1, 4))
+            ])
+            for s in range(60) if s % 12 < 9
+        ]
+        self.configs = [
+            CountConfig(name='sequences',
+                        sequence_condition=lambda seq: True),
+            CountConfig(name='targets', sequence_condition=lambda seq: True,
+                        action_condition=lambda a: True,
+                        action_split_by=lambda a: a.target_id)
+        ]
+        self.expected = temporal_counts_by_config(
+            self.sequences, self.configs, 'H')
+
+    def assert_counts_equal(self, counter: TemporalCounter):
+
+        for name, expected in self.expected.items():
+            self.assertEqual(expected.to_series().sort_index().to_dict(),
+                             counter.counts[name].to_series().sort_index()
+                             .to_dict())
+
+    def test_update(self):
+
+        counter = TemporalCounter(self.configs, freq='H')
+        for start in range(0, len(self.sequences), 10):
+            counter.update(self.sequences[start: start + 10])
+        self.assert_counts_equal(counter)
+        self.assertEqual(19, len(counter.counts['sequences']))
+
+    def test_replace(self):
+
+        counter = TemporalCounter(self.configs, freq='H')
+        counter.update(self.sequences)
+        last_hour = Sequences(self.sequences).start_times()[-1].floor('H')
+        counter.update([sequence for sequence in self.sequences
+                        if sequence.start >= last_hour], replace=True)
+        self.assert_counts_equal(counter)
+
+    def test_state(self):
+
+        counter = TemporalCounter(self.configs, freq='H')
+        counter.update(self.sequences[: 20])
+        state = json.loads(json.dumps(counter.to_state()))
+        counter = TemporalCounter.from_state(self.configs, state)
+        self.assertEqual('H', counter.freq)
+        counter.update(self.sequences[20:])
+        self.assert_counts_equal(counter)
+
+    def test_bounded_categories(self):
+
+        counter = TemporalCounter(self.configs, freq='H', sparse=True,
+                                  max_categories=2, other='other')
+        for start in range(0, len(self.sequences), 10):
+            counter.update(self.sequences[start: start + 10])
+        targets = counter.counts['targets']
+        self.assertTrue(targets.is_sparse)
+        self.assertEqual(3, len(targets.categories))
+        self.assertEqual('other', targets.categories[-1])
+        expected = self.expected['targets']
+        self.assertEqual(expected.counts.sum(axis=1).tolist(),
+                         targets.to_dense().counts.sum(axis=1).tolist())
+        counts = counter.sketches['targets'].counts()
+        self.assertEqual(list(counts), targets.categories[: -1].tolist())
+        state = json.loads(json.dumps(counter.to_state()))
+        restored = TemporalCounter.from_state(self.configs, state)
+        self.assertEqual(counts, restored.sketches['targets'].counts())
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from pytz import timezone
+
+from ux.actions.user_action import UserAction
+from ux.sqlite_database_manager import SQLiteDatabaseManager
+from ux.utils.versioning import find_location_history
+
+
+class TestSQLiteDatabaseManager(TestCase):
+
+    def setUp(self) -> None:
+
+        self.y2k = datetime(2000, 1, 1)
+        self.user_actions = [
+            UserAction(
+                action_id='{}-{}'.format(s, a), action_type='view',
+                source_id=source_id, target_id=target_id,
+                time_stamp=self.y2k + timedelta(days=s, seconds=a),
+                user_id='user_{}'.format(s % 2),
+                session_id='session_{}'.format(s),
+                meta={'position': a} if a == 0 else None
+            )
+            for s, actions in enumerate([
+                [('A', 'B'), ('B', 'C')],
+                [('B', None)],
+                [('C', 'A'), ('A', 'B'), ('B', None)]
+            ])
+            for a, (source_id, target_id) in enumerate(actions)
+        ]
+        self.manager = SQLiteDatabaseManager()
+        # insert across batches to upsert session extents
+        self.manager.insert_user_actions(self.user_actions, batch_size=2)
+
+    def test_sessions_and_users(self):
+
+        sessions = self.manager.sessions()
+        self.assertEqual(['session_0', 'session_1', 'session_2'],
+                         [session.session_id for session in sessions])
+        self.assertEqual(self.y2k + timedelta(days=2, seconds=2),
+                         sessions[2].end_time)
+        user = self.manager.user('user_0')
+        self.assertEqual(['session_0', 'session_2'], user.session_ids)
+        self.assertEqual(5, len(user.action_ids))
+        self.assertEqual(['A', 'B', 'C'], [location.location_id for location
+                                           in self.manager.locations()])
+
+    def test_session_sequences(self):
+
+        sequence = self.manager.get_session_sequence('session_2')
+        self.assertEqual(['C', 'A', 'B'], sequence.source_ids)
+        self.assertEqual(['A', 'B', None], sequence.target_ids)
+        self.assertEqual({'position': 0}, sequence[0].meta)
+        batch = self.manager.get_session_sequence_batch(
+            ['session_2', 'session_0'])
+        self.assertEqual([3, 2], [len(sequence) for sequence in batch])
+        self.assertIs(batch[0].store, batch[1].store)
+        with self.assertRaises(KeyError):
+            self.manager.get_session_sequence_batch(['session_3'])
+        history = find_location_history(
+            self.manager, start=self.y2k + timedelta(days=1),
+            prefetch_batches=True
+        )
+        self.assertEqual([self.y2k + timedelta(days=d) for d in (1, 2)],
+                         history['B'])
+
+    def test_aware_time_stamps(self):
+
+        london = timezone('Europe/London')
+        manager = SQLiteDatabaseManager(tz='Europe/London')
+        manager.insert_user_actions([
+            UserAction(action_id='1', action_type='view', source_id='A',
+                       time_stamp=london.localize(datetime(2020, 6, 1, 12)),
+                       user_id='user', session_id='session')
+        ])
+        self.assertEqual(
+            london.localize(datetime(2020, 6, 1, 12)),
+            manager.get_session_sequence('session')[0].time_stamp
+        )
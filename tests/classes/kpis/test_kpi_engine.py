@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from ux.actions.user_action import UserAction
+from ux.kpis import KPIConfig, KPIEngine
+from ux.sequences import ActionSequence, Sequences
+from ux.sequences.predicates import contains_location
+
+
+class TestKPIEngine(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(a), action_type='view',
+                    source_id=source_id, target_id=None,
+                    time_stamp=y2k + timedelta(hours=s, seconds=a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a, source_id in enumerate(sources)
+            ])
+            for s, sources in enumerate(['AB', 'ABC', 'BC', 'C', 'AC'])
+        ])
+        self.filter_sets = {
+            'length': {
+                'short': lambda seq: len(seq) == 1,
+                'long': lambda seq: len(seq) > 1
+            },
+            'start': {
+                'A': lambda seq: seq[0].source_id == 'A',
+                'other': lambda seq: seq[0].source_id != 'A'
+            }
+        }
+
+    def test_count(self):
+
+        engine = KPIEngine(self.sequences, self.filter_sets)
+        self.assertEqual(['length', 'start'], engine.filter_set_names)
+        self.assertEqual(5, engine.count((None, None)))
+        self.assertEqual(3, engine.count(('long', 'A')))
+        self.assertEqual(2, engine.count(('long', 'A'),
+                                         contains_location('C')))
+        self.assertEqual(0, engine.count(('short', 'A')))
+
+    def test_calculate(self):
+
+        kpis = KPIEngine(self.sequences, self.filter_sets).calculate([
+            KPIConfig(name='visits C', condition=contains_location('C'),
+                      numerator_sets=['length', 'start'],
+                      denominator_sets=['start']),
+            KPIConfig(name='not nested', condition=lambda seq: True,
+                      numerator_sets=['length'], denominator_sets=['start'])
+        ])
+        self.assertEqual([
+            ({'length': 'long', 'start': 'A'}, {'start': 'A'}, 2, 3),
+            ({'length': 'long', 'start': 'other'}, {'start': 'other'}, 1, 2),
+            ({'length': 'short', 'start': 'A'}, {'start': 'A'}, 0, 3),
+            ({'length': 'short', 'start': 'other'}, {'start': 'other'}, 1, 2)
+        ], [(kpi.numer_config, kpi.denom_config, kpi.numerator,
+             kpi.denominator) for kpi in kpis])
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+from ux.sequences.action_store import ActionStore
+
+
+class TestActionStore(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(
+                user_actions=[
+                    UserAction(
+                        action_id='{}-{}'.format(session_id, a),
+                        action_type='page-view',
+                        source_id=source_id, target_id=target_id,
+                        time_stamp=y2k + timedelta(seconds=a),
+                        user_id='user_1', session_id=session_id
+                    )
+                    for a, (source_id, target_id) in enumerate(locations)
+                ],
+                meta={'session': session_id}
+            )
+            for session_id, locations in [
+                ('session_1', [('A', 'B'), ('B', 'C'), ('C', None)]),
+                ('session_2', [('B', 'A'), ('A', None)])
+            ]
+        ])
+        self.columnar: Sequences = self.sequences.to_columnar()
+
+    def test_shared_store(self):
+
+        store = self.columnar.store
+        self.assertIsInstance(store, ActionStore)
+        self.assertEqual(5, len(store))
+        self.assertEqual(2, store.n_sequences)
+        self.assertTrue(all(sequence.store is store
+                            for sequence in self.columnar))
+        self.assertIsNone(self.sequences.store)
+        starts, stops = self.columnar.store_offsets()
+        self.assertEqual([0, 3], starts.tolist())
+        self.assertEqual([3, 5], stops.tolist())
+
+    def test_property_lists_match(self):
+
+        for original, view in zip(self.sequences, self.columnar):
+            self.assertEqual(len(original), len(view))
+            for attribute in ('source_ids', 'target_ids', 'action_types',
+                              'time_stamps', 'metas', 'start', 'end',
+                              'duration', 'user_id', 'session_id'):
+                self.assertEqual(getattr(original, attribute),
+                                 getattr(view, attribute))
+            self.assertEqual(original.meta, view.meta)
+            self.assertEqual(original.location_ids(), view.location_ids())
+
+    def test_user_actions_created_on_demand(self):
+
+        view = self.columnar[0]
+        _ = view.source_ids, view.duration, view.location_ids()
+        self.assertIsNone(view._user_actions)
+        self.assertEqual(['0', '1', '2'],
+                         [action.action_id[-1] for action in view])
+        self.assertIsNotNone(view._user_actions)
+
+    def test_split_returns_views(self):
+
+        view = self.columnar[0]
+        splits = view.split(view[1].template(), how='before')
+        self.assertEqual([1, 2], [len(split) for split in splits])
+        self.assertTrue(all(split.store is view.store for split in splits))
+        self.assertEqual(['B', 'C'], splits[1].source_ids)
+
+    def test_empty_view(self):
+
+        store = self.columnar.store
+        empty = ActionSequence.from_store(store, 3, 3)
+        self.assertEqual(0, len(empty))
+        for attribute in ('start', 'end', 'user_id', 'session_id'):
+            with self.assertRaises(IndexError):
+                getattr(empty, attribute)
+            with self.assertRaises(IndexError):
+                getattr(ActionSequence(user_actions=[]), attribute)
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from random import Random
+from unittest import TestCase
+
+from numpy import int64
+
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+
+
+class TestDwellTimes(TestCase):
+
+    def setUp(self) -> None:
+
+        random = Random(0)
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id='{}-{}'.format(s, a), action_type='view',
+                    source_id=random.choice('ABC'),
+                    target_id=random.choice(['A', 'B', '', None]),
+                    time_stamp=y2k + timedelta(hours=s, seconds=a * a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a in range(random.randint(1, 5))
+            ])
+            for s in range(50)
+        ])
+        self.columnar = self.sequences.to_columnar()
+
+    def test_matches_sequence_dwell_times(self):
+
+        for sum_by_location in (False, True):
+            for sum_by_sequence in (False, True):
+                self.assertEqual(
+                    dict(self.sequences.dwell_times(
+                        sum_by_location, sum_by_sequence)),
+                    dict(self.columnar.dwell_times(
+                        sum_by_location, sum_by_sequence))
+                )
+
+    def test_arrays(self):
+
+        dwell_times = self.columnar.dwell_time_arrays()
+        expected = self.sequences.dwell_times(True, True)
+        sums = dwell_times.location_sums()
+        for code, location in enumerate(dwell_times.locations):
+            self.assertEqual(
+                expected.get(location, timedelta()),
+                timedelta(microseconds=int(sums[code]) // 1000)
+            )
+        self.assertEqual(
+            [int(sequence.duration.total_seconds() * 1e9)
+             for sequence in self.columnar],
+            dwell_times.sequence_sums().tolist()
+        )
+        quantiles = dwell_times.quantiles([0, 1])
+        for location, durations in dwell_times.distributions().items():
+            self.assertEqual(durations.dtype, int64)
+            self.assertEqual([durations.min(), durations.max()],
+                             quantiles[location].tolist())
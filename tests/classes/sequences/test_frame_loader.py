@@ -0,0 +1,75 @@
+from io import StringIO
+from unittest import TestCase
+
+from pandas import DataFrame, read_csv, to_datetime
+
+from ux.sequences import Sequences
+
+
+class TestFrameLoader(TestCase):
+
+    def setUp(self) -> None:
+
+        # rows are shuffled across sessions and out of time order
+        self.frame = DataFrame([
+            ('s2', '2000-01-02 00:00:01', 'view', 'B', 'C', 'u2', 'a5'),
+            ('s1', '2000-01-01 00:00:02', 'view', 'B', 'C', 'u1', 'a2'),
+            ('s2', '2000-01-02 00:00:00', 'view', 'A', 'B', 'u2', 'a4'),
+            ('s3', '2000-01-01 12:00:00', 'click', 'D', None, 'u1', 'a6'),
+            ('s1', '2000-01-01 00:00:01', 'view', 'A', 'B', 'u1', 'a1'),
+            ('s1', '2000-01-01 00:00:03', 'click', 'C', None, 'u1', 'a3'),
+        ], columns=['session_id', 'time_stamp', 'action_type', 'source_id',
+                    'target_id', 'user_id', 'action_id'])
+        self.frame['time_stamp'] = to_datetime(self.frame['time_stamp'])
+
+    def assert_loaded(self, sequences: Sequences):
+
+        self.assertEqual(['s1', 's3', 's2'],
+                         [seq[0].session_id for seq in sequences])
+        self.assertEqual([['A', 'B', 'C'], ['D'], ['A', 'B']],
+                         [seq.source_ids for seq in sequences])
+        self.assertEqual([['B', 'C', None], [None], ['B', 'C']],
+                         [seq.target_ids for seq in sequences])
+        self.assertEqual([['a1', 'a2', 'a3'], ['a6'], ['a4', 'a5']],
+                         [[a.action_id for a in seq] for seq in sequences])
+        self.assertEqual(['u1', 'u1', 'u2'],
+                         [seq[0].user_id for seq in sequences])
+
+    def test_from_frame(self):
+
+        sequences = Sequences.from_frame(self.frame, action_id_col='action_id')
+        self.assertIsNotNone(sequences.store)
+        self.assert_loaded(sequences)
+
+    def test_from_chunks(self):
+
+        csv = StringIO(self.frame.to_csv(index=False))
+        sequences = Sequences.from_frame(
+            read_csv(csv, chunksize=2, parse_dates=['time_stamp']),
+            action_id_col='action_id'
+        )
+        self.assert_loaded(sequences)
+
+    def test_from_chunks_with_missing_values(self):
+
+        # the first chunk has no targets, so pandas reads them as floats
+        frame = self.frame.iloc[[3, 5, 0, 1, 2, 4]]
+        csv = StringIO(frame.to_csv(index=False))
+        sequences = Sequences.from_frame(
+            read_csv(csv, chunksize=2, parse_dates=['time_stamp']),
+            action_id_col='action_id'
+        )
+        self.assert_loaded(sequences)
+
+    def test_optional_columns(self):
+
+        frame = self.frame.drop(columns=['target_id', 'user_id'])
+        sequences = Sequences.from_frame(frame, meta_cols=['action_id'])
+        self.assertEqual([None, None, None],
+                         [seq[0].user_id for seq in sequences])
+        self.assertEqual({'action_id': 'a4'}, sequences[2][0].meta)
+
+    def test_missing_column(self):
+
+        with self.assertRaises(ValueError):
+            Sequences.from_frame(self.frame.drop(columns=['source_id']))
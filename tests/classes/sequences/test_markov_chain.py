@@ -0,0 +1,57 @@
+from unittest import TestCase
+
+from ux.sequences.markov_chain import MarkovChain
+
+
+class TestMarkovChain(TestCase):
+
+    def setUp(self) -> None:
+
+        self.chain = MarkovChain.from_counts({
+            ('home', 'search'): 6,
+            ('home', 'help'): 2,
+            ('search', 'product'): 3,
+            ('search', 'home'): 1,
+            ('product', 'checkout'): 1,
+            ('product', 'search'): 2,
+            ('help', 'home'): 1
+        })
+
+    def test_probabilities(self):
+
+        self.assertEqual(0.75, self.chain.probability('home', 'search'))
+        self.assertAlmostEqual(1 / 3,
+                               self.chain.probability('product', 'checkout'))
+        self.assertEqual(0, self.chain.probability('checkout', 'home'))
+
+    def test_paths(self):
+
+        self.assertEqual(['home', 'search', 'product', 'checkout'],
+                         self.chain.most_probable_path())
+        self.assertEqual(['home', 'search', 'product'],
+                         self.chain.most_probable_path(allow_revisits=True))
+        paths = self.chain.most_probable_paths('home', length=4,
+                                               beam_width=2)
+        self.assertEqual([['home', 'help'],
+                          ['home', 'search', 'product', 'checkout']],
+                         [path for path, _ in paths])
+        self.assertAlmostEqual(0.75 * 0.75 / 3, paths[1][1])
+
+    def test_absorption(self):
+
+        hitting = self.chain.hitting_probabilities('checkout')
+        self.assertAlmostEqual(1, hitting['home'])
+        self.assertAlmostEqual(1, hitting['checkout'])
+        absorption = self.chain.absorption_probabilities(['checkout', 'help'])
+        self.assertAlmostEqual(1, absorption.loc['home'].sum())
+        self.assertAlmostEqual(0.4, absorption.loc['home', 'help'])
+
+    def test_reachability(self):
+
+        self.assertEqual(['home', 'search', 'help'],
+                         self.chain.reachable('home', 1))
+        self.assertEqual(5, len(self.chain.reachable('home', 3)))
+        self.assertAlmostEqual(
+            1, self.chain.stationary_distribution().sum())
+        self.assertAlmostEqual(
+            0.75 * 0.75, self.chain.step_distribution('home', 2)['product'])
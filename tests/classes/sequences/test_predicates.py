@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+from ux.sequences.predicates import action_count, contains_action_type, \
+    contains_location, contains_template, duration_between, start_between
+
+
+class TestPredicates(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(a), action_type=action_type,
+                    source_id=source_id, target_id=target_id,
+                    time_stamp=y2k + timedelta(hours=s, seconds=10 * a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a, (action_type, source_id, target_id) in enumerate(
+                    actions
+                )
+            ])
+            for s, actions in enumerate([
+                [('view', 'A', 'B'), ('view', 'B', 'C'), ('click', 'C', None)],
+                [('view', 'B', 'A')],
+                [('click', 'D', None), ('view', 'D', 'E')],
+                [('view', 'A', 'B'), ('view', 'B', 'A'), ('view', 'A', 'B'),
+                 ('view', 'B', 'A')]
+            ])
+        ])
+        self.columnar: Sequences = self.sequences.to_columnar()
+
+    def assert_filters(self, predicate, expected_session_ids):
+
+        for sequences in (self.sequences, self.columnar):
+            self.assertEqual(
+                expected_session_ids,
+                [sequence.session_id for sequence in
+                 sequences.filter(predicate)]
+            )
+            self.assertEqual(len(expected_session_ids),
+                             sequences.count(predicate))
+
+    def test_contains(self):
+
+        self.assert_filters(contains_location('A'),
+                            ['session_0', 'session_1', 'session_3'])
+        self.assert_filters(contains_location('Z'), [])
+        self.assert_filters(contains_action_type('click'),
+                            ['session_0', 'session_2'])
+        self.assert_filters(
+            contains_template(ActionTemplate('view', 'B', 'A')),
+            ['session_1', 'session_3']
+        )
+        self.assert_filters(
+            contains_template(ActionTemplate('click', '*', None)),
+            ['session_0', 'session_2']
+        )
+
+    def test_time_predicates(self):
+
+        y2k = datetime(2000, 1, 1)
+        self.assert_filters(
+            start_between(y2k + timedelta(hours=1), y2k + timedelta(hours=3)),
+            ['session_1', 'session_2']
+        )
+        self.assert_filters(
+            duration_between(timedelta(seconds=10), timedelta(seconds=20)),
+            ['session_0', 'session_2']
+        )
+
+    def test_combinations(self):
+
+        self.assert_filters(action_count >= 3, ['session_0', 'session_3'])
+        self.assert_filters(
+            contains_location('A') & ~(action_count > 3),
+            ['session_0', 'session_1']
+        )
+        self.assert_filters(
+            contains_action_type('click') | (action_count == 1),
+            ['session_0', 'session_1', 'session_2']
+        )
+        self.assert_filters(
+            contains_location('B') & (lambda seq: seq.user_id == 'user_1'),
+            ['session_0', 'session_1', 'session_3']
+        )
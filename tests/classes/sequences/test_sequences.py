@@ -1,8 +1,31 @@
+from datetime import datetime, timedelta
 from unittest import TestCase
 
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+
 
 class TestSequences(TestCase):
 
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)  # a Saturday
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(a), action_type='view',
+                    source_id='location-{}'.format(a),
+                    time_stamp=y2k + timedelta(days=day, seconds=a),
+                    user_id=user_id, session_id='session_{}'.format(s)
+                )
+                for a in range(length)
+            ])
+            for s, (day, user_id, length) in enumerate([
+                (0, 'user_1', 2), (1, 'user_2', 3), (0, 'user_2', 1),
+                (1, 'user_2', 2), (0, 'user_1', 4)
+            ])
+        ])
+
     def test_location_transition_counts(self):
 
         pass
@@ -10,3 +33,30 @@ class TestSequences(TestCase):
     def test_most_probable_location_sequence(self):
 
         pass
+
+    def test_group_by(self):
+
+        for sequences in (self.sequences, self.sequences.to_columnar()):
+            groups = sequences.group_by(
+                ['weekday', lambda seq: seq.user_id]
+            )
+            self.assertEqual('weekday', groups.names[0])
+            self.assertEqual(
+                [(6, 'user_1'), (6, 'user_2'), (7, 'user_2')],
+                list(groups.keys())
+            )
+            self.assertEqual(
+                ['session_0', 'session_4'],
+                groups[(6, 'user_1')].session_ids
+            )
+            self.assertEqual(
+                ['session_1', 'session_3'],
+                groups[(7, 'user_2')].session_ids
+            )
+            with_empty = sequences.group_by(
+                ['weekday', lambda seq: seq.user_id], include_empty=True
+            )
+            self.assertEqual(4, len(with_empty))
+            self.assertEqual(0, len(with_empty[(7, 'user_1')]))
+            self.assertEqual([3, 2], [len(group) for group in
+                                      sequences.group_by('weekday').values()])
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+from ux.sequences.sequences_executor import SequencesExecutor
+
+
+class TestSequencesExecutor(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(a), action_type='view',
+                    source_id=source_id, target_id=target_id,
+                    time_stamp=y2k + timedelta(hours=s, seconds=a * s),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a, (source_id, target_id) in enumerate(actions)
+            ])
+            for s, actions in enumerate([
+                [('A', 'B'), ('B', 'C'), ('C', None)],
+                [('B', 'C'), ('C', 'A')],
+                [('A', 'B'), ('B', 'C'), ('C', 'A')],
+                [('C', 'A'), ('A', None)],
+                [('B', 'A'), ('A', 'B')]
+            ])
+        ])
+
+    def test_chunks(self):
+
+        executor = SequencesExecutor(n_jobs=2, kind='thread', chunk_size=2)
+        self.assertEqual([[0, 1], [2, 3], [4]], executor.chunks(list(range(5))))
+        self.assertEqual([1, 5, 4], executor.map_chunks(sum, list(range(5))))
+
+    def test_parallel_results_match(self):
+
+        for kind in SequencesExecutor.kinds:
+            for sequences in (self.sequences, self.sequences.to_columnar()):
+                parallel = sequences.with_executor(n_jobs=2, kind=kind,
+                                                   chunk_size=2)
+                filtered = parallel.filter(lambda seq: len(seq) > 2)
+                self.assertEqual(2, len(filtered))
+                self.assertIs(parallel.executor, filtered.executor)
+                self.assertEqual(
+                    sequences.counter(lambda seq: seq.source_ids),
+                    parallel.counter(lambda seq: seq.source_ids)
+                )
+                self.assertEqual(
+                    list(sequences.map(lambda seq: len(seq)).values()),
+                    list(parallel.map(lambda seq: len(seq)).values())
+                )
+                self.assertEqual(
+                    list(sequences.group_by(lambda seq: len(seq)).keys()),
+                    list(parallel.group_by(lambda seq: len(seq)).keys())
+                )
+                self.assertEqual(
+                    dict(sequences.dwell_times(True, True)),
+                    dict(parallel.dwell_times(True, True))
+                )
+                self.assertEqual(
+                    list(sequences.location_transition_counts().items()),
+                    list(parallel.location_transition_counts().items())
+                )
+                self.assertEqual(
+                    list(sequences.action_template_transition_counts(
+                    ).items()),
+                    list(parallel.action_template_transition_counts(
+                    ).items())
+                )
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+from ux.sequences.predicates import action_count, contains_action_type, \
+    contains_location, contains_template
+from ux.sequences.sequences_index import PostingList
+
+
+class TestSequencesIndex(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(a), action_type=action_type,
+                    source_id=source_id, target_id=target_id,
+                    time_stamp=y2k + timedelta(seconds=a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a, (action_type, source_id, target_id) in enumerate(
+                    actions
+                )
+            ])
+            for s, actions in enumerate([
+                [('view', 'A', 'B'), ('click', 'B', None)],
+                [('view', 'B', 'C')],
+                [('click', 'D', None)],
+                [('view', 'C', 'A'), ('view', 'A', 'B'), ('view', 'B', 'C')]
+            ])
+        ])
+
+    def test_posting_list_algebra(self):
+
+        a = PostingList([1, 3, 300], size=400)
+        b = PostingList([3, 4], size=400)
+        self.assertEqual([3], list(a & b))
+        self.assertEqual([1, 3, 4, 300], list(a | b))
+        self.assertEqual([1, 300], list(a - b))
+        self.assertEqual(397, len(~a))
+        self.assertEqual(6, a.nbytes)
+
+    def test_index_lookups(self):
+
+        for sequences in (self.sequences, self.sequences.to_columnar()):
+            index = sequences.build_index()
+            self.assertEqual([0, 1, 3], list(index.location('B')))
+            self.assertEqual([0, 2], list(index.action_type('click')))
+            self.assertEqual(
+                [0, 3], list(index.template(ActionTemplate('view', 'A', 'B')))
+            )
+            self.assertEqual(
+                [0, 2],
+                list(index.template(ActionTemplate('click', '*', None)))
+            )
+            self.assertEqual([], list(index.location('Z')))
+
+    def test_filter_uses_index(self):
+
+        for sequences in (self.sequences, self.sequences.to_columnar()):
+            sequences.build_index()
+            predicate = contains_location('A') & ~contains_action_type('click')
+            self.assertEqual(['session_3'], [
+                sequence.session_id
+                for sequence in sequences.filter(predicate)
+            ])
+            self.assertIsNotNone(predicate.postings(sequences.index))
+            self.assertEqual(2, sequences.count(
+                contains_template(ActionTemplate('*', 'B', 'C'))
+            ))
+            # non-indexable predicates fall back to masks
+            self.assertIsNone((action_count > 1).postings(sequences.index))
+            self.assertEqual(2, sequences.count(action_count > 1))
+            groups = sequences.group_filter({
+                'a': contains_location('A'), 'd': contains_location('D')
+            })
+            self.assertEqual([2, 1], [len(group) for group in groups.values()])
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from unittest import TestCase
+
+from pandas import DataFrame, to_datetime
+
+from ux.actions.action_template import ActionTemplate
+from ux.sequences import Sequences, Sessionizer
+
+
+class TestSessionizer(TestCase):
+
+    def setUp(self) -> None:
+
+        events = DataFrame([
+            ('u1', '2000-01-01 23:00', 'view', 'A'),
+            ('u2', '2000-01-01 23:05', 'view', 'A'),
+            ('u1', '2000-01-01 23:10', 'view', 'B'),
+            ('u2', '2000-01-01 23:30', 'view', 'B'),
+            ('u1', '2000-01-01 23:50', 'view', 'C'),
+            ('u1', '2000-01-02 00:10', 'click', 'D'),
+            ('u1', '2000-01-02 00:20', 'view', 'A'),
+        ], columns=['user_id', 'time_stamp', 'action_type', 'source_id'])
+        events['time_stamp'] = to_datetime(events['time_stamp'])
+        self.events = events
+        self.streams = Sequences.from_frame(events, session_col='user_id')
+
+    def test_gap(self):
+
+        sessions = Sessionizer(gap=timedelta(minutes=30)).sessionize(
+            self.streams)
+        self.assertEqual([['A', 'B'], ['A', 'B'], ['C', 'D', 'A']],
+                         [s.source_ids for s in sessions])
+        self.assertEqual(['u1-1', 'u2-1', 'u1-2'],
+                         [s.session_id for s in sessions])
+
+    def test_boundary(self):
+
+        sessions = Sessionizer(gap=None, boundary='day').sessionize(
+            self.streams)
+        self.assertEqual([['A', 'B', 'C'], ['A', 'B'], ['D', 'A']],
+                         [s.source_ids for s in sessions])
+
+    def test_templates(self):
+
+        sessionizer = Sessionizer(
+            gap=None, start_templates=[ActionTemplate('view', 'B')],
+            end_templates=[ActionTemplate('click', 'D')]
+        )
+        sessions = sessionizer.sessionize(self.streams)
+        self.assertEqual([['A'], ['A'], ['B', 'C', 'D'], ['B'], ['A']],
+                         [s.source_ids for s in sessions])
+
+    def test_incremental(self):
+
+        expected = Sessionizer().sessionize(self.streams)
+        sessionizer = Sessionizer()
+        first = sessionizer.update(
+            Sequences.from_frame(self.events[: 4], session_col='user_id'))
+        self.assertEqual([], [s.source_ids for s in first])
+        second = sessionizer.update(
+            Sequences.from_frame(self.events[4:], session_col='user_id'))
+        self.assertEqual([['A', 'B'], ['A', 'B']],
+                         [s.source_ids for s in second])
+        rest = sessionizer.flush()
+        self.assertEqual(
+            [(s.session_id, s.source_ids) for s in expected],
+            [(s.session_id, s.source_ids) for s in list(second) + list(rest)]
+        )
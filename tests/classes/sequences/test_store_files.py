@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, skipIf
+
+from numpy import memmap
+from pytz import timezone
+
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+from ux.sequences import store_files
+
+
+class TestStoreFiles(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id='{}-{}'.format(s, a), action_type='view',
+                    source_id=source_id, target_id=target_id,
+                    time_stamp=y2k + timedelta(hours=12 * s, seconds=a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a, (source_id, target_id) in enumerate(actions)
+            ], meta={'sequence': s})
+            for s, actions in enumerate([
+                [('A', 'B'), ('B', 'C'), ('C', None)],
+                [('B', 'C'), ('C', 'A')],
+                [('A', 'B'), ('B', 'C'), ('C', 'A')],
+                [('D', None)]
+            ])
+        ])
+
+    def assert_same(self, expected: Sequences, actual: Sequences):
+
+        self.assertEqual([s.source_ids for s in expected],
+                         [s.source_ids for s in actual])
+        self.assertEqual([s.target_ids for s in expected],
+                         [s.target_ids for s in actual])
+        self.assertEqual(expected.starts, actual.starts)
+        self.assertEqual(expected.metas, actual.metas)
+        self.assertEqual([a.action_id for s in expected for a in s],
+                         [a.action_id for s in actual for a in s])
+
+    def test_save_load(self):
+
+        with TemporaryDirectory() as path:
+            self.sequences.save(path)
+            loaded = Sequences.load(path)
+            self.assertIsInstance(loaded.store.codes('source_id'), memmap)
+            self.assert_same(self.sequences, loaded)
+
+    def test_save_subset(self):
+
+        subset = self.sequences.to_columnar().filter(
+            lambda seq: 'D' not in seq.source_ids and len(seq) == 3)
+        with TemporaryDirectory() as path:
+            subset.save(path)
+            loaded = Sequences.load(path)
+            self.assert_same(subset, loaded)
+            self.assertEqual(['A', 'B', 'C'],
+                             loaded.store.categories('location').tolist())
+
+    def test_partitions(self):
+
+        with TemporaryDirectory() as path:
+            self.sequences.save(path, partition_by='date')
+            self.assertEqual(
+                ['2000-01-01', '2000-01-02'],
+                [value for value, _ in store_files.list_partitions(
+                    path, 'date')]
+            )
+            self.assert_same(self.sequences, Sequences.load(path))
+            self.assert_same(
+                Sequences(self.sequences[2:]),
+                Sequences.load(path, start=datetime(2000, 1, 2))
+            )
+            self.assertEqual(0, len(Sequences.load(
+                path, end=datetime(1999, 12, 31))))
+
+    @skipIf(store_files.pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+
+        with TemporaryDirectory() as path:
+            self.sequences.to_parquet(join(path, 'sequences.parquet'))
+            self.assert_same(self.sequences, Sequences.from_parquet(
+                join(path, 'sequences.parquet')))
+            self.sequences.to_parquet(join(path, 'dataset'),
+                                      partition_by='date')
+            self.assert_same(
+                Sequences(self.sequences[2:]),
+                Sequences.from_parquet(join(path, 'dataset'),
+                                       start=datetime(2000, 1, 2))
+            )
+
+    @skipIf(store_files.pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_timezone(self):
+
+        aware = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=action.action_id,
+                    action_type=action.action_type,
+                    source_id=action.source_id, target_id=action.target_id,
+                    time_stamp=timezone('America/New_York').localize(
+                        action.time_stamp),
+                    user_id=action.user_id, session_id=action.session_id
+                )
+                for action in sequence
+            ], meta=sequence.meta)
+            for sequence in self.sequences
+        ])
+        with TemporaryDirectory() as path:
+            aware.to_parquet(join(path, 'sequences.parquet'))
+            loaded = Sequences.from_parquet(join(path, 'sequences.parquet'))
+            self.assertEqual('America/New_York', str(loaded.store.tz))
+            self.assert_same(aware, loaded)
+            aware.to_parquet(join(path, 'dataset'), partition_by='date')
+            loaded = Sequences.from_parquet(join(path, 'dataset'))
+            self.assertEqual('America/New_York', str(loaded.store.tz))
+            self.assertEqual('UTC', str(Sequences.from_parquet(
+                join(path, 'dataset'), tz='UTC').store.tz))
@@ -0,0 +1,85 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from tests.helpers.in_memory_database_manager import InMemoryDatabaseManager
+from ux.actions.user_action import UserAction
+from ux.sequences import StreamingSequences
+from ux.sequences.predicates import contains_location
+from ux.utils.versioning import find_location_history
+
+
+class TestStreamingSequences(TestCase):
+
+    def setUp(self) -> None:
+
+        self.y2k = datetime(2000, 1, 1)
+        self.manager = InMemoryDatabaseManager([
+            UserAction(
+                action_id='{}-{}'.format(s, a), action_type='view',
+                source_id=source_id, target_id=target_id,
+                time_stamp=self.y2k + timedelta(days=s, seconds=a),
+                user_id='user_1', session_id='session_{}'.format(s)
+            )
+            for s, actions in enumerate([
+                [('A', 'B'), ('B', 'C')],
+                [('B', 'C'), ('C', 'A')],
+                [('A', 'B'), ('B', 'C'), ('C', 'A')],
+                [('C', 'A')],
+                [('B', 'A')]
+            ])
+            for a, (source_id, target_id) in enumerate(actions)
+        ])
+
+    def test_iter_sessions(self):
+
+        batches = list(self.manager.iter_sessions(
+            start=self.y2k + timedelta(days=1), batch_size=3))
+        self.assertEqual([['session_1', 'session_2', 'session_3'],
+                          ['session_4']],
+                         [[session.session_id for session in batch]
+                          for batch in batches])
+
+    def test_stream(self):
+
+        stream = StreamingSequences.from_manager(self.manager, batch_size=2)
+        self.assertEqual(3, len(list(stream.batches())))
+        self.assertEqual(5, stream.count())
+        filtered = stream.filter(contains_location('C'))
+        self.assertEqual(4, filtered.count())
+        self.assertEqual(Counter({'A': 2, 'B': 4, 'C': 3}),
+                         stream.counter(lambda seq: seq.source_ids))
+        collected = stream.collect()
+        self.assertEqual(collected.location_transition_counts(),
+                         stream.location_transition_counts())
+        self.assertEqual(
+            list(collected.action_template_transition_counts().items()),
+            list(stream.action_template_transition_counts().items())
+        )
+
+    def test_get_session_sequences(self):
+
+        session_ids = ['session_4', 'session_0', 'session_2']
+        for prefetch_batches in (False, True):
+            sequences = list(self.manager.get_session_sequences(
+                iter(session_ids), batch_size=2,
+                prefetch_batches=prefetch_batches
+            ))
+            self.assertEqual(session_ids, [sequence.session_id
+                                           for sequence in sequences])
+
+    def test_find_location_history(self):
+
+        for prefetch_batches in (False, True):
+            self.manager.n_batch_calls = 0
+            history = find_location_history(
+                self.manager, end=self.y2k + timedelta(days=3),
+                batch_size=2, prefetch_batches=prefetch_batches
+            )
+            self.assertEqual(
+                [self.y2k + timedelta(days=d) for d in (0, 1, 2)],
+                history['B']
+            )
+            self.assertEqual(4, len(history['A']))
+            self.assertEqual(2, self.manager.n_batch_calls)
+        self.assertEqual(0, self.manager.n_sequence_calls)
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from random import Random
+from unittest import TestCase
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+
+
+class TestSubSequences(TestCase):
+
+    def setUp(self) -> None:
+
+        random = Random(0)
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id='{}-{}'.format(s, a), action_type='view',
+                    source_id=random.choice('ABC'), target_id=None,
+                    time_stamp=y2k + timedelta(hours=s, seconds=a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a in range(random.randint(1, 6))
+            ], meta={'sequence': s})
+            for s in range(200)
+        ]).to_columnar()
+        self.template = ActionTemplate('view', 'A')
+
+    def test_split_matches_sequence_split(self):
+
+        matching = self.sequences.filter(lambda seq: 'A' in seq.source_ids)
+        for how in ('before', 'after', 'at'):
+            expected = [
+                sub_sequence.source_ids for sequence in matching
+                for sub_sequence in sequence.split(
+                    lambda action: action.template() == self.template,
+                    how=how)
+            ]
+            actual = matching.split(self.template, how=how)
+            self.assertEqual(expected, [s.source_ids for s in actual])
+            self.assertIs(matching.store, actual.store)
+
+    def test_split_without_matches(self):
+
+        sequences = self.sequences.filter(
+            lambda seq: 'A' not in seq.source_ids)
+        split = sequences.split(self.template, how='at', copy_meta=True)
+        self.assertEqual([s.source_ids for s in sequences],
+                         [s.source_ids for s in split])
+        self.assertEqual(sequences.metas, split.metas)
+
+    def test_crop_matches_sequence_crop(self):
+
+        start = ActionTemplate('view', 'A')
+        end = ActionTemplate('view', 'B')
+        for how in ('first', 'last'):
+            expected = [
+                cropped.source_ids for cropped in (
+                    sequence.crop(start, end, how=how)
+                    for sequence in self.sequences
+                ) if cropped is not None
+            ]
+            actual = self.sequences.crop(start, end, how=how)
+            self.assertEqual(expected, [s.source_ids for s in actual])
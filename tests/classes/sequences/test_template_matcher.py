@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+from ux.sequences.template_matcher import TemplateMatcher
+
+
+class TestTemplateMatcher(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(a), action_type=action_type,
+                    source_id=source_id, target_id=target_id,
+                    time_stamp=y2k + timedelta(hours=s, seconds=a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a, (action_type, source_id, target_id) in enumerate(
+                    actions
+                )
+            ])
+            for s, actions in enumerate([
+                [('view', 'A', 'B'), ('view', 'B', 'C'), ('click', 'C', None)],
+                [('view', 'B', 'A')],
+                [('click', 'D', None), ('view', 'D', 'E')]
+            ])
+        ])
+        self.columnar: Sequences = self.sequences.to_columnar()
+        self.templates = [
+            ActionTemplate('view', 'A', 'B'),
+            ActionTemplate('click', '*', None),
+            ActionTemplate('view', '*', '*'),
+            ActionTemplate('view', 'Z', 'A')
+        ]
+
+    def test_match_sequence(self):
+
+        matcher = TemplateMatcher(self.templates)
+        for sequences in (self.sequences, self.columnar):
+            actions, templates = matcher.match_sequence(sequences[0])
+            self.assertEqual([0, 0, 1, 2], actions.tolist())
+            self.assertEqual([0, 2, 2, 1], templates.tolist())
+
+    def test_match_collection(self):
+
+        matcher = TemplateMatcher(self.templates)
+        for sequences in (self.sequences, self.columnar):
+            matches = matcher.match(sequences)
+            self.assertEqual([0, 0, 0, 0, 1, 2, 2],
+                             matches.positions.tolist())
+            self.assertEqual([0, 0, 1, 2, 0, 0, 1], matches.actions.tolist())
+            self.assertEqual([0, 2, 2, 1, 2, 1, 2],
+                             matches.templates.tolist())
+
+    def test_matches_agree_with_equality(self):
+
+        for sequences in (self.sequences, self.columnar):
+            for sequence in sequences:
+                for template in self.templates:
+                    self.assertEqual(
+                        [action for action in sequence
+                         if action.template() == template],
+                        sequence.find_all(template)
+                    )
+                    self.assertEqual(
+                        template in sequence.action_templates(),
+                        template in sequence
+                    )
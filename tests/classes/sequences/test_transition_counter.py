@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence, Sequences
+from ux.sequences.transition_counter import TransitionCounter
+
+
+class TestTransitionCounter(TestCase):
+
+    def setUp(self) -> None:
+
+        y2k = datetime(2000, 1, 1)
+        self.sequences: Sequences = Sequences([
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(a), action_type='view',
+                    source_id=source_id, target_id=target_id,
+                    time_stamp=y2k + timedelta(hours=s, seconds=a),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+                for a, (source_id, target_id) in enumerate(actions)
+            ])
+            for s, actions in enumerate([
+                [('A', 'B'), ('B', 'C'), ('C', None)],
+                [('B', 'C'), ('C', 'A')],
+                [('A', 'B'), ('B', 'C'), ('C', 'A')]
+            ])
+        ])
+        self.columnar: Sequences = self.sequences.to_columnar()
+
+    def test_location_transitions(self):
+
+        for sequences in (self.sequences, self.columnar):
+            self.assertEqual(
+                {('A', 'B'): 2, ('B', 'C'): 3, ('C', 'A'): 2},
+                TransitionCounter('location').update(sequences).counts()
+            )
+            self.assertEqual(
+                {('C', 'A'): 2},
+                TransitionCounter('location', exclude='B').update(
+                    sequences).counts()
+            )
+
+    def test_ngram_transitions(self):
+
+        for sequences in (self.sequences, self.columnar):
+            counter = TransitionCounter('source_id', order=2).update(sequences)
+            self.assertEqual({(('A', 'B'), 'C'): 2}, counter.counts())
+            self.assertEqual((1, 3), counter.matrix.shape)
+
+    def test_incremental_update(self):
+
+        counter = TransitionCounter('action_template')
+        counter.update(self.sequences[:1])
+        self.assertEqual(2, counter.matrix.sum())
+        counter.update(self.columnar[1:])
+        self.assertEqual(
+            self.sequences.action_template_transition_counts(),
+            counter.counts()
+        )
+        self.assertEqual(
+            2, counter.counts()[(ActionTemplate('view', 'A', 'B'),
+                                 ActionTemplate('view', 'B', 'C'))]
+        )
@@ -0,0 +1,21 @@
+from unittest import TestCase
+
+from ux.utils.prefetch import prefetch
+
+
+class TestPrefetch(TestCase):
+
+    def test_prefetch(self):
+
+        self.assertEqual(list(range(10)), list(prefetch(range(10), 3)))
+
+    def test_reraises_errors(self):
+
+        def failing():
+            yield 1
+            raise KeyError('failed')
+
+        items = prefetch(failing())
+        self.assertEqual(1, next(items))
+        with self.assertRaises(KeyError):
+            next(items)
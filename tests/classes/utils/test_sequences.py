@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from pandas import Timestamp
+from unittest import TestCase
+
+from ux.actions.user_action import UserAction
+from ux.sequences import ActionSequence
+from ux.utils.sequences import split_sequences_by_day, split_sequences_by_hour
+
+
+class TestSplitSequences(TestCase):
+
+    def setUp(self) -> None:
+
+        # sessions either side of the spring-forward change from 02:00 EST
+        # to 03:00 EDT on 2020-03-08
+        self.sequences = [
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id=str(s), action_type='view',
+                    source_id='A', target_id='B',
+                    time_stamp=Timestamp(
+                        datetime(2020, 3, 8, hour, 15)
+                    ).tz_localize('America/New_York').to_pydatetime(),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                )
+            ])
+            for s, hour in enumerate([0, 1, 3, 5])
+        ]
+
+    def test_split_by_hour_across_dst(self):
+
+        hours = split_sequences_by_hour(self.sequences)
+        self.assertEqual([datetime(2020, 3, 8, hour) for hour in range(6)],
+                         list(hours.keys()))
+        self.assertEqual(
+            [['session_0'], ['session_1'], [], ['session_2'], [],
+             ['session_3']],
+            [[sequence.session_id for sequence in sequences]
+             for sequences in hours.values()]
+        )
+
+    def test_split_by_day(self):
+
+        days = split_sequences_by_day(self.sequences)
+        self.assertEqual([datetime(2020, 3, 8).date()], list(days.keys()))
+        self.assertEqual(4, len(days[datetime(2020, 3, 8).date()]))
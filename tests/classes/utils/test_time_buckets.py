@@ -0,0 +1,54 @@
+from datetime import datetime
+from unittest import TestCase
+
+from pandas import DatetimeIndex, Timestamp
+
+from ux.utils.time_buckets import TimeBuckets
+
+
+class TestTimeBuckets(TestCase):
+
+    def setUp(self) -> None:
+
+        self.time_stamps = DatetimeIndex([
+            datetime(2020, 3, 2, 10, 5),
+            datetime(2020, 3, 1, 23, 50),
+            datetime(2020, 3, 2, 10, 20),
+            datetime(2020, 3, 9, 0, 0),
+            datetime(2020, 3, 2, 10, 10)
+        ])
+
+    def test_tick_frequency(self):
+
+        buckets = TimeBuckets(self.time_stamps, '15min',
+                              start=datetime(2020, 3, 2, 10),
+                              end=datetime(2020, 3, 2, 10, 59))
+        self.assertEqual(4, len(buckets))
+        self.assertEqual([[0, 4], [2], [], []],
+                         [positions.tolist()
+                          for _, positions in buckets.items()])
+        self.assertEqual([0, -1, 1, -1, 0], buckets.bucket_ids.tolist())
+
+    def test_anchored_frequency(self):
+
+        buckets = TimeBuckets(self.time_stamps, 'W-MON')
+        self.assertEqual([Timestamp(2020, 2, 24), Timestamp(2020, 3, 2),
+                          Timestamp(2020, 3, 9)], buckets.labels.tolist())
+        self.assertEqual([1, 3, 1], buckets.counts().tolist())
+        self.assertIs(buckets.positions(1).base,
+                      buckets.positions(2).base)
+
+    def test_timezone(self):
+
+        utc = self.time_stamps.tz_localize('UTC')
+        buckets = TimeBuckets(utc, 'D', tz='America/New_York')
+        self.assertEqual(
+            {'2020-03-01': ['2020-03-01 18:50']},
+            {label.strftime('%Y-%m-%d'): [
+                utc[p].tz_convert('America/New_York').strftime(
+                    '%Y-%m-%d %H:%M')
+                for p in positions.tolist()
+            ] for label, positions in buckets.items()
+                if label.day == 1}
+        )
+        self.assertEqual(8, len(buckets))
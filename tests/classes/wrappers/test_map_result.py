@@ -103,6 +103,15 @@ class TestMapResult(TestCase):
         self.assertTrue(self.series_equivalent(self.s_tuple_fixed, self.mr_tuple_fixed.to_series()))
         self.assertTrue(self.series_equivalent(self.s_tuple_variable, self.mr_tuple_variable.to_series()))
 
+    def test_to_series_cached(self):
+
+        series = self.mr_single_variable.to_series()
+        series.name = 'renamed'
+        self.assertEqual('numbers', self.mr_single_variable.to_series().name)
+        self.assertEqual([0, 2, 5], self.mr_single_variable.offsets.tolist())
+        self.assertEqual([3, 4, 5], self.mr_single_variable.b)
+        self.assertRaises(AttributeError, lambda: self.mr_single_variable.z)
+
     def test_to_frame(self):
 
         self.assertTrue(
@@ -0,0 +1,42 @@
+from typing import Dict, List
+
+from ux.actions.user_action import UserAction
+from ux.database_manager import DatabaseManager
+from ux.sequences.action_sequence import ActionSequence
+from ux.session import Session
+
+
+class InMemoryDatabaseManager(DatabaseManager):
+    """
+    DatabaseManager holding UserActions in memory, which counts the number of
+    calls made to fetch sequences and batches of sequences.
+    """
+    def __init__(self, user_actions: List[UserAction]):
+
+        self._actions: Dict[str, List[UserAction]] = {}
+        for action in user_actions:
+            self._actions.setdefault(action.session_id, []).append(action)
+        self.n_sequence_calls: int = 0
+        self.n_batch_calls: int = 0
+
+    def sessions(self) -> List[Session]:
+
+        return [
+            Session(session_id=session_id, user_id=actions[0].user_id,
+                    start_time=actions[0].time_stamp,
+                    end_time=actions[-1].time_stamp)
+            for session_id, actions in self._actions.items()
+        ]
+
+    def get_session_sequence(self, session_id) -> ActionSequence:
+
+        self.n_sequence_calls += 1
+        return ActionSequence(user_actions=self._actions[session_id])
+
+    def get_session_sequence_batch(
+            self, session_ids: List[str]
+    ) -> List[ActionSequence]:
+
+        self.n_batch_calls += 1
+        return [ActionSequence(user_actions=self._actions[session_id])
+                for session_id in session_ids]
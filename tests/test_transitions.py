@@ -0,0 +1,56 @@
+from datetime import datetime
+from unittest import TestCase
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import UserAction
+from ux.calcs.object_calcs.transitions import transition_counts, \
+    transition_probabilities
+from ux.sequences import ActionSequence, Sequences
+from ux.tasks import Task
+
+
+class TestTransitions(TestCase):
+
+    def setUp(self) -> None:
+
+        self.view_any = ActionTemplate(action_type='view', source_id='*')
+        self.click_c = ActionTemplate(action_type='click', source_id='C')
+        self.task: Task = Task(
+            name='WildcardTask',
+            action_templates=[self.view_any, self.click_c]
+        )
+        self.sequences = [
+            ActionSequence(user_actions=[
+                UserAction(
+                    action_id='action-{}'.format(i), action_type=action_type,
+                    source_id=source_id, time_stamp=datetime(2000, 1, 1, 0, i),
+                    user_id='user_1', session_id='session_{}'.format(s)
+                ) for i, (action_type, source_id) in enumerate(actions)
+            ])
+            for s, actions in enumerate([
+                [('view', 'A'), ('view', 'B'), ('click', 'C')],
+                [('view', 'B'), ('click', 'D'), ('click', 'C')],
+                [('click', 'D')]
+            ])
+        ]
+
+    def test_wildcard_transition_counts(self):
+
+        expected = {
+            (self.view_any, self.view_any): 1,
+            (self.view_any, self.click_c): 1
+        }
+        self.assertEqual(expected, dict(transition_counts(
+            task=self.task, action_sequences=self.sequences)))
+        self.assertEqual(expected, dict(transition_counts(
+            task=self.task,
+            action_sequences=Sequences(self.sequences).to_columnar())))
+
+    def test_wildcard_transition_probabilities(self):
+
+        self.assertEqual(
+            {(self.view_any, self.view_any): 0.5,
+             (self.view_any, self.click_c): 0.5},
+            dict(transition_probabilities(
+                task=self.task, action_sequences=self.sequences))
+        )
@@ -1,2 +1,2 @@
-from ux.actions.action_template import ActionTemplate
+from ux.actions.action_template import ActionTemplate, intern_template
 from ux.actions.user_action import UserAction
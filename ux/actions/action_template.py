@@ -1,10 +1,12 @@
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 
 class ActionTemplate(object):
     """
     Represents a Template for a single Action that could be taken by a User.
     """
+    __slots__ = ('_action_type', '_source_id', '_target_id', '_weighting',
+                 '_hash')
 
     def __init__(self,
                  action_type: str,
@@ -26,6 +28,7 @@ class ActionTemplate(object):
         self._source_id: str = source_id
         self._target_id: Optional[str] = target_id
         self._weighting: float = weighting
+        self._hash: int = hash((action_type, source_id, target_id))
 
     @property
     def action_type(self) -> str:
@@ -76,6 +79,8 @@ class ActionTemplate(object):
         }
 
     def __eq__(self, other: 'ActionTemplate') -> bool:
+        if self is other:
+            return True
         return (
                 (self._action_type == other._action_type or
                  '*' in (self._action_type, other._action_type)) and
@@ -93,7 +98,22 @@ class ActionTemplate(object):
         )
 
     def __hash__(self) -> int:
-        return hash(tuple(sorted(self.to_dict().items())))
+        return self._hash
 
 
 ActionTemplatePair = Tuple[ActionTemplate, ActionTemplate]
+_interned_templates: Dict[Tuple[str, str, Optional[str]], ActionTemplate] = {}
+
+
+def intern_template(action_type: str, source_id: str,
+                    target_id: Optional[str] = None) -> ActionTemplate:
+    """
+    Return the shared ActionTemplate for the given action type, source id and
+    target id, creating it on first use.
+    Interned templates have the default weighting of 1.
+    """
+    key = (action_type, source_id, target_id)
+    template = _interned_templates.get(key)
+    if template is None:
+        template = _interned_templates.setdefault(key, ActionTemplate(*key))
+    return template
@@ -1,13 +1,17 @@
 from datetime import datetime
 from typing import Optional, Callable, Union, List, Any
 
-from ux.actions.action_template import ActionTemplate
+from ux.actions.action_template import ActionTemplate, intern_template
 
 
 class UserAction(object):
     """
     Represents an Action taken by a User.
     """
+    __slots__ = ('_action_type', '_source_id', '_target_id', '_action_id',
+                 '_time_stamp', '_user_id', '_session_id', '_meta',
+                 '_action_template')
+
     def __init__(self, action_id: str, action_type: str, source_id: str,
                  time_stamp: datetime, user_id: str, session_id: str,
                  target_id: str = None, meta: dict = None):
@@ -92,10 +96,11 @@ class UserAction(object):
 
     def template(self) -> ActionTemplate:
         """
-        Return an ActionTemplate that corresponds to the Action.
+        Return an ActionTemplate that corresponds to the Action. Actions with
+        the same action type, source and target share the same template.
         """
         if self._action_template is None:
-            self._action_template = ActionTemplate(
+            self._action_template = intern_template(
                 action_type=self._action_type,
                 source_id=self._source_id,
                 target_id=self._target_id
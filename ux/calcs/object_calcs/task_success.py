@@ -1,6 +1,7 @@
 from typing import Callable
 
 from ux.sequences.action_sequence import ActionSequence
+from ux.sequences.template_matcher import TemplateMatcher, template_key
 from ux.tasks.task import Task
 
 
@@ -14,16 +15,18 @@ def unordered_task_completion_rate(task: Task, action_sequence: ActionSequence)
     """
     # calculate sum of task unique action template weights
     task_templates = task.action_templates
-    task_template_set = set(task_templates)
     task_weight = sum([action_template.weighting
                        for action_template in task.action_templates])
-    # calculate sum of weights of action templates in task and sequence
-    sequence_template_set = set(action_sequence.action_templates())
-    overlaps = task_template_set.intersection(sequence_template_set)
-    overlap_weight = sum([
-        action_template.weighting
-        for action_template in overlaps
-    ])
+    # calculate sum of weights of unique task templates matched by any action
+    # in the sequence, including '*' wildcard matches
+    matched = TemplateMatcher(task_templates).matched_templates(action_sequence)
+    overlap_keys = set()
+    overlap_weight = 0
+    for t in sorted(matched):
+        key = template_key(task_templates[t])
+        if key not in overlap_keys:
+            overlap_keys.add(key)
+            overlap_weight += task_templates[t].weighting
     return overlap_weight / task_weight
 
 
@@ -1,8 +1,9 @@
 from collections import defaultdict
 from typing import List, Dict
 
-from ux.calcs.object_calcs.utils import sequence_intersects_task
 from ux.sequences.action_sequence import ActionSequence
+from ux.sequences.markov_chain import MarkovChain
+from ux.sequences.template_matcher import TemplateMatcher
 from ux.tasks.task import Task, TaskPair
 from ux.actions.action_template import ActionTemplatePair
 
@@ -11,21 +12,28 @@ def transition_counts(task: Task, action_sequences: List[ActionSequence]) -> Dic
     """
     Count the transitions between actions.
 
+    Each action is resolved to the task templates it matches, honouring '*'
+    wildcards, and each transition between consecutive matching actions is
+    counted once for each pair of templates the two actions match.
+
     :param task: The task defining the actions that should  be counted.
     :param action_sequences: List of action sequences to count over.
     :return: Dictionary of {(from, to) => count}
     """
     transitions = defaultdict(int)
-    task_action_set = set(task.action_templates)
+    matcher = TemplateMatcher(task.action_templates)
+    templates = matcher.templates
     # count transitions
     for sequence in action_sequences:
-        if not sequence_intersects_task(action_sequence=sequence, task=task):
-            continue
-        for a in range(len(sequence) - 1):
-            from_action = sequence[a].template()
-            to_action = sequence[a + 1].template()
-            if {from_action, to_action}.issubset(task_action_set):
-                transitions[(from_action, to_action)] += 1
+        actions, matched = matcher.match_sequence(sequence)
+        # sequences without matches do not intersect the task
+        action_templates = defaultdict(list)
+        for a, t in zip(actions.tolist(), matched.tolist()):
+            action_templates[a].append(templates[t])
+        for a, from_templates in action_templates.items():
+            for from_template in from_templates:
+                for to_template in action_templates.get(a + 1, []):
+                    transitions[(from_template, to_template)] += 1
     return transitions
 
 
@@ -37,25 +45,6 @@ def transition_probabilities(task: Task, action_sequences: List[ActionSequence])
     :param action_sequences: List of action sequences to count over.
     :return: Dictionary of {(from, to) => p(to|from)}
     """
-    transitions = defaultdict(int)
-    source_counts = defaultdict(int)
-    task_action_set = set(task.action_templates)
-    # count transitions and occurrences
-    for sequence in action_sequences:
-        if not sequence_intersects_task(action_sequence=sequence, task=task):
-            continue
-        for a in range(len(sequence) - 1):
-            from_action = sequence[a].template()
-            to_action = sequence[a + 1].template()
-            if {from_action, to_action}.issubset(task_action_set):
-                transitions[(from_action, to_action)] += 1
-                source_counts[from_action] += 1
-    # calculate conditional probabilities
-    transition_probs = {}
-    for (from_state, to_state), count in transitions.items():
-        transition_probs[(from_state, to_state)] = (
-                transitions[(from_state, to_state)] /
-                source_counts[from_state]
-        )
-
-    return transition_probs
+    return MarkovChain.from_counts(
+        transition_counts(task=task, action_sequences=action_sequences)
+    ).transition_probabilities()
@@ -1,2 +1,5 @@
 from ux.counts.count_config import CountConfig
+from ux.counts.count_evaluator import CountEvaluator
 from ux.counts.temporal_count import TemporalCount
+from ux.counts.temporal_counter import TemporalCounter
+from ux.counts.space_saving import SpaceSaving
@@ -0,0 +1,200 @@
+from types import FunctionType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from numpy import array, bincount, int64, lexsort, unique, zeros
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import ActionFilter, UserAction
+from ux.counts.count_config import CountConfig
+from ux.sequences.action_sequence import ActionSequence
+
+BucketCount = Union[int, Dict[Any, int]]
+
+
+class CountEvaluator(object):
+    """
+    Evaluates a list of CountConfigs over buckets of ActionSequences in a
+    single pass, visiting each sequence and each action once.
+
+    Each distinct condition is called once per sequence or action and shared
+    by every config that uses it. Unsplit counts are accumulated into a
+    (bucket, config) array and split counts into (bucket, split) arrays per
+    config.
+    """
+    def __init__(self, configs: List[CountConfig]):
+        """
+        Create a new CountEvaluator.
+
+        :param configs: The CountConfigs to evaluate.
+        """
+        self._configs: List[CountConfig] = list(configs)
+        self._sequence_conditions: List[Callable] = []
+        self._action_conditions: List[Callable[[UserAction], bool]] = []
+        self._sequence_condition_ids: List[Optional[int]] = []
+        self._action_condition_ids: List[Optional[int]] = []
+        for config in self._configs:
+            self._sequence_condition_ids.append(self._condition_id(
+                config.sequence_condition, self._sequence_conditions
+            ))
+            self._action_condition_ids.append(self._condition_id(
+                _action_filter(config.action_condition),
+                self._action_conditions
+            ))
+
+    @staticmethod
+    def _condition_id(condition: Optional[Callable],
+                      conditions: List[Callable]) -> Optional[int]:
+        """
+        Return the index of the condition in the list of distinct conditions,
+        adding it if it is new, or None if there is no condition.
+        """
+        if condition is None or condition is True:
+            return None
+        for c, existing in enumerate(conditions):
+            if existing is condition:
+                return c
+        conditions.append(condition)
+        return len(conditions) - 1
+
+    def evaluate(
+            self, buckets: List[Iterable[ActionSequence]]
+    ) -> Dict[str, List[BucketCount]]:
+        """
+        Count each config in each bucket of sequences.
+
+        :param buckets: List of the sequences in each bucket.
+        :return: Dict of {config.name: [count for each bucket]}, where each
+                 count is an int for unsplit configs and a dict of
+                 {split: count} in order of first occurrence for split
+                 configs.
+        """
+        configs = self._configs
+        n_buckets = len(buckets)
+        totals = zeros((n_buckets, len(configs)), dtype=int64)
+        split_keys: List[Dict[Any, int]] = [{} for _ in configs]
+        split_buckets: List[List[int]] = [[] for _ in configs]
+        split_ids: List[List[int]] = [[] for _ in configs]
+        sequence_configs = []
+        action_configs = []
+        for c, config in enumerate(configs):
+            if config.action_condition is None:
+                sequence_configs.append((
+                    c, self._sequence_condition_ids[c],
+                    config.sequence_split_by
+                ))
+            else:
+                action_configs.append((
+                    c, self._sequence_condition_ids[c],
+                    self._action_condition_ids[c], config.action_split_by
+                ))
+
+        def add_split(c: int, bucket: int, value, strict: bool) -> None:
+            if isinstance(value, list):
+                values = value
+            elif isinstance(value, str):
+                values = [value]
+            elif strict:
+                raise TypeError('get_value must return str or list of str')
+            else:
+                return
+            keys = split_keys[c]
+            for item in values:
+                key = keys.get(item)
+                if key is None:
+                    key = keys[item] = len(keys)
+                split_buckets[c].append(bucket)
+                split_ids[c].append(key)
+
+        for b, bucket in enumerate(buckets):
+            row = [0] * len(configs)
+            for sequence in bucket:
+                passed = [condition(sequence)
+                          for condition in self._sequence_conditions]
+                for c, condition_id, split_by in sequence_configs:
+                    if condition_id is not None and not passed[condition_id]:
+                        continue
+                    if split_by is None:
+                        row[c] += 1
+                    else:
+                        add_split(c, b, split_by(sequence), False)
+                active = [
+                    config for config in action_configs
+                    if config[1] is None or passed[config[1]]
+                ]
+                if not active:
+                    continue
+                for action in sequence:
+                    action_passed = [condition(action)
+                                     for condition in self._action_conditions]
+                    for c, _, condition_id, split_by in active:
+                        if (condition_id is not None and
+                                not action_passed[condition_id]):
+                            continue
+                        if split_by is None:
+                            row[c] += 1
+                        else:
+                            add_split(c, b, split_by(action), True)
+            totals[b] = row
+        # assemble the count for each bucket of each config
+        results = {}
+        for c, config in enumerate(configs):
+            split_by = (config.sequence_split_by
+                        if config.action_condition is None
+                        else config.action_split_by)
+            if split_by is None:
+                results[config.name] = totals[:, c].tolist()
+            else:
+                results[config.name] = self._split_counts(
+                    n_buckets, list(split_keys[c].keys()),
+                    split_buckets[c], split_ids[c]
+                )
+        return results
+
+    @staticmethod
+    def _split_counts(n_buckets: int, keys: List[Any],
+                      buckets: List[int], ids: List[int]) -> List[dict]:
+        """
+        Return a dict of {split: count} for each bucket, with splits in the
+        order they first occurred in the bucket.
+        """
+        n_keys = max(len(keys), 1)
+        flat = (array(buckets, dtype=int64) * n_keys +
+                array(ids, dtype=int64))
+        counts = bincount(flat, minlength=n_buckets * n_keys).reshape(
+            n_buckets, n_keys
+        )
+        # order of first occurrence of each (bucket, split)
+        first_seen = zeros(n_buckets * n_keys, dtype=int64)
+        distinct, first_index = unique(flat, return_index=True)
+        first_seen[distinct] = first_index
+        results = []
+        for b in range(n_buckets):
+            present = counts[b].nonzero()[0]
+            present = present[lexsort(
+                (present, first_seen[b * n_keys + present])
+            )]
+            results.append({
+                keys[k]: int(counts[b, k]) for k in present.tolist()
+            })
+        return results
+
+    def __repr__(self) -> str:
+
+        return 'CountEvaluator({} configs)'.format(len(self._configs))
+
+
+def _action_filter(
+        condition: Optional[Union[ActionFilter, ActionTemplate]]
+) -> Optional[Callable[[UserAction], bool]]:
+    """
+    Return a callable for an action condition as used by
+    ActionSequence.count.
+    """
+    if condition is None or condition is True:
+        return None
+    if isinstance(condition, ActionTemplate):
+        return lambda action: action.template() == condition
+    if not isinstance(condition, FunctionType):
+        raise TypeError(
+            'count condition must be ActionFilter or IActionTemplate')
+    return condition
@@ -0,0 +1,193 @@
+from collections import Counter
+from collections.abc import Mapping
+from heapq import heapify, heappop, heappush
+from itertools import count as count_from
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, \
+    Union
+
+
+class SpaceSaving(object):
+    """
+    Finds the most frequent items of a stream in bounded memory with the
+    Space-Saving algorithm of Metwally, Agrawal and El Abbadi, monitoring at
+    most `capacity` items.
+
+    When a new item arrives and every slot is taken, the monitored item with
+    the lowest count is replaced and the new item inherits its count as an
+    error. Estimated counts are never less than the true counts and exceed
+    them by at most the error of each item, which is at most the total count
+    divided by the capacity, so every item more frequent than that is
+    monitored.
+    """
+    def __init__(self, capacity: int):
+        """
+        Create a new SpaceSaving sketch.
+
+        :param capacity: The maximum number of items to monitor.
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self._capacity: int = capacity
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        self._total: int = 0
+        # min-heap of [count, tie-breaker, item], with stale entries skipped
+        self._heap: List[list] = []
+        self._tie_breakers = count_from()
+
+    @property
+    def capacity(self) -> int:
+
+        return self._capacity
+
+    @property
+    def total(self) -> int:
+        """
+        Return the total count of all the items seen.
+        """
+        return self._total
+
+    def update(
+            self, items: Union[Iterable[Hashable], Dict[Hashable, int]]
+    ) -> 'SpaceSaving':
+        """
+        Count a batch of items.
+
+        :param items: Iterable of items, or dict of {item: count}.
+        :return: The SpaceSaving sketch, for chaining.
+        """
+        if not isinstance(items, Mapping):
+            items = Counter(items)
+        counts = self._counts
+        for item, weight in items.items():
+            if weight <= 0:
+                continue
+            self._total += weight
+            if item in counts:
+                counts[item] += weight
+            elif len(counts) < self._capacity:
+                counts[item] = weight
+                self._errors[item] = 0
+            else:
+                evicted, minimum = self._pop_minimum()
+                del counts[evicted]
+                del self._errors[evicted]
+                counts[item] = minimum + weight
+                self._errors[item] = minimum
+            self._push(item)
+        if len(self._heap) > 4 * self._capacity:
+            self._rebuild_heap()
+        return self
+
+    def counts(self) -> Dict[Hashable, int]:
+        """
+        Return the estimated count of each monitored item, in descending order
+        of count.
+        """
+        return dict(self.top())
+
+    def errors(self) -> Dict[Hashable, int]:
+        """
+        Return the maximum overestimate of the count of each monitored item.
+        """
+        return dict(self._errors)
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        Return the k monitored items with the highest estimated counts and
+        their counts, in descending order of count.
+
+        :param k: The number of items to return. Leave as None to return all
+                  the monitored items.
+        """
+        return sorted(self._counts.items(),
+                      key=lambda item_count: -item_count[1])[: k]
+
+    def guaranteed(self, k: Optional[int] = None) -> List[Hashable]:
+        """
+        Return the items of the top k whose counts are guaranteed to be
+        higher than that of any item outside the top k.
+
+        :param k: The number of items to check. Leave as None to check all
+                  the monitored items.
+        """
+        top = self.top(k)
+        if k is not None and k < len(self._counts):
+            threshold = self.top(k + 1)[-1][1]
+        elif len(self._counts) == self._capacity:
+            # unmonitored items have counts of at most the minimum
+            threshold = self._minimum()
+        else:
+            threshold = 0
+        return [item for item, count in top
+                if count - self._errors[item] >= threshold]
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Return a JSON-serializable dict of the sketch, to restore it with
+        `from_state`. Items must be JSON-serializable.
+        """
+        return {
+            'capacity': self._capacity,
+            'total': self._total,
+            'items': list(self._counts.keys()),
+            'counts': list(self._counts.values()),
+            'errors': [self._errors[item] for item in self._counts]
+        }
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> 'SpaceSaving':
+        """
+        Create a new SpaceSaving sketch from the dict returned by `to_state`.
+        """
+        sketch = SpaceSaving(state['capacity'])
+        sketch._total = state['total']
+        sketch._counts = dict(zip(state['items'], state['counts']))
+        sketch._errors = dict(zip(state['items'], state['errors']))
+        sketch._rebuild_heap()
+        return sketch
+
+    def _push(self, item: Hashable) -> None:
+
+        heappush(self._heap,
+                 [self._counts[item], next(self._tie_breakers), item])
+
+    def _pop_minimum(self) -> Tuple[Hashable, int]:
+        """
+        Remove and return the monitored item with the lowest count, and its
+        count.
+        """
+        while True:
+            count, _, item = heappop(self._heap)
+            if self._counts.get(item) == count:
+                return item, count
+
+    def _minimum(self) -> int:
+
+        while self._heap:
+            count, _, item = self._heap[0]
+            if self._counts.get(item) == count:
+                return count
+            heappop(self._heap)
+        return 0
+
+    def _rebuild_heap(self) -> None:
+        """
+        Rebuild the heap from the current counts, dropping stale entries.
+        """
+        self._heap = [[count, next(self._tie_breakers), item]
+                      for item, count in self._counts.items()]
+        heapify(self._heap)
+
+    def __contains__(self, item: Hashable) -> bool:
+
+        return item in self._counts
+
+    def __len__(self) -> int:
+
+        return len(self._counts)
+
+    def __repr__(self) -> str:
+
+        return 'SpaceSaving({} of {} items monitored, total={})'.format(
+            len(self._counts), self._capacity, self._total)
@@ -1,43 +1,106 @@
+from collections.abc import MutableMapping
 from datetime import timedelta
-from typing import List, Callable, Union, Optional
+from operator import add, mul, sub, truediv
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, \
+    Union
 
 from matplotlib.axes import Axes
-from numpy import nan
-from pandas import concat, DataFrame, MultiIndex, Series, pivot_table
+from numpy import add as np_add, append, arange, argsort, asarray, \
+    concatenate, cumsum, diff, errstate, flatnonzero, fmax, fmin, full, \
+    integer, isin, isnan, ix_, lexsort, maximum, nan, nansum, ndarray, ones, \
+    repeat, result_type, tile, where, zeros
+from pandas import concat, DataFrame, DatetimeIndex, Index, MultiIndex, \
+    Series, Timedelta, Timestamp
 from pandas.core.computation.ops import isnumeric
+from pandas.tseries.offsets import BaseOffset
+from scipy.sparse import coo_matrix, csr_matrix, hstack, issparse
 from seaborn import heatmap
 
 from ux.plots.helpers import new_axes, transform_axis_tick_labels, \
     set_axis_tick_label_rotation
+from ux.utils.time_buckets import TimeBuckets
 
 
-class TemporalCount(dict):
+# verb used in error messages for each arithmetic operator
+_OPERATOR_VERBS = {'+': 'add', '-': 'subtract', '*': 'multiply', '/': 'divide'}
+# NaN-skipping reduction of the counts in each bucket for each resample how
+_REDUCERS = {'sum': np_add, 'mean': np_add, 'min': fmin, 'max': fmax}
 
-    def __init__(self, name: str):
+
+class TemporalCount(MutableMapping):
+    """
+    The count of a single or split variable in each of a sequence of time
+    buckets.
+
+    Counts are stored as a sorted DatetimeIndex of bucket date-times and a
+    2-D array of counts with one row per bucket and one column per split
+    category, or a single column if the count is not split. Arithmetic aligns
+    the arrays of two counts on their date-times and categories.
+
+    Split counts with many categories that are mostly 0 can be stored in a
+    sparse matrix instead, which is kept sparse by merging, addition,
+    subtraction, scaling, summing resamples and selecting categories.
+
+    The count is also a mutable mapping of {date-time: count} for unsplit
+    counts or {date-time: {category: count}} for split counts, keyed by the
+    date, date-time or other key each bucket was set with, and with only the
+    non-zero categories of each bucket of a split count. Items set in this way
+    are buffered and merged into the arrays when they are next used. It is
+    not a dict subclass, so use `dict(count)` where a dict is needed.
+    """
+    def __init__(self, name: str,
+                 date_times: Optional[DatetimeIndex] = None,
+                 counts: Optional[Union[ndarray, csr_matrix]] = None,
+                 categories: Optional[Index] = None):
         """
         Create a new Temporal Count representing the count of a single or split
         variable over time.
 
         :param name: The name of the metric or measure being counted
+        :param date_times: Optional sorted, unique date-time of each bucket.
+        :param counts: Optional array of counts with one row per bucket, and
+                       one column per category if the count is split, or a
+                       scipy sparse matrix of the counts of a split count.
+        :param categories: The split categories, or None if the count is not
+                           split.
         """
-        super(TemporalCount, self).__init__()
         self._name: str = name
-        # validation checks
-        if None in self.keys():
-            raise KeyError('Keys cannot be None')
-        for k, v in self.items():
-            if isinstance(v, dict):
-                if None in v.keys():
-                    raise KeyError('Keys of a split count cannot be None')
+        if date_times is None:
+            date_times = DatetimeIndex([])
+            counts = zeros((0, 0 if categories is not None else 1))
+        if issparse(counts):
+            if categories is None:
+                raise ValueError(
+                    'Only split counts can be stored in a sparse matrix.')
+            counts = csr_matrix(counts)
+        else:
+            counts = asarray(counts)
+            if counts.ndim == 1:
+                counts = counts.reshape(-1, 1)
+        self._date_times: DatetimeIndex = DatetimeIndex(date_times)
+        self._counts: Union[ndarray, csr_matrix] = counts
+        self._categories: Optional[Index] = (
+            None if categories is None else Index(categories)
+        )
+        self._pending: Dict[Timestamp, Any] = {}
+        # the key each date-time was set with through the dict interface
+        self._keys: Dict[Timestamp, Any] = {}
+        self._frequency: Optional[timedelta] = None
 
     @staticmethod
-    def from_dict(dictionary: dict, name: str) -> 'TemporalCount':
+    def from_dict(dictionary: dict, name: str,
+                  sparse: bool = False) -> 'TemporalCount':
         """
-        Create a new Temporal Count from an existing dict.
+        Create a new Temporal Count from an existing dict of {date-time:
+        count} or {date-time: {category: count}}.
+
+        :param dictionary: The dict of counts.
+        :param name: The name of the count.
+        :param sparse: Whether to store the counts of a split count in a
+                       sparse matrix without creating the dense array.
         """
         count = TemporalCount(name=name)
-        for key, value in dictionary.items():
-            count[key] = value
+        count._keys = dict(zip(count._merge(dictionary, sparse), dictionary))
         return count
 
     @property
@@ -49,20 +112,167 @@ class TemporalCount(dict):
         self._name = name
         return self
 
+    # region arrays
+
+    @property
+    def date_times(self) -> DatetimeIndex:
+        """
+        Return the sorted date-time of each bucket.
+        """
+        self._consolidate()
+        return self._date_times
+
+    @property
+    def counts(self) -> Union[ndarray, csr_matrix]:
+        """
+        Return the array of counts, with one row per bucket and one column
+        per split category if the count is split, or the sparse matrix of
+        counts if the count is sparse.
+        """
+        self._consolidate()
+        return (self._counts if self._categories is not None
+                else self._counts[:, 0])
+
+    @property
+    def categories(self) -> Optional[Index]:
+        """
+        Return the split categories, or None if the count is not split.
+        """
+        self._consolidate()
+        return self._categories
+
+    @property
+    def is_sparse(self) -> bool:
+        """
+        Return whether the counts are stored in a sparse matrix.
+        """
+        return issparse(self._counts)
+
+    def to_sparse(self) -> 'TemporalCount':
+        """
+        Return a copy of a split count with the counts stored in a sparse
+        matrix.
+        """
+        self._consolidate()
+        return self._keyed(TemporalCount(
+            name=self._name, date_times=self._date_times,
+            counts=csr_matrix(self._counts), categories=self._categories
+        ))
+
+    def to_dense(self) -> 'TemporalCount':
+        """
+        Return the count with the counts stored in a dense array.
+        """
+        self._consolidate()
+        return self._keyed(TemporalCount(
+            name=self._name, date_times=self._date_times,
+            counts=self._dense(), categories=self._categories
+        ))
+
+    def _dense(self) -> ndarray:
+        """
+        Return the counts as a dense array.
+        """
+        return _as_dense(self._counts)
+
+    # end region
+
+    # region categories
+
+    def top(self, k: Optional[int] = None,
+            other: Optional[Any] = None) -> 'TemporalCount':
+        """
+        Return a split count of the k categories with the highest total
+        counts, in descending order of total. Sparse counts stay sparse, so
+        the top categories can be selected before converting to pandas.
+
+        :param k: The number of categories to keep. Leave as None to keep all
+                  the categories, sorted by total.
+        :param other: Optional category to add the counts of the remaining
+                      categories to.
+        """
+        self._check_split('select the top categories of')
+        if self.is_sparse:
+            totals = asarray(self._counts.sum(axis=0)).ravel()
+        else:
+            totals = nansum(self._counts, axis=0)
+        columns = self._other_excluded(arange(len(totals)), other)
+        order = columns[argsort(-totals[columns], kind='stable')][: k]
+        return self._select_columns(order, other)
+
+    def select(self, categories: List[Any],
+               other: Optional[Any] = None) -> 'TemporalCount':
+        """
+        Return a split count of the given categories, in the given order.
+        Categories that are not in the count are ignored.
+
+        :param categories: The categories to keep.
+        :param other: Optional category to add the counts of the remaining
+                      categories to.
+        """
+        self._check_split('select categories of')
+        columns = self._categories.get_indexer(categories)
+        return self._select_columns(
+            self._other_excluded(columns[columns != -1], other), other)
+
+    def _check_split(self, action: str) -> None:
+
+        self._consolidate()
+        if self._categories is None:
+            raise ValueError(
+                "Can't {} a non-split count.".format(action))
+
+    def _other_excluded(self, columns: ndarray,
+                        other: Optional[Any]) -> ndarray:
+        """
+        Return the columns without the column of the other category, whose
+        counts are added to the new other category.
+        """
+        if other is None or other not in self._categories:
+            return columns
+        return columns[columns != self._categories.get_loc(other)]
+
+    def _select_columns(self, columns: ndarray,
+                        other: Optional[Any]) -> 'TemporalCount':
+        """
+        Return a count of the columns of the categories, with the counts of
+        the remaining columns added to an other category if one is given.
+        """
+        counts = self._counts[:, columns]
+        categories = self._categories[columns]
+        if other is not None:
+            rest = ones(len(self._categories), dtype=bool)
+            rest[columns] = False
+            if self.is_sparse:
+                other_counts = csr_matrix(self._counts[:, rest].sum(axis=1))
+                counts = hstack([counts, other_counts], format='csr')
+            else:
+                other_counts = nansum(self._counts[:, rest], axis=1)
+                counts = concatenate(
+                    [counts, other_counts.reshape(-1, 1)], axis=1)
+            categories = categories.append(Index([other]))
+        return self._keyed(TemporalCount(
+            name=self._name, date_times=self._date_times,
+            counts=counts, categories=categories
+        ))
+
+    # end region
+
     @property
     def is_split(self) -> Optional[bool]:
 
-        values = list(self.values())
-        if not values:
+        self._consolidate()
+        if not len(self._date_times):
             return None
-        else:
-            return type(values[0]) is dict
+        return self._categories is not None
 
     @property
     def frequency(self) -> timedelta:
 
-        date_times = self.to_frame().index
-        return date_times[1] - date_times[0]
+        self._consolidate()
+        if self._frequency is None:
+            self._frequency = self._date_times[1] - self._date_times[0]
+        return self._frequency
 
     @property
     def freq_str(self) -> Optional[str]:
@@ -101,20 +311,31 @@ class TemporalCount(dict):
         Return the Series representation of the count data.
 
         If the count is split, return counts indexed by datetime and count
-        variable.
+        variable. If the counts are sparse, only non-zero counts are included.
         If the count is not split return counts indexed by datetime.
         """
-        if self.is_split:
-            data = DataFrame(self).T
-            data.index.name = 'date_time'
-            data = data.reset_index().melt(
-                id_vars='date_time', var_name=self._name, value_name='count'
+        date_times = self.date_times.rename('date_time')
+        if self.is_sparse:
+            coo = self._counts.tocoo()
+            order = lexsort((coo.row, coo.col))
+            index = MultiIndex.from_arrays(
+                [date_times[coo.row[order]],
+                 self._categories[coo.col[order]]],
+                names=['date_time', self._name]
+            )
+            return Series(coo.data[order], index=index, name='count')
+        elif self.is_split:
+            n_categories = len(self._categories)
+            index = MultiIndex.from_arrays(
+                [tile(date_times, n_categories),
+                 repeat(self._categories, len(date_times))],
+                names=['date_time', self._name]
             )
-            data = data.set_index(['date_time', self._name])['count']
+            data = Series(self._counts.T.ravel(), index=index, name='count')
             return data.replace(nan, 0)
         else:
-            data = Series(data=self, name=self._name)
-            data.index.name = 'date_time'
+            data = Series(self._counts[:, 0], index=date_times,
+                          name=self._name)
             return data.replace(nan, 0)
 
     def to_frame(self) -> DataFrame:
@@ -128,9 +349,13 @@ class TemporalCount(dict):
         In either case the Index will be the datetime of the count.
         """
         if self.is_split:
-            data = DataFrame(self).T
-            data.index.name = 'date_time'
-            data.columns = MultiIndex.from_product([[self._name], data.columns])
+            index = self._date_times.rename('date_time')
+            columns = MultiIndex.from_product([[self._name],
+                                               self._categories])
+            if self.is_sparse:
+                return DataFrame.sparse.from_spmatrix(
+                    self._counts, index=index, columns=columns)
+            data = DataFrame(self._counts, index=index, columns=columns)
             return data.replace(nan, 0)
         else:
             return self.to_series().to_frame().replace(nan, 0)
@@ -158,8 +383,8 @@ class TemporalCount(dict):
         :param plot_type: Type of plot for split counts.
                           One of ('bar', 'heatmap')
         :param stacked: If barplot is stacked
-        :param top: Number of results to show in heatmaps.
-                    Leave as None to show all.
+        :param top: Number of categories with the highest totals to show in
+                    heatmaps. Leave as None to show all.
         :param ax: Optional matplotlib axes to plot on
         :param axis_kws: Optional dict of values to call ax.set() with
         """
@@ -168,22 +393,13 @@ class TemporalCount(dict):
         ax.set_title(self.name)
         if self.is_split:
             if plot_type == 'bar':
-                data = self.to_frame()
+                data = self.to_dense().to_frame()
                 data.droplevel(0, axis=1).plot.bar(ax=ax, stacked=stacked)
                 ax.set_ylabel('Count')
             else:  # heatmap
-                data = self.to_series().reset_index()
-                pt = pivot_table(
-                    data=data, index='date_time',
-                    columns=self.name, values='count'
-                ).astype(int)
-                pt = (
-                    pt.append(Series(data=pt.sum(), name='#TOTAL#'))
-                      .sort_values('#TOTAL#', axis=1, ascending=False)
-                      .drop('#TOTAL#', axis=0)
-                )
-                if top is not None:
-                    pt = pt.T.head(top).T
+                # select the top categories before creating the dense frame
+                pt = self.top(top).to_dense().to_frame().droplevel(
+                    0, axis=1).astype(int)
                 heatmap(data=pt.T, annot=True, fmt='d', ax=ax)
                 y_lim = ax.get_ylim()
                 ax.set_ylim(max(y_lim) + 0.5, min(y_lim) - 0.5)
@@ -192,7 +408,7 @@ class TemporalCount(dict):
         else:
             data = self.to_series()
             data.plot.bar(ax=ax)
-        transform_axis_tick_labels(ax.xaxis, self.freq_formatter)
+        transform_axis_tick_labels(ax.xaxis, self.freq_formatter())
         ax.set_xlabel('Date Time')
         if axis_kws is not None:
             ax.set(**axis_kws)
@@ -216,292 +432,641 @@ class TemporalCount(dict):
         ], axis=1)  # assumes all are not split
         ax = ax or new_axes()
         data.plot.bar(ax=ax, stacked=stacked)
-        transform_axis_tick_labels(ax.xaxis, temporal_counts[0].freq_formatter)
+        transform_axis_tick_labels(ax.xaxis,
+                                  temporal_counts[0].freq_formatter())
         ax.set_xlabel('Date Time')
         ax.set_ylabel('Count')
         if axis_kws is not None:
             ax.set(**axis_kws)
         return ax
 
+    # region arithmetic
+
     def __truediv__(
             self, other: Union['TemporalCount', int, float]
     ) -> 'TemporalCount':
 
-        if isinstance(other, TemporalCount):
-            if self.is_split and not other.is_split:
-                raise ValueError(
-                    "Can't divide a split count by a non-split count."
-                )
-            elif not self.is_split and other.is_split:
-                raise ValueError(
-                    "Can't divide a non-split count by a split count."
-                )
-            new_name = '{} / {}'.format(self.name, other.name)
-            if not self.is_split:
-                div_data: dict = (
-                            self.to_pandas() / other.to_pandas()
-                ).to_dict()
-            else:
-                div_data: dict = self.to_frame().droplevel(0, axis=1).div(
-                    other.to_frame().droplevel(0, axis=1), fill_value=0
-                ).to_dict(orient='index')
-            return TemporalCount.from_dict(div_data, name=new_name)
-        elif isnumeric(type(other)):
-            if self.is_split:
-                div_data: dict = (
-                        self.to_frame().droplevel(0, axis=1) / other
-                ).to_dict(orient='index')
-            else:
-                div_data: dict = (
-                        self.to_series() / other
-                ).to_dict()
-            return TemporalCount.from_dict(
-                dictionary=div_data,
-                name='{} / {}'.format(self.name, other)
-            )
-        else:
-            raise TypeError(
-                'Can only divide a TemporalCount by another TemporalCount '
-                'or a numeric value.'
-            )
+        return self._operate(other, truediv, '/')
 
     def __rtruediv__(
             self,
             other: Union['TemporalCount', int, float]
     ) -> 'TemporalCount':
 
-        if isinstance(other, TemporalCount):
-            if self.is_split and not other.is_split:
-                raise ValueError(
-                    "Can't divide a non-split count by a split count.")
-            elif not self.is_split and other.is_split:
-                raise ValueError(
-                    "Can't divide a split count by a non-split count.")
-            new_name = '{} / {}'.format(other.name, self.name)
-            if not self.is_split:
-                div_data = (other.to_pandas() / self.to_pandas()).to_dict()
-            else:
-                div_data = other.to_frame().droplevel(0, axis=1).div(
-                    self.to_frame().droplevel(0, axis=1), fill_value=0)
-                div_data = div_data.to_dict(orient='index')
-            return TemporalCount.from_dict(div_data, name=new_name)
-        elif isnumeric(type(other)):
-            if self.is_split:
-                div_data: dict = (
-                        other / self.to_frame().droplevel(0, axis=1)
-                ).to_dict(orient='index')
-            else:
-                div_data: dict = (other / self.to_series()).to_dict()
-            return TemporalCount.from_dict(div_data,
-                                           name='{} / {}'.format(other,
-                                                                 self.name))
-        else:
-            raise TypeError(
-                'Can only divide another TemporalCount or a numeric value '
-                'by a TemporalCount.'
-            )
+        return self._operate(other, truediv, '/', reflected=True)
 
     def __mul__(self,
                 other: Union['TemporalCount', int, float]) -> 'TemporalCount':
 
-        if isinstance(other, TemporalCount):
-            if self.is_split and not other.is_split:
-                raise ValueError(
-                    "Can't multiply a split count by a non-split count.")
-            elif not self.is_split and other.is_split:
-                raise ValueError(
-                    "Can't multiply a non-split count by a split count.")
-            new_name = '{} * {}'.format(self.name, other.name)
-            if not self.is_split:
-                mul_data = (self.to_pandas() * other.to_pandas()).to_dict()
-            else:
-                mul_data = self.to_frame().droplevel(0, axis=1).mul(
-                    other.to_frame().droplevel(0, axis=1), fill_value=0)
-                mul_data = mul_data.to_dict(orient='index')
-            return TemporalCount.from_dict(mul_data, name=new_name)
-        elif isnumeric(type(other)):
-            if self.is_split:
-                mul_data: dict = (
-                        self.to_frame().droplevel(0, axis=1) * other
-                ).to_dict(orient='index')
-            else:
-                mul_data: dict = (self.to_series() * other).to_dict()
-            return TemporalCount.from_dict(mul_data,
-                                           name='{} * {}'.format(self.name,
-                                                                 other))
-        else:
-            raise TypeError(
-                'Can only multiply a TemporalCount by another TemporalCount'
-                ' or a numeric value.'
-            )
+        return self._operate(other, mul, '*')
 
     def __rmul__(self,
                  other: Union['TemporalCount', int, float]) -> 'TemporalCount':
 
-        if isinstance(other, TemporalCount):
-            if self.is_split and not other.is_split:
-                raise ValueError(
-                    "Can't multiply a split count by a non-split count.")
-            elif not self.is_split and other.is_split:
-                raise ValueError(
-                    "Can't multiply a non-split count by a split count.")
-            new_name = '{} * {}'.format(other.name, self.name)
-            if not self.is_split:
-                mul_data: dict = (
-                            other.to_pandas() * self.to_pandas()).to_dict()
-            else:
-                mul_data: dict = other.to_frame().droplevel(0, axis=1).mul(
-                    self.to_frame().droplevel(0, axis=1), fill_value=0
-                ).to_dict(orient='index')
-            return TemporalCount.from_dict(mul_data, name=new_name)
-        elif isnumeric(type(other)):
-            if self.is_split:
-                mul_data: dict = (
-                        other * self.to_frame().droplevel(0, axis=1)
-                ).to_dict(orient='index')
-            else:
-                mul_data: dict = (other * self.to_series()).to_dict()
-            return TemporalCount.from_dict(mul_data,
-                                           name='{} * {}'.format(other,
-                                                                 self.name))
-        else:
-            raise TypeError(
-                'Can only multiply a TemporalCount by '
-                'another TemporalCount or a numeric value.'
-            )
+        return self._operate(other, mul, '*', reflected=True)
 
     def __add__(self,
                 other: Union['TemporalCount', int, float]) -> 'TemporalCount':
 
-        if isinstance(other, TemporalCount):
-            if self.is_split and not other.is_split:
-                raise ValueError(
-                    "Can't add a split count to a non-split count.")
-            elif not self.is_split and other.is_split:
-                raise ValueError(
-                    "Can't add a non-split count to a split count.")
-            new_name = '{} + {}'.format(self.name, other.name)
-            if not self.is_split:
-                add_data = (self.to_pandas() + other.to_pandas()).to_dict()
-            else:
-                add_data = self.to_frame().droplevel(0, axis=1).add(
-                    other.to_frame().droplevel(0, axis=1), fill_value=0)
-                add_data = add_data.to_dict(orient='index')
-            return TemporalCount.from_dict(add_data, name=new_name)
-        elif isnumeric(type(other)):
-            if self.is_split:
-                add_data = (self.to_frame().droplevel(0,
-                                                      axis=1) + other).to_dict(
-                    orient='index')
-            else:
-                add_data = (self.to_series() + other).to_dict()
-            return TemporalCount.from_dict(add_data,
-                                           name='{} + {}'.format(self.name,
-                                                                 other))
-        else:
-            raise TypeError(
-                'Can only add a TemporalCount to another'
-                ' TemporalCount or a numeric value.'
-            )
+        return self._operate(other, add, '+')
 
     def __radd__(self,
                  other: Union['TemporalCount', int, float]) -> 'TemporalCount':
 
-        if isinstance(other, TemporalCount):
-            if self.is_split and not other.is_split:
-                raise ValueError(
-                    "Can't add a split count to a non-split count.")
-            elif not self.is_split and other.is_split:
-                raise ValueError(
-                    "Can't add a non-split count to a split count.")
-            new_name = '{} + {}'.format(other.name, self.name)
-            if not self.is_split:
-                add_data = (other.to_pandas() + self.to_pandas()).to_dict()
-            else:
-                add_data = other.to_frame().droplevel(0, axis=1).add(
-                    self.to_frame().droplevel(0, axis=1), fill_value=0)
-                add_data = add_data.to_dict(orient='index')
-            return TemporalCount.from_dict(add_data, name=new_name)
-        elif isnumeric(type(other)):
-            if self.is_split:
-                add_data = (other + self.to_frame().droplevel(0,
-                                                              axis=1)).to_dict(
-                    orient='index')
-            else:
-                add_data = (other + self.to_series()).to_dict()
-            return TemporalCount.from_dict(add_data,
-                                           name='{} + {}'.format(other,
-                                                                 self.name))
-        else:
-            raise TypeError(
-                'Can only add another TemporalCount '
-                'or a numeric value to a TemporalCount.')
+        return self._operate(other, add, '+', reflected=True)
 
     def __sub__(self,
                 other: Union['TemporalCount', int, float]) -> 'TemporalCount':
 
+        return self._operate(other, sub, '-')
+
+    def __rsub__(self,
+                 other: Union['TemporalCount', int, float]) -> 'TemporalCount':
+
+        return self._operate(other, sub, '-', reflected=True)
+
+    def _operate(self, other: Union['TemporalCount', int, float],
+                 operator: Callable[[Any, Any], Any], symbol: str,
+                 reflected: bool = False) -> 'TemporalCount':
+        """
+        Apply an arithmetic operator to this count and another count or a
+        number.
+
+        Counts are aligned on the union of their date-times and categories.
+        Buckets missing from one count are NaN for unsplit counts and 0 for
+        split counts, as in the pandas operations on `to_pandas()`.
+
+        Sparse counts stay sparse when added to or subtracted from other
+        sparse counts, and when multiplied or divided by a number. Other
+        operations give dense counts.
+
+        :param other: The other count or number.
+        :param operator: The operator, e.g. `operator.add`.
+        :param symbol: The symbol of the operator, used to name the result.
+        :param reflected: Whether `other` is the left operand.
+        """
+        verb = _OPERATOR_VERBS[symbol]
+        self._consolidate()
         if isinstance(other, TemporalCount):
-            if self.is_split and not other.is_split:
-                raise ValueError(
-                    "Can't subtract a non-split count from a split count.")
-            elif not self.is_split and other.is_split:
+            other._consolidate()
+            if (self._categories is None) != (other._categories is None):
                 raise ValueError(
-                    "Can't subtract a split count from a non-split count.")
-            new_name = '{} - {}'.format(self.name, other.name)
-            if not self.is_split:
-                sub_data = (self.to_pandas() - other.to_pandas()).to_dict()
-            else:
-                sub_data = self.to_frame().droplevel(0, axis=1).sub(
-                    other.to_frame().droplevel(0, axis=1), fill_value=0
-                )
-                sub_data = sub_data.to_dict(orient='index')
-            return TemporalCount.from_dict(sub_data, name=new_name)
+                    "Can't {} a split count and a non-split count.".format(
+                        verb))
+            left, right = (other, self) if reflected else (self, other)
+            date_times, categories, left_counts, right_counts = _align(
+                left, right)
+            if not (issparse(left_counts) and issparse(right_counts) and
+                    symbol in ('+', '-')):
+                left_counts = _as_dense(left_counts)
+                right_counts = _as_dense(right_counts)
+            with errstate(divide='ignore', invalid='ignore'):
+                counts = operator(left_counts, right_counts)
+            name = '{} {} {}'.format(left.name, symbol, right.name)
         elif isnumeric(type(other)):
-            if self.is_split:
-                sub_data = (self.to_frame().droplevel(0,
-                                                      axis=1) - other).to_dict(
-                    orient='index')
-            else:
-                sub_data = (self.to_series() - other).to_dict()
-            return TemporalCount.from_dict(sub_data,
-                                           name='{} - {}'.format(self.name,
-                                                                 other))
+            date_times = self._date_times
+            categories = self._categories
+            counts = self._counts
+            if issparse(counts) and not (
+                    symbol == '*' or
+                    (symbol == '/' and not reflected and other != 0)):
+                counts = counts.toarray()
+            with errstate(divide='ignore', invalid='ignore'):
+                if reflected:
+                    counts = operator(other, counts)
+                else:
+                    counts = operator(counts, other)
+            name = ('{} {} {}'.format(other, symbol, self.name) if reflected
+                    else '{} {} {}'.format(self.name, symbol, other))
         else:
             raise TypeError(
-                'Can only subtract another TemporalCount or '
-                'a numeric value from a TemporalCount.'
+                'Can only {} a TemporalCount and another TemporalCount or a '
+                'numeric value.'.format(verb)
             )
+        return self._keyed(
+            TemporalCount(name=name, date_times=date_times, counts=counts,
+                          categories=categories),
+            *([other] if isinstance(other, TemporalCount) else [])
+        )
 
-    def __rsub__(self,
-                 other: Union['TemporalCount', int, float]) -> 'TemporalCount':
+    # end region
 
-        if isinstance(other, TemporalCount):
-            if self.is_split and not other.is_split:
-                raise ValueError(
-                    "Can't subtract a split count from a non-split count.")
-            elif not self.is_split and other.is_split:
-                raise ValueError(
-                    "Can't subtract a non-split count from a split count.")
-            new_name = '{} - {}'.format(other.name, self.name)
-            if not self.is_split:
-                sub_data = (other.to_pandas() - self.to_pandas()).to_dict()
+    # region time operations
+
+    def resample(self, freq: Union[str, BaseOffset],
+                 how: str = 'sum') -> 'TemporalCount':
+        """
+        Aggregate the counts into coarser buckets of a pandas frequency, e.g.
+        daily counts into weekly totals with `resample('W-MON')`.
+
+        NaN counts are skipped. Buckets without any counts are 0 for 'sum'
+        and NaN otherwise. Sparse counts stay sparse for 'sum'.
+
+        :param freq: pandas frequency string or offset of the new buckets,
+                     e.g. 'W-MON' or 'MS'.
+        :param how: One of 'sum', 'mean', 'min' or 'max'.
+        """
+        if how not in _REDUCERS:
+            raise ValueError('how must be one of {}'.format(list(_REDUCERS)))
+        self._consolidate()
+        buckets = TimeBuckets(self._date_times, freq=freq)
+        if self.is_sparse and how == 'sum':
+            # sum the rows of each bucket with a sparse bucket-by-row matrix
+            n_rows = len(self._date_times)
+            rows_to_buckets = csr_matrix(
+                (ones(n_rows, dtype=self._counts.dtype),
+                 (buckets.bucket_ids, arange(n_rows))),
+                shape=(len(buckets), n_rows)
+            )
+            return TemporalCount(name=self._name, date_times=buckets.labels,
+                                 counts=rows_to_buckets @ self._counts,
+                                 categories=self._categories)
+        dense = self._dense()
+        dtype = (dense.dtype if how == 'sum'
+                 else result_type(dense.dtype, float))
+        counts = full((len(buckets), dense.shape[1]),
+                      0 if how == 'sum' else nan, dtype=dtype)
+        if len(self._date_times):
+            # the bucket ids of sorted date-times never decrease
+            bucket_ids = buckets.bucket_ids
+            starts = flatnonzero(append([True], diff(bucket_ids) != 0))
+            values, valid = _valid(dense)
+            if how in ('sum', 'mean'):
+                reduced = np_add.reduceat(values, starts, axis=0)
             else:
-                sub_data = other.to_frame().droplevel(0, axis=1).sub(
-                    self.to_frame().droplevel(0, axis=1), fill_value=0)
-                sub_data = sub_data.to_dict(orient='index')
-            return TemporalCount.from_dict(sub_data, name=new_name)
-        elif isnumeric(type(other)):
-            if self.is_split:
-                sub_data = (other - self.to_frame().droplevel(0,
-                                                              axis=1)).to_dict(
-                    orient='index')
+                reduced = _REDUCERS[how].reduceat(dense, starts, axis=0)
+            if how == 'mean':
+                with errstate(divide='ignore', invalid='ignore'):
+                    reduced = reduced / np_add.reduceat(valid, starts, axis=0)
+            counts[bucket_ids[starts]] = reduced
+        return TemporalCount(name=self._name, date_times=buckets.labels,
+                             counts=counts, categories=self._categories)
+
+    def rolling(self, window: Union[int, str, timedelta],
+                how: str = 'mean',
+                min_periods: Optional[int] = None) -> 'TemporalCount':
+        """
+        Return the sum or mean of the counts over a trailing window ending at
+        each bucket, e.g. a 7-day rolling average with `rolling('7D')`.
+
+        NaN counts are skipped, and windows with fewer than `min_periods`
+        non-NaN counts are NaN.
+
+        :param window: The number of buckets in each window, or the length of
+                       time covered by each window, e.g. '7D'.
+        :param how: 'sum' or 'mean'.
+        :param min_periods: Minimum number of counts in a window. Defaults to
+                            the window for a number of buckets and 1 for a
+                            length of time.
+        """
+        if how not in ('sum', 'mean'):
+            raise ValueError("how must be one of ['sum', 'mean']")
+        self._consolidate()
+        stops = arange(1, len(self._date_times) + 1)
+        if isinstance(window, (int, integer)):
+            if window < 1:
+                raise ValueError('window must be at least 1 bucket')
+            starts = maximum(stops - window, 0)
+            if min_periods is None:
+                min_periods = window
+        else:
+            window = Timedelta(window)
+            if window <= Timedelta(0):
+                raise ValueError('window must be a positive length of time')
+            time_stamps = self._date_times.asi8
+            starts = time_stamps.searchsorted(time_stamps - window.value,
+                                              side='right')
+            if min_periods is None:
+                min_periods = 1
+        values, valid = _valid(self._dense())
+        sums = _window_sums(values, starts, stops)
+        periods = _window_sums(valid, starts, stops)
+        with errstate(divide='ignore', invalid='ignore'):
+            counts = sums / periods if how == 'mean' else sums.astype(float)
+        counts[periods < min_periods] = nan
+        return self._keyed(TemporalCount(
+            name=self._name, date_times=self._date_times,
+            counts=counts, categories=self._categories
+        ))
+
+    def cumsum(self) -> 'TemporalCount':
+        """
+        Return the cumulative sum of the counts over time, skipping NaN
+        counts.
+        """
+        self._consolidate()
+        values, valid = _valid(self._dense())
+        counts = cumsum(values, axis=0)
+        if not valid.all():
+            counts = where(valid, counts, nan)
+        return self._keyed(TemporalCount(
+            name=self._name, date_times=self._date_times,
+            counts=counts, categories=self._categories
+        ))
+
+    def diff(self, periods: int = 1) -> 'TemporalCount':
+        """
+        Return the difference between each count and the count a number of
+        buckets earlier. The first `periods` buckets are NaN.
+
+        :param periods: The number of buckets to look back.
+        """
+        if periods < 1:
+            raise ValueError('periods must be at least 1')
+        self._consolidate()
+        dense = self._dense()
+        counts = full(dense.shape, nan, dtype=result_type(dense.dtype, float))
+        counts[periods:] = dense[periods:] - dense[: -periods]
+        return self._keyed(TemporalCount(
+            name=self._name, date_times=self._date_times,
+            counts=counts, categories=self._categories
+        ))
+
+    # end region
+
+    # region incremental updates
+
+    def merge(self, other: 'TemporalCount', replace: bool = False) -> None:
+        """
+        Merge another count into this count in place, e.g. the counts of the
+        latest time buckets of an append-only event stream.
+
+        :param other: The count to merge, split if this count is split.
+        :param replace: Whether to replace the counts of date-times in both
+                        counts with those of the other count instead of adding
+                        them.
+        """
+        self._consolidate()
+        other._consolidate()
+        self._merge_count(other, replace)
+        self._keys.update(other._keys)
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Return a JSON-serializable dict of the name, date-times, counts and
+        categories of the count, to restore it with `from_state`.
+
+        Date-times are stored as integer nanoseconds since the epoch, in UTC
+        if the date-times have a timezone. Sparse counts are stored as lists
+        of the rows, columns and values of the non-zero counts.
+        """
+        self._consolidate()
+        tz = self._date_times.tz
+        if self.is_sparse:
+            coo = self._counts.tocoo()
+            counts = [coo.row.tolist(), coo.col.tolist(), coo.data.tolist()]
+        else:
+            counts = self._counts.tolist()
+        return {
+            'name': self._name,
+            'date_times': self._date_times.asi8.tolist(),
+            'tz': None if tz is None else str(tz),
+            'counts': counts,
+            'categories': (None if self._categories is None
+                           else self._categories.tolist()),
+            'sparse': self.is_sparse
+        }
+
+    @staticmethod
+    def from_state(state: Dict[str, Any]) -> 'TemporalCount':
+        """
+        Create a new Temporal Count from the dict returned by `to_state`.
+        """
+        date_times = DatetimeIndex(
+            asarray(state['date_times'], dtype='datetime64[ns]'))
+        if state['tz'] is not None:
+            date_times = date_times.tz_localize('UTC').tz_convert(state['tz'])
+        categories = state['categories']
+        if state.get('sparse', False):
+            rows, columns, values = state['counts']
+            counts = csr_matrix((values, (rows, columns)),
+                                shape=(len(date_times), len(categories)))
+        else:
+            counts = asarray(state['counts'])
+            if not len(counts):
+                counts = zeros((0, 1 if categories is None
+                                else len(categories)))
+        return TemporalCount(name=state['name'], date_times=date_times,
+                             counts=counts, categories=categories)
+
+    # end region
+
+    # region dict interface
+
+    def __getitem__(self, key) -> Union[int, float, Dict[Any, Any]]:
+
+        self._consolidate()
+        _, row = self._row(key)
+        if self._categories is None:
+            return self._counts[row, 0].item()
+        counts = _as_dense(self._counts[row]).ravel()
+        columns = flatnonzero(counts)
+        return dict(zip(self._categories[columns].tolist(),
+                        counts[columns].tolist()))
+
+    def __setitem__(self, key, value: Union[int, float, Dict[Any, Any]]):
+
+        _validate(key, value)
+        date_time = Timestamp(key)
+        self._pending[date_time] = value
+        self._keys[date_time] = key
+
+    def __delitem__(self, key):
+
+        self._consolidate()
+        date_time, row = self._row(key)
+        self._keys.pop(date_time, None)
+        self._date_times = self._date_times.delete(row)
+        self._counts = self._counts[
+            [r for r in range(self._counts.shape[0]) if r != row]]
+        self._frequency = None
+
+    def __iter__(self) -> Iterator[Any]:
+
+        self._consolidate()
+        if not self._keys:
+            return iter(self._date_times)
+        keys = self._keys
+        return (keys.get(date_time, date_time)
+                for date_time in self._date_times)
+
+    def __reversed__(self) -> Iterator[Any]:
+
+        return reversed(list(self))
+
+    def __len__(self) -> int:
+
+        self._consolidate()
+        return len(self._date_times)
+
+    def copy(self) -> 'TemporalCount':
+
+        self._consolidate()
+        return self._keyed(TemporalCount(
+            name=self._name, date_times=self._date_times,
+            counts=self._counts.copy(), categories=self._categories
+        ))
+
+    def __or__(self, other) -> 'TemporalCount':
+
+        count = self.copy()
+        count.update(other)
+        return count
+
+    def __ror__(self, other) -> dict:
+
+        merged = dict(other)
+        merged.update(self)
+        return merged
+
+    def __ior__(self, other) -> 'TemporalCount':
+
+        self.update(other)
+        return self
+
+    def __copy__(self) -> 'TemporalCount':
+
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict) -> 'TemporalCount':
+
+        return self.copy()
+
+    def _row(self, key) -> Tuple[Timestamp, int]:
+        """
+        Return the date-time of a key and its row in the arrays, raising a
+        KeyError if the key is not a date-time of the count.
+        """
+        try:
+            date_time = Timestamp(key)
+            return date_time, self._date_times.get_loc(date_time)
+        except (TypeError, ValueError):
+            raise KeyError(key)
+
+    def _keyed(self, count: 'TemporalCount',
+               *others: 'TemporalCount') -> 'TemporalCount':
+        """
+        Give a new count the keys that this count and the counts it was
+        created from were set with, and return it.
+        """
+        for other in others:
+            count._keys.update(other._keys)
+        count._keys.update(self._keys)
+        return count
+
+    def _consolidate(self) -> None:
+        """
+        Merge any items set since the arrays were last used into the arrays.
+        """
+        if self._pending:
+            pending = self._pending
+            self._pending = {}
+            self._merge(pending, self.is_sparse)
+
+    def _merge(self, dictionary: dict,
+               sparse: bool = False) -> DatetimeIndex:
+        """
+        Merge a dict of {date-time: count} or {date-time: {category: count}}
+        into the arrays, replacing the counts of existing date-times.
+        Split counts are built as a sparse matrix if sparse is True.
+
+        Return the date-time of each key of the dict, in the order of the
+        dict.
+        """
+        if not dictionary:
+            return DatetimeIndex([])
+        for key, value in dictionary.items():
+            _validate(key, value)
+        values = list(dictionary.values())
+        date_times = DatetimeIndex([Timestamp(key) for key in dictionary])
+        if isinstance(values[0], dict):
+            category_codes = {}
+            rows, columns, flat_counts = [], [], []
+            for row, value in enumerate(values):
+                for category, count in value.items():
+                    rows.append(row)
+                    columns.append(category_codes.setdefault(
+                        category, len(category_codes)))
+                    flat_counts.append(count)
+            flat_counts = asarray(flat_counts)
+            shape = (len(values), len(category_codes))
+            dtype = flat_counts.dtype if len(flat_counts) else int
+            if sparse:
+                counts = csr_matrix((flat_counts, (rows, columns)),
+                                    shape=shape, dtype=dtype)
             else:
-                sub_data = (other - self.to_series()).to_dict()
-            return TemporalCount.from_dict(sub_data,
-                                           name='{} - {}'.format(other,
-                                                                 self.name))
+                counts = zeros(shape, dtype=dtype)
+                counts[rows, columns] = flat_counts
+            categories = Index(list(category_codes.keys()))
         else:
-            raise TypeError(
-                'Can only subtract a TemporalCount from '
-                'another TemporalCount or a numeric value.'
+            counts = asarray(values).reshape(-1, 1)
+            categories = None
+        order = date_times.argsort()
+        self._merge_count(
+            TemporalCount(self._name, date_times[order], counts[order],
+                          categories),
+            replace=True
+        )
+        return date_times
+
+    def _merge_count(self, new: 'TemporalCount', replace: bool) -> None:
+        """
+        Merge the arrays of a consolidated count into the arrays, adding to or
+        replacing the counts of existing date-times.
+        """
+        if not len(new._date_times):
+            return
+        if not len(self._date_times):
+            date_times = new._date_times
+            counts = new._counts.copy()
+            categories = new._categories
+        else:
+            if (self._categories is None) != (new._categories is None):
+                raise ValueError(
+                    "Can't mix split and non-split counts in a TemporalCount.")
+            date_times = self._date_times.union(new._date_times)
+            categories = _union(self._categories, new._categories)
+            dtype = result_type(self._counts.dtype, new._counts.dtype)
+            counts = self._reindexed(date_times, categories, 0, dtype)
+            rows = date_times.get_indexer(new._date_times)
+            columns = asarray(_columns(categories, new._categories))
+            if self.is_sparse:
+                counts = counts.tocoo()
+                if replace:
+                    keep = ~isin(counts.row, rows)
+                    counts = coo_matrix(
+                        (counts.data[keep],
+                         (counts.row[keep], counts.col[keep])),
+                        shape=counts.shape
+                    )
+                added = coo_matrix(new._counts)
+                counts = counts.tocsr() + csr_matrix(
+                    (added.data, (rows[added.row], columns[added.col])),
+                    shape=counts.shape, dtype=dtype
+                )
+            else:
+                if replace:
+                    counts[rows] = 0
+                counts[ix_(rows, columns)] += _as_dense(new._counts)
+        self._date_times = date_times
+        self._counts = counts
+        self._categories = categories
+        self._frequency = None
+
+    def _reindexed(self, date_times: DatetimeIndex,
+                   categories: Optional[Index], fill: float,
+                   dtype=None) -> Union[ndarray, csr_matrix]:
+        """
+        Return the counts reindexed to date-times and categories that include
+        those of this count, filling new cells with the fill value, which is 0
+        for sparse counts.
+        """
+        if issparse(self._counts):
+            coo = self._counts.tocoo()
+            return csr_matrix(
+                (coo.data,
+                 (date_times.get_indexer(self._date_times)[coo.row],
+                  asarray(_columns(categories, self._categories))[coo.col])),
+                shape=(len(date_times), len(categories)),
+                dtype=coo.dtype if dtype is None else dtype
             )
+        if dtype is None:
+            dtype = (self._counts.dtype if fill == 0
+                     else result_type(self._counts.dtype, float))
+        counts = full((len(date_times),
+                       1 if categories is None else len(categories)),
+                      fill, dtype=dtype)
+        counts[ix_(date_times.get_indexer(self._date_times),
+                   _columns(categories, self._categories))] = self._counts
+        return counts
+
+    # end region
+
+    def __repr__(self) -> str:
+
+        return repr(dict(self.items()))
+
+
+def _validate(key, value) -> None:
+    """
+    Raise a KeyError if a key or the key of a split value is None.
+    """
+    if key is None:
+        raise KeyError('Keys cannot be None')
+    if isinstance(value, dict) and None in value.keys():
+        raise KeyError('Keys of a split count cannot be None')
+
+
+def _as_dense(counts: Union[ndarray, csr_matrix]) -> ndarray:
+    """
+    Return a dense array of dense or sparse counts.
+    """
+    return counts.toarray() if issparse(counts) else counts
+
+
+def _union(first: Optional[Index],
+           second: Optional[Index]) -> Optional[Index]:
+    """
+    Return the categories of the first count followed by any new categories
+    of the second.
+    """
+    if first is None or second is None:
+        return None
+    if first is second or first.equals(second):
+        return first
+    return first.append(second.difference(first, sort=False))
+
+
+def _columns(categories: Optional[Index],
+             count_categories: Optional[Index]) -> List[int]:
+    """
+    Return the column of each of a count's categories in the categories.
+    """
+    if categories is None:
+        return [0]
+    return categories.get_indexer(count_categories)
+
+
+def _align(
+        left: TemporalCount, right: TemporalCount
+) -> Tuple[DatetimeIndex, Optional[Index], ndarray, ndarray]:
+    """
+    Return the union of the date-times and categories of two counts and the
+    counts of each reindexed to them.
+    """
+    same_date_times = (left._date_times is right._date_times or
+                       left._date_times.equals(right._date_times))
+    categories = _union(left._categories, right._categories)
+    same_categories = (categories is None or (
+        categories is left._categories and
+        (right._categories is categories or
+         right._categories.equals(categories))
+    ))
+    if same_date_times and same_categories:
+        return (left._date_times, categories,
+                left._counts, right._counts)
+    date_times = (left._date_times if same_date_times
+                  else left._date_times.union(right._date_times))
+    fill = nan if categories is None else 0
+    return (date_times, categories,
+            left._reindexed(date_times, categories, fill),
+            right._reindexed(date_times, categories, fill))
+
+
+def _valid(counts: ndarray) -> Tuple[ndarray, ndarray]:
+    """
+    Return the counts with NaN replaced by 0, and a 0/1 array of whether each
+    count is not NaN.
+    """
+    is_nan = isnan(counts)
+    return where(is_nan, 0, counts), (~is_nan).astype(int)
+
+
+def _window_sums(values: ndarray, starts: ndarray, stops: ndarray) -> ndarray:
+    """
+    Return the sums of the rows from each start to each stop, from the
+    differences of a cumulative sum.
+    """
+    totals = concatenate([zeros((1, values.shape[1]), dtype=values.dtype),
+                          cumsum(values, axis=0)])
+    return totals[stops] - totals[starts]
@@ -0,0 +1,203 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from pandas import date_range
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import BaseOffset
+
+from ux.counts.count_config import CountConfig
+from ux.counts.count_evaluator import CountEvaluator
+from ux.counts.space_saving import SpaceSaving
+from ux.counts.temporal_count import TemporalCount
+from ux.sequences.action_sequence import ActionSequence
+from ux.sequences.sequences import Sequences
+from ux.utils.time_buckets import TimeBuckets
+
+
+class TemporalCounter(object):
+    """
+    Maintains a TemporalCount for each of a list of CountConfigs over an
+    append-only stream of ActionSequences, e.g. the sessions of the last hour,
+    evaluating the configs only over the time buckets of each new batch.
+
+    Sequences are bucketed by the time of their first action, as in
+    `temporal_counts_by_config` with a frequency string, and the state of the
+    counts can be saved with `to_state` between runs of a job.
+
+    Split counts can be stored sparsely, and the number of categories of each
+    split count can be bounded by keeping only the heavy hitters found by a
+    SpaceSaving sketch of the category totals, with the counts of all other
+    categories added to a single other category.
+    """
+    def __init__(self, configs: List[CountConfig],
+                 freq: Union[str, BaseOffset] = 'D',
+                 counts: Optional[Dict[str, TemporalCount]] = None,
+                 sparse: bool = False,
+                 max_categories: Optional[int] = None,
+                 other: Any = '#OTHER#'):
+        """
+        Create a new TemporalCounter.
+
+        :param configs: The CountConfigs to count.
+        :param freq: pandas frequency string or offset of the time buckets,
+                     e.g. 'H' or 'D'.
+        :param counts: Optional existing counts of each config to update.
+        :param sparse: Whether to store split counts in sparse matrices.
+        :param max_categories: Optional maximum number of categories to keep
+                               in each split count.
+        :param other: The category to add the counts of categories that are
+                      not kept to.
+        """
+        self._configs: List[CountConfig] = list(configs)
+        self._evaluator: CountEvaluator = CountEvaluator(self._configs)
+        self._offset: BaseOffset = to_offset(freq)
+        if counts is None:
+            counts = {}
+        self._counts: Dict[str, TemporalCount] = {
+            config.name: counts.get(config.name, TemporalCount(config.name))
+            for config in self._configs
+        }
+        self._sparse: bool = sparse
+        self._max_categories: Optional[int] = max_categories
+        self._other: Any = other
+        self._sketches: Dict[str, SpaceSaving] = {}
+
+    @property
+    def freq(self) -> str:
+
+        return self._offset.freqstr
+
+    @property
+    def counts(self) -> Dict[str, TemporalCount]:
+        """
+        Return the TemporalCount of each config, by config name.
+        """
+        return self._counts
+
+    @property
+    def sketches(self) -> Dict[str, SpaceSaving]:
+        """
+        Return the SpaceSaving sketch of the category totals of each split
+        config, by config name, if the number of categories is bounded.
+        """
+        return self._sketches
+
+    def update(self, sequences: Union[Sequences, Iterable[ActionSequence]],
+               replace: bool = False) -> 'TemporalCounter':
+        """
+        Count a batch of sequences and merge the counts of their time buckets
+        into the counts of each config.
+
+        Buckets between the last counted bucket and the first bucket of the
+        batch are counted as 0, so the counts match those of counting all the
+        sequences at once.
+
+        :param sequences: Sequences collection or iterable of ActionSequences
+                          that have not been counted before.
+        :param replace: Whether to replace the counts of the buckets of the
+                        batch instead of adding to them, for recounting all
+                        the sequences in the buckets, e.g. the last day. The
+                        sketches of bounded split counts count the batch
+                        again.
+        :return: The TemporalCounter, for chaining.
+        """
+        if not isinstance(sequences, Sequences):
+            sequences = Sequences(list(sequences))
+        if not len(sequences):
+            return self
+        buckets = TimeBuckets(sequences.start_times(), freq=self._offset)
+        labels = buckets.labels
+        bucket_sequences = [
+            [sequences[p] for p in positions.tolist()]
+            for _, positions in buckets.items()
+        ]
+        counts = self._evaluator.evaluate(bucket_sequences)
+        # count empty buckets since the last update
+        last = max([count.date_times[-1] for count in self._counts.values()
+                    if len(count)], default=None)
+        if last is not None and labels[0] > last + self._offset:
+            gap = date_range(last + self._offset, labels[0],
+                             freq=self._offset, inclusive='left')
+            labels = gap.append(labels)
+            counts = {
+                name: ([{} if isinstance(config_counts[0], dict) else 0] *
+                       len(gap) + config_counts)
+                for name, config_counts in counts.items()
+            }
+        for name, config_counts in counts.items():
+            is_split = isinstance(config_counts[0], dict)
+            count = self._counts[name]
+            count.merge(
+                TemporalCount.from_dict(dict(zip(labels, config_counts)),
+                                        name=name,
+                                        sparse=self._sparse and is_split),
+                replace=replace
+            )
+            if is_split and self._max_categories is not None:
+                self._counts[name] = self._bound_categories(
+                    name, count, config_counts)
+        return self
+
+    def _bound_categories(
+            self, name: str, count: TemporalCount,
+            bucket_counts: List[Dict[Any, int]]
+    ) -> TemporalCount:
+        """
+        Add the category totals of a batch to the sketch of a split config and
+        return its count with only the categories monitored by the sketch and
+        the other category.
+        """
+        totals = Counter()
+        for bucket_count in bucket_counts:
+            totals.update(bucket_count)
+        sketch = self._sketches.get(name)
+        if sketch is None:
+            sketch = self._sketches[name] = SpaceSaving(self._max_categories)
+        sketch.update(totals)
+        return count.select(list(sketch.counts()), other=self._other)
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Return a JSON-serializable dict of the frequency and the state of the
+        count of each config, to restore the counter with `from_state`.
+        """
+        return {
+            'freq': self.freq,
+            'counts': {name: count.to_state()
+                       for name, count in self._counts.items()},
+            'sparse': self._sparse,
+            'max_categories': self._max_categories,
+            'other': self._other,
+            'sketches': {name: sketch.to_state()
+                         for name, sketch in self._sketches.items()}
+        }
+
+    @staticmethod
+    def from_state(configs: List[CountConfig],
+                   state: Dict[str, Any]) -> 'TemporalCounter':
+        """
+        Create a new TemporalCounter from a list of CountConfigs and the dict
+        returned by `to_state`.
+
+        :param configs: The CountConfigs to count. Configs that are not in the
+                        state start with empty counts.
+        :param state: The state of a TemporalCounter.
+        """
+        counter = TemporalCounter(
+            configs=configs, freq=state['freq'],
+            counts={name: TemporalCount.from_state(count_state)
+                    for name, count_state in state['counts'].items()},
+            sparse=state.get('sparse', False),
+            max_categories=state.get('max_categories'),
+            other=state.get('other', '#OTHER#')
+        )
+        counter._sketches = {
+            name: SpaceSaving.from_state(sketch_state)
+            for name, sketch_state in state.get('sketches', {}).items()
+        }
+        return counter
+
+    def __repr__(self) -> str:
+
+        return 'TemporalCounter({} configs, freq={})'.format(
+            len(self._configs), self.freq)
@@ -1,11 +1,14 @@
 from abc import ABC
-from typing import List
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
 
 from ux.sequences.action_sequence import ActionSequence
+from ux.sequences.sequences import Sequences
 from ux.location import Location
 from ux.session import Session
 from ux.user import User
 from ux.actions.user_action import UserAction
+from ux.utils.prefetch import prefetch
 
 
 class DatabaseManager(ABC):
@@ -24,6 +27,56 @@ class DatabaseManager(ABC):
         """
         raise NotImplementedError
 
+    def iter_sessions(self, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None,
+                      batch_size: int = 1000) -> Iterator[List[Session]]:
+        """
+        Yield batches of the Sessions in the database, optionally only those
+        starting between start and end.
+
+        The default implementation filters the list returned by `sessions`.
+        Backends should override it to page through their storage so that
+        only one batch is held in memory at a time.
+
+        :param start: Optional start date-time to exclude older sessions.
+        :param end: Optional end date-time to exclude newer sessions.
+        :param batch_size: Maximum number of Sessions in each batch.
+        """
+        batch = []
+        for session in self.sessions():
+            session_start = session.start_time
+            if (start and session_start < start) or (
+                    end and session_start > end):
+                continue
+            batch.append(session)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def iter_session_sequences(
+            self, start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            batch_size: int = 1000
+    ) -> Iterator[Sequences]:
+        """
+        Yield a Sequences of the ActionSequence of each Session in each batch
+        returned by `iter_sessions`.
+
+        :param start: Optional start date-time to exclude older sessions.
+        :param end: Optional end date-time to exclude newer sessions.
+        :param batch_size: Maximum number of ActionSequences in each batch.
+        """
+        session_ids = (
+            session.session_id
+            for sessions in self.iter_sessions(start=start, end=end,
+                                               batch_size=batch_size)
+            for session in sessions
+        )
+        for batch in self._iter_sequence_batches(session_ids, batch_size):
+            yield Sequences(batch)
+
     def user(self, user_id: str) -> User:
 
         raise NotImplementedError
@@ -34,6 +87,19 @@ class DatabaseManager(ABC):
         """
         raise NotImplementedError
 
+    def iter_users(self, batch_size: int = 1000) -> Iterator[List[User]]:
+        """
+        Yield batches of the Users in the database.
+
+        The default implementation batches the list returned by `users`.
+        Backends should override it to page through their storage.
+
+        :param batch_size: Maximum number of Users in each batch.
+        """
+        users = self.users()
+        for first in range(0, len(users), batch_size):
+            yield users[first: first + batch_size]
+
     def user_action(self, action_id: str) -> UserAction:
         """
         Return the UserAction with the given id.
@@ -71,3 +137,51 @@ class DatabaseManager(ABC):
         with the given id.
         """
         raise NotImplementedError
+
+    def get_session_sequence_batch(
+            self, session_ids: List[str]
+    ) -> List[ActionSequence]:
+        """
+        Return the ActionSequence of each Session in a batch of session ids,
+        in the same order.
+
+        The default implementation calls `get_session_sequence` for each id.
+        Backends should override it to fetch the batch in one query.
+        """
+        return [self.get_session_sequence(session_id=session_id)
+                for session_id in session_ids]
+
+    def get_session_sequences(
+            self, session_ids: Iterable[str], batch_size: int = 1000,
+            prefetch_batches: bool = False
+    ) -> Iterator[ActionSequence]:
+        """
+        Yield the ActionSequence of each Session with the given ids, fetching
+        them in batches with `get_session_sequence_batch`.
+
+        :param session_ids: The ids of the Sessions, which can be a lazy
+                            iterable.
+        :param batch_size: Number of sequences to fetch at a time.
+        :param prefetch_batches: Whether to fetch the next batch in a
+                                 background thread while the current batch is
+                                 processed. Only use with backends that can be
+                                 queried from another thread.
+        """
+        batches = self._iter_sequence_batches(session_ids, batch_size)
+        if prefetch_batches:
+            batches = prefetch(batches)
+        for batch in batches:
+            yield from batch
+
+    def _iter_sequence_batches(
+            self, session_ids: Iterable[str], batch_size: int
+    ) -> Iterator[List[ActionSequence]]:
+
+        batch_ids = []
+        for session_id in session_ids:
+            batch_ids.append(session_id)
+            if len(batch_ids) == batch_size:
+                yield self.get_session_sequence_batch(batch_ids)
+                batch_ids = []
+        if batch_ids:
+            yield self.get_session_sequence_batch(batch_ids)
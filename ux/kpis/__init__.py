@@ -1,2 +1,3 @@
 from ux.kpis.kpi import KPI
 from ux.kpis.kpi_config import KPIConfig
+from ux.kpis.kpi_engine import KPIEngine
@@ -0,0 +1,176 @@
+from itertools import product
+from typing import Dict, List, Optional, Tuple, Union
+
+from numpy import arange, array, ndarray, packbits, uint8, unpackbits
+
+from ux.kpis.kpi import KPI
+from ux.kpis.kpi_config import KPIConfig
+from ux.sequences.action_sequence import SequenceFilter, SequenceFilterSet
+from ux.sequences.predicates import SequencePredicate
+from ux.sequences.sequences import Sequences
+
+# number of set bits in each byte value
+_POPCOUNT: ndarray = unpackbits(
+    arange(256, dtype=uint8)[:, None], axis=1
+).sum(axis=1).astype(uint8)
+
+FilterCombination = Tuple[Optional[str], ...]
+
+
+class KPIEngine(object):
+    """
+    Calculates KPIs for combinations of sequence filters by evaluating each
+    filter and condition once per sequence into a packed bitmask, then
+    counting the sequences matching each combination with bitwise AND and a
+    popcount.
+
+    The bitmask of each combination of filters is derived from a cached
+    combination with one filter fewer, so combinations that share filters
+    share the work.
+    """
+    def __init__(self, sequences: Sequences,
+                 filter_sets: Dict[str, SequenceFilterSet]):
+        """
+        Create a new KPIEngine.
+
+        :param sequences: The population of sequences to calculate KPIs for.
+        :param filter_sets: Dictionary mapping names of filter-sets to
+                            dictionaries of filter names to filter functions.
+        """
+        self._sequences: Sequences = sequences
+        self._filter_sets: Dict[str, SequenceFilterSet] = filter_sets
+        self._filter_set_names: List[str] = sorted(filter_sets.keys())
+        self._filter_bits: Dict[Tuple[int, str], ndarray] = {}
+        self._condition_bits: List[Tuple[SequenceFilter, ndarray]] = []
+        self._combination_bits: Dict[FilterCombination, ndarray] = {
+            (None,) * len(self._filter_set_names): packbits(
+                array([True] * len(sequences), dtype=bool)
+            )
+        }
+
+    @property
+    def filter_set_names(self) -> List[str]:
+        """
+        Return the names of the filter-sets, in the order of the filter names
+        in each FilterCombination.
+        """
+        return self._filter_set_names
+
+    def count(self, combination: FilterCombination,
+              condition: Optional[Union[SequenceFilter,
+                                        SequencePredicate]] = None) -> int:
+        """
+        Return the number of sequences matching a combination of filters and
+        an optional condition.
+
+        :param combination: The name of the filter to apply from each
+                            filter-set, or None to not filter by the set.
+        :param condition: Optional condition the sequences must also match.
+        """
+        bits = self._bits(tuple(combination))
+        if condition is not None and condition is not True:
+            bits = bits & self._condition(condition)
+        return int(_POPCOUNT[bits].sum(dtype='int64'))
+
+    def calculate(self, kpi_configs: List[KPIConfig]) -> List[KPI]:
+        """
+        Calculate KPIs for each KPIConfig for each combination of the filters
+        in its numerator sets, divided by the count for the matching filters
+        of its denominator sets.
+
+        Denominator sets must be a subset of numerator sets for a config to
+        produce any KPIs.
+        """
+        names = self._filter_set_names
+        results = []
+        for kpi_config in kpi_configs:
+            if any(split_name in self._filter_sets and
+                   split_name not in kpi_config.numerator_sets
+                   for split_name in kpi_config.denominator_sets):
+                continue
+            for numer_filter_names in product(*[
+                [None] if split_name not in kpi_config.numerator_sets
+                else sorted(self._filter_sets[split_name].keys())
+                for split_name in names
+            ]):
+                denom_filter_names = tuple(
+                    filter_name if split_name in kpi_config.denominator_sets
+                    else None
+                    for split_name, filter_name in zip(
+                        names, numer_filter_names
+                    )
+                )
+                results.append(KPI(
+                    name=kpi_config.name,
+                    numerator=self.count(numer_filter_names,
+                                         kpi_config.condition),
+                    denominator=self.count(denom_filter_names),
+                    numer_config=self._config(numer_filter_names),
+                    denom_config=self._config(denom_filter_names)
+                ))
+        return results
+
+    def _bits(self, combination: FilterCombination) -> ndarray:
+        """
+        Return the packed bitmask of the sequences matching a combination of
+        filters, ANDing the last filter onto the cached bitmask of the rest.
+        """
+        bits = self._combination_bits.get(combination)
+        if bits is None:
+            last = max(s for s, filter_name in enumerate(combination)
+                       if filter_name is not None)
+            bits = (
+                self._bits(combination[: last] + (None,) +
+                           combination[last + 1:]) &
+                self._filter(last, combination[last])
+            )
+            self._combination_bits[combination] = bits
+        return bits
+
+    def _filter(self, set_index: int, filter_name: str) -> ndarray:
+
+        key = (set_index, filter_name)
+        if key not in self._filter_bits:
+            filter_set = self._filter_sets[self._filter_set_names[set_index]]
+            self._filter_bits[key] = self._evaluate(filter_set[filter_name])
+        return self._filter_bits[key]
+
+    def _condition(
+            self, condition: Union[SequenceFilter, SequencePredicate]
+    ) -> ndarray:
+
+        for existing, bits in self._condition_bits:
+            if existing is condition:
+                return bits
+        bits = self._evaluate(condition)
+        self._condition_bits.append((condition, bits))
+        return bits
+
+    def _evaluate(
+            self, condition: Union[SequenceFilter, SequencePredicate]
+    ) -> ndarray:
+        """
+        Evaluate a condition for every sequence into a packed bitmask.
+        """
+        if isinstance(condition, SequencePredicate):
+            mask = condition.mask(self._sequences)
+        else:
+            mask = array([bool(condition(sequence))
+                          for sequence in self._sequences], dtype=bool)
+        return packbits(mask)
+
+    def _config(self, combination: FilterCombination) -> Dict[str, str]:
+
+        return {
+            filter_set_name: filter_name
+            for filter_set_name, filter_name in zip(
+                self._filter_set_names, combination
+            )
+            if filter_name is not None
+        }
+
+    def __repr__(self) -> str:
+
+        return 'KPIEngine({} sequences, {} filter sets)'.format(
+            len(self._sequences), len(self._filter_set_names)
+        )
@@ -2,6 +2,8 @@ class Location(object):
     """
     Represents a Location where an Action could be taken.
     """
+    __slots__ = ('_location_id',)
+
     def __init__(self, location_id: str):
         """
         Create a new Location.
@@ -8,7 +8,9 @@ from ux.utils.versioning import find_location_history, find_action_type_history
 
 def plot_history(manager: DatabaseManager,
                  start: datetime = None, end: datetime = None,
-                 history_type: str = 'location', ax: Axes = None) -> Axes:
+                 history_type: str = 'location', ax: Axes = None,
+                 batch_size: int = 1000,
+                 prefetch_batches: bool = False) -> Axes:
     """
     Plot the history of each Location's appearance in the set of logs in Manager.
 
@@ -17,6 +19,10 @@ def plot_history(manager: DatabaseManager,
     :param end: Optional end date-time to exclude newer sessions.
     :param history_type: Type of history to plot. One of ['location', 'action-type'].
     :param ax: Optional matplotlib axes to plot on.
+    :param batch_size: Number of sessions to read from the manager at a time.
+    :param prefetch_batches: Whether to read the next batch of sessions in a
+                             background thread while the current batch is
+                             processed.
     """
     ax = ax or new_axes()
     if history_type == 'location':
@@ -25,7 +31,9 @@ def plot_history(manager: DatabaseManager,
         find_history = find_action_type_history
     else:
         raise ValueError("history_type must be 'location' or 'action-type'")
-    history = find_history(manager=manager, start=start, end=end)
+    history = find_history(manager=manager, start=start, end=end,
+                           batch_size=batch_size,
+                           prefetch_batches=prefetch_batches)
     locations = list(history.keys())
     # sort locations by first session
     locations = sorted(locations, key=lambda loc: history[loc][0])
@@ -1,3 +1,6 @@
 from ux.sequences.action_sequence import ActionSequence
+from ux.sequences.action_store import ActionStore
 from ux.sequences.sequences import Sequences
 from ux.sequences.sequences_group_by import SequencesGroupBy
+from ux.sequences.sessionizer import Sessionizer
+from ux.sequences.streaming_sequences import StreamingSequences
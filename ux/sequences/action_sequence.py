@@ -2,16 +2,20 @@ from collections import defaultdict, OrderedDict, Counter
 from datetime import datetime, timedelta
 from types import FunctionType
 from typing import List, Callable, Set, Union, Iterator, Dict, Optional, \
-    overload, Any
+    overload, Any, Tuple, TYPE_CHECKING
 
 from pandas import notnull
 
-from ux.actions.action_template import ActionTemplate
+from ux.actions.action_template import ActionTemplate, intern_template
 from ux.actions.user_action import UserAction, ActionCounter, ActionFilter, \
     ActionMapper
+from ux.sequences.template_matcher import TemplateMatcher
 from ux.utils.misc import get_method_name
 from ux.wrappers.map_result import MapResult
 
+if TYPE_CHECKING:
+    from ux.sequences.action_store import ActionStore
+
 
 class ActionSequence(object):
     """
@@ -26,18 +30,59 @@ class ActionSequence(object):
                              ActionSequence.
         :param meta: Optional additional data to store with the ActionSequence.
         """
-        self._user_actions: List[UserAction] = user_actions or []
+        self._user_actions: Optional[List[UserAction]] = user_actions or []
         self._meta: Optional[dict] = meta
         self._action_templates: Optional[List[ActionTemplate]] = None
         self._location_ids: Optional[List[str]] = None
+        self._store: Optional['ActionStore'] = None
+        self._start: int = 0
+        self._stop: int = 0
+
+    @staticmethod
+    def from_store(store: 'ActionStore', start: int, stop: int,
+                   meta: Optional[dict] = None) -> 'ActionSequence':
+        """
+        Create a new ActionSequence as a view onto a range of rows of an
+        ActionStore. UserActions are only created if they are accessed.
+
+        :param store: The ActionStore holding the actions.
+        :param start: The first row of the sequence in the store.
+        :param stop: The row after the last row of the sequence in the store.
+        :param meta: Optional additional data to store with the ActionSequence.
+        """
+        sequence = ActionSequence(meta=meta)
+        sequence._user_actions = None
+        sequence._store = store
+        sequence._start = start
+        sequence._stop = stop
+        return sequence
 
     @property
     def user_actions(self) -> List[UserAction]:
         """
         Return the list of UserActions in the ActionSequence.
         """
+        if self._user_actions is None:
+            self._user_actions = self._store.user_actions(
+                self._start, self._stop
+            )
         return self._user_actions
 
+    @property
+    def store(self) -> Optional['ActionStore']:
+        """
+        Return the ActionStore the sequence is a view onto, or None if the
+        sequence holds its own list of UserActions.
+        """
+        return self._store
+
+    @property
+    def store_offsets(self) -> Tuple[int, int]:
+        """
+        Return the start and stop rows of the sequence in its ActionStore.
+        """
+        return self._start, self._stop
+
     @property
     def meta(self) -> dict:
         """
@@ -48,12 +93,12 @@ class ActionSequence(object):
     @property
     def start(self) -> datetime:
 
-        return self[0].time_stamp
+        return self._first_value('time_stamp')
 
     @property
     def end(self) -> datetime:
 
-        return self[-1].time_stamp
+        return self._last_value('time_stamp')
 
     @property
     def duration(self) -> timedelta:
@@ -61,41 +106,41 @@ class ActionSequence(object):
         Return the total duration of the ActionSequence from the first Action to
         the last.
         """
-        start_time = self[0].time_stamp
-        end_time = self[-1].time_stamp
+        start_time = self._first_value('time_stamp')
+        end_time = self._last_value('time_stamp')
         return end_time - start_time
 
     @property
     def user_id(self) -> str:
 
-        return self[0].user_id
+        return self._first_value('user_id')
 
     @property
     def session_id(self) -> str:
 
-        return self[0].session_id
+        return self._first_value('session_id')
 
     # region action property lists
 
     @property
     def source_ids(self) -> List[str]:
-        return [action.source_id for action in self]
+        return self._values('source_id')
 
     @property
     def target_ids(self) -> List[Optional[str]]:
-        return [action.target_id for action in self]
+        return self._values('target_id')
 
     @property
     def action_types(self) -> List[str]:
-        return [action.action_type for action in self]
+        return self._values('action_type')
 
     @property
     def time_stamps(self) -> List[datetime]:
-        return [action.time_stamp for action in self]
+        return self._values('time_stamp')
 
     @property
     def metas(self) -> List[dict]:
-        return [action.meta for action in self]
+        return self._values('meta')
 
     # end region
 
@@ -105,10 +150,19 @@ class ActionSequence(object):
         taken.
         """
         if self._action_templates is None:
-            self._action_templates = [
-                user_action.template()
-                for user_action in self._user_actions
-            ]
+            if self._store is not None:
+                self._action_templates = [
+                    intern_template(*key) for key in zip(
+                        self._values('action_type'),
+                        self._values('source_id'),
+                        self._values('target_id')
+                    )
+                ]
+            else:
+                self._action_templates = [
+                    user_action.template()
+                    for user_action in self.user_actions
+                ]
         return self._action_templates
 
     def action_template_set(self) -> Set[ActionTemplate]:
@@ -154,9 +208,9 @@ class ActionSequence(object):
             return len(self)
         action_count = 0
         if isinstance(condition, ActionTemplate):
-            return len(self.find_all(condition))
+            return len(TemplateMatcher([condition]).match_sequence(self)[0])
         elif isinstance(condition, FunctionType):
-            for action in self._user_actions:
+            for action in self:
                 if condition(action):
                     action_count += 1
             return action_count
@@ -195,7 +249,9 @@ class ActionSequence(object):
 
         :param template: The ActionTemplate to match against.
         """
-        return [action for action in self if action.template() == template]
+        actions, _ = TemplateMatcher([template]).match_sequence(self)
+        user_actions = self.user_actions
+        return [user_actions[a] for a in actions.tolist()]
 
     def find_first(self, template: ActionTemplate) -> Optional[UserAction]:
         """
@@ -239,7 +295,7 @@ class ActionSequence(object):
                         # properties
                         return [getattr(action, item_mapper) for action in self]
             elif isinstance(item_mapper, FunctionType):
-                return [item_mapper(action) for action in self._user_actions]
+                return [item_mapper(action) for action in self]
             else:
                 raise TypeError('item mappers must be FunctionType or str')
 
@@ -310,10 +366,10 @@ class ActionSequence(object):
             raise ValueError(
                 "'how' must be set to one of ['before', 'after', 'at']")
 
-        return [ActionSequence(
-            user_actions=self[start: end],
-            meta=self._meta if copy_meta else None
-        ) for start, end in zip(seq_starts, seq_ends)]
+        return [
+            self._sub_sequence(start, end, self._meta if copy_meta else None)
+            for start, end in zip(seq_starts, seq_ends)
+        ]
 
     def crop(
             self, start, end, how: str, copy_meta: bool = False
@@ -356,9 +412,8 @@ class ActionSequence(object):
         if None in (a_start, a_end):
             return None
         else:
-            return ActionSequence(
-                user_actions=self.user_actions[a_start: a_end + 1],
-                meta=self._meta if copy_meta else None
+            return self._sub_sequence(
+                a_start, a_end + 1, self._meta if copy_meta else None
             )
 
     def location_ids(self) -> Set[str]:
@@ -367,10 +422,14 @@ class ActionSequence(object):
         """
         if self._location_ids is None:
             location_ids = set()
-            for action in self._user_actions:
-                location_ids.add(action.source_id)
-                if action.target_id:
-                    location_ids.add(action.target_id)
+            if self._store is not None:
+                location_ids.update(self.source_ids)
+                location_ids.update(filter(None, self.target_ids))
+            else:
+                for action in self._user_actions:
+                    location_ids.add(action.source_id)
+                    if action.target_id:
+                        location_ids.add(action.target_id)
             self._location_ids = location_ids
         return self._location_ids
 
@@ -384,7 +443,7 @@ class ActionSequence(object):
         """
         Return a set of the unique action types carried out in the sequence.
         """
-        return set([action.action_type for action in self])
+        return set(self.action_types)
 
     def back_click_rates(self) -> Dict[ActionTemplate, float]:
 
@@ -444,30 +503,74 @@ class ActionSequence(object):
 
     def __getitem__(self, value):
 
-        return self._user_actions[value]
+        return self.user_actions[value]
 
     def __repr__(self) -> str:
 
-        return 'ActionSequence([{}])'.format(
-            len(self._user_actions)
-        )
+        return 'ActionSequence([{}])'.format(len(self))
 
     def __len__(self) -> int:
 
+        if self._store is not None:
+            return self._stop - self._start
         return len(self._user_actions)
 
     def __contains__(self, item) -> bool:
 
         if isinstance(item, UserAction):
-            return item in self._user_actions
+            return item in self.user_actions
         elif isinstance(item, ActionTemplate):
-            return item in self.action_templates()
+            return TemplateMatcher([item]).matches_any(self)
         else:
             raise TypeError('item must be UserAction or IActionTemplate')
 
     def __iter__(self) -> Iterator[UserAction]:
 
-        return self._user_actions.__iter__()
+        return self.user_actions.__iter__()
+
+    def _values(self, attribute: str) -> list:
+        """
+        Return the value of a UserAction attribute for each action, decoding
+        from the ActionStore if the sequence is a view onto one.
+        """
+        if self._store is not None:
+            return self._store.decode(attribute, self._start, self._stop)
+        return [getattr(action, attribute) for action in self]
+
+    def _first_value(self, attribute: str):
+
+        if self._store is not None:
+            self._check_not_empty()
+            return self._store.value(attribute, self._start)
+        return getattr(self[0], attribute)
+
+    def _last_value(self, attribute: str):
+
+        if self._store is not None:
+            self._check_not_empty()
+            return self._store.value(attribute, self._stop - 1)
+        return getattr(self[-1], attribute)
+
+    def _check_not_empty(self) -> None:
+        """
+        Raise an IndexError for an empty view, whose start row belongs to
+        another sequence, as indexing an empty list of actions does.
+        """
+        if self._start == self._stop:
+            raise IndexError('ActionSequence has no actions')
+
+    def _sub_sequence(self, start: int, stop: int,
+                      meta: Optional[dict]) -> 'ActionSequence':
+        """
+        Return a new ActionSequence of the actions from start to stop, as a
+        view onto the same ActionStore if the sequence is backed by one.
+        """
+        if self._store is not None:
+            return ActionSequence.from_store(
+                store=self._store, start=self._start + start,
+                stop=self._start + stop, meta=meta
+            )
+        return ActionSequence(user_actions=self[start: stop], meta=meta)
 
 
 def _create_action_template_condition(
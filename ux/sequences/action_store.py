@@ -0,0 +1,490 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING, Tuple
+
+from numpy import append, arange, asarray, concatenate, cumsum, empty, \
+    full, int32, int64, ndarray, zeros
+from pandas import DatetimeIndex, Timestamp, factorize, to_datetime
+
+from ux.actions.user_action import UserAction
+
+if TYPE_CHECKING:
+    from ux.sequences.action_sequence import ActionSequence
+
+
+# map each categorical column to the name of its category vocabulary.
+# source and target ids share a vocabulary so that codes identify locations.
+CATEGORICAL_COLUMNS: Dict[str, str] = {
+    'action_type': 'action_type',
+    'source_id': 'location',
+    'target_id': 'location',
+    'user_id': 'user_id',
+    'session_id': 'session_id'
+}
+
+
+def encode_categories(values: Iterable) -> Tuple[ndarray, ndarray]:
+    """
+    Encode a sequence of values as integer codes into an array of unique
+    categories. Missing values are encoded as -1.
+
+    :param values: The values to encode.
+    :return: Tuple of (codes, categories)
+    """
+    values = asarray(values, dtype=object)
+    if not len(values):
+        return zeros(0, dtype=int32), empty(0, dtype=object)
+    codes, categories = factorize(values)
+    return codes.astype(int32), asarray(categories, dtype=object)
+
+
+class ActionStore(object):
+    """
+    Columnar store of the UserActions in a collection of ActionSequences.
+
+    Categorical attributes are held as integer codes into arrays of unique
+    values, and time stamps as a single datetime64 array. Each ActionSequence
+    backed by the store is a view onto a contiguous range of its rows.
+    """
+    def __init__(self,
+                 codes: Dict[str, ndarray],
+                 categories: Dict[str, ndarray],
+                 time_stamps: ndarray,
+                 offsets: ndarray,
+                 action_ids: Optional[ndarray] = None,
+                 metas: Optional[ndarray] = None,
+                 tz=None):
+        """
+        Create a new ActionStore from already encoded columns.
+
+        :param codes: Dict mapping each categorical column name to an array of
+                      integer codes.
+        :param categories: Dict mapping each vocabulary name to an array of
+                           its unique values.
+        :param time_stamps: datetime64[ns] array of action time stamps (UTC if
+                            `tz` is given).
+        :param offsets: Array of length n_sequences + 1 giving the first row of
+                        each sequence and the total number of rows.
+        :param action_ids: Optional array of action ids.
+        :param metas: Optional array of action meta dicts.
+        :param tz: Optional timezone to localize decoded time stamps into.
+        """
+        self._codes: Dict[str, ndarray] = codes
+        self._categories: Dict[str, ndarray] = categories
+        self._time_stamps: ndarray = time_stamps
+        self._offsets: ndarray = asarray(offsets, dtype=int64)
+        self._action_ids: Optional[ndarray] = action_ids
+        self._metas: Optional[ndarray] = metas
+        self._tz = tz
+        self._lookups: Dict[str, Dict[object, int]] = {}
+        self._decoders: Dict[str, ndarray] = {}
+
+    @staticmethod
+    def from_arrays(action_types: Iterable[str],
+                    source_ids: Iterable[str],
+                    target_ids: Iterable[Optional[str]],
+                    user_ids: Iterable[str],
+                    session_ids: Iterable[str],
+                    time_stamps: Iterable[datetime],
+                    lengths: Iterable[int],
+                    action_ids: Optional[Iterable[str]] = None,
+                    metas: Optional[Iterable[dict]] = None) -> 'ActionStore':
+        """
+        Create a new ActionStore from one array or list per action attribute.
+
+        :param action_types: The type of each action.
+        :param source_ids: The source location id of each action.
+        :param target_ids: The target location id of each action.
+        :param user_ids: The user id of each action.
+        :param session_ids: The session id of each action.
+        :param time_stamps: The time stamp of each action.
+        :param lengths: The number of actions in each sequence, in row order.
+        :param action_ids: Optional id of each action.
+        :param metas: Optional meta dict of each action.
+        """
+        source_ids = asarray(source_ids, dtype=object)
+        target_ids = asarray(target_ids, dtype=object)
+        n_actions = len(source_ids)
+        location_codes, locations = encode_categories(
+            append(source_ids, target_ids)
+        )
+        codes = {
+            'source_id': location_codes[: n_actions],
+            'target_id': location_codes[n_actions:]
+        }
+        categories = {'location': locations}
+        for column, values in (('action_type', action_types),
+                               ('user_id', user_ids),
+                               ('session_id', session_ids)):
+            codes[column], categories[column] = encode_categories(values)
+        if not isinstance(time_stamps, ndarray):
+            time_stamps = list(time_stamps)
+        index = DatetimeIndex(to_datetime(time_stamps))
+        tz = index.tz
+        if tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        offsets = append([0], cumsum(asarray(lengths, dtype=int64)))
+        if action_ids is not None:
+            action_ids = asarray(action_ids, dtype=object)
+        if metas is not None:
+            metas = asarray(metas, dtype=object)
+            if all(meta is None for meta in metas):
+                metas = None
+        return ActionStore(
+            codes=codes, categories=categories,
+            time_stamps=index.values.astype('datetime64[ns]'),
+            offsets=offsets, action_ids=action_ids, metas=metas, tz=tz
+        )
+
+    @staticmethod
+    def from_sequences(
+            sequences: Iterable['ActionSequence']
+    ) -> 'ActionStore':
+        """
+        Create a new ActionStore containing the UserActions of each
+        ActionSequence, in order.
+
+        :param sequences: The ActionSequences to store.
+        """
+        columns = {
+            'action_type': [], 'source_id': [], 'target_id': [],
+            'user_id': [], 'session_id': [], 'time_stamp': [],
+            'action_id': [], 'meta': []
+        }
+        lengths = []
+        for sequence in sequences:
+            lengths.append(len(sequence))
+            for action in sequence:
+                for column, values in columns.items():
+                    values.append(getattr(action, column))
+        return ActionStore.from_arrays(
+            action_types=columns['action_type'],
+            source_ids=columns['source_id'],
+            target_ids=columns['target_id'],
+            user_ids=columns['user_id'],
+            session_ids=columns['session_id'],
+            time_stamps=columns['time_stamp'],
+            lengths=lengths,
+            action_ids=columns['action_id'],
+            metas=columns['meta']
+        )
+
+    def take(self, starts: ndarray, stops: ndarray) -> 'ActionStore':
+        """
+        Return a new ActionStore of the rows in each range of rows, with one
+        sequence per range and only the categories those rows use.
+
+        :param starts: First row of each range.
+        :param stops: Row after the last row of each range.
+        """
+        starts = asarray(starts, dtype=int64)
+        stops = asarray(stops, dtype=int64)
+        if (len(starts) == self.n_sequences and
+                (starts == self._offsets[: -1]).all() and
+                (stops == self._offsets[1:]).all()):
+            return self
+        rows, _ = expand_ranges(starts, stops)
+        codes = {column: codes[rows] for column, codes in self._codes.items()}
+        # keep only the categories used by the rows, so that a small store
+        # taken from a large one has small vocabularies
+        categories = {}
+        for vocabulary, vocabulary_categories in self._categories.items():
+            columns = [column
+                       for column, column_vocabulary in
+                       CATEGORICAL_COLUMNS.items()
+                       if column_vocabulary == vocabulary]
+            used = zeros(len(vocabulary_categories) + 1, dtype=bool)
+            for column in columns:
+                used[codes[column]] = True
+            used = used[: -1]
+            remap = full(len(vocabulary_categories) + 1, -1, dtype=int32)
+            remap[: -1][used] = arange(int(used.sum()), dtype=int32)
+            for column in columns:
+                codes[column] = remap[codes[column]]
+            categories[vocabulary] = vocabulary_categories[used]
+        return ActionStore(
+            codes=codes,
+            categories=categories,
+            time_stamps=self._time_stamps[rows],
+            offsets=append([0], cumsum(stops - starts)),
+            action_ids=(None if self._action_ids is None
+                        else self._action_ids[rows]),
+            metas=None if self._metas is None else self._metas[rows],
+            tz=self._tz
+        )
+
+    @staticmethod
+    def concat(stores: List['ActionStore']) -> 'ActionStore':
+        """
+        Return a new ActionStore of the rows of each store in turn, merging
+        their categories.
+
+        :param stores: The stores to concatenate. Their time stamps must share
+                       a timezone.
+        """
+        if len(stores) == 1:
+            return stores[0]
+        if len({str(store.tz) for store in stores}) > 1:
+            raise ValueError('stores must share a timezone')
+        codes = {column: [] for column in CATEGORICAL_COLUMNS.keys()}
+        categories = {}
+        for vocabulary in set(CATEGORICAL_COLUMNS.values()):
+            merged = {}
+            remaps = []
+            for store in stores:
+                # map each code of the store to its code in the merged
+                # categories, with -1 mapping to itself at the end
+                remaps.append(append(asarray([
+                    merged.setdefault(category, len(merged))
+                    for category in store.categories(vocabulary).tolist()
+                ], dtype=int32), int32(-1)))
+            categories[vocabulary] = asarray(list(merged.keys()),
+                                             dtype=object)
+            for column, column_vocabulary in CATEGORICAL_COLUMNS.items():
+                if column_vocabulary == vocabulary:
+                    codes[column] = concatenate([
+                        remap[store.codes(column)]
+                        for store, remap in zip(stores, remaps)
+                    ])
+        lengths = concatenate([store.offsets[1:] - store.offsets[: -1]
+                               for store in stores])
+
+        def concat_objects(name: str) -> Optional[ndarray]:
+            columns = [getattr(store, name) for store in stores]
+            if all(column is None for column in columns):
+                return None
+            return concatenate([
+                full(len(store), None, dtype=object) if column is None
+                else asarray(column, dtype=object)
+                for store, column in zip(stores, columns)
+            ])
+
+        return ActionStore(
+            codes=codes, categories=categories,
+            time_stamps=concatenate([store.time_stamps for store in stores]),
+            offsets=append([0], cumsum(lengths)).astype(int64),
+            action_ids=concat_objects('action_ids'),
+            metas=concat_objects('metas'), tz=stores[0].tz
+        )
+
+    # region properties
+
+    @property
+    def offsets(self) -> ndarray:
+        """
+        Return the array of first rows of each sequence, followed by the total
+        number of rows.
+        """
+        return self._offsets
+
+    @property
+    def n_sequences(self) -> int:
+        """
+        Return the number of sequences the rows of the store are divided into.
+        """
+        return len(self._offsets) - 1
+
+    @property
+    def time_stamps(self) -> ndarray:
+        """
+        Return the datetime64[ns] array of action time stamps.
+        """
+        return self._time_stamps
+
+    @property
+    def tz(self):
+        """
+        Return the timezone of the time stamps, or None if they are naive.
+        """
+        return self._tz
+
+    @property
+    def action_ids(self) -> Optional[ndarray]:
+
+        return self._action_ids
+
+    @property
+    def metas(self) -> Optional[ndarray]:
+
+        return self._metas
+
+    # end region
+
+    def codes(self, column: str) -> ndarray:
+        """
+        Return the integer codes of a categorical column.
+
+        :param column: One of 'action_type', 'source_id', 'target_id',
+                       'user_id' or 'session_id'.
+        """
+        return self._codes[column]
+
+    def categories(self, column: str) -> ndarray:
+        """
+        Return the unique values that the codes of a column index into.
+
+        :param column: A categorical column name, or 'location'.
+        """
+        return self._categories[CATEGORICAL_COLUMNS.get(column, column)]
+
+    def code(self, column: str, value) -> int:
+        """
+        Return the code of a value in a categorical column, or -1 if the value
+        does not occur in the store.
+
+        :param column: A categorical column name, or 'location'.
+        :param value: The value to look up.
+        """
+        vocabulary = CATEGORICAL_COLUMNS.get(column, column)
+        if vocabulary not in self._lookups:
+            self._lookups[vocabulary] = {
+                category: c
+                for c, category in enumerate(self._categories[vocabulary])
+            }
+        return self._lookups[vocabulary].get(value, -1)
+
+    def decode(self, column: str, start: int = 0,
+               stop: Optional[int] = None) -> list:
+        """
+        Return the decoded values of a column for a range of rows.
+
+        :param column: Any UserAction attribute name.
+        :param start: First row to decode.
+        :param stop: Row after the last row to decode.
+        """
+        stop = len(self) if stop is None else stop
+        if column == 'time_stamp':
+            return list(self._decode_time_stamps(start, stop))
+        elif column == 'action_id':
+            if self._action_ids is None:
+                return [None] * (stop - start)
+            return self._action_ids[start: stop].tolist()
+        elif column == 'meta':
+            if self._metas is None:
+                return [None] * (stop - start)
+            return self._metas[start: stop].tolist()
+        else:
+            # categories with None appended so that code -1 decodes to None
+            vocabulary = CATEGORICAL_COLUMNS.get(column, column)
+            if vocabulary not in self._decoders:
+                self._decoders[vocabulary] = append(
+                    self._categories[vocabulary], [None]
+                )
+            decoder = self._decoders[vocabulary]
+            return decoder[self._codes[column][start: stop]].tolist()
+
+    def time_stamp(self, row: int) -> datetime:
+        """
+        Return the time stamp of a single row as a datetime.
+        """
+        time_stamp = Timestamp(self._time_stamps[row])
+        if self._tz is not None:
+            time_stamp = time_stamp.tz_localize('UTC').tz_convert(self._tz)
+        return time_stamp.to_pydatetime()
+
+    def value(self, column: str, row: int):
+        """
+        Return the decoded value of a column for a single row.
+        """
+        if column == 'time_stamp':
+            return self.time_stamp(row)
+        elif column == 'action_id':
+            return None if self._action_ids is None else self._action_ids[row]
+        elif column == 'meta':
+            return None if self._metas is None else self._metas[row]
+        code = self._codes[column][row]
+        return None if code == -1 else self.categories(column)[code]
+
+    def user_actions(self, start: int = 0,
+                     stop: Optional[int] = None) -> List[UserAction]:
+        """
+        Create UserActions for a range of rows.
+
+        :param start: First row to create an action for.
+        :param stop: Row after the last row to create an action for.
+        """
+        stop = len(self) if stop is None else stop
+        columns = {
+            column: self.decode(column, start, stop)
+            for column in ('action_type', 'source_id', 'target_id',
+                           'user_id', 'session_id', 'time_stamp',
+                           'action_id', 'meta')
+        }
+        return [
+            UserAction(
+                action_id=action_id, action_type=action_type,
+                source_id=source_id, target_id=target_id,
+                time_stamp=time_stamp, user_id=user_id,
+                session_id=session_id, meta=meta
+            )
+            for (action_id, action_type, source_id, target_id, time_stamp,
+                 user_id, session_id, meta) in zip(
+                columns['action_id'], columns['action_type'],
+                columns['source_id'], columns['target_id'],
+                columns['time_stamp'], columns['user_id'],
+                columns['session_id'], columns['meta']
+            )
+        ]
+
+    def sequence_ids(self) -> ndarray:
+        """
+        Return the index of the sequence that each row belongs to.
+        """
+        lengths = self._offsets[1:] - self._offsets[: -1]
+        return arange(self.n_sequences, dtype=int64).repeat(lengths)
+
+    def nbytes(self) -> int:
+        """
+        Return the number of bytes used by the numeric arrays of the store.
+        """
+        return (
+            sum(codes.nbytes for codes in self._codes.values()) +
+            self._time_stamps.nbytes + self._offsets.nbytes
+        )
+
+    def _decode_time_stamps(self, start: int, stop: int) -> ndarray:
+
+        index = DatetimeIndex(self._time_stamps[start: stop])
+        if self._tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self._tz)
+        return index.to_pydatetime()
+
+    def __len__(self) -> int:
+
+        return len(self._time_stamps)
+
+    def __repr__(self) -> str:
+
+        return 'ActionStore({} actions, {} sequences)'.format(
+            len(self), self.n_sequences
+        )
+
+
+def count_in_ranges(mask: ndarray, starts: ndarray, stops: ndarray) -> ndarray:
+    """
+    Count the True values of a row mask within each range of rows.
+
+    :param mask: Boolean array with one value per row of an ActionStore.
+    :param starts: First row of each range.
+    :param stops: Row after the last row of each range.
+    """
+    totals = append([0], cumsum(mask, dtype=int64))
+    return totals[stops] - totals[starts]
+
+
+def expand_ranges(starts: ndarray,
+                  stops: ndarray) -> Tuple[ndarray, ndarray]:
+    """
+    Return the rows in each range of rows, concatenated, and the position of
+    the range that each row came from.
+
+    :param starts: First row of each range.
+    :param stops: Row after the last row of each range.
+    """
+    lengths = stops - starts
+    positions = arange(len(starts), dtype=int64).repeat(lengths)
+    range_offsets = append([0], cumsum(lengths)[: -1])
+    rows = (
+        arange(int(lengths.sum()), dtype=int64) +
+        (starts - range_offsets).repeat(lengths)
+    )
+    return rows, positions
@@ -0,0 +1,243 @@
+from datetime import timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from numpy import add, append, asarray, diff, flatnonzero, int64, \
+    lexsort, maximum, ndarray, quantile, where, zeros
+from pandas import isnull, to_timedelta
+
+from ux.sequences.action_store import ActionStore, expand_ranges
+
+
+class DwellTimes(object):
+    """
+    The time spent at a location between each pair of consecutive actions in
+    ranges of rows of an ActionStore, as int64 nanosecond arrays.
+
+    The location of each step is the target of its first action if it has
+    one, or else its source, as in `ActionSequence.dwell_times`. Sums are
+    exact integer nanoseconds.
+    """
+    def __init__(self, store: ActionStore, starts: ndarray, stops: ndarray):
+        """
+        Compute the dwell times of the steps in ranges of rows of a store.
+
+        :param store: The ActionStore holding the actions.
+        :param starts: First row of each range, e.g. each sequence.
+        :param stops: Row after the last row of each range.
+        """
+        starts = asarray(starts, dtype=int64)
+        stops = asarray(stops, dtype=int64)
+        self._n_sequences: int = len(starts)
+        self._locations: ndarray = store.categories('location')
+        # each step runs from an action to the next action in its range
+        rows, positions = expand_ranges(starts, maximum(stops - 1, starts))
+        # targets that are missing or empty fall back to the source
+        locations = self._locations
+        has_location = append(
+            ~isnull(locations) & (locations != ''), False
+        ) if len(locations) else zeros(1, dtype=bool)
+        targets = store.codes('target_id')[rows]
+        sources = store.codes('source_id')[rows]
+        times = store.time_stamps.view(int64)
+        self._positions: ndarray = positions
+        self._location_codes: ndarray = where(
+            has_location[targets], targets, sources).astype(int64)
+        self._durations: ndarray = times[rows + 1] - times[rows]
+
+    @staticmethod
+    def from_sequences(sequences) -> 'DwellTimes':
+        """
+        Compute the dwell times of a columnar Sequences collection.
+
+        :param sequences: Sequences backed by a single ActionStore.
+        """
+        if sequences.store is None:
+            raise ValueError('sequences must share an ActionStore')
+        starts, stops = sequences.store_offsets()
+        return DwellTimes(sequences.store, starts, stops)
+
+    # region arrays
+
+    @property
+    def locations(self) -> ndarray:
+        """
+        Return the location each location code refers to.
+        """
+        return self._locations
+
+    @property
+    def positions(self) -> ndarray:
+        """
+        Return the position of the sequence of each step.
+        """
+        return self._positions
+
+    @property
+    def location_codes(self) -> ndarray:
+        """
+        Return the location code of each step, or -1 if it has no location.
+        """
+        return self._location_codes
+
+    @property
+    def durations(self) -> ndarray:
+        """
+        Return the duration of each step in nanoseconds.
+        """
+        return self._durations
+
+    # end region
+
+    # region aggregation
+
+    def location_sums(self) -> ndarray:
+        """
+        Return the total nanoseconds spent at each location code.
+        """
+        keys, sums = _group_sums(self._location_codes + 1, self._durations)
+        totals = zeros(len(self._locations) + 1, dtype=int64)
+        totals[keys] = sums
+        return totals[1:]
+
+    def sequence_sums(self) -> ndarray:
+        """
+        Return the total nanoseconds spent in each sequence between its first
+        and last action.
+        """
+        keys, sums = _group_sums(self._positions, self._durations)
+        totals = zeros(self._n_sequences, dtype=int64)
+        totals[keys] = sums
+        return totals
+
+    def sequence_location_sums(self) -> Tuple[ndarray, ndarray, ndarray]:
+        """
+        Return the total nanoseconds spent at each location in each sequence,
+        for the locations visited by each sequence.
+
+        :return: Tuple of (sequence position, location code, nanoseconds),
+                 ordered by position and then location code.
+        """
+        n_codes = len(self._locations) + 1
+        keys, sums = _group_sums(
+            self._positions * n_codes + self._location_codes + 1,
+            self._durations
+        )
+        return keys // n_codes, keys % n_codes - 1, sums
+
+    def distributions(self) -> Dict[str, ndarray]:
+        """
+        Return the sorted durations in nanoseconds of the steps at each
+        location.
+        """
+        codes, durations, bounds = self._sorted()
+        return {
+            self._location_name(codes[start]): durations[start: stop]
+            for start, stop in zip(bounds[: -1].tolist(), bounds[1:].tolist())
+        }
+
+    def quantiles(self, q: Iterable[float]) -> Dict[str, ndarray]:
+        """
+        Return quantiles of the durations in nanoseconds of the steps at each
+        location.
+
+        :param q: The quantiles to compute, between 0 and 1.
+        """
+        q = list(q)
+        return {
+            location: quantile(durations, q)
+            for location, durations in self.distributions().items()
+        }
+
+    # end region
+
+    # region compatibility
+
+    def to_dict(
+            self, sum_by_location: bool, sum_by_sequence: bool
+    ) -> Dict[str, object]:
+        """
+        Return the dwell times in the format of `Sequences.dwell_times`.
+
+        :param sum_by_location: Whether to sum the durations of time spent at
+                                each location in each sequence or keep as a
+                                list.
+        :param sum_by_sequence: Whether to sum the durations of time spent at
+                                each location over every sequence.
+        """
+        if sum_by_sequence:
+            codes, sums = _group_sums(self._location_codes, self._durations)
+            return dict(zip(
+                [self._location_name(code) for code in codes.tolist()],
+                _to_timedelta(sums)
+            ))
+        if sum_by_location:
+            positions, codes, sums = self.sequence_location_sums()
+            order = lexsort((positions, codes))
+            codes = codes[order]
+            sums = sums[order]
+        else:
+            order = self._location_codes.argsort(kind='stable')
+            codes = self._location_codes[order]
+            sums = self._durations[order]
+        bounds = _bounds(codes)
+        values = _to_timedelta(sums)
+        return {
+            self._location_name(codes[start]): values[start: stop]
+            for start, stop in zip(bounds[: -1].tolist(), bounds[1:].tolist())
+        }
+
+    # end region
+
+    def _sorted(self) -> Tuple[ndarray, ndarray, ndarray]:
+        """
+        Return the location codes and durations of the steps sorted by
+        location and duration, and the bounds of each location.
+        """
+        order = lexsort((self._durations, self._location_codes))
+        codes = self._location_codes[order]
+        return codes, self._durations[order], _bounds(codes)
+
+    def _location_name(self, code: int):
+
+        return None if code == -1 else self._locations[code]
+
+    def __len__(self) -> int:
+
+        return len(self._durations)
+
+    def __repr__(self) -> str:
+
+        return 'DwellTimes({} steps in {} sequences)'.format(
+            len(self), self._n_sequences)
+
+
+def _group_sums(keys: ndarray, values: ndarray) -> Tuple[ndarray, ndarray]:
+    """
+    Return the unique keys and the exact int64 sum of the values for each.
+    """
+    if not len(keys):
+        return zeros(0, dtype=int64), zeros(0, dtype=int64)
+    order = keys.argsort(kind='stable')
+    sorted_keys = keys[order]
+    bounds = _bounds(sorted_keys)
+    return (sorted_keys[bounds[: -1]],
+            add.reduceat(values[order], bounds[: -1]))
+
+
+def _bounds(sorted_keys: ndarray) -> ndarray:
+    """
+    Return the first index of each run of equal keys, followed by the number
+    of keys.
+    """
+    if not len(sorted_keys):
+        return zeros(1, dtype=int64)
+    return append(
+        append([0], flatnonzero(diff(sorted_keys)) + 1), len(sorted_keys)
+    ).astype(int64)
+
+
+def _to_timedelta(nanoseconds: ndarray) -> List[timedelta]:
+    """
+    Convert an array of nanoseconds to a list of timedeltas.
+    """
+    return list(to_timedelta(nanoseconds, unit='ns').to_pytimedelta())
@@ -0,0 +1,188 @@
+from typing import Iterable, List, Optional, Tuple, Union
+
+from numpy import append, argsort, asarray, diff, empty, flatnonzero, full, \
+    int32, int64, lexsort, ndarray
+from pandas import Categorical, CategoricalDtype, DataFrame, \
+    DatetimeIndex, Index, Series, concat, factorize, to_datetime
+from pandas.api.types import union_categoricals
+
+from ux.sequences.action_store import ActionStore, expand_ranges
+
+
+def concat_frames(frames: Iterable[DataFrame], columns: List[str],
+                  time_col: str,
+                  object_cols: Optional[List[str]] = None) -> DataFrame:
+    """
+    Concatenate chunks of an event log, e.g. from `pandas.read_csv` or
+    `pandas.read_json` with a chunksize, keeping only the given columns.
+
+    Each chunk's time column is parsed as date-times and its other columns are
+    converted to categoricals before the next chunk is read, so repeated
+    values such as session and location ids are only held once.
+
+    :param frames: Iterable of DataFrame chunks.
+    :param columns: The columns to keep.
+    :param time_col: The column of time stamps.
+    :param object_cols: Columns with mostly unique values, e.g. action ids,
+                        to keep as they are.
+    """
+    object_cols = object_cols or []
+    chunks = []
+    for frame in frames:
+        chunk = {}
+        for column in columns:
+            if column == time_col:
+                chunk[column] = to_datetime(frame[column])
+            elif column in object_cols:
+                chunk[column] = frame[column]
+            else:
+                chunk[column] = _object_categorical(frame[column])
+        chunks.append(chunk)
+    if not chunks:
+        return DataFrame(columns=columns)
+    data = {}
+    for column in columns:
+        if column == time_col or column in object_cols:
+            data[column] = concat([chunk[column] for chunk in chunks],
+                                  ignore_index=True)
+        else:
+            data[column] = union_categoricals(
+                [chunk[column] for chunk in chunks]
+            )
+    return DataFrame(data)
+
+
+def store_from_frame(frame: DataFrame,
+                     session_col: str,
+                     time_col: str,
+                     action_type_col: str,
+                     source_col: str,
+                     target_col: Optional[str] = None,
+                     user_col: Optional[str] = None,
+                     action_id_col: Optional[str] = None,
+                     meta_cols: Optional[List[str]] = None) -> ActionStore:
+    """
+    Create an ActionStore from a DataFrame with one row per action, with one
+    sequence per session.
+
+    Rows are sorted by session and then time stamp, keeping the frame order of
+    equal time stamps, and sequences are ordered by their first time stamp.
+    Categorical columns are encoded without creating any Python objects per
+    row.
+
+    :param frame: The DataFrame of actions.
+    :param session_col: Column of session ids.
+    :param time_col: Column of action time stamps.
+    :param action_type_col: Column of action types.
+    :param source_col: Column of source location ids.
+    :param target_col: Optional column of target location ids.
+    :param user_col: Optional column of user ids.
+    :param action_id_col: Optional column of action ids.
+    :param meta_cols: Optional columns to collect into a meta dict per action.
+    """
+    n_rows = len(frame)
+    session_codes, sessions = _encode(frame[session_col])
+    if (session_codes == -1).any():
+        raise ValueError('every action must have a session id')
+    time_index = DatetimeIndex(to_datetime(frame[time_col]))
+    tz = time_index.tz
+    if tz is not None:
+        time_index = time_index.tz_convert('UTC').tz_localize(None)
+    times = time_index.asi8
+    # sort by session and then time, with ties kept in frame order
+    order = lexsort((times, session_codes))
+    boundaries = flatnonzero(diff(session_codes[order])) + 1
+    starts = append([0], boundaries).astype(int64)
+    stops = append(boundaries, [n_rows]).astype(int64)
+    if not n_rows:
+        starts = stops = empty(0, dtype=int64)
+    # order the sequences by their first time stamp
+    sequence_order = argsort(times[order][starts], kind='stable')
+    starts = starts[sequence_order]
+    stops = stops[sequence_order]
+    rows, _ = expand_ranges(starts, stops)
+    order = order[rows]
+
+    source_codes, source_categories = _encode(frame[source_col])
+    if target_col is None:
+        target_codes = full(n_rows, -1, dtype=int32)
+        locations = source_categories
+    else:
+        target_codes, target_categories = _encode(frame[target_col])
+        locations, source_map, target_map = _merge_categories(
+            source_categories, target_categories
+        )
+        source_codes = source_map[source_codes]
+        target_codes = target_map[target_codes]
+    action_type_codes, action_types = _encode(frame[action_type_col])
+    if user_col is None:
+        user_codes = full(n_rows, -1, dtype=int32)
+        users = empty(0, dtype=object)
+    else:
+        user_codes, users = _encode(frame[user_col])
+    action_ids = None
+    if action_id_col is not None:
+        action_ids = frame[action_id_col].to_numpy(dtype=object)[order]
+    metas = None
+    if meta_cols:
+        metas = asarray(frame[meta_cols].iloc[order].to_dict('records'),
+                        dtype=object)
+    return ActionStore(
+        codes={
+            'action_type': action_type_codes[order],
+            'source_id': source_codes[order],
+            'target_id': target_codes[order],
+            'user_id': user_codes[order],
+            'session_id': session_codes[order]
+        },
+        categories={
+            'action_type': action_types,
+            'location': locations,
+            'user_id': users,
+            'session_id': sessions
+        },
+        time_stamps=time_index.values.astype('datetime64[ns]')[order],
+        offsets=append([0], (stops - starts).cumsum()).astype(int64),
+        action_ids=action_ids, metas=metas, tz=tz
+    )
+
+
+def _object_categorical(values: Series) -> Categorical:
+    """
+    Return a categorical of a column with object categories, so that the
+    categoricals of chunks whose values were read as different types, e.g.
+    floats for a chunk with only missing values, can be unioned.
+    """
+    values = Categorical(values)
+    return Categorical.from_codes(
+        values.codes, categories=Index(values.categories, dtype=object))
+
+
+def _encode(values: Union[Series, Categorical]) -> Tuple[ndarray, ndarray]:
+    """
+    Return int32 codes, with -1 for missing values, and an object array of
+    categories for a column.
+    """
+    if isinstance(values.dtype, CategoricalDtype):
+        values = Categorical(values)
+        return (values.codes.astype(int32),
+                asarray(values.categories, dtype=object))
+    codes, categories = factorize(values)
+    return codes.astype(int32), asarray(categories, dtype=object)
+
+
+def _merge_categories(
+        first: ndarray, second: ndarray
+) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Merge two arrays of categories, returning the merged categories and an
+    array mapping each code of each input, with -1 at the end, to its merged
+    code.
+    """
+    merged_codes, merged = factorize(
+        asarray(list(first) + list(second), dtype=object)
+    )
+    merged_codes = merged_codes.astype(int32)
+    first_map = append(merged_codes[: len(first)], int32(-1))
+    second_map = append(merged_codes[len(first):], int32(-1))
+    return asarray(merged, dtype=object), first_map, second_map
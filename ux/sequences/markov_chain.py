@@ -0,0 +1,374 @@
+from heapq import nlargest
+from inspect import signature
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from numpy import abs as np_abs, arange, array, errstate, exp, float64, \
+    int64, log, ndarray, ones, zeros
+from pandas import DataFrame, Series
+from scipy.sparse import coo_matrix, csr_matrix, diags, identity, spmatrix
+from scipy.sparse.linalg import lgmres, spsolve
+
+from ux.sequences.transition_counter import TransitionCounter
+
+# keyword of the relative tolerance of lgmres, which was `tol` before scipy 1.12
+_LGMRES_RTOL = 'rtol' if 'rtol' in signature(lgmres).parameters else 'tol'
+
+
+class MarkovChain(object):
+    """
+    First-order Markov Chain over a sparse matrix of transition counts, where
+    element [i, j] is the number of transitions from state i to state j.
+    """
+    def __init__(self, counts: spmatrix, states: List[Hashable],
+                 ranks: Optional[spmatrix] = None):
+        """
+        Create a new MarkovChain.
+
+        :param counts: Square sparse matrix of transition counts or weights.
+        :param states: The state of each row and column of the matrix.
+        :param ranks: Optional sparse matrix with the same non-zero elements
+                      as counts, giving the order to break ties between
+                      equally likely transitions in (lowest first).
+        """
+        counts = csr_matrix(counts, dtype=float64)
+        if counts.shape[0] != counts.shape[1]:
+            raise ValueError('counts must be a square matrix')
+        if counts.shape[0] != len(states):
+            raise ValueError('there must be one state per row of counts')
+        counts.sum_duplicates()
+        counts.eliminate_zeros()
+        self._counts: csr_matrix = counts
+        self._states: List[Hashable] = list(states)
+        self._state_ids: Dict[Hashable, int] = {
+            state: s for s, state in enumerate(self._states)
+        }
+        self._ranks: Optional[csr_matrix] = (
+            None if ranks is None else csr_matrix(ranks, dtype=int64)
+        )
+        self._out_weights: ndarray = array(counts.sum(axis=1)).ravel()
+        with errstate(divide='ignore'):
+            inverse = 1 / self._out_weights
+        inverse[self._out_weights == 0] = 0
+        self._probabilities: csr_matrix = diags(inverse) @ counts
+
+    # region constructors
+
+    @staticmethod
+    def from_counter(counter: TransitionCounter) -> 'MarkovChain':
+        """
+        Create a MarkovChain from the counts of a first-order
+        TransitionCounter. Ties are broken in the order the transitions were
+        first counted.
+        """
+        if counter.order != 1:
+            raise ValueError('MarkovChain requires a first-order counter')
+        coo = counter.matrix.tocoo()
+        ranks = [counter.pair_rank(row, col)
+                 for row, col in zip(coo.row.tolist(), coo.col.tolist())]
+        return MarkovChain(
+            counts=coo, states=counter.state_keys,
+            ranks=coo_matrix((array(ranks, dtype=int64) + 1,
+                              (coo.row, coo.col)), shape=coo.shape)
+        )
+
+    @staticmethod
+    def from_counts(
+            counts: Dict[Tuple[Hashable, Hashable], Union[int, float]]
+    ) -> 'MarkovChain':
+        """
+        Create a MarkovChain from a dictionary of {(from, to) => count}. Ties
+        are broken in the order of the dictionary.
+        """
+        state_ids = {}
+        rows = []
+        cols = []
+        for from_state, to_state in counts.keys():
+            rows.append(state_ids.setdefault(from_state, len(state_ids)))
+            cols.append(state_ids.setdefault(to_state, len(state_ids)))
+        shape = (len(state_ids), len(state_ids))
+        return MarkovChain(
+            counts=coo_matrix((list(counts.values()), (rows, cols)),
+                              shape=shape),
+            states=list(state_ids.keys()),
+            ranks=coo_matrix((arange(1, len(rows) + 1), (rows, cols)),
+                             shape=shape)
+        )
+
+    # end region
+
+    @property
+    def states(self) -> List[Hashable]:
+
+        return self._states
+
+    @property
+    def counts(self) -> csr_matrix:
+        """
+        Return the sparse matrix of transition counts.
+        """
+        return self._counts
+
+    @property
+    def probabilities(self) -> csr_matrix:
+        """
+        Return the sparse matrix of row-normalised transition probabilities.
+        Rows of states with no outgoing transitions are all zero.
+        """
+        return self._probabilities
+
+    def state_id(self, state: Hashable) -> int:
+
+        try:
+            return self._state_ids[state]
+        except KeyError:
+            raise ValueError('{} is not a state of the chain'.format(state))
+
+    def probability(self, from_state: Hashable, to_state: Hashable) -> float:
+        """
+        Return the probability of transitioning from one state to another.
+        """
+        return float(self._probabilities[
+            self.state_id(from_state), self.state_id(to_state)
+        ])
+
+    def transition_probabilities(
+            self
+    ) -> Dict[Tuple[Hashable, Hashable], float]:
+        """
+        Return a dictionary of {(from, to) => p(to|from)}, in tie-break order
+        if the chain has one.
+        """
+        coo = self._probabilities.tocoo()
+        rows = coo.row.tolist()
+        cols = coo.col.tolist()
+        values = coo.data.tolist()
+        order = range(len(values))
+        if self._ranks is not None:
+            ranks = self._ranks.tocoo()
+            pair_ranks = dict(zip(
+                zip(ranks.row.tolist(), ranks.col.tolist()),
+                ranks.data.tolist()
+            ))
+            order = sorted(order,
+                           key=lambda i: pair_ranks.get((rows[i], cols[i]), 0))
+        return {
+            (self._states[rows[i]], self._states[cols[i]]): values[i]
+            for i in order
+        }
+
+    # region paths
+
+    def most_probable_path(self, start: Optional[Hashable] = None,
+                           allow_revisits: bool = False,
+                           max_length: Optional[int] = None) -> List[Hashable]:
+        """
+        Walk the chain greedily, taking the most probable transition from
+        each state.
+
+        :param start: Optional state to start at. Leave as None to start at
+                      the state with the most outgoing transitions.
+        :param allow_revisits: If False, transitions to states already in the
+                               path are never taken and the walk stops at a
+                               state with no transitions to unvisited states.
+                               If True, the walk stops when the most probable
+                               transition is to a state already in the path.
+        :param max_length: Optional maximum number of states in the path.
+        """
+        if start is None:
+            current = int(self._out_weights.argmax())
+        else:
+            current = self.state_id(start)
+        path = [current]
+        visited = {current}
+        while max_length is None or len(path) < max_length:
+            candidates = self._row(current)
+            if not allow_revisits:
+                candidates = [candidate for candidate in candidates
+                              if candidate[0] not in visited]
+            if not candidates:
+                break
+            current = max(candidates, key=lambda c: (c[1], -c[2]))[0]
+            if current in visited:
+                break
+            path.append(current)
+            visited.add(current)
+        return [self._states[s] for s in path]
+
+    def most_probable_paths(
+            self, start: Hashable, length: int, beam_width: int = 10,
+            allow_revisits: bool = False
+    ) -> List[Tuple[List[Hashable], float]]:
+        """
+        Find the most probable paths of up to `length` states from the start
+        state using beam search.
+
+        :param start: The state to start at.
+        :param length: The maximum number of states in each path.
+        :param beam_width: The number of partial paths kept at each step.
+        :param allow_revisits: Whether paths can return to a state.
+        :return: List of (path, probability), most probable first. Paths
+                 that reach a state with no transitions end early.
+        """
+        beams = [(0.0, [self.state_id(start)])]
+        finished = []
+        for _ in range(length - 1):
+            extended = []
+            for log_p, path in beams:
+                candidates = [
+                    candidate for candidate in self._row(path[-1])
+                    if allow_revisits or candidate[0] not in path
+                ]
+                if not candidates:
+                    finished.append((log_p, path))
+                for state, p, _ in candidates:
+                    extended.append((log_p + float(log(p)), path + [state]))
+            beams = nlargest(beam_width, extended, key=lambda b: b[0])
+            if not beams:
+                break
+        best = nlargest(beam_width, beams + finished, key=lambda b: b[0])
+        return [([self._states[s] for s in path], float(exp(log_p)))
+                for log_p, path in best]
+
+    # end region
+
+    # region distributions
+
+    def stationary_distribution(self, tol: float = 1e-12,
+                                max_iter: int = 10000) -> Series:
+        """
+        Return the stationary distribution of the chain found by power
+        iteration. Probability leaving states with no outgoing transitions is
+        spread uniformly over all the states.
+        """
+        n = len(self._states)
+        distribution = ones(n) / n
+        dangling = self._out_weights == 0
+        transposed = self._probabilities.T.tocsr()
+        for _ in range(max_iter):
+            updated = transposed @ distribution
+            updated += distribution[dangling].sum() / n
+            if np_abs(updated - distribution).sum() < tol:
+                distribution = updated
+                break
+            distribution = updated
+        return Series(distribution, index=self._states)
+
+    def step_distribution(self, start: Hashable, k: int) -> Series:
+        """
+        Return the probability of being in each state k steps after the
+        start state.
+        """
+        distribution = zeros(len(self._states))
+        distribution[self.state_id(start)] = 1
+        transposed = self._probabilities.T.tocsr()
+        for _ in range(k):
+            distribution = transposed @ distribution
+        return Series(distribution, index=self._states)
+
+    def reachable(self, start: Hashable, k: int) -> List[Hashable]:
+        """
+        Return the states reachable from the start state in at most k steps,
+        including the start state.
+        """
+        reached = zeros(len(self._states), dtype=bool)
+        reached[self.state_id(start)] = True
+        frontier = reached.copy()
+        adjacency = (self._counts.T > 0).tocsr()
+        for _ in range(k):
+            frontier = (adjacency @ frontier) & ~reached
+            if not frontier.any():
+                break
+            reached |= frontier
+        return [self._states[s] for s in reached.nonzero()[0].tolist()]
+
+    def absorption_probabilities(
+            self, goals: Union[Hashable, Iterable[Hashable]]
+    ) -> DataFrame:
+        """
+        Return the probability of each state first reaching each of the goal
+        states, treating the goals as absorbing.
+
+        :param goals: Goal state or states, e.g. task goal locations.
+        :return: DataFrame with a row for each state and a column for each
+                 goal.
+        """
+        goal_ids = self._goal_ids(goals)
+        n = len(self._states)
+        is_goal = zeros(n, dtype=bool)
+        is_goal[goal_ids] = True
+        # only states that can reach a goal have non-zero probabilities, and
+        # restricting to them makes the linear system non-singular
+        can_reach = is_goal.copy()
+        adjacency = (self._counts > 0).tocsr()
+        while True:
+            updated = can_reach | (adjacency @ can_reach)
+            if (updated == can_reach).all():
+                break
+            can_reach = updated
+        transient = (can_reach & ~is_goal).nonzero()[0]
+        result = zeros((n, len(goal_ids)))
+        result[goal_ids, arange(len(goal_ids))] = 1
+        if len(transient):
+            q = self._probabilities[transient][:, transient]
+            r = self._probabilities[transient][:, goal_ids].toarray()
+            system = (identity(len(transient), format='csr') - q).tocsr()
+            for g in range(len(goal_ids)):
+                # iterative solves avoid the fill-in of a direct solve on
+                # large sparse graphs, falling back to it if they stall
+                solved, info = lgmres(system, r[:, g], atol=0, maxiter=1000,
+                                      **{_LGMRES_RTOL: 1e-10})
+                if info != 0:
+                    solved = spsolve(system.tocsc(), r[:, g])
+                result[transient, g] = solved
+        return DataFrame(result, index=self._states,
+                         columns=[self._states[g] for g in goal_ids])
+
+    def hitting_probabilities(
+            self, goals: Union[Hashable, Iterable[Hashable]]
+    ) -> Series:
+        """
+        Return the probability of each state eventually reaching any of the
+        goal states.
+        """
+        return self.absorption_probabilities(goals).sum(axis=1)
+
+    # end region
+
+    def _goal_ids(self, goals: Union[Hashable, Iterable[Hashable]]) -> list:
+
+        if isinstance(goals, (list, set)) or (
+                isinstance(goals, tuple) and goals not in self._state_ids):
+            return [self.state_id(goal) for goal in goals]
+        return [self.state_id(goals)]
+
+    def _row(self, state_id: int) -> List[Tuple[int, float, int]]:
+        """
+        Return (state id, probability, tie-break rank) for each transition
+        out of the state.
+        """
+        start = self._probabilities.indptr[state_id]
+        stop = self._probabilities.indptr[state_id + 1]
+        columns = self._probabilities.indices[start: stop].tolist()
+        values = self._probabilities.data[start: stop].tolist()
+        if self._ranks is None:
+            ranks = columns
+        else:
+            rank_row = self._ranks.getrow(state_id)
+            row_ranks = dict(zip(rank_row.indices.tolist(),
+                                 rank_row.data.tolist()))
+            ranks = [row_ranks.get(column, 0) for column in columns]
+        return list(zip(columns, values, ranks))
+
+    def __contains__(self, state: Hashable) -> bool:
+
+        return state in self._state_ids
+
+    def __len__(self) -> int:
+
+        return len(self._states)
+
+    def __repr__(self) -> str:
+
+        return 'MarkovChain({} states, {} transitions)'.format(
+            len(self._states), self._counts.nnz
+        )
@@ -0,0 +1,499 @@
+import operator
+from datetime import datetime, timedelta
+from typing import Callable, Optional, TYPE_CHECKING
+
+from numpy import array, datetime64, ndarray, ones, timedelta64, zeros
+from pandas import Timedelta, Timestamp
+
+from ux.actions.action_template import ActionTemplate
+from ux.sequences.action_sequence import ActionSequence, SequenceFilter
+from ux.sequences.action_store import ActionStore, count_in_ranges
+from ux.sequences.sequences_index import PostingList, SequencesIndex
+from ux.sequences.template_matcher import TemplateMatcher
+
+if TYPE_CHECKING:
+    from ux.sequences.sequences import Sequences
+
+
+class SequencePredicate(object):
+    """
+    Declarative condition on an ActionSequence.
+
+    Predicates can be called on a single ActionSequence like a SequenceFilter,
+    combined with &, | and ~, and evaluated for a whole Sequences collection
+    at once as a boolean mask. Collections backed by an ActionStore are
+    evaluated with array operations over its columns.
+    """
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        raise NotImplementedError
+
+    def mask(self, sequences: 'Sequences') -> ndarray:
+        """
+        Return a boolean array which is True for each ActionSequence in the
+        collection that satisfies the predicate.
+
+        :param sequences: The Sequences to evaluate the predicate for.
+        """
+        store = sequences.store
+        if store is not None:
+            starts, stops = sequences.store_offsets()
+            return self.store_mask(store, starts, stops)
+        return array([self(sequence) for sequence in sequences], dtype=bool)
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+        """
+        Return a boolean array which is True for each range of rows of the
+        ActionStore that satisfies the predicate.
+
+        :param store: The ActionStore holding the actions.
+        :param starts: First row of each sequence.
+        :param stops: Row after the last row of each sequence.
+        """
+        raise NotImplementedError
+
+    def postings(self, index: SequencesIndex) -> Optional[PostingList]:
+        """
+        Return the positions of the sequences satisfying the predicate from a
+        SequencesIndex, or None if the predicate cannot be answered from the
+        index alone.
+
+        :param index: SequencesIndex built over the collection to filter.
+        """
+        return None
+
+    def __and__(self, other) -> 'SequencePredicate':
+
+        return AndPredicate(self, as_predicate(other))
+
+    def __rand__(self, other) -> 'SequencePredicate':
+
+        return AndPredicate(as_predicate(other), self)
+
+    def __or__(self, other) -> 'SequencePredicate':
+
+        return OrPredicate(self, as_predicate(other))
+
+    def __ror__(self, other) -> 'SequencePredicate':
+
+        return OrPredicate(as_predicate(other), self)
+
+    def __invert__(self) -> 'SequencePredicate':
+
+        return NotPredicate(self)
+
+
+class FunctionPredicate(SequencePredicate):
+    """
+    Wraps an opaque SequenceFilter so it can be combined with other
+    predicates. Evaluated by calling the function on each ActionSequence.
+    """
+    def __init__(self, condition: SequenceFilter):
+
+        self._condition: SequenceFilter = condition
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return bool(self._condition(sequence))
+
+    def mask(self, sequences: 'Sequences') -> ndarray:
+
+        return array([self(sequence) for sequence in sequences], dtype=bool)
+
+    def __repr__(self) -> str:
+
+        return 'FunctionPredicate({})'.format(self._condition)
+
+
+class AndPredicate(SequencePredicate):
+
+    def __init__(self, left: SequencePredicate, right: SequencePredicate):
+
+        self.left: SequencePredicate = left
+        self.right: SequencePredicate = right
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return self.left(sequence) and self.right(sequence)
+
+    def mask(self, sequences: 'Sequences') -> ndarray:
+
+        return self.left.mask(sequences) & self.right.mask(sequences)
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        return (self.left.store_mask(store, starts, stops) &
+                self.right.store_mask(store, starts, stops))
+
+    def postings(self, index: SequencesIndex) -> Optional[PostingList]:
+
+        left = self.left.postings(index)
+        right = self.right.postings(index)
+        if left is None or right is None:
+            return None
+        return left & right
+
+    def __repr__(self) -> str:
+
+        return '({} & {})'.format(self.left, self.right)
+
+
+class OrPredicate(SequencePredicate):
+
+    def __init__(self, left: SequencePredicate, right: SequencePredicate):
+
+        self.left: SequencePredicate = left
+        self.right: SequencePredicate = right
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return self.left(sequence) or self.right(sequence)
+
+    def mask(self, sequences: 'Sequences') -> ndarray:
+
+        return self.left.mask(sequences) | self.right.mask(sequences)
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        return (self.left.store_mask(store, starts, stops) |
+                self.right.store_mask(store, starts, stops))
+
+    def postings(self, index: SequencesIndex) -> Optional[PostingList]:
+
+        left = self.left.postings(index)
+        right = self.right.postings(index)
+        if left is None or right is None:
+            return None
+        return left | right
+
+    def __repr__(self) -> str:
+
+        return '({} | {})'.format(self.left, self.right)
+
+
+class NotPredicate(SequencePredicate):
+
+    def __init__(self, predicate: SequencePredicate):
+
+        self.predicate: SequencePredicate = predicate
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return not self.predicate(sequence)
+
+    def mask(self, sequences: 'Sequences') -> ndarray:
+
+        return ~self.predicate.mask(sequences)
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        return ~self.predicate.store_mask(store, starts, stops)
+
+    def postings(self, index: SequencesIndex) -> Optional[PostingList]:
+
+        postings = self.predicate.postings(index)
+        return None if postings is None else ~postings
+
+    def __repr__(self) -> str:
+
+        return '~{}'.format(self.predicate)
+
+
+class ContainsLocation(SequencePredicate):
+    """
+    True if any action in the sequence has the location as its source or
+    target.
+    """
+    def __init__(self, location_id: str):
+
+        self.location_id: str = location_id
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return sequence.contains_location_id(self.location_id)
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        code = store.code('location', self.location_id)
+        if code == -1:
+            return zeros(len(starts), dtype=bool)
+        action_mask = (
+            (store.codes('source_id') == code) |
+            (store.codes('target_id') == code)
+        )
+        return count_in_ranges(action_mask, starts, stops) > 0
+
+    def postings(self, index: SequencesIndex) -> Optional[PostingList]:
+
+        return index.location(self.location_id)
+
+    def __repr__(self) -> str:
+
+        return 'contains_location({})'.format(self.location_id)
+
+
+class ContainsActionType(SequencePredicate):
+    """
+    True if any action in the sequence has the action type.
+    """
+    def __init__(self, action_type: str):
+
+        self.action_type: str = action_type
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return self.action_type in sequence.unique_action_types()
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        code = store.code('action_type', self.action_type)
+        if code == -1:
+            return zeros(len(starts), dtype=bool)
+        action_mask = store.codes('action_type') == code
+        return count_in_ranges(action_mask, starts, stops) > 0
+
+    def postings(self, index: SequencesIndex) -> Optional[PostingList]:
+
+        return index.action_type(self.action_type)
+
+    def __repr__(self) -> str:
+
+        return 'contains_action_type({})'.format(self.action_type)
+
+
+class ContainsTemplate(SequencePredicate):
+    """
+    True if any action in the sequence matches the ActionTemplate, including
+    '*' wildcard matches.
+    """
+    def __init__(self, template: ActionTemplate):
+
+        self.template: ActionTemplate = template
+        self._matcher: TemplateMatcher = TemplateMatcher([template])
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return self._matcher.matches_any(sequence)
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        mask = zeros(len(starts), dtype=bool)
+        mask[self._matcher.match_store(store, starts, stops).positions] = True
+        return mask
+
+    def postings(self, index: SequencesIndex) -> Optional[PostingList]:
+
+        return index.template(self.template)
+
+    def __repr__(self) -> str:
+
+        return 'contains_template({})'.format(self.template)
+
+
+class StartBetween(SequencePredicate):
+    """
+    True if the first action in the sequence is on or after `start` and
+    before `end`. Either bound can be None to leave it open.
+    """
+    def __init__(self, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None):
+
+        self.start: Optional[datetime] = start
+        self.end: Optional[datetime] = end
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return (
+            (self.start is None or self.start <= sequence.start) and
+            (self.end is None or sequence.start < self.end)
+        )
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        sequence_starts = store.time_stamps[starts]
+        mask = ones(len(starts), dtype=bool)
+        if self.start is not None:
+            mask &= sequence_starts >= _store_datetime64(self.start, store)
+        if self.end is not None:
+            mask &= sequence_starts < _store_datetime64(self.end, store)
+        return mask
+
+    def __repr__(self) -> str:
+
+        return 'start_between({}, {})'.format(self.start, self.end)
+
+
+class DurationBetween(SequencePredicate):
+    """
+    True if the duration of the sequence is at least `minimum` and at most
+    `maximum`. Either bound can be None to leave it open.
+    """
+    def __init__(self, minimum: Optional[timedelta] = None,
+                 maximum: Optional[timedelta] = None):
+
+        self.minimum: Optional[timedelta] = minimum
+        self.maximum: Optional[timedelta] = maximum
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return (
+            (self.minimum is None or self.minimum <= sequence.duration) and
+            (self.maximum is None or sequence.duration <= self.maximum)
+        )
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        durations = store.time_stamps[stops - 1] - store.time_stamps[starts]
+        mask = ones(len(starts), dtype=bool)
+        if self.minimum is not None:
+            mask &= durations >= _timedelta64(self.minimum)
+        if self.maximum is not None:
+            mask &= durations <= _timedelta64(self.maximum)
+        return mask
+
+    def __repr__(self) -> str:
+
+        return 'duration_between({}, {})'.format(self.minimum, self.maximum)
+
+
+class ActionCountComparison(SequencePredicate):
+    """
+    Compares the number of actions in the sequence to a value.
+    """
+    _symbols = {
+        operator.lt: '<', operator.le: '<=', operator.eq: '==',
+        operator.ne: '!=', operator.ge: '>=', operator.gt: '>'
+    }
+
+    def __init__(self, comparison: Callable[[int, int], bool], value: int):
+
+        self.comparison: Callable[[int, int], bool] = comparison
+        self.value: int = value
+
+    def __call__(self, sequence: ActionSequence) -> bool:
+
+        return self.comparison(len(sequence), self.value)
+
+    def store_mask(self, store: ActionStore,
+                   starts: ndarray, stops: ndarray) -> ndarray:
+
+        return self.comparison(stops - starts, self.value)
+
+    def __repr__(self) -> str:
+
+        return 'action_count {} {}'.format(
+            self._symbols[self.comparison], self.value
+        )
+
+
+class ActionCount(object):
+    """
+    Placeholder for the number of actions in a sequence. Comparing it to an
+    int creates a SequencePredicate e.g. `action_count >= 5`.
+    """
+    def __lt__(self, value: int) -> SequencePredicate:
+        return ActionCountComparison(operator.lt, value)
+
+    def __le__(self, value: int) -> SequencePredicate:
+        return ActionCountComparison(operator.le, value)
+
+    def __eq__(self, value: int) -> SequencePredicate:
+        return ActionCountComparison(operator.eq, value)
+
+    def __ne__(self, value: int) -> SequencePredicate:
+        return ActionCountComparison(operator.ne, value)
+
+    def __ge__(self, value: int) -> SequencePredicate:
+        return ActionCountComparison(operator.ge, value)
+
+    def __gt__(self, value: int) -> SequencePredicate:
+        return ActionCountComparison(operator.gt, value)
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __repr__(self) -> str:
+        return 'action_count'
+
+
+action_count = ActionCount()
+
+
+def contains_location(location_id: str) -> SequencePredicate:
+    """
+    Return a predicate that is True for sequences visiting the location.
+    """
+    return ContainsLocation(location_id)
+
+
+def contains_action_type(action_type: str) -> SequencePredicate:
+    """
+    Return a predicate that is True for sequences with an action of the type.
+    """
+    return ContainsActionType(action_type)
+
+
+def contains_template(template: ActionTemplate) -> SequencePredicate:
+    """
+    Return a predicate that is True for sequences with an action matching the
+    ActionTemplate.
+    """
+    return ContainsTemplate(template)
+
+
+def start_between(start: Optional[datetime] = None,
+                  end: Optional[datetime] = None) -> SequencePredicate:
+    """
+    Return a predicate that is True for sequences starting in [start, end).
+    """
+    return StartBetween(start=start, end=end)
+
+
+def duration_between(minimum: Optional[timedelta] = None,
+                     maximum: Optional[timedelta] = None) -> SequencePredicate:
+    """
+    Return a predicate that is True for sequences lasting between minimum and
+    maximum, inclusive.
+    """
+    return DurationBetween(minimum=minimum, maximum=maximum)
+
+
+def as_predicate(condition) -> SequencePredicate:
+    """
+    Return the condition if it is a SequencePredicate, otherwise wrap the
+    callable in a FunctionPredicate.
+    """
+    if isinstance(condition, SequencePredicate):
+        return condition
+    elif callable(condition):
+        return FunctionPredicate(condition)
+    else:
+        raise TypeError('condition must be SequencePredicate or callable')
+
+
+def _store_datetime64(value: datetime, store: ActionStore) -> datetime64:
+    """
+    Convert a datetime to a datetime64 comparable with the time stamps of the
+    store, which are held in UTC when the store is timezone-aware.
+    """
+    time_stamp = Timestamp(value)
+    if time_stamp.tzinfo is not None:
+        time_stamp = time_stamp.tz_convert('UTC').tz_localize(None)
+    elif store.tz is not None:
+        time_stamp = time_stamp.tz_localize(store.tz).tz_convert(
+            'UTC').tz_localize(None)
+    return time_stamp.to_datetime64()
+
+
+def _timedelta64(value: timedelta) -> timedelta64:
+
+    return Timedelta(value).to_timedelta64()
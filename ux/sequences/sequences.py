@@ -1,18 +1,35 @@
 from collections import defaultdict, OrderedDict, Counter
-from datetime import timedelta, datetime
+from datetime import date, timedelta, datetime
+from os.path import join
 from itertools import chain, product
 from types import FunctionType
 from typing import Counter as CounterType, Tuple, Callable, Any
-from typing import Dict, Iterator, List, Optional, overload, Union
+from typing import Dict, Iterable, Iterator, List, Optional, overload, \
+    Union
 
-from pandas import notnull
+from numpy import array, int64, ndarray
+from pandas import DataFrame, DatetimeIndex, Timestamp, factorize
 
 from ux.actions.action_template import ActionTemplate, ActionTemplatePair
+from ux.actions.user_action import ActionFilter
 from ux.compound_types import StrPair
 from ux.sequences.action_sequence import ActionSequence, SequenceCounter, \
     SequenceFilter, SequenceFilterSet, SequenceGrouper
+from ux.sequences.action_store import ActionStore
+from ux.sequences.dwell_times import DwellTimes
+from ux.sequences.frame_loader import concat_frames, store_from_frame
+from ux.sequences.markov_chain import MarkovChain
+from ux.sequences.predicates import SequencePredicate
+from ux.sequences.sequences_executor import SequencesExecutor
+from ux.sequences.sequences_index import SequencesIndex
+from ux.sequences.store_files import is_store, list_partitions, \
+    read_parquet, read_store, write_parquet, write_store
+from ux.sequences.sub_sequences import crop_ranges, match_offsets, \
+    split_ranges
 from ux.sequences.sequences_group_by import SequencesGroupBy
+from ux.sequences.transition_counter import TransitionCounter
 from ux.utils.misc import get_method_name
+from ux.utils.time_buckets import TimeBuckets
 from ux.wrappers.map_result import MapResult
 
 
@@ -41,6 +58,32 @@ class Sequences(object):
         'end_month': lambda seq: seq.end.month
     }
 
+    # lookups that can be computed for every sequence at once from the start
+    # or end time stamps of a columnar collection
+    _vectorized_lookups = {
+        'date': ('start', lambda index: index.date),
+        'start_date': ('start', lambda index: index.date),
+        'end_date': ('end', lambda index: index.date),
+        'date_time': ('start', lambda index: index.to_pydatetime()),
+        'start': ('start', lambda index: index.to_pydatetime()),
+        'end': ('end', lambda index: index.to_pydatetime()),
+        'hour': ('start', lambda index: index.hour),
+        'start_hour': ('start', lambda index: index.hour),
+        'end_hour': ('end', lambda index: index.hour),
+        'day': ('start', lambda index: index.day),
+        'start_day': ('start', lambda index: index.day),
+        'end_day': ('end', lambda index: index.day),
+        'weekday': ('start', lambda index: index.dayofweek + 1),
+        'start_weekday': ('start', lambda index: index.dayofweek + 1),
+        'end_weekday': ('end', lambda index: index.dayofweek + 1),
+        'week': ('start', lambda index: _iso_weeks(index)),
+        'start_week': ('start', lambda index: _iso_weeks(index)),
+        'end_week': ('end', lambda index: _iso_weeks(index)),
+        'month': ('start', lambda index: index.month),
+        'start_month': ('start', lambda index: index.month),
+        'end_month': ('end', lambda index: index.month)
+    }
+
     def __init__(self, sequences: List[ActionSequence]):
         """
         Create a new Sequences collection.
@@ -48,6 +91,225 @@ class Sequences(object):
         :param sequences: List of ActionSequences to use to create the object.
         """
         self._sequences: List[ActionSequence] = sequences
+        self._store_offsets: Optional[Tuple[ndarray, ndarray]] = None
+        self._index: Optional[SequencesIndex] = None
+        self._executor: Optional[SequencesExecutor] = None
+
+    @staticmethod
+    def from_store(store: ActionStore,
+                   metas: Optional[List[dict]] = None) -> 'Sequences':
+        """
+        Create a new Sequences collection with one ActionSequence view onto
+        each sequence of rows in an ActionStore.
+
+        :param store: The ActionStore holding the actions.
+        :param metas: Optional meta dict for each sequence.
+        """
+        offsets = store.offsets.tolist()
+        if metas is None:
+            metas = [None] * store.n_sequences
+        return Sequences([
+            ActionSequence.from_store(
+                store=store, start=start, stop=stop, meta=meta
+            )
+            for start, stop, meta in zip(offsets[: -1], offsets[1:], metas)
+        ])
+
+    @staticmethod
+    def from_frame(frame: Union[DataFrame, Iterable[DataFrame]],
+                   session_col: str = 'session_id',
+                   time_col: str = 'time_stamp',
+                   action_type_col: str = 'action_type',
+                   source_col: str = 'source_id',
+                   target_col: Optional[str] = 'target_id',
+                   user_col: Optional[str] = 'user_id',
+                   action_id_col: Optional[str] = None,
+                   meta_cols: Optional[List[str]] = None) -> 'Sequences':
+        """
+        Create a new Sequences collection from a DataFrame with one row per
+        action, with one ActionSequence per session backed by a single
+        ActionStore.
+
+        Rows are sorted by session and time stamp and split into sequences
+        with array operations, so no UserAction is created until one is
+        accessed. Sequences are ordered by their first time stamp.
+
+        :param frame: DataFrame of actions, or an iterable of DataFrame chunks
+                      e.g. from `pandas.read_csv(path, chunksize=n)` or
+                      `pandas.read_json(path, lines=True, chunksize=n)`.
+                      Sessions may span chunks.
+        :param session_col: Column of session ids.
+        :param time_col: Column of action time stamps.
+        :param action_type_col: Column of action types.
+        :param source_col: Column of source location ids.
+        :param target_col: Column of target location ids, if present.
+        :param user_col: Column of user ids, if present.
+        :param action_id_col: Optional column of action ids.
+        :param meta_cols: Optional columns to collect into a meta dict for each
+                          action.
+        """
+        chunks = None
+        if not isinstance(frame, DataFrame):
+            chunks = iter(frame)
+            frame = next(chunks, None)
+            if frame is None:
+                return Sequences([])
+        # optional columns are skipped if they are not in the frame
+        target_col, user_col = [
+            col if col in frame.columns else None
+            for col in (target_col, user_col)
+        ]
+        columns = [
+            col for col in [session_col, time_col, action_type_col,
+                            source_col, target_col, user_col, action_id_col]
+            if col is not None
+        ] + (meta_cols or [])
+        missing = [col for col in columns if col not in frame.columns]
+        if missing:
+            raise ValueError('frame has no column(s) {}'.format(missing))
+        if chunks is not None:
+            frame = concat_frames(
+                chain([frame], chunks), columns=columns, time_col=time_col,
+                object_cols=[col for col in [action_id_col] if col] +
+                (meta_cols or [])
+            )
+        return Sequences.from_store(store_from_frame(
+            frame, session_col=session_col, time_col=time_col,
+            action_type_col=action_type_col, source_col=source_col,
+            target_col=target_col, user_col=user_col,
+            action_id_col=action_id_col, meta_cols=meta_cols
+        ))
+
+    def to_columnar(self) -> 'Sequences':
+        """
+        Return a new collection of ActionSequences backed by a single shared
+        ActionStore containing the actions of this collection.
+        """
+        return Sequences.from_store(
+            store=ActionStore.from_sequences(self._sequences),
+            metas=self.metas
+        )
+
+    # region persistence
+
+    def save(self, path: str, partition_by: Optional[str] = None) -> None:
+        """
+        Write the collection to a directory of one file per column, which
+        `Sequences.load` memory-maps.
+
+        :param path: Path of the directory.
+        :param partition_by: Optional 'date' to write the sequences starting
+                             on each date to a separate `date=YYYY-MM-DD`
+                             sub-directory.
+        """
+        store, starts, stops = self._stored()
+        metas = self.metas
+        if partition_by is None:
+            write_store(store.take(starts, stops), path, metas)
+            return
+        for value, positions in self._partitions(partition_by):
+            write_store(
+                store.take(starts[positions], stops[positions]),
+                join(path, '{}={}'.format(partition_by, value)),
+                [metas[p] for p in positions.tolist()]
+            )
+
+    @staticmethod
+    def load(path: str, start: Optional[Union[date, datetime]] = None,
+             end: Optional[Union[date, datetime]] = None,
+             mmap: bool = True) -> 'Sequences':
+        """
+        Load a collection written by `Sequences.save`.
+
+        Columns are memory-mapped, so opening a collection is fast and each
+        column is only read from disk when it is used. Date partitions are
+        read in date order and concatenated, which copies their columns.
+
+        :param path: Path of the directory.
+        :param start: Optional first date to read partitions for.
+        :param end: Optional last date to read partitions for.
+        :param mmap: Whether to memory-map the columns.
+        """
+        if is_store(path):
+            store, metas = read_store(path, mmap=mmap)
+            return Sequences.from_store(store, metas=metas)
+        start, end = _partition_bounds(start, end)
+        stores = []
+        metas = []
+        for value, partition_path in list_partitions(path, 'date'):
+            if (start is not None and value < start) or (
+                    end is not None and value > end):
+                continue
+            store, partition_metas = read_store(partition_path, mmap=mmap)
+            stores.append(store)
+            metas.extend(partition_metas or [None] * store.n_sequences)
+        if not stores:
+            return Sequences([])
+        return Sequences.from_store(ActionStore.concat(stores), metas=metas)
+
+    def to_parquet(self, path: str,
+                   partition_by: Optional[str] = None) -> None:
+        """
+        Write the collection to Parquet with one row per action. Requires
+        pyarrow.
+
+        :param path: Path of the file, or of the dataset directory if
+                     partitioned.
+        :param partition_by: Optional 'date' to partition the dataset by the
+                             start date of each sequence.
+        """
+        store, starts, stops = self._stored()
+        partition_dates = None
+        if partition_by is not None:
+            partition_dates = [None] * len(self)
+            for value, positions in self._partitions(partition_by):
+                for p in positions.tolist():
+                    partition_dates[p] = value
+        write_parquet(store.take(starts, stops), path, self.metas,
+                      partition_dates)
+
+    @staticmethod
+    def from_parquet(path: str, start: Optional[Union[date, datetime]] = None,
+                     end: Optional[Union[date, datetime]] = None,
+                     memory_map: bool = True,
+                     tz: Optional[str] = None) -> 'Sequences':
+        """
+        Load a collection written by `Sequences.to_parquet`. Requires pyarrow.
+
+        :param path: Path of the file or dataset directory.
+        :param start: Optional first date partition to read.
+        :param end: Optional last date partition to read.
+        :param memory_map: Whether to memory-map the file while decoding it.
+        :param tz: Optional timezone to return time stamps in. Defaults to
+                   the timezone of the written sequences.
+        """
+        start, end = _partition_bounds(start, end)
+        store, metas = read_parquet(path, start=start, end=end,
+                                    memory_map=memory_map, tz=tz)
+        return Sequences.from_store(store, metas=metas)
+
+    def _stored(self) -> Tuple[ActionStore, ndarray, ndarray]:
+        """
+        Return the ActionStore of the collection, converting it to a
+        columnar collection if needed, and the rows of each sequence.
+        """
+        sequences = self if self.store is not None else self.to_columnar()
+        if sequences.store is None:
+            raise ValueError('Cannot save an empty collection')
+        starts, stops = sequences.store_offsets()
+        return sequences.store, starts, stops
+
+    def _partitions(self, partition_by: str) -> List[Tuple[str, ndarray]]:
+        """
+        Return each partition value and the positions of its sequences.
+        """
+        if partition_by != 'date':
+            raise ValueError('Can only partition by "date"')
+        codes, values = factorize(self.start_times().strftime('%Y-%m-%d'))
+        return [(value, (codes == c).nonzero()[0])
+                for c, value in enumerate(values.tolist())]
+
+    # end region
 
     @property
     def sequences(self) -> List[ActionSequence]:
@@ -56,16 +318,110 @@ class Sequences(object):
         """
         return self._sequences
 
-    def filter(self, condition: SequenceFilter) -> 'Sequences':
+    @property
+    def store(self) -> Optional[ActionStore]:
+        """
+        Return the ActionStore shared by every ActionSequence in the collection,
+        or None if the sequences are not all views onto the same store.
+        """
+        if not self._sequences:
+            return None
+        store = self._sequences[0].store
+        if store is None:
+            return None
+        for sequence in self._sequences:
+            if sequence.store is not store:
+                return None
+        return store
+
+    @property
+    def executor(self) -> Optional[SequencesExecutor]:
+        """
+        Return the executor used to run operations in parallel, if any.
+        """
+        return self._executor
+
+    def with_executor(self, n_jobs: Optional[int] = None,
+                      kind: str = 'process',
+                      chunk_size: Optional[int] = None) -> 'Sequences':
+        """
+        Return a copy of the collection whose `map`, `filter`, `counter`,
+        `group_by`, `dwell_times` and transition counts run over chunks of the
+        sequences in parallel. Collections returned by `filter` and `group_by`
+        keep the executor.
+
+        Functions passed to these methods must return picklable values when
+        kind is 'process'.
+
+        :param n_jobs: Number of workers. Defaults to the number of CPUs.
+        :param kind: 'process' or 'thread'. Threads only speed up functions
+                     that release the GIL.
+        :param chunk_size: Optional number of sequences per chunk.
+        """
+        parallel = self.copy()
+        parallel._store_offsets = self._store_offsets
+        parallel._index = self._index
+        parallel._executor = SequencesExecutor(
+            n_jobs=n_jobs, kind=kind, chunk_size=chunk_size
+        )
+        return parallel
+
+    @property
+    def index(self) -> Optional[SequencesIndex]:
+        """
+        Return the SequencesIndex of the collection, if one has been built.
+        """
+        return self._index
+
+    def build_index(self) -> SequencesIndex:
+        """
+        Build an inverted index from the locations, action types and
+        ActionTemplates in the collection to the sequences containing them.
+        Once built, `filter`, `count` and `group_filter` answer indexable
+        predicates such as `contains_location` from the index.
+        """
+        self._index = SequencesIndex(self)
+        return self._index
+
+    def store_offsets(self) -> Optional[Tuple[ndarray, ndarray]]:
+        """
+        Return arrays of the start and stop row of each ActionSequence in the
+        shared ActionStore, or None if there is no shared store.
+        """
+        if self._store_offsets is None:
+            if self.store is None:
+                return None
+            offsets = array(
+                [sequence.store_offsets for sequence in self._sequences],
+                dtype=int64
+            )
+            self._store_offsets = offsets[:, 0], offsets[:, 1]
+        return self._store_offsets
+
+    def filter(
+            self, condition: Union[SequenceFilter, SequencePredicate]
+    ) -> 'Sequences':
         """
         Return a new Sequences containing only the sequences matching the
         `condition`.
 
         :param condition: lambda(sequence) that returns True to include a
-        sequence.
+                          sequence, or a SequencePredicate to evaluate for
+                          every sequence at once.
         """
-        if condition in (None, True):
+        if condition is None or condition is True:
             return self
+        if isinstance(condition, SequencePredicate):
+            if self._index is not None:
+                postings = condition.postings(self._index)
+                if postings is not None:
+                    return self._take(postings.positions())
+            return self._take(condition.mask(self).nonzero()[0])
+        if self._executor is not None:
+            mask = array(self._map_sequences(
+                lambda sequence: bool(condition(sequence))
+            ), dtype=bool)
+            return self._take(mask.nonzero()[0])
         filtered = []
         for sequence in self:
             if condition(sequence):
@@ -108,7 +464,8 @@ class Sequences(object):
 
     def group_by(
             self,
-            by: Union[SequenceGrouper, Dict[str, SequenceGrouper], str, list]
+            by: Union[SequenceGrouper, Dict[str, SequenceGrouper], str, list],
+            include_empty: bool = False
     ) -> SequencesGroupBy:
         """
         Return a SequencesGroupBy keyed by each value returned by a single
@@ -118,17 +475,10 @@ class Sequences(object):
 
         :param by: lambda(Sequence) or dict[group_name, lambda(Sequence)] or
                    list[str or lambda(Sequence)].
+        :param include_empty: Whether to include an empty Sequences for each
+                              combination of grouper values that no sequence
+                              has.
         """
-
-        def apply_group_by(method: SequenceGrouper) -> Dict[str, 'Sequences']:
-            splits = defaultdict(list)
-            for sequence in self:
-                splits[method(sequence)].append(sequence)
-            return {
-                group_name: Sequences(group_sequences)
-                for group_name, group_sequences in splits.items()
-            }
-
         # build groupers dict mapping name to grouping function
         groupers: Dict[str, SequenceGrouper] = OrderedDict()
         if callable(by):
@@ -154,20 +504,53 @@ class Sequences(object):
                     raise TypeError(
                         'List elements must be strings or functions.')
 
-        # calculate dict mapping group-by split names to Sequences
+        # compute the key values of lookup groupers for every sequence at once
+        # where the collection is columnar, and call the other groupers below
         group_by_names = list(groupers.keys())
-        group_bys = OrderedDict([
-            (by_name, apply_group_by(groupers[by_name]))
-            for by_name in group_by_names
-        ])
-        result = dict()
-        for subgroups_combo in product(
-                *[group_bys[group].items() for group in group_bys.keys()]):
-            result_key = tuple([subgroup[0] for subgroup in subgroups_combo])
-            if len(result_key) == 1:
-                result_key = result_key[0]
-            result_sequences = [subgroup[1] for subgroup in subgroups_combo]
-            result[result_key] = Sequences.intersect_all(result_sequences)
+        lookup_values = [
+            self._lookup_values(name)
+            if groupers[name] is self._sequence_lookups.get(name) else None
+            for name in group_by_names
+        ]
+        if all(values is not None for values in lookup_values):
+            keys = zip(*lookup_values)
+        elif self._executor is not None:
+            keys = zip(*[
+                values if values is not None else self._map_sequences(method)
+                for values, method in zip(lookup_values, groupers.values())
+            ])
+        else:
+            keys = (
+                tuple(
+                    values[s] if values is not None else method(sequence)
+                    for values, method in zip(lookup_values,
+                                              groupers.values())
+                )
+                for s, sequence in enumerate(self)
+            )
+        # bucket each sequence by its composite key in a single pass,
+        # recording the order in which each grouper's values first appear
+        value_ranks: List[Dict[Any, int]] = [dict() for _ in group_by_names]
+        buckets: Dict[tuple, List[ActionSequence]] = dict()
+        for sequence, key in zip(self, keys):
+            if key not in buckets:
+                buckets[key] = []
+                for ranks, value in zip(value_ranks, key):
+                    if value not in ranks:
+                        ranks[value] = len(ranks)
+            buckets[key].append(sequence)
+        if include_empty:
+            keys = list(product(*[list(ranks.keys())
+                                  for ranks in value_ranks]))
+        else:
+            keys = sorted(buckets.keys(), key=lambda k: tuple(
+                ranks[value] for ranks, value in zip(value_ranks, k)
+            ))
+        result = OrderedDict()
+        for key in keys:
+            result_key = key[0] if len(key) == 1 else key
+            result[result_key] = Sequences(buckets.get(key, []))
+            result[result_key]._executor = self._executor
         return SequencesGroupBy(result, names=group_by_names)
 
     def map(self, mapper: Union[str, dict, list, SequenceGrouper]) -> MapResult:
@@ -184,22 +567,28 @@ class Sequences(object):
                 if hasattr(ActionSequence, item_mapper):
                     if callable(getattr(self[0], item_mapper)):
                         # methods
-                        return [getattr(sequence, item_mapper)() for sequence in
-                                self]
+                        return self._map_sequences(
+                            lambda sequence: getattr(sequence, item_mapper)()
+                        )
                     else:
                         # properties
-                        return [getattr(sequence, item_mapper) for sequence in
-                                self]
+                        return self._map_sequences(
+                            lambda sequence: getattr(sequence, item_mapper)
+                        )
                 elif item_mapper in self._sequence_lookups:
-                    return [self._sequence_lookups[item_mapper](sequence) for
-                            sequence in self]
+                    values = self._lookup_values(item_mapper)
+                    if values is not None:
+                        return values
+                    return self._map_sequences(
+                        self._sequence_lookups[item_mapper]
+                    )
                 else:
                     raise ValueError(
                         f'ActionSequence has no property'
                         f' or attribute named {item_mapper}'
                     )
             elif isinstance(item_mapper, FunctionType):
-                return [item_mapper(sequence) for sequence in self]
+                return self._map_sequences(item_mapper)
             else:
                 raise TypeError('item mappers must be FunctionType or str')
 
@@ -221,12 +610,22 @@ class Sequences(object):
 
         return MapResult(results)
 
-    def count(self, condition: Optional[SequenceFilter] = None) -> int:
+    def count(
+            self,
+            condition: Optional[Union[SequenceFilter, SequencePredicate]] = None
+    ) -> int:
         """
-        Return the number of ActionSequences in the collection.
+        Return the number of ActionSequences in the collection, or the number
+        matching the condition if one is given.
         """
         if condition is None:
             return len(self)
+        if isinstance(condition, SequencePredicate):
+            if self._index is not None:
+                postings = condition.postings(self._index)
+                if postings is not None:
+                    return len(postings)
+            return int(condition.mask(self).sum())
         return len(self.filter(condition))
 
     def counter(self, get_value: SequenceCounter) -> CounterType[str]:
@@ -242,20 +641,28 @@ class Sequences(object):
         :param get_value: method that returns a str or list of strs when called
         on an action.
         """
+        def count_chunk(sequences: Sequences) -> CounterType[str]:
+            chunk_counts = Counter()
+            for sequence in sequences:
+                sequence_result = get_value(sequence)
+                if isinstance(sequence_result, list):
+                    chunk_counts.update(sequence_result)
+                elif isinstance(sequence_result, str):
+                    chunk_counts[sequence_result] += 1
+            return chunk_counts
+
         counts = Counter()
-        for sequence in self:
-            sequence_result = get_value(sequence)
-            if isinstance(sequence_result, list):
-                counts += Counter(sequence_result)
-            elif isinstance(sequence_result, str):
-                counts[sequence_result] += 1
+        for partial in self._map_chunks(count_chunk):
+            counts.update(partial)
         return counts
 
     def copy(self) -> 'Sequences':
         """
         Return a new collection referencing this collection's ActionSequences.
         """
-        return Sequences(self._sequences)
+        copied = Sequences(self._sequences)
+        copied._executor = self._executor
+        return copied
 
     def intersection(
             self, other: Union['Sequences', List[ActionSequence]]
@@ -293,6 +700,111 @@ class Sequences(object):
                 rates[template] = rate
         return rates
 
+    # region sub-sequences
+
+    def split(
+            self,
+            split: Union[ActionFilter, ActionTemplate, List[ActionTemplate]],
+            how: str = 'at',
+            copy_meta: bool = False
+    ) -> 'Sequences':
+        """
+        Split every sequence into new ActionSequences at each `UserAction`
+        where `split` is met, in the same way as `ActionSequence.split`.
+
+        ActionTemplates are matched across the whole collection at once and
+        each new sequence is a view onto the collection's ActionStore. Lambda
+        functions are applied to each sequence in turn.
+
+        :param split: Lambda function, ActionTemplate or list of
+                      ActionTemplates to use to break the sequences.
+        :param how: How to split the Sequences.
+                    One of `['before', 'after', 'at']`
+        :param copy_meta: Whether to copy the `meta` dict of each sequence into
+                          its new Sequences.
+        """
+        templates = _as_templates(split)
+        if templates is None:
+            return Sequences([
+                sub_sequence for sequence in self._sequences
+                for sub_sequence in sequence.split(
+                    split, how=how, copy_meta=copy_meta)
+            ])
+        sequences = self if self.store is not None else self.to_columnar()
+        if sequences.store is None:
+            return Sequences([])
+        starts, stops = sequences.store_offsets()
+        matches = match_offsets(sequences.store, starts, stops, templates)
+        return sequences._sub_sequences(
+            *split_ranges(starts, stops, matches, how), copy_meta=copy_meta
+        )
+
+    def crop(
+            self,
+            start: Union[ActionFilter, ActionTemplate, List[ActionTemplate]],
+            end: Union[ActionFilter, ActionTemplate, List[ActionTemplate]],
+            how: str,
+            copy_meta: bool = False
+    ) -> 'Sequences':
+        """
+        Crop every sequence to start and end ActionTemplates or conditions, in
+        the same way as `ActionSequence.crop`, dropping the sequences where
+        both are not found in order.
+
+        ActionTemplates are matched across the whole collection at once and
+        each cropped sequence is a view onto the collection's ActionStore.
+
+        :param start: The start of the subsequences to crop to.
+        :param end: The end of the subsequences to crop to.
+        :param how: 'first' or 'last'
+        :param copy_meta: Whether to copy the `meta` dict of each sequence into
+                          its cropped Sequence.
+        """
+        start_templates = _as_templates(start)
+        end_templates = _as_templates(end)
+        if start_templates is None or end_templates is None:
+            cropped = [
+                sequence.crop(start, end, how=how, copy_meta=copy_meta)
+                for sequence in self._sequences
+            ]
+            return Sequences([sequence for sequence in cropped
+                              if sequence is not None])
+        sequences = self if self.store is not None else self.to_columnar()
+        if sequences.store is None:
+            return Sequences([])
+        starts, stops = sequences.store_offsets()
+        return sequences._sub_sequences(
+            *crop_ranges(
+                starts, stops,
+                match_offsets(sequences.store, starts, stops, start_templates),
+                match_offsets(sequences.store, starts, stops, end_templates),
+                how
+            ), copy_meta=copy_meta
+        )
+
+    def _sub_sequences(self, positions: ndarray, starts: ndarray,
+                       stops: ndarray, copy_meta: bool) -> 'Sequences':
+        """
+        Return a new collection of views onto ranges of rows of the store,
+        each from the sequence at the given position.
+        """
+        store = self.store
+        metas = self.metas if copy_meta else None
+        sub_sequences = Sequences([
+            ActionSequence.from_store(
+                store=store, start=start, stop=stop,
+                meta=None if metas is None else metas[p]
+            )
+            for p, start, stop in zip(
+                positions.tolist(), starts.tolist(), stops.tolist())
+        ])
+        if len(positions):
+            sub_sequences._store_offsets = starts, stops
+        sub_sequences._executor = self._executor
+        return sub_sequences
+
+    # end region
+
     # region sequence property lists
 
     @property
@@ -355,14 +867,10 @@ class Sequences(object):
 
         :return: Dictionary of {(from, to) => count}
         """
-        transitions = defaultdict(int)
-        # count transitions
-        for sequence in self:
-            for a in range(len(sequence) - 1):
-                from_action = sequence[a].template()
-                to_action = sequence[a + 1].template()
-                transitions[(from_action, to_action)] += 1
-        return dict(transitions)
+        return _merge_counts(self._map_chunks(
+            lambda sequences: TransitionCounter(
+                'action_template').update(sequences).counts()
+        ))
 
     def location_transition_counts(
             self, exclude: Union[str, List[str]] = None
@@ -373,24 +881,10 @@ class Sequences(object):
 
         :return: Counter[Tuple[from, to], count]
         """
-        transitions = Counter()
-        if exclude is not None:
-            if isinstance(exclude, str):
-                exclude = [exclude]
-        else:
-            exclude = []
-        # count transitions
-        for sequence in self:
-            for action in sequence:
-                source = action.source_id
-                target = action.target_id
-                if (
-                        notnull(target) and
-                        source not in exclude and
-                        target not in exclude
-                ):
-                    transitions[(source, target)] += 1
-        return transitions
+        return Counter(_merge_counts(self._map_chunks(
+            lambda sequences: TransitionCounter(
+                'location', exclude=exclude).update(sequences).counts()
+        )))
 
     def dwell_times(
             self, sum_by_location: bool, sum_by_sequence: bool
@@ -404,32 +898,48 @@ class Sequences(object):
                                 each location in each sequence or keep as a
                                 list.
         """
-        if sum_by_sequence:
-            dwell_times = defaultdict(timedelta)
-            for sequence in self:
-                for location, duration in sequence.dwell_times(
-                        sum_by_location=True).items():
-                    dwell_times[location] += duration
-        elif not sum_by_location and not sum_by_sequence:
-            dwell_times = defaultdict(list)
-            for sequence in self:
-                for location, durations in sequence.dwell_times(
-                        sum_by_location=False).items():
-                    dwell_times[location].extend(durations)
-        elif sum_by_location and not sum_by_sequence:
-            dwell_times = defaultdict(list)
-            for sequence in self:
+        if self.store is not None:
+            dwell_times = defaultdict(timedelta if sum_by_sequence else list)
+            dwell_times.update(self.dwell_time_arrays().to_dict(
+                sum_by_location=sum_by_location,
+                sum_by_sequence=sum_by_sequence
+            ))
+            return dwell_times
+
+        def chunk_dwell_times(sequences: Sequences) -> dict:
+            chunk_times = defaultdict(timedelta if sum_by_sequence else list)
+            for sequence in sequences:
                 for location, duration in sequence.dwell_times(
-                        sum_by_location=True).items():
-                    dwell_times[location].append(duration)
-        else:
-            raise ValueError(
-                'Invalid arguments for sum_per_location'
-                ' and / or sum_per_sequence'
-            )
+                        sum_by_location=sum_by_location or
+                        sum_by_sequence).items():
+                    if sum_by_sequence:
+                        chunk_times[location] += duration
+                    elif not sum_by_location:
+                        chunk_times[location].extend(duration)
+                    else:
+                        chunk_times[location].append(duration)
+            return chunk_times
+
+        dwell_times = defaultdict(timedelta if sum_by_sequence else list)
+        for partial in self._map_chunks(chunk_dwell_times):
+            for location, durations in partial.items():
+                dwell_times[location] += durations
 
         return dwell_times
 
+    def dwell_time_arrays(self) -> DwellTimes:
+        """
+        Return the time spent at each location between each pair of
+        consecutive actions in the collection as int64 nanosecond arrays, with
+        methods to sum them by location or sequence and to compute their
+        distributions.
+        """
+        sequences = self if self.store is not None else self.to_columnar()
+        if sequences.store is None:
+            return DwellTimes(ActionStore.from_sequences([]),
+                              array([], dtype=int64), array([], dtype=int64))
+        return DwellTimes.from_sequences(sequences)
+
     def most_probable_location_sequence(
             self,
             exclude: Union[str, List[str]] = None,
@@ -449,34 +959,102 @@ class Sequences(object):
         """
         transitions = self.location_transition_counts(exclude=exclude)
         # find most frequent from point
-        if start_at is not None:
-            current_name = start_at
-        else:
-            current_name = transitions.most_common(1)[0][0][0]
-        sequence = [current_name]
-        # iteratively find most frequent transition point from the current point
-        found = True
-        while found:
-            # remove last added location as a possible target
-            if not allow_repeats:
-                transitions = {from_to: count for from_to, count in
-                               transitions.items()
-                               if from_to[1] != current_name}
-            # find next location
-            froms = [from_to[0] for from_to in transitions.keys()]
-            if current_name in froms:
-                current_name = Counter({
-                    from_to: count for from_to, count in transitions.items()
-                    if from_to[0] == current_name
-                }).most_common(1)[0][0][1]
-                # add if not already in sequence
-                if current_name not in sequence:
-                    sequence.append(current_name)
-                else:
-                    found = False
-            else:
-                found = False
-        return sequence
+        if start_at is None:
+            start_at = transitions.most_common(1)[0][0][0]
+        markov_chain = MarkovChain.from_counts(transitions)
+        if start_at not in markov_chain:
+            return [start_at]
+        return markov_chain.most_probable_path(start=start_at,
+                                               allow_revisits=allow_repeats)
+
+    def start_times(self) -> DatetimeIndex:
+        """
+        Return the time stamp of the first action of each ActionSequence.
+        """
+        return self._time_stamps('start')
+
+    def end_times(self) -> DatetimeIndex:
+        """
+        Return the time stamp of the last action of each ActionSequence.
+        """
+        return self._time_stamps('end')
+
+    def time_buckets(self, freq: str,
+                     start: Optional[datetime] = None,
+                     end: Optional[datetime] = None,
+                     tz: Optional[str] = None) -> TimeBuckets:
+        """
+        Bucket the ActionSequences by the time of their first action.
+
+        :param freq: pandas frequency of the buckets e.g. '15min', '6H', 'D',
+                     'W-SUN' or 'MS'.
+        :param start: Optional time in the first bucket.
+        :param end: Optional time in the last bucket.
+        :param tz: Optional timezone to bucket in.
+        """
+        return TimeBuckets(self.start_times(), freq=freq,
+                           start=start, end=end, tz=tz)
+
+    def _lookup_values(self, name: str) -> Optional[list]:
+        """
+        Return the value of a named sequence lookup for every sequence,
+        computed from the time stamp arrays of the shared ActionStore, or None
+        if the collection is not columnar or the lookup is not vectorized.
+        """
+        if name not in self._vectorized_lookups or self.store is None:
+            return None
+        which, get_values = self._vectorized_lookups[name]
+        index = self.start_times() if which == 'start' else self.end_times()
+        values = get_values(index)
+        return values.tolist()
+
+    def _time_stamps(self, which: str) -> DatetimeIndex:
+
+        store = self.store
+        if store is None:
+            return DatetimeIndex([getattr(sequence, which)
+                                  for sequence in self._sequences])
+        starts, stops = self.store_offsets()
+        rows = starts if which == 'start' else stops - 1
+        index = DatetimeIndex(store.time_stamps[rows])
+        if store.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(store.tz)
+        return index
+
+    def _map_chunks(self, func: Callable[['Sequences'], Any]) -> list:
+        """
+        Return the result of calling func on this collection, or on a
+        Sequences of each chunk of the collection in chunk order if it has an
+        executor.
+        """
+        if self._executor is None:
+            return [func(self)]
+        return self._executor.map_chunks(
+            lambda chunk: func(Sequences(chunk)), self._sequences
+        )
+
+    def _map_sequences(self, func: Callable[[ActionSequence], Any]) -> list:
+        """
+        Return the result of calling func on each ActionSequence.
+        """
+        if self._executor is None:
+            return [func(sequence) for sequence in self]
+        return list(chain.from_iterable(self._executor.map_chunks(
+            lambda chunk: [func(sequence) for sequence in chunk],
+            self._sequences
+        )))
+
+    def _take(self, positions: ndarray) -> 'Sequences':
+        """
+        Return a new collection of the ActionSequences at the given positions,
+        keeping any shared store offsets.
+        """
+        taken = Sequences([self._sequences[p] for p in positions.tolist()])
+        if self._store_offsets is not None and len(positions):
+            starts, stops = self._store_offsets
+            taken._store_offsets = starts[positions], stops[positions]
+        taken._executor = self._executor
+        return taken
 
     def sort(self, by: str, ascending: bool = True) -> 'Sequences':
 
@@ -533,5 +1111,51 @@ class Sequences(object):
         )).sort('date_time')
 
 
+def _merge_counts(partials: List[Dict[Any, int]]) -> Dict[Any, int]:
+    """
+    Sum dictionaries of counts, keeping keys in order of first occurrence.
+    """
+    if len(partials) == 1:
+        return partials[0]
+    counts = {}
+    for partial in partials:
+        for key, count in partial.items():
+            counts[key] = counts.get(key, 0) + count
+    return counts
+
+
+def _partition_bounds(
+        start: Optional[Union[date, datetime]],
+        end: Optional[Union[date, datetime]]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the 'YYYY-MM-DD' partition values of optional start and end dates.
+    """
+    return tuple(
+        None if value is None else Timestamp(value).strftime('%Y-%m-%d')
+        for value in (start, end)
+    )
+
+
+def _as_templates(
+        condition: Union[ActionFilter, ActionTemplate, List[ActionTemplate]]
+) -> Optional[List[ActionTemplate]]:
+    """
+    Return a split or crop condition as a list of ActionTemplates, or None if
+    it is not made of ActionTemplates.
+    """
+    if isinstance(condition, ActionTemplate):
+        return [condition]
+    if isinstance(condition, (list, tuple, set)) and all(
+            isinstance(template, ActionTemplate) for template in condition):
+        return list(condition)
+    return None
+
+
+def _iso_weeks(index: DatetimeIndex) -> ndarray:
+
+    return index.isocalendar().week.to_numpy(dtype=int64)
+
+
 SequencesGroupByKey = Union[str, Tuple[str, ...]]
 SequencesGrouper = Callable[[Sequences], Any]
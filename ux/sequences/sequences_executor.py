@@ -0,0 +1,131 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
+from multiprocessing import get_all_start_methods, get_context
+from os import cpu_count
+from threading import Lock
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+try:
+    import cloudpickle
+except ImportError:
+    cloudpickle = None
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# the function and chunks of the running task, inherited by forked workers so
+# that neither has to be pickled
+_fork_task: Optional[Tuple[Callable[[list], Any], List[list]]] = None
+_fork_lock = Lock()
+
+
+def _run_fork_task(chunk_index: int):
+
+    func, chunks = _fork_task
+    return func(chunks[chunk_index])
+
+
+def _run_pickled_task(payload: bytes):
+
+    func, chunk = pickle.loads(payload)
+    return func(chunk)
+
+
+class SequencesExecutor(object):
+    """
+    Runs a function over contiguous chunks of a list in a pool of processes or
+    threads, returning the result for each chunk in chunk order so that
+    partial results can be merged deterministically.
+
+    Process pools use the fork start method where the platform supports it,
+    so functions such as lambdas and closures and the items themselves are
+    inherited by the workers rather than pickled. Elsewhere each function and
+    chunk is pickled with cloudpickle if it is installed, or with pickle.
+    The results of each chunk are always pickled back to the parent process.
+    """
+    kinds = ('process', 'thread')
+
+    def __init__(self, n_jobs: Optional[int] = None, kind: str = 'process',
+                 chunk_size: Optional[int] = None):
+        """
+        Create a new SequencesExecutor.
+
+        :param n_jobs: Number of workers. Defaults to the number of CPUs.
+        :param kind: 'process' or 'thread'.
+        :param chunk_size: Optional number of items per chunk. Defaults to
+                           splitting the items into 4 chunks per worker.
+        """
+        if kind not in self.kinds:
+            raise ValueError('kind must be one of {}'.format(self.kinds))
+        if n_jobs is None or n_jobs == -1:
+            n_jobs = cpu_count() or 1
+        if n_jobs < 1:
+            raise ValueError('n_jobs must be at least 1')
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError('chunk_size must be at least 1')
+        self._n_jobs: int = n_jobs
+        self._kind: str = kind
+        self._chunk_size: Optional[int] = chunk_size
+
+    @property
+    def n_jobs(self) -> int:
+
+        return self._n_jobs
+
+    @property
+    def kind(self) -> str:
+
+        return self._kind
+
+    def chunks(self, items: List[T]) -> List[List[T]]:
+        """
+        Split the items into contiguous chunks.
+        """
+        if not items:
+            return []
+        chunk_size = self._chunk_size or ceil(len(items) / (4 * self._n_jobs))
+        return [items[start: start + chunk_size]
+                for start in range(0, len(items), chunk_size)]
+
+    def map_chunks(self, func: Callable[[List[T]], R],
+                   items: List[T]) -> List[R]:
+        """
+        Call the function on each chunk of the items in parallel.
+
+        :param func: Function taking a list of items.
+        :param items: The items to chunk.
+        :return: The result of the function for each chunk, in chunk order.
+        """
+        chunks = self.chunks(items)
+        if self._n_jobs == 1 or len(chunks) <= 1:
+            return [func(chunk) for chunk in chunks]
+        n_workers = min(self._n_jobs, len(chunks))
+        if self._kind == 'thread':
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                return list(executor.map(func, chunks))
+        if 'fork' in get_all_start_methods():
+            return self._map_forked(func, chunks, n_workers)
+        dumps = pickle.dumps if cloudpickle is None else cloudpickle.dumps
+        payloads = [dumps((func, chunk)) for chunk in chunks]
+        with get_context().Pool(n_workers) as pool:
+            return pool.map(_run_pickled_task, payloads)
+
+    @staticmethod
+    def _map_forked(func: Callable[[List[T]], R], chunks: List[List[T]],
+                    n_workers: int) -> List[R]:
+
+        global _fork_task
+        with _fork_lock:
+            _fork_task = (func, chunks)
+            try:
+                with get_context('fork').Pool(n_workers) as pool:
+                    return pool.map(_run_fork_task, range(len(chunks)))
+            finally:
+                _fork_task = None
+
+    def __repr__(self) -> str:
+
+        return 'SequencesExecutor(n_jobs={}, kind={})'.format(
+            self._n_jobs, self._kind
+        )
@@ -196,7 +196,8 @@ class SequencesGroupBy(object):
 
     def group_by(
             self,
-            by: Union[SequenceGrouper, Dict[str, SequenceGrouper], str, list]
+            by: Union[SequenceGrouper, Dict[str, SequenceGrouper], str, list],
+            include_empty: bool = False
     ) -> 'SequencesGroupBy':
         """
         Return a new SequencesGroupBy keyed by each value returned by a single
@@ -206,6 +207,8 @@ class SequencesGroupBy(object):
 
         :param by: lambda(Sequence) or dict[group_name, lambda(Sequence)] or
                    list[str or lambda(Sequence)].
+        :param include_empty: Whether to include empty groups for combinations
+                              of grouper values that no sequence has.
         """
         new_results = OrderedDict()
         group_sub_results: Optional[SequencesGroupBy] = None
@@ -214,7 +217,9 @@ class SequencesGroupBy(object):
                 group_key = list(group_key)
             else:
                 group_key = [group_key]
-            group_sub_results = group_sequences.group_by(by)
+            group_sub_results = group_sequences.group_by(
+                by, include_empty=include_empty
+            )
             for group_sub_key, group_sub_values in group_sub_results.items():
                 if isinstance(group_sub_key, tuple):
                     group_sub_key = list(group_sub_key)
@@ -0,0 +1,265 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, \
+    TYPE_CHECKING
+
+from numpy import arange, asarray, concatenate, cumsum, diff, empty, int64, \
+    intersect1d, ndarray, searchsorted, setdiff1d, uint8, uint16, uint32, \
+    union1d, unique
+
+from ux.actions.action_template import ActionTemplate, intern_template
+from ux.sequences.action_store import ActionStore, expand_ranges
+
+if TYPE_CHECKING:
+    from ux.sequences.sequences import Sequences
+
+
+TemplateKey = Tuple[str, str, Optional[str]]
+
+
+class PostingList(object):
+    """
+    Sorted list of the positions of sequences in a collection, stored as
+    delta-encoded gaps in the smallest unsigned integer type that holds them.
+    """
+    def __init__(self, positions: Iterable[int], size: int):
+        """
+        Create a new PostingList.
+
+        :param positions: Sorted, unique positions of sequences.
+        :param size: The number of sequences in the collection, used to
+                     negate the list.
+        """
+        positions = asarray(positions, dtype=int64)
+        deltas = diff(positions, prepend=0) if len(positions) else positions
+        max_delta = int(deltas.max()) if len(deltas) else 0
+        for dtype in (uint8, uint16, uint32):
+            if max_delta < 2 ** (8 * dtype().itemsize):
+                break
+        else:
+            dtype = int64
+        self._deltas: ndarray = deltas.astype(dtype)
+        self._size: int = size
+
+    @property
+    def size(self) -> int:
+        """
+        Return the number of sequences in the indexed collection.
+        """
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+
+        return self._deltas.nbytes
+
+    def positions(self) -> ndarray:
+        """
+        Return the decoded array of sequence positions.
+        """
+        return cumsum(self._deltas, dtype=int64)
+
+    def __and__(self, other: 'PostingList') -> 'PostingList':
+
+        return PostingList(intersect1d(self.positions(), other.positions(),
+                                       assume_unique=True), self._size)
+
+    def __or__(self, other: 'PostingList') -> 'PostingList':
+
+        return PostingList(union1d(self.positions(), other.positions()),
+                           self._size)
+
+    def __sub__(self, other: 'PostingList') -> 'PostingList':
+
+        return PostingList(setdiff1d(self.positions(), other.positions(),
+                                     assume_unique=True), self._size)
+
+    def __invert__(self) -> 'PostingList':
+
+        return PostingList(setdiff1d(arange(self._size), self.positions(),
+                                     assume_unique=True), self._size)
+
+    def __len__(self) -> int:
+
+        return len(self._deltas)
+
+    def __iter__(self) -> Iterator[int]:
+
+        return iter(self.positions().tolist())
+
+    def __repr__(self) -> str:
+
+        return 'PostingList({} of {})'.format(len(self), self._size)
+
+
+class SequencesIndex(object):
+    """
+    Inverted index from locations, action types and ActionTemplates to the
+    positions of the sequences of a Sequences collection that contain them.
+    """
+    def __init__(self, sequences: 'Sequences'):
+        """
+        Build a new SequencesIndex over a Sequences collection.
+
+        :param sequences: The collection to index. Positions in the posting
+                          lists refer to the order of this collection.
+        """
+        self._size: int = len(sequences)
+        self._locations: Dict[str, PostingList] = {}
+        self._action_types: Dict[str, PostingList] = {}
+        self._templates: Dict[TemplateKey, PostingList] = {}
+        if not self._size:
+            return
+        if sequences.store is not None:
+            starts, stops = sequences.store_offsets()
+            self._build_from_store(sequences.store, starts, stops)
+        else:
+            self._build_from_sequences(sequences)
+
+    @property
+    def size(self) -> int:
+        """
+        Return the number of sequences in the indexed collection.
+        """
+        return self._size
+
+    def all(self) -> PostingList:
+        """
+        Return a PostingList of every sequence in the indexed collection.
+        """
+        return PostingList(arange(self._size), self._size)
+
+    def location(self, location_id: str) -> PostingList:
+        """
+        Return the positions of sequences visiting the location.
+        """
+        return self._locations.get(location_id, self._empty())
+
+    def action_type(self, action_type: str) -> PostingList:
+        """
+        Return the positions of sequences with an action of the type.
+        """
+        return self._action_types.get(action_type, self._empty())
+
+    def template(self, template: ActionTemplate) -> PostingList:
+        """
+        Return the positions of sequences with an action matching the
+        ActionTemplate. Templates with '*' wildcards are resolved to the union
+        of the lists of every matching indexed template.
+        """
+        key = (template.action_type, template.source_id, template.target_id)
+        if '*' not in key:
+            return self._templates.get(key, self._empty())
+        postings = self._empty()
+        for indexed_key, indexed_postings in self._templates.items():
+            if intern_template(*indexed_key) == template:
+                postings = postings | indexed_postings
+        return postings
+
+    def locations(self) -> List[str]:
+
+        return list(self._locations.keys())
+
+    def action_types(self) -> List[str]:
+
+        return list(self._action_types.keys())
+
+    def templates(self) -> List[ActionTemplate]:
+
+        return [intern_template(*key) for key in self._templates.keys()]
+
+    def nbytes(self) -> int:
+        """
+        Return the number of bytes used by the posting lists.
+        """
+        return sum(
+            postings.nbytes
+            for lookup in (self._locations, self._action_types,
+                           self._templates)
+            for postings in lookup.values()
+        )
+
+    def _empty(self) -> PostingList:
+
+        return PostingList(empty(0, dtype=int64), self._size)
+
+    def _build_from_sequences(self, sequences: 'Sequences') -> None:
+
+        locations = defaultdict(set)
+        action_types = defaultdict(set)
+        templates = defaultdict(set)
+        for position, sequence in enumerate(sequences):
+            for action in sequence:
+                locations[action.source_id].add(position)
+                if action.target_id:
+                    locations[action.target_id].add(position)
+                action_types[action.action_type].add(position)
+                templates[(action.action_type, action.source_id,
+                           action.target_id)].add(position)
+        for lookup, values in ((self._locations, locations),
+                               (self._action_types, action_types)):
+            for key, positions in values.items():
+                lookup[key] = PostingList(sorted(positions), self._size)
+        for key, positions in templates.items():
+            self._templates[key] = PostingList(sorted(positions), self._size)
+
+    def _build_from_store(self, store: ActionStore,
+                          starts: ndarray, stops: ndarray) -> None:
+
+        # rows of the store and the position of the sequence they are in
+        rows, positions = expand_ranges(starts, stops)
+        source_codes = store.codes('source_id')[rows].astype(int64)
+        target_codes = store.codes('target_id')[rows].astype(int64)
+        type_codes = store.codes('action_type')[rows].astype(int64)
+        locations = store.categories('location')
+        action_types = store.categories('action_type')
+        # locations
+        has_target = target_codes != -1
+        empty_code = store.code('location', '')
+        if empty_code != -1:
+            has_target &= target_codes != empty_code
+        for key, postings in self._code_postings(
+            concatenate([source_codes, target_codes[has_target]]),
+            concatenate([positions, positions[has_target]])
+        ):
+            self._locations[locations[key]] = postings
+        # action types
+        for key, postings in self._code_postings(type_codes, positions):
+            self._action_types[action_types[key]] = postings
+        # templates, with -1 target codes shifted to 0
+        n_locations = len(locations) + 1
+        template_codes = (
+            type_codes * n_locations * n_locations +
+            source_codes * n_locations + target_codes + 1
+        )
+        for key, postings in self._code_postings(template_codes, positions):
+            type_code, remainder = divmod(key, n_locations * n_locations)
+            source_code, target_code = divmod(remainder, n_locations)
+            self._templates[(
+                action_types[type_code], locations[source_code],
+                None if target_code == 0 else locations[target_code - 1]
+            )] = postings
+
+    def _code_postings(
+            self, codes: ndarray, positions: ndarray
+    ) -> Iterator[Tuple[int, PostingList]]:
+        """
+        Yield each distinct code with the PostingList of the sequence
+        positions it occurs in.
+        """
+        distinct_codes, dense_codes = unique(codes, return_inverse=True)
+        keys = unique(dense_codes.astype(int64) * self._size + positions)
+        key_codes = keys // self._size
+        key_positions = keys % self._size
+        bounds = searchsorted(
+            key_codes, arange(len(distinct_codes))
+        ).tolist() + [len(keys)]
+        for c, code in enumerate(distinct_codes.tolist()):
+            yield code, PostingList(
+                key_positions[bounds[c]: bounds[c + 1]], self._size
+            )
+
+    def __repr__(self) -> str:
+
+        return 'SequencesIndex({} sequences, {} templates)'.format(
+            self._size, len(self._templates)
+        )
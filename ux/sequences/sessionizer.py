@@ -0,0 +1,283 @@
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from numpy import append, arange, argsort, array, asarray, cumsum, diff, \
+    empty, flatnonzero, int32, int64, lexsort, ndarray, zeros
+from pandas import DatetimeIndex
+
+from ux.actions.action_template import ActionTemplate
+from ux.sequences.action_store import ActionStore, CATEGORICAL_COLUMNS, \
+    expand_ranges
+from ux.sequences.sequences import Sequences
+from ux.sequences.template_matcher import TemplateMatcher
+
+
+BOUNDARIES = ('hour', 'day', 'week', 'month', 'year')
+
+
+class Sessionizer(object):
+    """
+    Splits streams of UserActions into sessions, for logs that only have user
+    ids.
+
+    The actions of each user are sorted by time, and a new session is started
+    after an inactivity gap, when a calendar boundary is crossed, at an action
+    matching a start template or after an action matching an end template.
+    Every user is split at once with array operations. Each session is given
+    a synthetic id of the user id and the number of the session for that
+    user, e.g. 'user-1-3'.
+
+    `sessionize` splits a complete log. `update` and `flush` split a log that
+    arrives in time-ordered batches, holding the last session of each user
+    open until a later batch shows that it has ended.
+    """
+    def __init__(self, gap: Optional[timedelta] = timedelta(minutes=30),
+                 boundary: Optional[str] = None,
+                 start_templates: Optional[Iterable[ActionTemplate]] = None,
+                 end_templates: Optional[Iterable[ActionTemplate]] = None,
+                 session_id_format: str = '{user_id}-{number}'):
+        """
+        Create a new Sessionizer.
+
+        :param gap: Start a new session when the time since a user's previous
+                    action is longer than this. None to never split on gaps.
+        :param boundary: Optional calendar period not to let sessions span,
+                         one of 'hour', 'day', 'week', 'month' or 'year', in
+                         the local time of the actions.
+        :param start_templates: Optional ActionTemplates that start a new
+                                session.
+        :param end_templates: Optional ActionTemplates that end a session.
+        :param session_id_format: Format of the session ids, with `user_id`
+                                  and `number` fields.
+        """
+        if boundary is not None and boundary not in BOUNDARIES:
+            raise ValueError('boundary must be one of {}'.format(BOUNDARIES))
+        self._gap: Optional[timedelta] = gap
+        self._boundary: Optional[str] = boundary
+        self._start_templates: List[ActionTemplate] = list(
+            start_templates or [])
+        self._end_templates: List[ActionTemplate] = list(end_templates or [])
+        self._session_id_format: str = session_id_format
+        # incremental state
+        self._open: Optional[ActionStore] = None
+        self._watermark: Optional[int] = None
+        self._n_sessions: Dict[object, int] = {}
+
+    def sessionize(
+            self, actions: Union[Sequences, ActionStore]
+    ) -> Sequences:
+        """
+        Split the actions of every user into sessions.
+
+        :param actions: Sequences or an ActionStore of the actions to split,
+                        e.g. from `Sequences.from_frame` with
+                        `session_col='user_id'`. Existing sequences and
+                        session ids are ignored.
+        :return: One ActionSequence per session, ordered by start time.
+        """
+        store = _user_order(_as_store(actions))
+        starts, stops, _ = self._split(store, hold_open=False)
+        return self._sessions(store, starts, stops, {})
+
+    def update(self, actions: Union[Sequences, ActionStore]) -> Sequences:
+        """
+        Add the next batch of a log and return the sessions that have ended.
+
+        Batches must arrive in time order. The last session of each user is
+        held open, and returned by a later call or by `flush`, unless an end
+        template, the gap or the calendar boundary shows that it has ended.
+
+        :param actions: Sequences or an ActionStore of the next batch.
+        :return: One ActionSequence per ended session, ordered by start time.
+        """
+        store = _as_store(actions)
+        if self._open is not None:
+            store = ActionStore.concat([self._open, store])
+        store = _user_order(store)
+        if len(store):
+            latest = int(store.time_stamps.view(int64).max())
+            if self._watermark is None or latest > self._watermark:
+                self._watermark = latest
+        starts, stops, is_open = self._split(store, hold_open=True)
+        self._open = (None if not is_open.any()
+                      else store.take(starts[is_open], stops[is_open]))
+        return self._sessions(store, starts[~is_open], stops[~is_open],
+                              self._n_sessions)
+
+    def flush(self) -> Sequences:
+        """
+        Return the sessions held open by `update`, e.g. at the end of a log.
+        """
+        if self._open is None:
+            return Sequences([])
+        store = _user_order(self._open)
+        self._open = None
+        starts, stops, _ = self._split(store, hold_open=False)
+        return self._sessions(store, starts, stops, self._n_sessions)
+
+    def _split(self, store: ActionStore,
+               hold_open: bool) -> Tuple[ndarray, ndarray, ndarray]:
+        """
+        Return the first row, row after the last row and whether it is held
+        open of each session in a store ordered by user and time.
+        """
+        n_rows = len(store)
+        if not n_rows:
+            return (empty(0, dtype=int64), empty(0, dtype=int64),
+                    empty(0, dtype=bool))
+        times = store.time_stamps.view(int64)
+        first_rows = store.offsets[: -1]
+        is_start = zeros(n_rows, dtype=bool)
+        is_start[first_rows] = True
+        if self._gap is not None:
+            gap = int(self._gap.total_seconds() * 1e9)
+            is_start[1:] |= diff(times) > gap
+        periods = None
+        if self._boundary is not None:
+            periods = self._periods(times, store.tz)
+            is_start[1:] |= periods[1:] != periods[: -1]
+        if self._start_templates:
+            is_start[_match_rows(self._start_templates, store)] = True
+        is_end = zeros(n_rows, dtype=bool)
+        if self._end_templates:
+            is_end[_match_rows(self._end_templates, store)] = True
+            is_start[1:] |= is_end[: -1]
+        starts = flatnonzero(is_start).astype(int64)
+        stops = append(starts[1:], n_rows).astype(int64)
+        is_open = zeros(len(starts), dtype=bool)
+        if hold_open:
+            # the last session of each user may continue in the next batch
+            user_stops = store.offsets[1:]
+            last = is_start.cumsum()[user_stops - 1] - 1
+            last_rows = stops[last] - 1
+            ended = is_end[last_rows]
+            if self._gap is not None:
+                ended |= self._watermark - times[last_rows] > gap
+            if periods is not None:
+                watermark_period = self._periods(
+                    array([self._watermark], dtype=int64), store.tz)[0]
+                ended |= periods[last_rows] != watermark_period
+            is_open[last[~ended]] = True
+        return starts, stops, is_open
+
+    def _periods(self, times: ndarray, tz) -> ndarray:
+        """
+        Return the number of the calendar period of each UTC time stamp, in
+        local time.
+        """
+        if tz is not None:
+            times = DatetimeIndex(times).tz_localize('UTC').tz_convert(
+                tz).tz_localize(None).asi8
+        times = times.view('datetime64[ns]')
+        if self._boundary == 'week':
+            # weeks starting on Monday, since 1970-01-01 was a Thursday
+            return (times.astype('datetime64[D]').view(int64) + 3) // 7
+        unit = {'hour': 'h', 'day': 'D', 'month': 'M', 'year': 'Y'}[
+            self._boundary]
+        return times.astype('datetime64[{}]'.format(unit)).view(int64)
+
+    def _sessions(self, store: ActionStore, starts: ndarray, stops: ndarray,
+                  n_sessions: Dict[object, int]) -> Sequences:
+        """
+        Return the sessions in a store ordered by user and time as Sequences
+        ordered by start time, with new session ids numbered on from the
+        number of earlier sessions of each user.
+        """
+        if not len(starts):
+            return Sequences([])
+        # number the sessions of each user, which are contiguous
+        user_codes = store.codes('user_id')[starts]
+        first = flatnonzero(
+            append([True], user_codes[1:] != user_codes[: -1]))
+        counts = diff(append(first, len(starts)))
+        users = store.categories('user_id')
+        user_values = [None if code == -1 else users[code]
+                       for code in user_codes[first].tolist()]
+        previous = []
+        for user, count in zip(user_values, counts.tolist()):
+            previous.append(n_sessions.get(user, 0))
+            n_sessions[user] = previous[-1] + count
+        numbers = (
+            arange(len(starts)) - first.repeat(counts) +
+            asarray(previous, dtype=int64).repeat(counts) + 1
+        )
+        session_ids = asarray([
+            self._session_id_format.format(user_id=user, number=number)
+            for user, number in zip(
+                asarray(user_values, dtype=object).repeat(counts).tolist(),
+                numbers.tolist())
+        ], dtype=object)
+        # order the sessions by start time
+        order = argsort(store.time_stamps[starts], kind='stable')
+        starts = starts[order]
+        stops = stops[order]
+        rows, positions = expand_ranges(starts, stops)
+        codes = {column: store.codes(column)[rows]
+                 for column in CATEGORICAL_COLUMNS.keys()}
+        codes['session_id'] = order.astype(int32)[positions]
+        categories = {vocabulary: store.categories(vocabulary)
+                      for vocabulary in set(CATEGORICAL_COLUMNS.values())}
+        categories['session_id'] = session_ids
+        return Sequences.from_store(ActionStore(
+            codes=codes, categories=categories,
+            time_stamps=store.time_stamps[rows],
+            offsets=append([0], cumsum(stops - starts)).astype(int64),
+            action_ids=(None if store.action_ids is None
+                        else store.action_ids[rows]),
+            metas=None if store.metas is None else store.metas[rows],
+            tz=store.tz
+        ))
+
+    def __repr__(self) -> str:
+
+        return 'Sessionizer(gap={}, boundary={})'.format(
+            self._gap, self._boundary)
+
+
+def _as_store(actions: Union[Sequences, ActionStore]) -> ActionStore:
+    """
+    Return an ActionStore of only the actions in a Sequences collection.
+    """
+    if isinstance(actions, ActionStore):
+        return actions
+    if actions.store is None:
+        actions = actions.to_columnar()
+    starts, stops = actions.store_offsets()
+    return actions.store.take(starts, stops)
+
+
+def _match_rows(templates: List[ActionTemplate],
+                store: ActionStore) -> ndarray:
+    """
+    Return the rows of the store matching any of the templates.
+    """
+    # a new matcher per store, as matchers keep the stores they compile for
+    return TemplateMatcher(templates).match_store(
+        store, array([0]), array([len(store)])
+    ).actions
+
+
+def _user_order(store: ActionStore) -> ActionStore:
+    """
+    Return a new ActionStore with one sequence of the actions of each user,
+    sorted by time with ties kept in their existing order.
+    """
+    user_codes = store.codes('user_id')
+    rows = lexsort((store.time_stamps.view(int64), user_codes))
+    sorted_users = user_codes[rows]
+    boundaries = flatnonzero(diff(sorted_users)) + 1
+    offsets = append(append([0], boundaries), len(rows)).astype(int64)
+    if not len(rows):
+        offsets = zeros(1, dtype=int64)
+    return ActionStore(
+        codes={column: store.codes(column)[rows]
+               for column in CATEGORICAL_COLUMNS.keys()},
+        categories={vocabulary: store.categories(vocabulary)
+                    for vocabulary in set(CATEGORICAL_COLUMNS.values())},
+        time_stamps=store.time_stamps[rows],
+        offsets=offsets,
+        action_ids=(None if store.action_ids is None
+                    else store.action_ids[rows]),
+        metas=None if store.metas is None else store.metas[rows],
+        tz=store.tz
+    )
@@ -0,0 +1,255 @@
+from json import dump, dumps, load, loads
+from os import listdir, makedirs
+from os.path import exists, isdir, join
+from typing import List, Optional, Tuple
+
+from numpy import append, asarray, flatnonzero, load as np_load, ndarray, \
+    save as np_save
+from pandas import Categorical, DataFrame, DatetimeIndex
+
+from ux.sequences.action_store import ActionStore, CATEGORICAL_COLUMNS
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
+    pq = None
+
+FORMAT_VERSION = 1
+MANIFEST = 'store.json'
+# key of the manifest in the schema metadata of Parquet files
+PARQUET_MANIFEST = b'ux'
+
+
+def write_store(store: ActionStore, path: str,
+                sequence_metas: Optional[List[dict]] = None) -> None:
+    """
+    Write an ActionStore to a directory of one .npy file per column, which
+    `read_store` can memory-map.
+
+    Codes, time stamps, offsets and string action ids are written as plain
+    arrays. Categories and meta dicts are pickled, so only read directories
+    from trusted sources.
+
+    :param store: The ActionStore to write.
+    :param path: Path of the directory, which is created if needed.
+    :param sequence_metas: Optional meta dict of each sequence in the store.
+    """
+    makedirs(path, exist_ok=True)
+    for column in CATEGORICAL_COLUMNS.keys():
+        np_save(join(path, 'codes.{}.npy'.format(column)), store.codes(column))
+    for vocabulary in set(CATEGORICAL_COLUMNS.values()):
+        np_save(join(path, 'categories.{}.npy'.format(vocabulary)),
+                store.categories(vocabulary), allow_pickle=True)
+    np_save(join(path, 'time_stamps.npy'), store.time_stamps)
+    np_save(join(path, 'offsets.npy'), store.offsets)
+    if store.action_ids is not None:
+        action_ids = store.action_ids
+        if all(isinstance(action_id, str) for action_id in action_ids):
+            # fixed width strings can be memory-mapped
+            action_ids = asarray(action_ids, dtype=str)
+        np_save(join(path, 'action_ids.npy'), action_ids, allow_pickle=True)
+    if store.metas is not None:
+        np_save(join(path, 'metas.npy'), store.metas, allow_pickle=True)
+    if sequence_metas is not None and any(
+            meta is not None for meta in sequence_metas):
+        np_save(join(path, 'sequence_metas.npy'),
+                asarray(sequence_metas, dtype=object), allow_pickle=True)
+    with open(join(path, MANIFEST), 'w') as f:
+        dump({
+            'version': FORMAT_VERSION,
+            'n_actions': len(store),
+            'n_sequences': store.n_sequences,
+            'tz': None if store.tz is None else str(store.tz)
+        }, f)
+
+
+def read_store(path: str,
+               mmap: bool = True) -> Tuple[ActionStore, Optional[List[dict]]]:
+    """
+    Read an ActionStore written by `write_store`.
+
+    :param path: Path of the directory.
+    :param mmap: Whether to memory-map the codes, time stamps, offsets and
+                 action ids so that each column is only read from disk when
+                 it is used.
+    :return: Tuple of (store, meta dict of each sequence or None)
+    """
+    with open(join(path, MANIFEST)) as f:
+        manifest = load(f)
+    if manifest['version'] > FORMAT_VERSION:
+        raise ValueError('store format version {} is not supported'.format(
+            manifest['version']))
+    mmap_mode = 'r' if mmap else None
+
+    def read(name: str) -> Optional[ndarray]:
+        file_path = join(path, name + '.npy')
+        if not exists(file_path):
+            return None
+        try:
+            return np_load(file_path, mmap_mode=mmap_mode)
+        except ValueError:
+            # pickled object arrays cannot be memory-mapped
+            return np_load(file_path, allow_pickle=True)
+
+    store = ActionStore(
+        codes={column: read('codes.' + column)
+               for column in CATEGORICAL_COLUMNS.keys()},
+        categories={vocabulary: read('categories.' + vocabulary)
+                    for vocabulary in set(CATEGORICAL_COLUMNS.values())},
+        time_stamps=read('time_stamps'),
+        offsets=read('offsets'),
+        action_ids=read('action_ids'),
+        metas=read('metas'),
+        tz=manifest['tz']
+    )
+    sequence_metas = read('sequence_metas')
+    if sequence_metas is not None:
+        sequence_metas = sequence_metas.tolist()
+    return store, sequence_metas
+
+
+def is_store(path: str) -> bool:
+    """
+    Return whether the path is a directory written by `write_store`.
+    """
+    return exists(join(path, MANIFEST))
+
+
+def list_partitions(path: str, key: str) -> List[Tuple[str, str]]:
+    """
+    Return the (value, path) of each `key=value` partition directory in a
+    path, sorted by value.
+    """
+    prefix = key + '='
+    return sorted(
+        (name[len(prefix):], join(path, name))
+        for name in listdir(path)
+        if name.startswith(prefix) and isdir(join(path, name))
+    )
+
+
+def write_parquet(store: ActionStore, path: str,
+                  sequence_metas: Optional[List[dict]] = None,
+                  partition_dates: Optional[List[str]] = None) -> None:
+    """
+    Write an ActionStore to Parquet with one row per action. Requires
+    pyarrow.
+
+    Categorical columns are written as dictionary encoded columns, and meta
+    dicts as JSON strings. The sequence of each row is written to a
+    `sequence` column, and the meta of each sequence to a `sequence_meta`
+    column on its first row. Time stamps with a timezone are written in UTC,
+    with the timezone of the store in the schema metadata.
+
+    :param store: The ActionStore to write.
+    :param path: Path of the Parquet file, or of the dataset directory if
+                 partitioned.
+    :param sequence_metas: Optional meta dict of each sequence in the store.
+    :param partition_dates: Optional 'YYYY-MM-DD' date of each sequence to
+                            write a `date=YYYY-MM-DD` partition per date.
+    """
+    if pyarrow is None:
+        raise ImportError('writing Parquet requires pyarrow')
+    sequence_ids = store.sequence_ids()
+    columns = {'sequence': sequence_ids}
+    for column, vocabulary in CATEGORICAL_COLUMNS.items():
+        columns[column] = Categorical.from_codes(
+            store.codes(column), categories=store.categories(vocabulary)
+        )
+    time_stamps = DatetimeIndex(store.time_stamps)
+    if store.tz is not None:
+        time_stamps = time_stamps.tz_localize('UTC')
+    columns['time_stamp'] = time_stamps
+    if store.action_ids is not None:
+        columns['action_id'] = asarray(store.action_ids, dtype=object)
+    if store.metas is not None:
+        columns['meta'] = [None if meta is None else dumps(meta, default=str)
+                           for meta in store.metas]
+    if sequence_metas is not None:
+        first_rows = store.offsets[: -1]
+        sequence_meta = [None] * len(store)
+        for row, meta in zip(first_rows.tolist(), sequence_metas):
+            if meta is not None:
+                sequence_meta[row] = dumps(meta, default=str)
+        columns['sequence_meta'] = sequence_meta
+    if partition_dates is not None:
+        columns['date'] = asarray(partition_dates, dtype=object)[sequence_ids]
+    table = pyarrow.Table.from_pandas(DataFrame(columns),
+                                      preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        PARQUET_MANIFEST: dumps({
+            'version': FORMAT_VERSION,
+            'tz': None if store.tz is None else str(store.tz)
+        })
+    })
+    if partition_dates is None:
+        pq.write_table(table, path)
+    else:
+        pq.write_to_dataset(table, path, partition_cols=['date'])
+
+
+def read_parquet(path: str, start: Optional[str] = None,
+                 end: Optional[str] = None, memory_map: bool = True,
+                 tz: Optional[str] = None
+                 ) -> Tuple[ActionStore, Optional[List[dict]]]:
+    """
+    Read an ActionStore written by `write_parquet`. Requires pyarrow.
+
+    :param path: Path of the Parquet file or partitioned dataset.
+    :param start: Optional first 'YYYY-MM-DD' date partition to read.
+    :param end: Optional last 'YYYY-MM-DD' date partition to read.
+    :param memory_map: Whether to memory-map the file rather than reading it
+                       into memory before decoding.
+    :param tz: Optional timezone to return time stamps in. Defaults to the
+               timezone of the written store.
+    :return: Tuple of (store, meta dict of each sequence or None)
+    """
+    if pyarrow is None:
+        raise ImportError('reading Parquet requires pyarrow')
+    filters = []
+    if start is not None:
+        filters.append(('date', '>=', start))
+    if end is not None:
+        filters.append(('date', '<=', end))
+    table = pq.read_table(path, memory_map=memory_map,
+                          filters=filters or None)
+    manifest = loads((table.schema.metadata or {}).get(PARQUET_MANIFEST,
+                                                        b'{}'))
+    if tz is None:
+        tz = manifest.get('tz')
+    frame = table.to_pandas()
+    if 'date' in frame.columns:
+        # partitions are read in date order, each in written order
+        frame = frame.sort_values(['date', 'sequence'], kind='stable')
+    sequence_ids = frame['sequence'].to_numpy()
+    first_rows = append([0], flatnonzero(
+        sequence_ids[1:] != sequence_ids[: -1]) + 1)
+    lengths = append(first_rows[1:], len(frame)) - first_rows
+    time_stamps = DatetimeIndex(frame['time_stamp'])
+    if time_stamps.tz is not None and tz is not None:
+        time_stamps = time_stamps.tz_convert(tz)
+    store = ActionStore.from_arrays(
+        action_types=frame['action_type'].astype(object),
+        source_ids=frame['source_id'].astype(object),
+        target_ids=frame['target_id'].astype(object),
+        user_ids=frame['user_id'].astype(object),
+        session_ids=frame['session_id'].astype(object),
+        time_stamps=(time_stamps.values if time_stamps.tz is None
+                     else time_stamps),
+        lengths=lengths,
+        action_ids=(frame['action_id'].to_numpy(dtype=object)
+                    if 'action_id' in frame.columns else None),
+        metas=([None if meta is None else loads(meta)
+                for meta in frame['meta']]
+               if 'meta' in frame.columns else None)
+    )
+    sequence_metas = None
+    if 'sequence_meta' in frame.columns:
+        sequence_metas = [
+            None if meta is None else loads(meta)
+            for meta in frame['sequence_meta'].to_numpy()[first_rows]
+        ]
+    return store, sequence_metas
@@ -0,0 +1,171 @@
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Counter as CounterType, Dict, Iterable, \
+    Iterator, List, Optional, Union, TYPE_CHECKING
+
+from ux.actions.action_template import ActionTemplatePair
+from ux.compound_types import StrPair
+from ux.sequences.action_sequence import ActionSequence, SequenceCounter, \
+    SequenceFilter
+from ux.sequences.predicates import SequencePredicate
+from ux.sequences.sequences import Sequences
+from ux.sequences.transition_counter import TransitionCounter
+
+if TYPE_CHECKING:
+    from ux.database_manager import DatabaseManager
+
+SequencesBatch = Union[Sequences, Iterable[ActionSequence]]
+
+
+class StreamingSequences(object):
+    """
+    A collection of ActionSequences read in batches, e.g. from a
+    DatabaseManager, that is never held in memory all at once.
+
+    Each operation makes one pass over the batches, so only a single batch and
+    the running result are in memory at any time. Filters are applied lazily
+    to each batch as it is read.
+    """
+    def __init__(self, get_batches: Callable[[], Iterable[SequencesBatch]]):
+        """
+        Create a new StreamingSequences.
+
+        :param get_batches: Function returning a new iterable of batches of
+                            ActionSequences each time it is called.
+        """
+        self._get_batches: Callable[[], Iterable[SequencesBatch]] = get_batches
+
+    @staticmethod
+    def from_manager(manager: 'DatabaseManager',
+                     start: Optional[datetime] = None,
+                     end: Optional[datetime] = None,
+                     batch_size: int = 1000) -> 'StreamingSequences':
+        """
+        Stream the ActionSequences of the Sessions in a database.
+
+        :param manager: Instance of a class inheriting from DatabaseManager.
+        :param start: Optional start date-time to exclude older sessions.
+        :param end: Optional end date-time to exclude newer sessions.
+        :param batch_size: Maximum number of ActionSequences in each batch.
+        """
+        return StreamingSequences(
+            lambda: manager.iter_session_sequences(
+                start=start, end=end, batch_size=batch_size
+            )
+        )
+
+    def batches(self) -> Iterator[Sequences]:
+        """
+        Yield each batch of ActionSequences as a Sequences collection.
+        """
+        for batch in self._get_batches():
+            if not isinstance(batch, Sequences):
+                batch = Sequences(list(batch))
+            yield batch
+
+    def filter(
+            self, condition: Union[SequenceFilter, SequencePredicate]
+    ) -> 'StreamingSequences':
+        """
+        Return a new StreamingSequences containing only the sequences matching
+        the `condition`.
+
+        :param condition: lambda(sequence) that returns True to include a
+                          sequence, or a SequencePredicate.
+        """
+        if condition is None or condition is True:
+            return self
+        return StreamingSequences(
+            lambda: (batch.filter(condition) for batch in self.batches())
+        )
+
+    def count(
+            self,
+            condition: Optional[Union[SequenceFilter, SequencePredicate]] = None
+    ) -> int:
+        """
+        Return the number of ActionSequences, or the number matching the
+        condition if one is given.
+        """
+        return sum(batch.count(condition) for batch in self.batches())
+
+    def counter(self, get_value: SequenceCounter) -> CounterType[str]:
+        """
+        Return a Counter of each value returned by get_value(sequence) for
+        each sequence, counting each element if a list is returned.
+        """
+        counts = Counter()
+        for batch in self.batches():
+            counts.update(batch.counter(get_value))
+        return counts
+
+    def reduce(self, func: Callable[[Any, Sequences], Any],
+               initial: Any) -> Any:
+        """
+        Fold each batch into an accumulated value with func(value, batch).
+        """
+        value = initial
+        for batch in self.batches():
+            value = func(value, batch)
+        return value
+
+    def transition_counter(
+            self, states: str = 'action_template', order: int = 1,
+            exclude: Optional[Union[Any, List[Any]]] = None
+    ) -> TransitionCounter:
+        """
+        Return a TransitionCounter updated with the transitions in every
+        batch.
+
+        :param states: The kind of state to count transitions between.
+        :param order: The number of consecutive states to count transitions
+                      from.
+        :param exclude: Optional state or list of states to exclude.
+        """
+        counter = TransitionCounter(states=states, order=order,
+                                    exclude=exclude)
+        for batch in self.batches():
+            counter.update(batch)
+        return counter
+
+    def action_template_transition_counts(
+            self
+    ) -> Dict[ActionTemplatePair, int]:
+        """
+        Return counts of transitions between pairs of Actions from each Sequence
+        in the stream.
+
+        :return: Dictionary of {(from, to) => count}
+        """
+        return self.transition_counter('action_template').counts()
+
+    def location_transition_counts(
+            self, exclude: Union[str, List[str]] = None
+    ) -> CounterType[StrPair]:
+        """
+        Count the transitions from each location to each other location in
+        actions in the stream.
+
+        :return: Counter[Tuple[from, to], count]
+        """
+        return Counter(
+            self.transition_counter('location', exclude=exclude).counts()
+        )
+
+    def collect(self) -> Sequences:
+        """
+        Read every batch into a single Sequences collection in memory.
+        """
+        sequences = []
+        for batch in self.batches():
+            sequences.extend(batch)
+        return Sequences(sequences)
+
+    def __iter__(self) -> Iterator[ActionSequence]:
+
+        for batch in self.batches():
+            yield from batch
+
+    def __repr__(self) -> str:
+
+        return 'StreamingSequences()'
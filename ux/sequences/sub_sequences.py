@@ -0,0 +1,149 @@
+from typing import Iterable, Tuple
+
+from numpy import append, arange, concatenate, cumsum, int64, lexsort, \
+    minimum, ndarray, searchsorted, unique, zeros
+
+from ux.actions.action_template import ActionTemplate
+from ux.sequences.action_store import ActionStore
+from ux.sequences.template_matcher import TemplateMatcher
+
+
+SubSequenceRanges = Tuple[ndarray, ndarray, ndarray]
+
+
+def match_offsets(store: ActionStore, starts: ndarray, stops: ndarray,
+                  templates: Iterable[ActionTemplate]) -> ndarray:
+    """
+    Return the sorted unique offsets of the actions matching any of the
+    templates, counting rows across the ranges as if they were concatenated.
+
+    :param store: The ActionStore holding the actions.
+    :param starts: First row of each range.
+    :param stops: Row after the last row of each range.
+    :param templates: The ActionTemplates to match.
+    """
+    matches = TemplateMatcher(templates).match_store(store, starts, stops)
+    range_offsets = append([0], cumsum(stops - starts))[: -1]
+    return unique(range_offsets[matches.positions] + matches.actions)
+
+
+def split_ranges(starts: ndarray, stops: ndarray, matches: ndarray,
+                 how: str) -> SubSequenceRanges:
+    """
+    Split ranges of rows at matched actions, in the same way as
+    `ActionSequence.split`.
+
+    :param starts: First row of each range.
+    :param stops: Row after the last row of each range.
+    :param matches: Sorted offsets of the matched actions from
+                    `match_offsets`.
+    :param how: One of `['before', 'after', 'at']`.
+    :return: Tuple of (position of the range each sub-range came from, first
+             row, row after the last row) of each sub-range, in order.
+    """
+    if how not in ('before', 'after', 'at'):
+        raise ValueError(
+            "'how' must be set to one of ['before', 'after', 'at']")
+    lengths = stops - starts
+    range_ends = cumsum(lengths)
+    range_starts = range_ends - lengths
+    match_positions = searchsorted(range_ends, matches, side='right')
+    # each range starts a sub-range, as does each match or the action after it
+    split_starts = concatenate([
+        range_starts, matches if how == 'before' else matches + 1
+    ])
+    split_positions = concatenate([arange(len(starts)), match_positions])
+    order = lexsort((split_starts, split_positions))
+    split_starts = split_starts[order]
+    split_positions = split_positions[order]
+    if how == 'at':
+        # each sub-range runs up to the next match in its range
+        split_stops = range_ends[split_positions].copy()
+        next_matches = searchsorted(matches, split_starts, side='left')
+        has_next = next_matches < len(matches)
+        split_stops[has_next] = minimum(
+            matches[next_matches[has_next]], split_stops[has_next])
+        # drop the empty sub-ranges before a first or after a last match
+        keep = (split_stops > split_starts) | ~(
+            (split_starts == range_starts[split_positions]) |
+            (split_starts == range_ends[split_positions])
+        )
+    else:
+        # each sub-range runs up to the start of the next one in its range
+        split_stops = range_ends[split_positions].copy()
+        same_range = split_positions[1:] == split_positions[: -1]
+        split_stops[: -1][same_range] = split_starts[1:][same_range]
+        keep = split_stops > split_starts
+    split_positions = split_positions[keep]
+    shift = starts[split_positions] - range_starts[split_positions]
+    return (split_positions, split_starts[keep] + shift,
+            split_stops[keep] + shift)
+
+
+def crop_ranges(starts: ndarray, stops: ndarray, start_matches: ndarray,
+                end_matches: ndarray, how: str) -> SubSequenceRanges:
+    """
+    Crop ranges of rows to start and end matches, in the same way as
+    `ActionSequence.crop`. Ranges without a start and end match in order are
+    dropped.
+
+    :param starts: First row of each range.
+    :param stops: Row after the last row of each range.
+    :param start_matches: Sorted offsets of the actions matching the start.
+    :param end_matches: Sorted offsets of the actions matching the end.
+    :param how: 'first' or 'last'
+    :return: Tuple of (position of the range each cropped range came from,
+             first row, row after the last row) of each cropped range.
+    """
+    lengths = stops - starts
+    range_ends = cumsum(lengths)
+    range_starts = range_ends - lengths
+    if how == 'first':
+        crop_starts, found = _first_after(start_matches, range_starts,
+                                          range_ends, side='left')
+        crop_ends, found_end = _first_after(end_matches, crop_starts,
+                                            range_ends, side='right')
+        found &= found_end
+    elif how == 'last':
+        crop_ends, found = _last_before(end_matches, range_ends,
+                                        range_starts)
+        crop_starts, found_start = _last_before(start_matches, crop_ends,
+                                                range_starts)
+        found &= found_start
+    else:
+        raise ValueError("'how' must be one of 'first' or 'last'")
+    positions = found.nonzero()[0]
+    shift = starts[positions] - range_starts[positions]
+    return (positions, crop_starts[positions] + shift,
+            crop_ends[positions] + 1 + shift)
+
+
+def _first_after(matches: ndarray, after: ndarray, range_ends: ndarray,
+                 side: str) -> Tuple[ndarray, ndarray]:
+    """
+    Return the first match at or after (side='left') or strictly after
+    (side='right') each offset and whether it is within its range.
+    """
+    if not len(matches):
+        return zeros(len(after), dtype=int64), zeros(len(after), dtype=bool)
+    indices = searchsorted(matches, after, side=side)
+    found = indices < len(matches)
+    firsts = matches[indices.clip(max=len(matches) - 1)]
+    found &= firsts < range_ends
+    return firsts, found
+
+
+def _last_before(matches: ndarray, before: ndarray,
+                 range_starts: ndarray) -> Tuple[ndarray, ndarray]:
+    """
+    Return the last match strictly before each offset and whether it is
+    within its range.
+    """
+    if not len(matches):
+        return (zeros(len(before), dtype=int64),
+                zeros(len(before), dtype=bool))
+    indices = searchsorted(matches, before, side='left') - 1
+    found = indices >= 0
+    lasts = matches[indices.clip(min=0)]
+    found &= lasts >= range_starts
+    return lasts, found
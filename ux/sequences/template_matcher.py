@@ -0,0 +1,295 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, \
+    TYPE_CHECKING
+
+from numpy import arange, argsort, array, concatenate, empty, int64, \
+    lexsort, ndarray, ones, searchsorted, zeros
+
+from ux.actions.action_template import ActionTemplate
+from ux.actions.user_action import UserAction
+from ux.sequences.action_store import ActionStore, expand_ranges
+from ux.sequences.sequences_index import TemplateKey
+
+if TYPE_CHECKING:
+    from ux.sequences.action_sequence import ActionSequence
+    from ux.sequences.sequences import Sequences
+
+
+WILDCARD = '*'
+
+
+class TemplateMatches(NamedTuple):
+    """
+    Arrays describing each (action, template) match in a collection.
+    """
+    positions: ndarray  # position of the sequence in the collection
+    actions: ndarray  # index of the action in its sequence
+    templates: ndarray  # index of the matched template
+
+
+class TemplateMatcher(object):
+    """
+    Matches UserActions against a set of ActionTemplates, honouring '*'
+    wildcards in the same way as ActionTemplate.__eq__.
+
+    Concrete templates are resolved by hashing their (action type, source,
+    target) key, or their integer codes for sequences backed by an
+    ActionStore. Wildcard templates are resolved through one lookup table per
+    field.
+    """
+    def __init__(self, templates: Iterable[ActionTemplate]):
+        """
+        Compile a new TemplateMatcher.
+
+        :param templates: The ActionTemplates to match against.
+        """
+        self._templates: List[ActionTemplate] = list(templates)
+        self._concrete: Dict[TemplateKey, List[int]] = defaultdict(list)
+        self._wildcards: List[int] = []
+        for t, template in enumerate(self._templates):
+            if template_has_wildcard(template):
+                self._wildcards.append(t)
+            else:
+                self._concrete[template_key(template)].append(t)
+        self._store_tables: Dict[int, tuple] = {}
+
+    @property
+    def templates(self) -> List[ActionTemplate]:
+        """
+        Return the ActionTemplates in the order their indices refer to.
+        """
+        return self._templates
+
+    def match_action(self, action: UserAction) -> List[int]:
+        """
+        Return the indices of the templates matched by the UserAction.
+        """
+        key = (action.action_type, action.source_id, action.target_id)
+        if WILDCARD in key:
+            template = action.template()
+            return [t for t, other in enumerate(self._templates)
+                    if other == template]
+        matches = list(self._concrete.get(key, []))
+        if self._wildcards:
+            template = action.template()
+            matches.extend(t for t in self._wildcards
+                           if self._templates[t] == template)
+            matches.sort()
+        return matches
+
+    def match_sequence(
+            self, sequence: 'ActionSequence'
+    ) -> Tuple[ndarray, ndarray]:
+        """
+        Return arrays of the index of each matching action in the sequence and
+        the index of the template it matched, ordered by action.
+        """
+        if sequence.store is not None:
+            start, stop = sequence.store_offsets
+            matches = self.match_store(
+                sequence.store, array([start]), array([stop])
+            )
+            return matches.actions, matches.templates
+        actions = []
+        templates = []
+        for a, action in enumerate(sequence):
+            for t in self.match_action(action):
+                actions.append(a)
+                templates.append(t)
+        return array(actions, dtype=int64), array(templates, dtype=int64)
+
+    def match(self, sequences: 'Sequences') -> TemplateMatches:
+        """
+        Match every action of every sequence in the collection at once.
+
+        :param sequences: The Sequences to match.
+        """
+        if sequences.store is not None:
+            starts, stops = sequences.store_offsets()
+            return self.match_store(sequences.store, starts, stops)
+        positions = []
+        actions = []
+        templates = []
+        for p, sequence in enumerate(sequences):
+            sequence_actions, sequence_templates = self.match_sequence(
+                sequence)
+            positions.append(zeros(len(sequence_actions), dtype=int64) + p)
+            actions.append(sequence_actions)
+            templates.append(sequence_templates)
+        if not positions:
+            return TemplateMatches(*[empty(0, dtype=int64)] * 3)
+        return TemplateMatches(
+            concatenate(positions), concatenate(actions),
+            concatenate(templates)
+        )
+
+    def matched_templates(self, sequence: 'ActionSequence') -> Set[int]:
+        """
+        Return the indices of the templates matched by any action in the
+        sequence.
+        """
+        return set(self.match_sequence(sequence)[1].tolist())
+
+    def matches_any(self, sequence: 'ActionSequence') -> bool:
+        """
+        Return whether any action in the sequence matches any template.
+        """
+        if sequence.store is not None:
+            return len(self.match_sequence(sequence)[0]) > 0
+        for action in sequence:
+            if self.match_action(action):
+                return True
+        return False
+
+    def match_store(self, store: ActionStore,
+                    starts: ndarray, stops: ndarray) -> TemplateMatches:
+        """
+        Match the actions in ranges of rows of an ActionStore.
+
+        :param store: The ActionStore to match against.
+        :param starts: The first row of each range.
+        :param stops: The row after the last row of each range.
+        """
+        rows, positions = expand_ranges(starts, stops)
+        n_locations = len(store.categories('location')) + 1
+        type_codes = store.codes('action_type')[rows].astype(int64) + 1
+        source_codes = store.codes('source_id')[rows].astype(int64) + 1
+        target_codes = store.codes('target_id')[rows].astype(int64) + 1
+        concrete_keys, concrete_templates, tables = self._compile(store)
+        matched_rows = []
+        matched_templates = []
+        # concrete templates: look up each action's key in the sorted keys
+        if len(concrete_keys):
+            action_keys = (
+                type_codes * n_locations * n_locations +
+                source_codes * n_locations + target_codes
+            )
+            lefts = searchsorted(concrete_keys, action_keys, side='left')
+            rights = searchsorted(concrete_keys, action_keys, side='right')
+            counts = rights - lefts
+            hits = counts.nonzero()[0]
+            if len(hits):
+                hit_counts = counts[hits]
+                within = arange(int(hit_counts.sum())) - (
+                    hit_counts.cumsum() - hit_counts
+                ).repeat(hit_counts)
+                matched_rows.append(hits.repeat(hit_counts))
+                matched_templates.append(
+                    concrete_templates[lefts[hits].repeat(hit_counts) + within]
+                )
+        # wildcard templates: combine one lookup table per field
+        for t, type_table, source_table, target_table in tables:
+            hits = (
+                type_table[type_codes] &
+                source_table[source_codes] &
+                target_table[target_codes]
+            ).nonzero()[0]
+            matched_rows.append(hits)
+            matched_templates.append(zeros(len(hits), dtype=int64) + t)
+        if matched_rows:
+            hits = concatenate(matched_rows)
+            templates = concatenate(matched_templates)
+            order = lexsort((templates, hits))
+            hits = hits[order]
+            templates = templates[order]
+        else:
+            hits = templates = empty(0, dtype=int64)
+        hit_positions = positions[hits]
+        return TemplateMatches(
+            positions=hit_positions,
+            actions=rows[hits] - starts[hit_positions],
+            templates=templates
+        )
+
+    def _compile(self, store: ActionStore) -> tuple:
+        """
+        Compile the templates against the category codes of an ActionStore.
+
+        :return: Tuple of (sorted concrete keys, template index of each key,
+                 list of (template index, type, source, target) tables for
+                 templates resolved by table lookup)
+        """
+        if id(store) in self._store_tables:
+            compiled_store, compiled = self._store_tables[id(store)]
+            if compiled_store is store:
+                return compiled
+        n_locations = len(store.categories('location')) + 1
+        # literal '*' values in the data match any template field, so every
+        # template goes through the lookup tables if the store has any
+        data_wildcards = any(
+            store.code(column, WILDCARD) != -1
+            for column in ('action_type', 'location')
+        )
+        keys = []
+        key_templates = []
+        tables = []
+        for t, template in enumerate(self._templates):
+            if data_wildcards or t in self._wildcards:
+                tables.append((t,) + tuple(
+                    self._field_table(store, column, value)
+                    for column, value in zip(
+                        ('action_type', 'source_id', 'target_id'),
+                        template_key(template)
+                    )
+                ))
+                continue
+            type_code = store.code('action_type', template.action_type)
+            source_code = store.code('location', template.source_id)
+            target_code = store.code('location', template.target_id)
+            if -1 in (type_code, source_code) or (
+                    template.target_id is not None and target_code == -1):
+                continue
+            keys.append(
+                (type_code + 1) * n_locations * n_locations +
+                (source_code + 1) * n_locations + target_code + 1
+            )
+            key_templates.append(t)
+        keys = array(keys, dtype=int64)
+        key_templates = array(key_templates, dtype=int64)
+        order = argsort(keys, kind='stable')
+        compiled = keys[order], key_templates[order], tables
+        self._store_tables[id(store)] = (store, compiled)
+        return compiled
+
+    @staticmethod
+    def _field_table(store: ActionStore, column: str,
+                     value: Optional[str]) -> ndarray:
+        """
+        Return a boolean table indexed by code + 1 that is True for the codes
+        matching the template field value.
+        """
+        size = len(store.categories(column)) + 1
+        if value == WILDCARD:
+            return ones(size, dtype=bool)
+        table = zeros(size, dtype=bool)
+        table[store.code(column, value) + 1 if value is not None else 0] = (
+            value is None or store.code(column, value) != -1
+        )
+        wildcard_code = store.code(column, WILDCARD)
+        if wildcard_code != -1:
+            table[wildcard_code + 1] = True
+        return table
+
+    def __len__(self) -> int:
+
+        return len(self._templates)
+
+    def __repr__(self) -> str:
+
+        return 'TemplateMatcher({} templates, {} wildcard)'.format(
+            len(self._templates), len(self._wildcards)
+        )
+
+
+def template_key(template: ActionTemplate) -> TemplateKey:
+    """
+    Return the (action type, source id, target id) key of an ActionTemplate.
+    """
+    return template.action_type, template.source_id, template.target_id
+
+
+def template_has_wildcard(template: ActionTemplate) -> bool:
+    """
+    Return whether any field of the ActionTemplate is a '*' wildcard.
+    """
+    return WILDCARD in template_key(template)
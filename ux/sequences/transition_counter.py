@@ -0,0 +1,325 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, \
+    Tuple, Union, TYPE_CHECKING
+
+from numpy import append, arange, array, concatenate, cumsum, empty, int64, \
+    ndarray, unique, zeros
+from pandas import notnull
+from scipy.sparse import coo_matrix, csr_matrix
+
+from ux.actions.action_template import intern_template
+from ux.sequences.action_store import ActionStore, expand_ranges
+
+if TYPE_CHECKING:
+    from ux.sequences.action_sequence import ActionSequence
+
+
+class TransitionCounter(object):
+    """
+    Counts transitions between states of the actions in sequences into a
+    sparse matrix over interned integer state ids.
+
+    The kinds of state are:
+
+    * 'action_template': transitions between the templates of consecutive
+      actions in a sequence.
+    * 'source_id': transitions between the source locations of consecutive
+      actions in a sequence.
+    * 'location': the transition from the source to the target location of
+      each action with a target.
+
+    For order n > 1 the rows of the matrix are n-grams of consecutive states
+    and the columns are the state that follows them.
+    """
+    state_kinds = ('action_template', 'source_id', 'location')
+
+    def __init__(self, states: str = 'action_template', order: int = 1,
+                 exclude: Optional[Union[Any, List[Any]]] = None):
+        """
+        Create a new TransitionCounter.
+
+        :param states: The kind of state to count transitions between.
+        :param order: The number of consecutive states to count transitions
+                      from.
+        :param exclude: Optional state or list of states. Transitions to or
+                        from these states are not counted.
+        """
+        if states not in self.state_kinds:
+            raise ValueError('states must be one of {}'.format(
+                self.state_kinds))
+        if order < 1:
+            raise ValueError('order must be at least 1')
+        if states == 'location' and order != 1:
+            raise ValueError('location transitions only support order 1')
+        if exclude is None:
+            exclude = []
+        elif not isinstance(exclude, (list, tuple, set)):
+            exclude = [exclude]
+        self._states: str = states
+        self._order: int = order
+        self._exclude: List[Any] = list(exclude)
+        self._state_keys: List[Hashable] = []
+        self._state_ids: Dict[Hashable, int] = {}
+        self._excluded_ids: List[int] = []
+        self._context_keys: List[Tuple[int, ...]] = []
+        self._context_ids: Dict[Tuple[int, ...], int] = {}
+        self._pair_ranks: Dict[Tuple[int, int], int] = {}
+        self._matrix: csr_matrix = csr_matrix((0, 0), dtype=int64)
+
+    @property
+    def states(self) -> str:
+        """
+        Return the kind of state transitions are counted between.
+        """
+        return self._states
+
+    @property
+    def order(self) -> int:
+
+        return self._order
+
+    @property
+    def matrix(self) -> csr_matrix:
+        """
+        Return the sparse matrix of counts, with a row for each context id
+        and a column for each state id.
+        """
+        return self._matrix
+
+    @property
+    def state_keys(self) -> List[Hashable]:
+        """
+        Return the state (location id or ActionTemplate) of each state id.
+        """
+        return self._state_keys
+
+    @property
+    def context_keys(self) -> List[Union[Hashable, Tuple[Hashable, ...]]]:
+        """
+        Return the state of each row of the matrix, or the tuple of states for
+        transitions of order > 1.
+        """
+        if self._order == 1:
+            return self._state_keys
+        return [tuple(self._state_keys[s] for s in context)
+                for context in self._context_keys]
+
+    def state_id(self, key: Hashable) -> int:
+        """
+        Return the id of the state, or -1 if it has not been seen.
+        """
+        return self._state_ids.get(key, -1)
+
+    def pair_rank(self, context_id: int, state_id: int) -> int:
+        """
+        Return the order in which the transition from the context to the state
+        was first counted.
+        """
+        return self._pair_ranks[(context_id, state_id)]
+
+    def update(self,
+               sequences: Iterable['ActionSequence']) -> 'TransitionCounter':
+        """
+        Add the transitions in the given sequences to the counts.
+
+        :param sequences: Sequences collection or iterable of ActionSequences.
+        :return: The TransitionCounter, for chaining.
+        """
+        store: Optional[ActionStore] = getattr(sequences, 'store', None)
+        if store is not None:
+            starts, stops = sequences.store_offsets()
+            froms, tos = self._store_transitions(store, starts, stops)
+        else:
+            froms, tos = self._sequence_transitions(sequences)
+        self._add(froms, tos)
+        return self
+
+    def counts(self) -> Dict[Tuple[Hashable, Hashable], int]:
+        """
+        Return a dictionary of {(from, to) => count}, in the order each
+        transition was first seen.
+        """
+        coo = self._matrix.tocoo()
+        rows = coo.row.tolist()
+        cols = coo.col.tolist()
+        data = coo.data.tolist()
+        context_keys = self.context_keys
+        ranks = self._pair_ranks
+        order = sorted(range(len(data)),
+                       key=lambda i: ranks[(rows[i], cols[i])])
+        return {
+            (context_keys[rows[i]], self._state_keys[cols[i]]): data[i]
+            for i in order
+        }
+
+    def _intern(self, key: Hashable) -> int:
+
+        state_id = self._state_ids.get(key)
+        if state_id is None:
+            state_id = len(self._state_keys)
+            self._state_ids[key] = state_id
+            self._state_keys.append(key)
+            if any(isinstance(excluded, type(key)) and key == excluded
+                   for excluded in self._exclude):
+                self._excluded_ids.append(state_id)
+        return state_id
+
+    def _intern_codes(self, codes: ndarray,
+                      decode: Callable[[int], Hashable]) -> ndarray:
+        """
+        Map an array of store codes to state ids, decoding each distinct code
+        once.
+        """
+        distinct, inverse = unique(codes, return_inverse=True)
+        state_ids = array([self._intern(decode(code))
+                           for code in distinct.tolist()], dtype=int64)
+        return state_ids[inverse] if len(distinct) else empty(0, dtype=int64)
+
+    def _store_transitions(self, store: ActionStore,
+                           starts: ndarray, stops: ndarray
+                           ) -> Tuple[ndarray, ndarray]:
+
+        rows, positions = expand_ranges(starts, stops)
+        locations = store.categories('location')
+        source_codes = store.codes('source_id')[rows].astype(int64)
+        if self._states == 'location':
+            target_codes = store.codes('target_id')[rows].astype(int64)
+            has_target = (source_codes != -1) & (target_codes != -1)
+            state_ids = self._intern_codes(
+                concatenate([source_codes[has_target],
+                             target_codes[has_target]]),
+                lambda code: locations[code]
+            )
+            n_pairs = int(has_target.sum())
+            return self._exclude_pairs(state_ids[: n_pairs],
+                                       state_ids[n_pairs:])
+        if self._states == 'source_id':
+            state_ids = self._intern_codes(
+                source_codes, lambda code: locations[code])
+        else:
+            action_types = store.categories('action_type')
+            n_locations = len(locations) + 1
+            target_codes = store.codes('target_id')[rows].astype(int64) + 1
+            type_codes = store.codes('action_type')[rows].astype(int64)
+
+            def decode(code: int):
+                type_code, remainder = divmod(code, n_locations * n_locations)
+                source_code, target_code = divmod(remainder, n_locations)
+                return intern_template(
+                    action_types[type_code], locations[source_code],
+                    None if target_code == 0 else locations[target_code - 1]
+                )
+
+            state_ids = self._intern_codes(
+                type_codes * n_locations * n_locations +
+                source_codes * n_locations + target_codes,
+                decode
+            )
+        return self._ngram_transitions(state_ids, positions)
+
+    def _sequence_transitions(
+            self, sequences: Iterable['ActionSequence']
+    ) -> Tuple[ndarray, ndarray]:
+
+        if self._states == 'location':
+            sources = []
+            targets = []
+            for sequence in sequences:
+                for action in sequence:
+                    source = action.source_id
+                    target = action.target_id
+                    if notnull(source) and notnull(target):
+                        sources.append(self._intern(source))
+                        targets.append(self._intern(target))
+            return self._exclude_pairs(array(sources, dtype=int64),
+                                       array(targets, dtype=int64))
+        state_ids = []
+        positions = []
+        for position, sequence in enumerate(sequences):
+            if self._states == 'source_id':
+                state_ids.extend(self._intern(source_id)
+                                 for source_id in sequence.source_ids)
+            else:
+                state_ids.extend(self._intern(template)
+                                 for template in sequence.action_templates())
+            positions.extend([position] * len(sequence))
+        return self._ngram_transitions(array(state_ids, dtype=int64),
+                                       array(positions, dtype=int64))
+
+    def _excluded_mask(self, state_ids: ndarray) -> ndarray:
+
+        excluded = zeros(len(self._state_keys), dtype=bool)
+        excluded[self._excluded_ids] = True
+        return excluded[state_ids]
+
+    def _exclude_pairs(self, froms: ndarray,
+                       tos: ndarray) -> Tuple[ndarray, ndarray]:
+
+        if not self._excluded_ids:
+            return froms, tos
+        keep = ~(self._excluded_mask(froms) | self._excluded_mask(tos))
+        froms = froms[keep]
+        tos = tos[keep]
+        return froms, tos
+
+    def _ngram_transitions(self, state_ids: ndarray,
+                           positions: ndarray) -> Tuple[ndarray, ndarray]:
+        """
+        Return the context id and next state id of each transition in the
+        stream of states, where consecutive states with the same position are
+        in the same sequence.
+        """
+        n = self._order
+        n_states = len(state_ids)
+        if n_states <= n:
+            return empty(0, dtype=int64), empty(0, dtype=int64)
+        valid = positions[: n_states - n] == positions[n:]
+        if self._excluded_ids:
+            excluded = append([0], cumsum(self._excluded_mask(state_ids)))
+            valid &= excluded[n + 1:] - excluded[: n_states - n] == 0
+        tos = state_ids[n:][valid]
+        if n == 1:
+            return state_ids[: -1][valid], tos
+        windows = array([state_ids[k: n_states - n + k][valid]
+                         for k in range(n)]).T
+        if not len(windows):
+            return empty(0, dtype=int64), tos
+        distinct, inverse = unique(windows, axis=0, return_inverse=True)
+        context_ids = []
+        for context in map(tuple, distinct.tolist()):
+            context_id = self._context_ids.get(context)
+            if context_id is None:
+                context_id = len(self._context_keys)
+                self._context_ids[context] = context_id
+                self._context_keys.append(context)
+            context_ids.append(context_id)
+        return array(context_ids, dtype=int64)[inverse.ravel()], tos
+
+    def _add(self, froms: ndarray, tos: ndarray) -> None:
+        """
+        Add the transitions to the count matrix, growing it for new states.
+        """
+        n_states = len(self._state_keys)
+        n_contexts = n_states if self._order == 1 else len(self._context_keys)
+        shape = (n_contexts, n_states)
+        if self._matrix.shape != shape:
+            self._matrix.resize(shape)
+        if not len(froms):
+            return
+        pairs, first_seen, counts = unique(
+            froms * n_states + tos, return_index=True, return_counts=True
+        )
+        for p in arange(len(pairs))[first_seen.argsort()].tolist():
+            pair = divmod(int(pairs[p]), n_states)
+            if pair not in self._pair_ranks:
+                self._pair_ranks[pair] = len(self._pair_ranks)
+        self._matrix = self._matrix + coo_matrix(
+            (counts.astype(int64), (pairs // n_states, pairs % n_states)),
+            shape=shape
+        ).tocsr()
+
+    def __repr__(self) -> str:
+
+        return 'TransitionCounter({}, order={}, {} states, {} counted)'.format(
+            self._states, self._order, len(self._state_keys),
+            int(self._matrix.sum())
+        )
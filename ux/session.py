@@ -5,6 +5,8 @@ class Session(object):
     """
     Represents a single User Session.
     """
+    __slots__ = ('_session_id', '_user_id', '_start_time', '_end_time')
+
     def __init__(self, session_id: str, user_id: str,
                  start_time: datetime, end_time: datetime):
         """
@@ -0,0 +1,529 @@
+import sqlite3
+from datetime import datetime
+from json import dumps, loads
+from threading import RLock
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from numpy import array, bincount, int64
+from pandas import DatetimeIndex, Timestamp
+
+from ux.actions.user_action import UserAction
+from ux.database_manager import DatabaseManager
+from ux.location import Location
+from ux.sequences.action_sequence import ActionSequence
+from ux.sequences.action_store import ActionStore
+from ux.sequences.sequences import Sequences
+from ux.session import Session
+from ux.user import User
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS action_types (
+    action_type_key INTEGER PRIMARY KEY,
+    action_type TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS locations (
+    location_key INTEGER PRIMARY KEY,
+    location_id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS users (
+    user_key INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_key INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL UNIQUE,
+    user_key INTEGER REFERENCES users (user_key),
+    start_time INTEGER NOT NULL,
+    end_time INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS actions (
+    action_key INTEGER PRIMARY KEY,
+    action_id TEXT,
+    action_type_key INTEGER NOT NULL REFERENCES action_types (action_type_key),
+    source_key INTEGER NOT NULL REFERENCES locations (location_key),
+    target_key INTEGER REFERENCES locations (location_key),
+    user_key INTEGER REFERENCES users (user_key),
+    session_key INTEGER NOT NULL REFERENCES sessions (session_key),
+    time_stamp INTEGER NOT NULL,
+    meta TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_actions_session_time
+    ON actions (session_key, time_stamp);
+CREATE INDEX IF NOT EXISTS ix_actions_user ON actions (user_key);
+CREATE INDEX IF NOT EXISTS ix_actions_source ON actions (source_key);
+CREATE INDEX IF NOT EXISTS ix_actions_target ON actions (target_key);
+CREATE INDEX IF NOT EXISTS ix_actions_action_id ON actions (action_id);
+CREATE INDEX IF NOT EXISTS ix_sessions_start ON sessions (start_time);
+CREATE INDEX IF NOT EXISTS ix_sessions_user ON sessions (user_key);
+"""
+
+_ACTION_COLUMNS = """
+    a.action_id, t.action_type, src.location_id, tgt.location_id, u.user_id,
+    s.session_id, a.time_stamp, a.meta
+FROM actions a
+    JOIN action_types t ON t.action_type_key = a.action_type_key
+    JOIN locations src ON src.location_key = a.source_key
+    LEFT JOIN locations tgt ON tgt.location_key = a.target_key
+    LEFT JOIN users u ON u.user_key = a.user_key
+    JOIN sessions s ON s.session_key = a.session_key
+"""
+
+_SESSION_COLUMNS = """
+    s.session_id, u.user_id, s.start_time, s.end_time
+FROM sessions s
+    LEFT JOIN users u ON u.user_key = s.user_key
+"""
+
+# the tables holding the distinct values of each normalised column
+_VOCABULARIES = {
+    'action_type': ('action_types', 'action_type_key', 'action_type'),
+    'location': ('locations', 'location_key', 'location_id'),
+    'user_id': ('users', 'user_key', 'user_id')
+}
+
+ActionRow = Tuple[Optional[str], str, str, Optional[str], Optional[str],
+                  str, int, Optional[str]]
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """
+    DatabaseManager backed by a SQLite database using the Python standard
+    library.
+
+    Action types, locations, users and sessions are normalised into their own
+    tables and referenced from the actions table by integer keys. Actions are
+    indexed by (session, time stamp), user, source and target, so sessions
+    are read with range scans and batches of sessions are read with a single
+    query into a columnar ActionStore.
+
+    Time stamps are stored as integer nanoseconds since the epoch. Timezone
+    aware time stamps are stored in UTC and returned in the timezone of the
+    manager; naive time stamps are stored and returned as they are.
+    """
+    def __init__(self, path: str = ':memory:', tz: Optional[str] = None):
+        """
+        Open or create a SQLite database.
+
+        :param path: Path of the database file, or ':memory:' for an
+                     in-memory database.
+        :param tz: Optional timezone to return time stamps in, for databases
+                   of timezone aware actions.
+        """
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._tz: Optional[str] = tz
+        # the connection is shared with prefetching threads
+        self._lock = RLock()
+
+    def close(self) -> None:
+
+        self._connection.close()
+
+    # region writing
+
+    def insert_user_actions(self, user_actions: Iterable[UserAction],
+                            batch_size: int = 10000) -> int:
+        """
+        Insert UserActions into the database in batches, creating the action
+        types, locations, users and sessions they reference.
+
+        :param user_actions: Iterable of UserActions to insert.
+        :param batch_size: Number of actions to insert per transaction.
+        :return: The number of actions inserted.
+        """
+        n_inserted = 0
+        batch = []
+        for user_action in user_actions:
+            batch.append(user_action)
+            if len(batch) == batch_size:
+                n_inserted += self._insert_batch(batch)
+                batch = []
+        if batch:
+            n_inserted += self._insert_batch(batch)
+        return n_inserted
+
+    def _insert_batch(self, user_actions: List[UserAction]) -> int:
+
+        time_stamps = self._to_nanoseconds(
+            [action.time_stamp for action in user_actions]
+        )
+        with self._lock, self._connection:
+            type_keys = self._keys('action_type', [
+                action.action_type for action in user_actions
+            ])
+            location_keys = self._keys('location', [
+                location for action in user_actions
+                for location in (action.source_id, action.target_id)
+            ])
+            user_keys = self._keys('user_id', [
+                action.user_id for action in user_actions
+            ])
+            # upsert each session with the extent of its actions in the batch
+            sessions: Dict[str, list] = {}
+            for action, time_stamp in zip(user_actions, time_stamps):
+                session = sessions.get(action.session_id)
+                if session is None:
+                    sessions[action.session_id] = [
+                        action.session_id, user_keys.get(action.user_id),
+                        time_stamp, time_stamp
+                    ]
+                else:
+                    session[2] = min(session[2], time_stamp)
+                    session[3] = max(session[3], time_stamp)
+            self._connection.executemany(
+                'INSERT INTO sessions '
+                '(session_id, user_key, start_time, end_time) '
+                'VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (session_id) DO UPDATE SET '
+                'start_time = min(start_time, excluded.start_time), '
+                'end_time = max(end_time, excluded.end_time)',
+                list(sessions.values())
+            )
+            session_keys = self._existing_keys(
+                'sessions', 'session_key', 'session_id', list(sessions.keys())
+            )
+            self._connection.executemany(
+                'INSERT INTO actions (action_id, action_type_key, source_key, '
+                'target_key, user_key, session_key, time_stamp, meta) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (action.action_id, type_keys[action.action_type],
+                     location_keys[action.source_id],
+                     location_keys.get(action.target_id),
+                     user_keys.get(action.user_id),
+                     session_keys[action.session_id], time_stamp,
+                     None if action.meta is None else dumps(action.meta))
+                    for action, time_stamp in zip(user_actions, time_stamps)
+                ]
+            )
+        return len(user_actions)
+
+    def _keys(self, vocabulary: str, values: List[str]) -> Dict[str, int]:
+        """
+        Return the key of each distinct non-null value in a vocabulary table,
+        inserting the values that are new.
+        """
+        table, key_column, value_column = _VOCABULARIES[vocabulary]
+        distinct = list({value: None for value in values
+                         if value is not None})
+        self._connection.executemany(
+            'INSERT OR IGNORE INTO {} ({}) VALUES (?)'.format(
+                table, value_column),
+            [(value,) for value in distinct]
+        )
+        return self._existing_keys(table, key_column, value_column, distinct)
+
+    def _existing_keys(self, table: str, key_column: str, value_column: str,
+                       values: List[str]) -> Dict[str, int]:
+
+        keys = {}
+        for first in range(0, len(values), 500):
+            chunk = values[first: first + 500]
+            keys.update(self._connection.execute(
+                'SELECT {}, {} FROM {} WHERE {} IN ({})'.format(
+                    value_column, key_column, table, value_column,
+                    ', '.join('?' * len(chunk))
+                ),
+                chunk
+            ).fetchall())
+        return keys
+
+    # end region
+
+    # region sessions and users
+
+    def session(self, session_id: str) -> Session:
+
+        row = self._fetch_one(
+            'SELECT {} WHERE s.session_id = ?'.format(_SESSION_COLUMNS),
+            (session_id,)
+        )
+        if row is None:
+            raise KeyError('no session with id {}'.format(session_id))
+        return self._session(row)
+
+    def sessions(self) -> List[Session]:
+
+        return [session for sessions in self.iter_sessions()
+                for session in sessions]
+
+    def iter_sessions(self, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None,
+                      batch_size: int = 1000) -> Iterator[List[Session]]:
+        """
+        Yield batches of the Sessions in the database in order of start time,
+        optionally only those starting between start and end, reading one
+        batch at a time from a cursor.
+        """
+        conditions = []
+        parameters = []
+        if start:
+            conditions.append('s.start_time >= ?')
+            parameters.append(self._to_nanoseconds([start])[0])
+        if end:
+            conditions.append('s.start_time <= ?')
+            parameters.append(self._to_nanoseconds([end])[0])
+        query = 'SELECT {} {} ORDER BY s.start_time, s.session_key'.format(
+            _SESSION_COLUMNS,
+            'WHERE ' + ' AND '.join(conditions) if conditions else ''
+        )
+        for rows in self._fetch_batches(query, parameters, batch_size):
+            yield [self._session(row) for row in rows]
+
+    def user(self, user_id: str) -> User:
+
+        users = self._users([user_id])
+        if not users:
+            raise KeyError('no user with id {}'.format(user_id))
+        return users[0]
+
+    def users(self) -> List[User]:
+
+        return [user for users in self.iter_users() for user in users]
+
+    def iter_users(self, batch_size: int = 1000) -> Iterator[List[User]]:
+
+        for rows in self._fetch_batches(
+                'SELECT user_id FROM users ORDER BY user_key', (), batch_size
+        ):
+            yield self._users([row[0] for row in rows])
+
+    def _users(self, user_ids: List[str]) -> List[User]:
+        """
+        Return a User with its session and action ids for each user id that
+        exists.
+        """
+        if not user_ids:
+            return []
+        placeholders = ', '.join('?' * len(user_ids))
+        users = {
+            user_id: User(user_id=user_id)
+            for (user_id,) in self._fetch_all(
+                'SELECT user_id FROM users WHERE user_id IN ({}) '
+                'ORDER BY user_key'.format(placeholders), user_ids
+            )
+        }
+        for user_id, session_id in self._fetch_all(
+                'SELECT u.user_id, s.session_id FROM sessions s '
+                'JOIN users u ON u.user_key = s.user_key '
+                'WHERE u.user_id IN ({}) '
+                'ORDER BY s.start_time, s.session_key'.format(placeholders),
+                user_ids
+        ):
+            users[user_id].add_session_id(session_id)
+        for user_id, action_id in self._fetch_all(
+                'SELECT u.user_id, a.action_id FROM actions a '
+                'JOIN users u ON u.user_key = a.user_key '
+                'WHERE u.user_id IN ({}) '
+                'ORDER BY a.time_stamp, a.action_key'.format(placeholders),
+                user_ids
+        ):
+            users[user_id].add_action_id(action_id)
+        return list(users.values())
+
+    # end region
+
+    # region actions, locations and action types
+
+    def user_action(self, action_id: str) -> UserAction:
+
+        row = self._fetch_one(
+            'SELECT {} WHERE a.action_id = ?'.format(_ACTION_COLUMNS),
+            (action_id,)
+        )
+        if row is None:
+            raise KeyError('no action with id {}'.format(action_id))
+        return self._user_actions([row])[0]
+
+    def user_actions(self, user_id: str) -> List[UserAction]:
+
+        return self._user_actions(self._fetch_all(
+            'SELECT {} WHERE u.user_id = ? '
+            'ORDER BY a.time_stamp, a.action_key'.format(_ACTION_COLUMNS),
+            (user_id,)
+        ))
+
+    def location(self, location_id: str) -> Location:
+
+        if self._fetch_one('SELECT 1 FROM locations WHERE location_id = ?',
+                           (location_id,)) is None:
+            raise KeyError('no location with id {}'.format(location_id))
+        return Location(location_id)
+
+    def locations(self) -> List[Location]:
+
+        return [Location(location_id) for (location_id,) in self._fetch_all(
+            'SELECT location_id FROM locations ORDER BY location_key', ()
+        )]
+
+    def action_types(self) -> List[str]:
+
+        return [action_type for (action_type,) in self._fetch_all(
+            'SELECT action_type FROM action_types ORDER BY action_type_key',
+            ()
+        )]
+
+    # end region
+
+    # region sequences
+
+    def get_session_sequence(self, session_id) -> ActionSequence:
+        """
+        Return the ActionSequence of the Session with the given id, read with
+        a query for the single session.
+        """
+        rows = self._fetch_all(
+            'SELECT {} WHERE a.session_key = '
+            '(SELECT session_key FROM sessions WHERE session_id = ?) '
+            'ORDER BY a.time_stamp, a.action_key'.format(_ACTION_COLUMNS),
+            (session_id,)
+        )
+        if not rows:
+            raise KeyError('no session with id {}'.format(session_id))
+        return self._sequences(rows, [0] * len(rows), 1)[0]
+
+    def get_session_sequence_batch(
+            self, session_ids: List[str]
+    ) -> List[ActionSequence]:
+        """
+        Return the ActionSequence of each Session in a batch of session ids,
+        read with a single query into one columnar ActionStore.
+        """
+        if not session_ids:
+            return []
+        with self._lock:
+            self._connection.execute(
+                'CREATE TEMP TABLE IF NOT EXISTS batch_sessions '
+                '(position INTEGER PRIMARY KEY, session_id TEXT)'
+            )
+            self._connection.execute('DELETE FROM batch_sessions')
+            self._connection.executemany(
+                'INSERT INTO batch_sessions (position, session_id) '
+                'VALUES (?, ?)',
+                list(enumerate(session_ids))
+            )
+            rows = self._connection.execute(
+                'SELECT b.position, {} '
+                'JOIN batch_sessions b ON b.session_id = s.session_id '
+                'ORDER BY b.position, a.time_stamp, a.action_key'.format(
+                    _ACTION_COLUMNS
+                )
+            ).fetchall()
+            self._connection.execute('DELETE FROM batch_sessions')
+        positions = [row[0] for row in rows]
+        sequences = self._sequences([row[1:] for row in rows], positions,
+                                    len(session_ids))
+        for session_id, sequence in zip(session_ids, sequences):
+            if sequence is None:
+                raise KeyError('no session with id {}'.format(session_id))
+        return sequences
+
+    def _sequences(self, rows: List[ActionRow], positions: List[int],
+                   n_sequences: int) -> List[Optional[ActionSequence]]:
+        """
+        Create an ActionStore from rows of actions ordered by position and
+        return an ActionSequence view for each position, or None for
+        positions with no actions.
+        """
+        lengths = bincount(array(positions, dtype=int64),
+                           minlength=n_sequences)
+        if not rows:
+            return [None] * n_sequences
+        columns = list(zip(*rows))
+        time_stamps = self._time_index(columns[6])
+        store = ActionStore.from_arrays(
+            action_types=columns[1], source_ids=columns[2],
+            target_ids=columns[3], user_ids=columns[4],
+            session_ids=columns[5],
+            time_stamps=(time_stamps.values if time_stamps.tz is None
+                         else time_stamps),
+            lengths=lengths[lengths > 0], action_ids=columns[0],
+            metas=[None if meta is None else loads(meta)
+                   for meta in columns[7]]
+        )
+        views = iter(Sequences.from_store(store).sequences)
+        return [next(views) if length else None
+                for length in lengths.tolist()]
+
+    # end region
+
+    # region helpers
+
+    def _fetch_one(self, query: str, parameters) -> Optional[tuple]:
+
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchone()
+
+    def _fetch_all(self, query: str, parameters) -> List[tuple]:
+
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchall()
+
+    def _fetch_batches(self, query: str, parameters,
+                       batch_size: int) -> Iterator[List[tuple]]:
+
+        cursor = self._connection.cursor()
+        with self._lock:
+            cursor.execute(query, parameters)
+        try:
+            while True:
+                with self._lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            cursor.close()
+
+    def _session(self, row: tuple) -> Session:
+
+        start_time, end_time = self._from_nanoseconds(row[2:])
+        return Session(session_id=row[0], user_id=row[1],
+                       start_time=start_time, end_time=end_time)
+
+    def _user_actions(self, rows: List[ActionRow]) -> List[UserAction]:
+
+        time_stamps = self._from_nanoseconds([row[6] for row in rows])
+        return [
+            UserAction(
+                action_id=action_id, action_type=action_type,
+                source_id=source_id, target_id=target_id,
+                time_stamp=time_stamp, user_id=user_id,
+                session_id=session_id,
+                meta=None if meta is None else loads(meta)
+            )
+            for (action_id, action_type, source_id, target_id, user_id,
+                 session_id, _, meta), time_stamp in zip(rows, time_stamps)
+        ]
+
+    @staticmethod
+    def _to_nanoseconds(time_stamps: List[datetime]) -> List[int]:
+        """
+        Convert date-times to integer nanoseconds, in UTC if they are aware.
+        """
+        nanoseconds = []
+        for time_stamp in time_stamps:
+            time_stamp = Timestamp(time_stamp)
+            if time_stamp.tz is not None:
+                time_stamp = time_stamp.tz_convert('UTC').tz_localize(None)
+            nanoseconds.append(time_stamp.value)
+        return nanoseconds
+
+    def _time_index(self, nanoseconds: Iterable[int]) -> DatetimeIndex:
+
+        index = DatetimeIndex(array(list(nanoseconds), dtype=int64).view(
+            'datetime64[ns]'
+        ))
+        if self._tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self._tz)
+        return index
+
+    def _from_nanoseconds(self, nanoseconds: Iterable[int]) -> List[datetime]:
+
+        return list(self._time_index(nanoseconds).to_pydatetime())
+
+    # end region
+
+    def __repr__(self) -> str:
+
+        return 'SQLiteDatabaseManager()'
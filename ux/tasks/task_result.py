@@ -2,7 +2,6 @@ from typing import List, Tuple, Optional
 
 from ux.calcs.basic_calcs.task_success import binary_task_success_rate
 from ux.compound_types import FloatPair, Number
-from ux.tasks import TaskResult
 
 
 class TaskResult(object):
@@ -21,7 +20,7 @@ class TaskResult(object):
 
     @staticmethod
     def binary_task_success_rate(
-            results: List[TaskResult],
+            results: List['TaskResult'],
             alpha: float = 0.05,
             method: str = 'normal'
     ) -> Tuple[float, FloatPair]:
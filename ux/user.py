@@ -5,6 +5,8 @@ class User(object):
     """
     Represents a User.
     """
+    __slots__ = ('_user_id', '_session_ids', '_action_ids')
+
     def __init__(
             self,
             user_id: str,
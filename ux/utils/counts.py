@@ -1,12 +1,15 @@
-from collections import Counter
+from collections import Counter, OrderedDict
+from datetime import date
 from typing import Dict, List, Union, Callable
 
 from ux.counts.count_config import CountConfig
+from ux.counts.count_evaluator import CountEvaluator
 from ux.counts.temporal_count import TemporalCount
 from ux.sequences.action_sequence import ActionSequence, SequenceFilter, \
     SequenceGrouper
 from ux.sequences.sequences import Sequences
 from ux.actions.user_action import ActionCounter, ActionFilter
+from ux.utils.sequences import split_sequences_by_time
 
 
 def count_actions_where(sequences: Sequences,
@@ -34,7 +37,7 @@ def count_actions_where(sequences: Sequences,
     else:
         counts = Counter()
         for sequence in sequences:
-            counts += sequence.filter(action_condition).counter(split_by)
+            counts.update(sequence.filter(action_condition).counter(split_by))
         return dict(counts)
 
 
@@ -60,42 +63,44 @@ def count_sequences_where(sequences: Sequences,
 
 
 def temporal_counts_by_config(
-        sequences: List[ActionSequence],
+        sequences: Union[Sequences, List[ActionSequence]],
         configs: List[CountConfig],
-        temporal_split: Callable[[List[ActionSequence]], List[ActionSequence]]
+        temporal_split: Union[
+            str,
+            Callable[[List[ActionSequence]],
+                     'OrderedDict[date, List[ActionSequence]]']
+        ]
 ) -> Dict[str, TemporalCount]:
     """
     Count metrics using the settings in a list of CountConfigs.
 
+    All the configs are evaluated together in a single pass over the
+    sequences and their actions.
+
     :param sequences: List of ActionSequences containing actions to measure
                       metrics.
     :param configs: List of CountConfigs defining the metrics to count.
     :param temporal_split: lambda function returning
-                           OrderedDict[date, List[IActionSequence]]
+                           OrderedDict[date, List[IActionSequence]], or a
+                           pandas frequency string e.g. 'D' or '6H' to bucket
+                           the sequences by the time of their first action.
     :return Dict[config.name, TemporalCount for config]
     """
-    total_counts = dict()
-    # create a new TemporalCount for each CountConfig
-    for config in configs:
-        total_counts[config.name] = TemporalCount(config.name)
-    sequence_groups = temporal_split(sequences)
-    for sequence_date, date_sequences in sequence_groups.items():
-        for config in configs:
-            # count sequences
-            if config.action_condition is None:
-                counts = count_sequences_where(
-                    sequences=Sequences(date_sequences),
-                    condition=config.sequence_condition,
-                    split_by=config.sequence_split_by
-                )
-            # count actions
-            else:
-                counts = count_actions_where(
-                    sequences=Sequences(date_sequences),
-                    sequence_condition=config.sequence_condition,
-                    action_condition=config.action_condition,
-                    split_by=config.action_split_by
-                )
-            total_counts[config.name][sequence_date] = counts
-
-    return total_counts
+    if isinstance(temporal_split, str):
+        buckets = split_sequences_by_time(sequences, freq=temporal_split)
+        sequence_dates = [label.to_pydatetime() for label in buckets.labels]
+        date_sequences = [
+            [sequences[p] for p in positions.tolist()]
+            for _, positions in buckets.items()
+        ]
+    else:
+        sequence_groups = temporal_split(sequences)
+        sequence_dates = list(sequence_groups.keys())
+        date_sequences = list(sequence_groups.values())
+    counts = CountEvaluator(configs).evaluate(date_sequences)
+    return {
+        config.name: TemporalCount.from_dict(
+            dict(zip(sequence_dates, counts[config.name])), name=config.name
+        )
+        for config in configs
+    }
@@ -0,0 +1,62 @@
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable[T], n_ahead: int = 1) -> Iterator[T]:
+    """
+    Iterate over an iterable in a background thread, reading up to n_ahead
+    items before they are needed so that slow reads, e.g. database queries,
+    overlap with the processing of earlier items.
+
+    Exceptions raised by the iterable are re-raised by the returned iterator.
+    The background thread stops if the returned iterator is closed early.
+
+    :param iterable: The iterable to read. It is only used by the background
+                     thread.
+    :param n_ahead: Maximum number of items to read ahead.
+    """
+    if n_ahead < 1:
+        raise ValueError('n_ahead must be at least 1')
+    queue = Queue(maxsize=n_ahead)
+    stop = Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as error:
+            put((_DONE, error))
+
+    thread = Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                item, error = queue.get(timeout=0.1)
+            except Empty:
+                if not thread.is_alive() and queue.empty():
+                    return
+                continue
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
@@ -1,10 +1,24 @@
 from collections import OrderedDict
-from datetime import date, timedelta, datetime
-from typing import List
+from datetime import date, datetime
+from typing import List, Optional, Union
+
+from pandas import DatetimeIndex
 
 from ux.sequences.action_sequence import ActionSequence
+from ux.sequences.sequences import Sequences
 from ux.compound_types import DatePair, DateTimePair
-from ux.utils.dates import monday_on_or_before, date_to_datetime
+from ux.utils.time_buckets import TimeBuckets
+
+
+def _get_sequence_start_times(
+        sequences: Union[Sequences, List[ActionSequence]]
+) -> DatetimeIndex:
+    """
+    Return the time stamp of the first UserAction in each sequence.
+    """
+    if isinstance(sequences, Sequences):
+        return sequences.start_times()
+    return DatetimeIndex([sequence.start for sequence in sequences])
 
 
 def _get_sequence_start_end_dates(sequences: List[ActionSequence]) -> DatePair:
@@ -14,15 +28,10 @@ def _get_sequence_start_end_dates(sequences: List[ActionSequence]) -> DatePair:
 
     :param sequences: List of IActionSequences to find dates from.
     """
-    start_date = None
-    end_date = None
-    for sequence in sequences:
-        sequence_date = sequence[0].time_stamp.date()
-        if start_date is None or sequence_date < start_date:
-            start_date = sequence_date
-        if end_date is None or sequence_date > end_date:
-            end_date = sequence_date
-    return start_date, end_date
+    start_date_time, end_date_time = _get_sequence_start_end_date_times(
+        sequences
+    )
+    return start_date_time.date(), end_date_time.date()
 
 
 def _get_sequence_start_end_date_times(
@@ -34,26 +43,59 @@ def _get_sequence_start_end_date_times(
 
     :param sequences: List of IActionSequences to find dates from.
     """
-    start_date_time = None
-    end_date_time = None
-    for sequence in sequences:
-        sequence_date_time = sequence[0].time_stamp
-        if start_date_time is None or sequence_date_time < start_date_time:
-            start_date_time = sequence_date_time
-        if end_date_time is None or sequence_date_time > end_date_time:
-            end_date_time = sequence_date_time
-    return start_date_time, end_date_time
+    start_times = _get_sequence_start_times(sequences)
+    return (start_times.min().to_pydatetime(),
+            start_times.max().to_pydatetime())
+
+
+def split_sequences_by_time(
+        sequences: Union[Sequences, List[ActionSequence]],
+        freq: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        tz: Optional[str] = None
+) -> TimeBuckets:
+    """
+    Bucket ActionSequences by the time of their first UserAction.
+
+    :param sequences: The sequences to bucket.
+    :param freq: pandas frequency of the buckets e.g. '15min', '6H', 'W-SUN'.
+    :param start: Optional time in the first bucket.
+    :param end: Optional time in the last bucket.
+    :param tz: Optional timezone to bucket in.
+    :return: TimeBuckets with the positions of the sequences in each bucket.
+    """
+    if isinstance(sequences, Sequences):
+        return sequences.time_buckets(freq=freq, start=start, end=end, tz=tz)
+    return TimeBuckets(_get_sequence_start_times(sequences), freq=freq,
+                       start=start, end=end, tz=tz)
+
+
+def _get_sequence_wall_clock_start_times(
+        sequences: Union[Sequences, List[ActionSequence]]
+) -> DatetimeIndex:
+    """
+    Return the local wall-clock time of the first UserAction in each sequence,
+    as naive time stamps.
+    """
+    start_times = _get_sequence_start_times(sequences)
+    if start_times.tz is not None:
+        start_times = start_times.tz_localize(None)
+    return start_times
 
 
 def split_sequences_by_hour(
         sequences: List[ActionSequence],
         start_date_time: datetime = None,
         end_date_time: datetime = None
-) -> OrderedDict[date, List[ActionSequence]]:
+) -> OrderedDict[datetime, List[ActionSequence]]:
     """
     Split a list of ActionSequences into an OrderedDict mapping each hour to a
     new list.
 
+    Hours are local wall-clock hours of the time stamps, so every hour between
+    the start and end is included across daylight saving time changes.
+
     Hours without any Sequences will contain an empty list.
 
     :param sequences: Original list of sequences to split by day.
@@ -71,19 +113,16 @@ def split_sequences_by_hour(
     if end_date_time is None:
         end_date_time = datetime(max_date.year, max_date.month, max_date.day,
                                  max_date.hour, 0, 0)
-    # build the lists of sequences
-    current_date_time = start_date_time
-    sequence_dict = OrderedDict()
-    while current_date_time <= end_date_time:
-        date_sequences = [
-            sequence for sequence in sequences
-            if sequence[0].time_stamp.date() == current_date_time.date() and
-            sequence[0].time_stamp.hour == current_date_time.hour
-        ]
-        sequence_dict[current_date_time] = date_sequences
-        current_date_time = current_date_time + timedelta(hours=1)
-
-    return sequence_dict
+    # build the lists of sequences in naive wall-clock hours
+    buckets = TimeBuckets(
+        _get_sequence_wall_clock_start_times(sequences), freq='H',
+        start=start_date_time.replace(tzinfo=None),
+        end=end_date_time.replace(tzinfo=None)
+    )
+    return OrderedDict(
+        (label.to_pydatetime(), [sequences[p] for p in positions.tolist()])
+        for label, positions in buckets.items()
+    )
 
 
 def split_sequences_by_day(
@@ -110,17 +149,7 @@ def split_sequences_by_day(
     if end_date is None:
         end_date = max_date
     # build the lists of sequences
-    current_date = start_date
-    sequence_dict = OrderedDict()
-    while current_date <= end_date:
-        date_sequences = [
-            sequence for sequence in sequences
-            if sequence[0].time_stamp.date() == current_date
-        ]
-        sequence_dict[current_date] = date_sequences
-        current_date = current_date + timedelta(days=1)
-
-    return sequence_dict
+    return _split_sequences_by_date(sequences, 'D', start_date, end_date)
 
 
 def split_sequences_by_week(
@@ -146,26 +175,8 @@ def split_sequences_by_week(
         start_date = min_date
     if end_date is None:
         end_date = max_date
-    start_date = monday_on_or_before(start_date)
-    end_date = monday_on_or_before(end_date)
-    # build the lists of sequences
-    current_date = start_date
-    sequence_dict = OrderedDict()
-    while current_date <= end_date:
-        first_date_time = date_to_datetime(current_date)
-        last_date_time = date_to_datetime(current_date + timedelta(days=7))
-        date_sequences = [
-            sequence for sequence in sequences
-            if (
-                    first_date_time <=
-                    sequence[0].time_stamp <
-                    last_date_time
-            )
-        ]
-        sequence_dict[current_date] = date_sequences
-        current_date = current_date + timedelta(days=7)
-
-    return sequence_dict
+    # build the lists of sequences, in weeks starting on Monday
+    return _split_sequences_by_date(sequences, 'W-MON', start_date, end_date)
 
 
 def split_sequences_by_month(
@@ -191,23 +202,21 @@ def split_sequences_by_month(
         start_date = min_date
     if end_date is None:
         end_date = max_date
-    start_date = date(start_date.year, start_date.month, 1)
-    end_date = date(end_date.year, end_date.month, 1)
-    # build the lists of sequences
-    current_date = start_date
-    sequence_dict = OrderedDict()
-    while current_date <= end_date:
-        first_date = current_date
-        last_date = (
-            date(first_date.year, first_date.month + 1, 1)
-            if first_date.month < 12
-            else date(first_date.year + 1, 1, 1)
-        )
-        date_sequences = [
-            sequence for sequence in sequences
-            if first_date <= sequence[0].time_stamp.date() < last_date
-        ]
-        sequence_dict[current_date] = date_sequences
-        current_date = last_date
-
-    return sequence_dict
+    # build the lists of sequences, in months starting on the 1st
+    return _split_sequences_by_date(sequences, 'MS', start_date, end_date)
+
+
+def _split_sequences_by_date(
+        sequences: List[ActionSequence],
+        freq: str, start_date: date, end_date: date
+) -> OrderedDict[date, List[ActionSequence]]:
+    """
+    Split the sequences into an OrderedDict mapping the start date of each
+    bucket of the frequency to a list of sequences.
+    """
+    buckets = split_sequences_by_time(sequences, freq=freq,
+                                      start=start_date, end=end_date)
+    return OrderedDict(
+        (label.date(), [sequences[p] for p in positions.tolist()])
+        for label, positions in buckets.items()
+    )
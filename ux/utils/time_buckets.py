@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from numpy import append, argsort, bincount, cumsum, empty, int64, \
+    ndarray, searchsorted
+from pandas import DatetimeIndex, Timestamp, date_range
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import BaseOffset, Tick
+
+T = TypeVar('T')
+
+
+class TimeBuckets(object):
+    """
+    Assigns time stamps to consecutive calendar buckets of a pandas frequency,
+    e.g. 'H', '15min', 'D', 'W-MON' or 'MS', using binary search over the
+    bucket edges.
+
+    Each bucket is a view onto a single array of positions, ordered by bucket
+    and then by position in the original time stamps.
+    """
+    def __init__(self, time_stamps: Union[DatetimeIndex, Sequence[datetime]],
+                 freq: Union[str, BaseOffset],
+                 start: Optional[datetime] = None,
+                 end: Optional[datetime] = None,
+                 tz: Optional[str] = None):
+        """
+        Bucket a collection of time stamps.
+
+        :param time_stamps: The time stamps to bucket.
+        :param freq: The pandas frequency string or offset of the buckets.
+        :param start: Optional time in the first bucket. Defaults to the
+                      earliest time stamp.
+        :param end: Optional time in the last bucket. Defaults to the latest
+                    time stamp.
+        :param tz: Optional timezone to bucket in. Aware time stamps are
+                   converted to it and naive time stamps are localized to it.
+        """
+        index = DatetimeIndex(time_stamps)
+        if tz is not None:
+            if index.tz is None:
+                index = index.tz_localize(tz)
+            else:
+                index = index.tz_convert(tz)
+        self._offset: BaseOffset = to_offset(freq)
+        self._tz = index.tz
+        if not len(index) and (start is None or end is None):
+            self._labels = DatetimeIndex([], tz=self._tz)
+            self._positions = empty(0, dtype=int64)
+            self._bounds = [0]
+            self._bucket_ids = empty(0, dtype=int64)
+            return
+        first = self._floor(self._timestamp(start if start is not None
+                                            else index.min()))
+        last = self._floor(self._timestamp(end if end is not None
+                                           else index.max()))
+        self._labels: DatetimeIndex = date_range(
+            first, last, freq=self._offset
+        )
+        edges = self._labels.append(
+            DatetimeIndex([self._labels[-1] + self._offset])
+        ) if len(self._labels) else self._labels
+        # find the bucket of each time stamp, with -1 outside the range
+        bucket_ids = searchsorted(edges.asi8, index.asi8, side='right') - 1
+        bucket_ids[bucket_ids >= len(self._labels)] = -1
+        self._bucket_ids: ndarray = bucket_ids
+        in_range = (bucket_ids != -1).nonzero()[0]
+        order = argsort(bucket_ids[in_range], kind='stable')
+        self._positions: ndarray = in_range[order]
+        self._bounds: List[int] = append(
+            [0], cumsum(bincount(bucket_ids[in_range],
+                                 minlength=len(self._labels)))
+        ).tolist()
+
+    @property
+    def labels(self) -> DatetimeIndex:
+        """
+        Return the start time of each bucket.
+        """
+        return self._labels
+
+    @property
+    def bucket_ids(self) -> ndarray:
+        """
+        Return the bucket of each time stamp, or -1 if it is outside the
+        range of the buckets.
+        """
+        return self._bucket_ids
+
+    def positions(self, bucket: int) -> ndarray:
+        """
+        Return a view of the positions of the time stamps in a bucket.
+        """
+        return self._positions[self._bounds[bucket]: self._bounds[bucket + 1]]
+
+    def counts(self) -> ndarray:
+        """
+        Return the number of time stamps in each bucket.
+        """
+        return bincount(self._bucket_ids[self._bucket_ids != -1],
+                        minlength=len(self._labels))
+
+    def items(self) -> Iterator[Tuple[Timestamp, ndarray]]:
+        """
+        Yield the label and positions of each bucket.
+        """
+        for bucket, label in enumerate(self._labels):
+            yield label, self.positions(bucket)
+
+    def split(self, values: Sequence[T]) -> 'OrderedDict[Timestamp, List[T]]':
+        """
+        Split values in the same order as the time stamps into an OrderedDict
+        mapping each bucket label to a list of its values.
+        """
+        return OrderedDict(
+            (label, [values[p] for p in positions.tolist()])
+            for label, positions in self.items()
+        )
+
+    def _timestamp(self, value: datetime) -> Timestamp:
+
+        value = Timestamp(value)
+        if self._tz is not None and value.tz is None:
+            value = value.tz_localize(self._tz)
+        elif self._tz is not None:
+            value = value.tz_convert(self._tz)
+        return value
+
+    def _floor(self, value: Timestamp) -> Timestamp:
+        """
+        Return the start of the bucket containing the value.
+        """
+        if isinstance(self._offset, Tick):
+            return value.floor(self._offset)
+        return self._offset.rollback(value.normalize())
+
+    def __len__(self) -> int:
+
+        return len(self._labels)
+
+    def __repr__(self) -> str:
+
+        return 'TimeBuckets({} buckets of {})'.format(
+            len(self._labels), self._offset.freqstr
+        )
+
@@ -1,9 +1,11 @@
 from collections import defaultdict
-from pandas import Series, pivot_table, DataFrame, notnull
+from pandas import Series, pivot_table, DataFrame
 from typing import List, Dict, Tuple, Union, Callable, Optional
 
 from ux.actions.user_action import UserAction
 from ux.sequences.action_sequence import ActionSequence
+from ux.sequences.markov_chain import MarkovChain
+from ux.sequences.transition_counter import TransitionCounter
 from ux.actions.action_template import ActionTemplatePair
 from ux.compound_types import StrPair
 
@@ -18,14 +20,10 @@ def count_action_transitions(
     :param action_sequences: List of IActionSequence to count transitions in.
     :return: Dictionary of {(from, to) => count}
     """
-    transitions = defaultdict(int)
-    # count transitions
-    for sequence in action_sequences:
-        for a in range(len(sequence) - 1):
-            from_action = sequence[a].template()
-            to_action = sequence[a + 1].template()
-            transitions[(from_action, to_action)] += 1
-    return transitions
+    return defaultdict(
+        int,
+        TransitionCounter('action_template').update(action_sequences).counts()
+    )
 
 
 def count_location_transitions(
@@ -37,15 +35,10 @@ def count_location_transitions(
 
     :param action_sequences: List of IActionSequence to count transitions in.
     """
-    transitions = defaultdict(int)
-    # count transitions
-    for sequence in action_sequences:
-        for action in sequence:
-            source = action.source_id
-            target = action.target_id
-            if notnull(source) and notnull(target):
-                transitions[(source, target)] += 1
-    return transitions
+    return defaultdict(
+        int,
+        TransitionCounter('location').update(action_sequences).counts()
+    )
 
 
 def create_transition_table(
@@ -151,19 +144,10 @@ def find_most_probable_sequence(
         current_name = transitions.groupby('from').sum()[
             'count'
         ].sort_values(ascending=False).index[0]
-    sequence = [current_name]
-    # iteratively find most frequent transition point from the current point
-    found = True
-    while found:
-        transitions = transitions.loc[transitions['to'] != current_name]
-        if current_name in transitions['from'].tolist():
-            current_name = transitions.loc[
-                transitions['from'] == current_name
-            ].sort_values('count', ascending=False).iloc[0]['to']
-            if current_name not in sequence:
-                sequence.append(current_name)
-            else:
-                found = False
-        else:
-            found = False
-    return sequence
+    # walk the most probable transitions, never returning to a visited state
+    chain = MarkovChain.from_counts(
+        transitions.groupby(['from', 'to'], sort=False)['count'].sum().to_dict()
+    )
+    if current_name not in chain:
+        return [current_name]
+    return chain.most_probable_path(start=current_name, allow_revisits=False)
@@ -1,15 +1,46 @@
-from collections import defaultdict
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 
 from ux.sequences.action_sequence import ActionSequence
 from ux.database_manager import DatabaseManager
+from ux.session import Session
+
+
+def _iter_sessions_with_sequences(
+        manager: DatabaseManager,
+        start: datetime = None,
+        end: datetime = None,
+        batch_size: int = 1000,
+        prefetch_batches: bool = False
+) -> Iterator[Tuple[Session, ActionSequence]]:
+    """
+    Yield each Session in the Database with its ActionSequence, fetching the
+    sequences in batches with `DatabaseManager.get_session_sequences`.
+    """
+    # sessions whose sequences have not been yielded yet, in fetch order
+    sessions = deque()
+
+    def session_ids() -> Iterator[str]:
+        for batch in manager.iter_sessions(start=start, end=end,
+                                           batch_size=batch_size):
+            for session in batch:
+                sessions.append(session)
+                yield session.session_id
+
+    for sequence in manager.get_session_sequences(
+            session_ids(), batch_size=batch_size,
+            prefetch_batches=prefetch_batches
+    ):
+        yield sessions.popleft(), sequence
 
 
 def find_location_history(
         manager: DatabaseManager,
         start: datetime = None,
-        end: datetime = None
+        end: datetime = None,
+        batch_size: int = 1000,
+        prefetch_batches: bool = False
 ) -> Dict[str, List[datetime]]:
     """
     Find the history of each Location's appearance in the Database.
@@ -17,25 +48,27 @@ def find_location_history(
     :param manager: Instance of a class inheriting from IDatabaseManager.
     :param start: Optional start date-time to exclude older sessions.
     :param end: Optional end date-time to exclude newer sessions.
+    :param batch_size: Number of sessions to read from the manager at a time.
+    :param prefetch_batches: Whether to read the next batch in a background
+                             thread while the current batch is processed.
     :return: Dictionary mapping location ids to lists of session start times.
     """
     history = defaultdict(list)
-    for session in manager.sessions():
-        session_start = session.start_time
-        if (start and session_start < start) or (end and (session_start > end)):
-            continue
-        sequence: ActionSequence = manager.get_session_sequence(
-            session_id=session.session_id
-        )
+    for session, sequence in _iter_sessions_with_sequences(
+            manager=manager, start=start, end=end, batch_size=batch_size,
+            prefetch_batches=prefetch_batches
+    ):
         for location_id in sequence.location_ids():
-            history[location_id].append(session_start)
+            history[location_id].append(session.start_time)
     return dict(history)
 
 
 def find_action_type_history(
         manager: DatabaseManager,
         start: datetime = None,
-        end: datetime = None
+        end: datetime = None,
+        batch_size: int = 1000,
+        prefetch_batches: bool = False
 ) -> Dict[str, List[datetime]]:
     """
     Find the history of each Action Type's appearance in the Database.
@@ -43,16 +76,16 @@ def find_action_type_history(
     :param manager: Instance of a class inheriting from IDatabaseManager.
     :param start: Optional start date-time to exclude older sessions.
     :param end: Optional end date-time to exclude newer sessions.
+    :param batch_size: Number of sessions to read from the manager at a time.
+    :param prefetch_batches: Whether to read the next batch in a background
+                             thread while the current batch is processed.
     :return: Dictionary mapping location ids to lists of session start times.
     """
     history = defaultdict(list)
-    for session in manager.sessions():
-        session_start = session.start_time
-        if (start and session_start < start) or (end and (session_start > end)):
-            continue
-        sequence: ActionSequence = manager.get_session_sequence(
-            session_id=session.session_id
-        )
+    for session, sequence in _iter_sessions_with_sequences(
+            manager=manager, start=start, end=end, batch_size=batch_size,
+            prefetch_batches=prefetch_batches
+    ):
         for action_type in sequence.unique_action_types():
-            history[action_type].append(session_start)
+            history[action_type].append(session.start_time)
     return dict(history)
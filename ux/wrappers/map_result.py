@@ -1,6 +1,10 @@
 from collections import OrderedDict
-from pandas import DataFrame, Series, MultiIndex, Index, concat
-from typing import Iterable, Iterator, List, Union, ItemsView, KeysView, ValuesView
+from collections.abc import Iterable as AbcIterable
+from itertools import chain
+from numpy import append, array, cumsum, int64, ndarray
+from pandas import DataFrame, Series, MultiIndex, Index
+from typing import Iterable, Iterator, List, Optional, Union, ItemsView, \
+    KeysView, ValuesView
 
 
 def _str_or_non_iterable(val) -> bool:
@@ -8,8 +12,36 @@ def _str_or_non_iterable(val) -> bool:
     return not isinstance(val, Iterable) or isinstance(val, str)
 
 
-class MapResult(object):
+def _str_or_non_iterable_type(val_type: type) -> bool:
+
+    return (issubclass(val_type, str) or
+            not issubclass(val_type, AbcIterable))
+
+
+def _numeric_array(values: list) -> Optional[ndarray]:
+    """
+    Return a flat numeric or boolean array of a list of values, or None if the
+    values are not all Python numbers or all booleans, so pandas infers their
+    dtype.
+    """
+    value_types = set(map(type, values))
+    if not (value_types <= {int, float} or value_types == {bool}):
+        return None
+    try:
+        return array(values)
+    except OverflowError:
+        return None
 
+
+class MapResult(object):
+    """
+    The result of mapping groups or sequences to values, keyed by a single
+    value or a tuple of values.
+
+    The pandas representation is built once, as an Index or MultiIndex of the
+    keys, repeated by the length of each list of values, over a flat array of
+    the values, and reused by later conversions.
+    """
     def __init__(self, data: dict,
                  key_names: Union[str, List[str]] = 'map',
                  value_names: Union[str, List[str]] = 'result'):
@@ -19,15 +51,20 @@ class MapResult(object):
         if isinstance(value_names, str):
             value_names = [value_names]
 
+        self._first_key = next(iter(data), None)
+        self._first_value = (None if self._first_key is None
+                             else data[self._first_key])
+
         # check key names
-        if all(_str_or_non_iterable(k) for k in list(data.keys())):
+        if all(_str_or_non_iterable_type(key_type)
+               for key_type in set(map(type, data.keys()))):
             if not len(key_names) == 1:
                 raise ValueError(
                     'Length of index names must be '
                     '1 when keys are not Iterables'
                 )
         else:
-            if not len(key_names) == len(list(data.keys())[0]):
+            if not len(key_names) == len(self._first_key):
                 raise KeyError(
                     'Keys must have same length as key_names'
                 )
@@ -39,15 +76,18 @@ class MapResult(object):
         self._data: dict = data
         self._key_names: List[str] = key_names
         self._value_names: List[str] = value_names
+        self._series: Optional[Series] = None
+        self._offsets: Optional[ndarray] = None
 
-        self._first_key = list(data.keys())[0]
-        self._first_value = list(data.values())[0]
-
-        for attribute in self._data.keys():
-            try:
-                setattr(self, attribute, self._data[attribute])
-            except:
-                pass
+    def __getattr__(self, item: str):
+        """
+        Return the value of a key that is not the name of an attribute.
+        """
+        data = self.__dict__.get('_data')
+        if data is not None and item in data:
+            return data[item]
+        raise AttributeError(
+            "'MapResult' object has no attribute '{}'".format(item))
 
     @property
     def key_names(self) -> List[str]:
@@ -59,40 +99,55 @@ class MapResult(object):
 
         return self._value_names
 
+    @property
+    def offsets(self) -> ndarray:
+        """
+        Return the offset of the values of each key in the flat values of the
+        Series representation, followed by the number of values.
+        """
+        self._build_series()
+        return self._offsets
+
     def to_series(self) -> Series:
 
+        self._build_series()
+        return self._series.copy(deep=False)
+
+    def _build_series(self) -> None:
+        """
+        Build the Series representation from the keys and the flat values,
+        if it has not been built yet.
+        """
+        if self._series is not None:
+            return
+        keys = list(self._data.keys())
+        values = list(self._data.values())
         if _str_or_non_iterable(self._first_key):
-            if _str_or_non_iterable(self._first_value):
-                # e.g. {'a': 1, 'b': 2, 'c': 3}
-                series = Series(self._data, name=self.value_names[0])
-                series.index.name = self.key_names[0]
-            else:
-                # e.g. {'a': [1, 2], 'b': [3, 4, 5]}
-                series = concat([
-                    Series(
-                        index=Index([key] * len(values),
-                                    name=self.key_names[0]),
-                        data=values, name=self.value_names[0]
-                    )
-                    for key, values in self._data.items()
-                ])
+            # e.g. {'a': ...}
+            index = Index(keys, name=self.key_names[0])
+        elif all(len(key) == len(self.key_names) for key in keys):
+            # e.g. {('a', 'b'): ...}
+            index = MultiIndex.from_arrays(
+                [list(level) for level in zip(*keys)], names=self.key_names
+            )
         else:
-            if _str_or_non_iterable(self._first_value):
-                # e.g. {('a', 'b'): 1, ('c', 'd'): 2, ('e', 'f'): 3}
-                series = Series(self._data, name=self.value_names[0])
-                series.index.names = self.key_names
-            else:
-                # e.g. {('a', 'b'): [1, 2], ('c', 'd'): [3, 4, 5]}
-                series = concat([
-                    Series(
-                        index=MultiIndex.from_tuples(tuples=[key] * len(values),
-                                                     names=self.key_names),
-                        data=values, name=self.value_names[0]
-                    )
-                    for key, values in self._data.items()
-                ])
-
-        return series
+            index = MultiIndex.from_tuples(keys, names=self.key_names)
+        if keys and not _str_or_non_iterable(self._first_value):
+            # e.g. {'a': [1, 2], 'b': [3, 4, 5]}
+            lengths = [len(value) for value in values]
+            index = index.repeat(lengths)
+            values = list(chain.from_iterable(values))
+        else:
+            # e.g. {'a': 1, 'b': 2, 'c': 3}
+            lengths = [1] * len(keys)
+        self._offsets = append([0], cumsum(lengths)).astype(int64)
+        if not values:
+            values = array([], dtype=object)
+        else:
+            numeric = _numeric_array(values)
+            if numeric is not None:
+                values = numeric
+        self._series = Series(values, index=index, name=self.value_names[0])
 
     def to_dict(self) -> dict:
 